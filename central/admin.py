@@ -1,7 +1,8 @@
 from django.contrib import admin
 from .models import (
     Moneda, CuentaContable, EntidadComercial, Producto,
-    TransaccionEncabezado, MovimientoContable
+    TransaccionEncabezado, MovimientoContable, SaldoCuenta, ContabilizacionPendiente,
+    SerieNumeracion
 )
 
 # -------------------------------------------------------------
@@ -48,4 +49,38 @@ class TransaccionEncabezadoAdmin(admin.ModelAdmin):
     list_display = ('id', 'fecha', 'referencia')
     list_filter = ('fecha',)
 
-    inlines = [MovimientoContableInline] # Mostramos los movimientos debajo
\ No newline at end of file
+    inlines = [MovimientoContableInline] # Mostramos los movimientos debajo
+
+# -------------------------------------------------------------
+# 4. SALDOS (Solo lectura, se mantienen por Signals)
+# -------------------------------------------------------------
+
+@admin.register(SaldoCuenta)
+class SaldoCuentaAdmin(admin.ModelAdmin):
+    list_display = ('cuenta', 'anio', 'mes', 'moneda', 'total_debito', 'total_credito', 'cantidad_movimientos')
+    list_filter = ('anio', 'moneda')
+    search_fields = ('cuenta__codigo', 'cuenta__nombre')
+    readonly_fields = ('cuenta', 'anio', 'mes', 'moneda', 'total_debito', 'total_credito', 'cantidad_movimientos')
+
+# -------------------------------------------------------------
+# 5. BANDEJA DE CONTABILIZACIÓN DIFERIDA
+# -------------------------------------------------------------
+
+@admin.register(ContabilizacionPendiente)
+class ContabilizacionPendienteAdmin(admin.ModelAdmin):
+    list_display = ('id', 'tipo_documento', 'documento_id', 'estado', 'intentos', 'fecha_creacion', 'fecha_proceso')
+    list_filter = ('estado', 'tipo_documento')
+    search_fields = ('documento_id', 'ultimo_error')
+
+# -------------------------------------------------------------
+# 6. SERIES DE NUMERACIÓN
+# -------------------------------------------------------------
+
+@admin.register(SerieNumeracion)
+class SerieNumeracionAdmin(admin.ModelAdmin):
+    list_display = ('tipo_documento', 'prefijo', 'anio', 'digitos', 'tamano_bloque')
+    list_filter = ('tipo_documento', 'anio')
+
+    def get_readonly_fields(self, request, obj=None):
+        # El tamaño de bloque define el incremento de la secuencia: fijo tras crear la serie
+        return ('tamano_bloque', 'ultimo_numero') if obj else ('ultimo_numero',)
@@ -0,0 +1,13 @@
+# Archivo: central/apps.py
+
+from django.apps import AppConfig
+from django.utils.translation import gettext_lazy as _
+
+class CentralConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'central'
+    verbose_name = _("Núcleo Contable")
+
+    def ready(self):
+        # Registra las señales que mantienen SaldoCuenta al día
+        import central.signals
@@ -0,0 +1,157 @@
+# Archivo: central/bandeja.py
+
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Min, Q
+from django.utils import timezone
+
+from .contabilizacion import contabilizar, obtener_contabilizador
+from .models import ContabilizacionPendiente
+
+# Reintentos antes de mandar la fila a 'F' (dead letter) y espera base entre intentos
+MAX_INTENTOS = 5
+ESPERA_BASE_SEGUNDOS = 30
+
+
+def contabilizacion_diferida():
+    """True si settings.HERMES_CONTABILIZACION_DIFERIDA activa el modo bandeja de salida."""
+    return getattr(settings, 'HERMES_CONTABILIZACION_DIFERIDA', False)
+
+
+def encolar(nombre, documentos):
+    """
+    Escribe una fila de bandeja por documento. Debe llamarse dentro de la misma
+    transacción que crea los documentos: si esta se revierte, la fila también.
+    """
+    obtener_contabilizador(nombre)
+    ahora = timezone.now()
+    return ContabilizacionPendiente.objects.bulk_create([
+        ContabilizacionPendiente(tipo_documento=nombre, documento_id=documento.pk, disponible_desde=ahora)
+        for documento in documentos
+    ])
+
+
+def contabilizar_o_encolar(nombre, documentos, omitir_errores=False):
+    """
+    Punto de entrada de los serializadores: en modo diferido solo encola y retorna
+    None; si no, contabiliza en línea y retorna el resultado de contabilizar()
+    (omitir_errores se pasa tal cual).
+    """
+    if contabilizacion_diferida():
+        encolar(nombre, documentos)
+        return None
+    return contabilizar(nombre, documentos, omitir_errores=omitir_errores)
+
+
+def espera_reintento(intentos):
+    """Espera exponencial: 30s, 60s, 120s, ..."""
+    return timedelta(seconds=ESPERA_BASE_SEGUNDOS * 2 ** max(intentos - 1, 0))
+
+
+def _registrar_fallo(fila, error, ahora, max_intentos):
+    fila.intentos += 1
+    fila.ultimo_error = error
+    if fila.intentos >= max_intentos:
+        fila.estado = 'F'
+        fila.fecha_proceso = ahora
+    else:
+        fila.disponible_desde = ahora + espera_reintento(fila.intentos)
+
+
+def procesar_lote(tamano_lote=500, max_intentos=MAX_INTENTOS):
+    """
+    Reclama hasta tamano_lote filas pendientes con SELECT ... FOR UPDATE SKIP LOCKED
+    (varios workers pueden correr a la vez sin pisarse) y las contabiliza agrupadas
+    por tipo de documento con el motor por lotes.
+
+    Los documentos que ya tienen asiento o ya no aplican (ej. facturas anuladas) se
+    marcan como contabilizados sin generar nada. Un error de un documento solo
+    reprograma su fila; un error inesperado reprograma las filas de su grupo.
+    Retorna {'reclamadas', 'contabilizadas', 'reintentos', 'fallidas'}.
+    """
+    with transaction.atomic():
+        ahora = timezone.now()
+        filas = list(
+            ContabilizacionPendiente.objects
+            .select_for_update(skip_locked=True)
+            .filter(estado='P', disponible_desde__lte=ahora)
+            .order_by('id')[:tamano_lote]
+        )
+        por_tipo = defaultdict(list)
+        for fila in filas:
+            por_tipo[fila.tipo_documento].append(fila)
+
+        for nombre, filas_tipo in por_tipo.items():
+            errores = {}
+            try:
+                with transaction.atomic():
+                    contabilizador = obtener_contabilizador(nombre)
+                    documentos = list(
+                        contabilizador.pendientes().filter(pk__in={fila.documento_id for fila in filas_tipo})
+                    )
+                    resultado = contabilizar(nombre, documentos, omitir_errores=True)
+                    errores = {error['documento']: error['error'] for error in resultado['errores']}
+            except Exception as e:
+                errores = {fila.documento_id: f"{type(e).__name__}: {e}" for fila in filas_tipo}
+
+            for fila in filas_tipo:
+                if fila.documento_id in errores:
+                    _registrar_fallo(fila, errores[fila.documento_id], ahora, max_intentos)
+                else:
+                    fila.estado = 'C'
+                    fila.fecha_proceso = ahora
+
+        ContabilizacionPendiente.objects.bulk_update(
+            filas, ['estado', 'intentos', 'ultimo_error', 'disponible_desde', 'fecha_proceso']
+        )
+
+    return {
+        'reclamadas': len(filas),
+        'contabilizadas': sum(1 for fila in filas if fila.estado == 'C'),
+        'reintentos': sum(1 for fila in filas if fila.estado == 'P'),
+        'fallidas': sum(1 for fila in filas if fila.estado == 'F'),
+    }
+
+
+def reintentar_fallidas(tipo_documento=None):
+    """Devuelve las filas en dead letter a la cola con el contador de intentos en cero."""
+    fallidas = ContabilizacionPendiente.objects.filter(estado='F')
+    if tipo_documento:
+        fallidas = fallidas.filter(tipo_documento=tipo_documento)
+    return fallidas.update(estado='P', intentos=0, disponible_desde=timezone.now(), fecha_proceso=None)
+
+
+def metricas_bandeja():
+    """
+    Estado de la cola por tipo de documento. 'retraso_segundos' es la antigüedad de
+    la fila pendiente más vieja: el retraso de la contabilidad frente a la operación.
+    """
+    ahora = timezone.now()
+    filas = (
+        ContabilizacionPendiente.objects
+        .filter(estado__in=['P', 'F'])
+        .values('tipo_documento')
+        .annotate(
+            pendientes=Count('id', filter=Q(estado='P')),
+            fallidas=Count('id', filter=Q(estado='F')),
+            mas_antigua=Min('fecha_creacion', filter=Q(estado='P')),
+        )
+        .order_by('tipo_documento')
+    )
+    por_tipo = {
+        fila['tipo_documento']: {
+            'pendientes': fila['pendientes'],
+            'fallidas': fila['fallidas'],
+            'retraso_segundos': (ahora - fila['mas_antigua']).total_seconds() if fila['mas_antigua'] else 0,
+        }
+        for fila in filas
+    }
+    return {
+        'pendientes': sum(m['pendientes'] for m in por_tipo.values()),
+        'fallidas': sum(m['fallidas'] for m in por_tipo.values()),
+        'retraso_segundos': max((m['retraso_segundos'] for m in por_tipo.values()), default=0),
+        'por_tipo': por_tipo,
+    }
@@ -0,0 +1,105 @@
+# Archivo: central/consultas.py
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from rest_framework import serializers
+
+# Relaciones calculadas por (serializador, modelo): los campos no cambian entre peticiones
+_relaciones = {}
+
+
+def _recorrer_fuente(modelo, partes):
+    """
+    Sigue una fuente con puntos (ej. ['cliente', 'nombre_comercial']) por el modelo.
+    Retorna (ruta de select_related, ruta de prefetch_related, modelo final): la
+    primera relación "a muchos" corta el select_related y pasa a prefetch.
+    """
+    seleccion = []
+    for posicion, parte in enumerate(partes):
+        try:
+            campo = modelo._meta.get_field(parte)
+        except FieldDoesNotExist:
+            # Propiedad o método: solo se optimiza lo recorrido hasta aquí
+            break
+        if not campo.is_relation:
+            break
+        if campo.many_to_many or campo.one_to_many:
+            return seleccion, seleccion + [parte], campo.related_model
+        seleccion.append(parte)
+        modelo = campo.related_model
+        if posicion == len(partes) - 1:
+            return seleccion, None, modelo
+    return seleccion, None, None
+
+
+def _unir(prefijo, ruta):
+    return '__'.join(prefijo + ruta)
+
+
+def relaciones_de_serializador(serializador, modelo, prefijo=()):
+    """
+    Deriva (select_related, prefetch_related) de los campos de lectura de un serializador:
+
+    - Fuentes con puntos (source='producto.nombre') -> select_related('producto').
+    - Serializadores anidados simples -> select_related, recursivo.
+    - Serializadores anidados many=True y relaciones a muchos -> Prefetch con su
+      propio queryset optimizado (ej. detalles -> detalles + select_related('producto')).
+
+    Los ForeignKey expuestos como pk (PrimaryKeyRelatedField) no necesitan consulta.
+    """
+    prefijo = list(prefijo)
+    seleccion, prefetch = set(), []
+    for campo in serializador.fields.values():
+        if campo.write_only or campo.source == '*':
+            continue
+        ruta_select, ruta_prefetch, relacionado = _recorrer_fuente(modelo, campo.source.split('.'))
+        hijo = campo.child if isinstance(campo, serializers.ListSerializer) else (
+            campo if isinstance(campo, serializers.BaseSerializer) else None
+        )
+
+        if ruta_prefetch:
+            if ruta_select:
+                seleccion.add(_unir(prefijo, ruta_select))
+            if hijo is not None:
+                hijo_select, hijo_prefetch = relaciones_de_serializador(hijo, relacionado)
+                consulta = relacionado._default_manager.select_related(*hijo_select).prefetch_related(*hijo_prefetch)
+                prefetch.append(Prefetch(_unir(prefijo, ruta_prefetch), queryset=consulta))
+            else:
+                prefetch.append(_unir(prefijo, ruta_prefetch))
+        elif relacionado is not None and hijo is not None:
+            # Anidado simple: sus relaciones se encadenan al mismo select_related
+            seleccion.add(_unir(prefijo, ruta_select))
+            hijo_select, hijo_prefetch = relaciones_de_serializador(hijo, relacionado, prefijo + ruta_select)
+            seleccion.update(hijo_select)
+            prefetch.extend(hijo_prefetch)
+        elif relacionado is not None and isinstance(campo, serializers.PrimaryKeyRelatedField):
+            # Un ForeignKey expuesto como pk se lee de la columna <campo>_id: basta con lo intermedio
+            if len(ruta_select) > 1:
+                seleccion.add(_unir(prefijo, ruta_select[:-1]))
+        elif ruta_select:
+            seleccion.add(_unir(prefijo, ruta_select))
+    return sorted(seleccion), prefetch
+
+
+def optimizar_queryset(queryset, serializer_class):
+    """Aplica al queryset los select_related/prefetch_related que necesita serializer_class."""
+    clave = (serializer_class, queryset.model)
+    if clave not in _relaciones:
+        _relaciones[clave] = relaciones_de_serializador(serializer_class(), queryset.model)
+    seleccion, prefetch = _relaciones[clave]
+    if seleccion:
+        queryset = queryset.select_related(*seleccion)
+    if prefetch:
+        queryset = queryset.prefetch_related(*prefetch)
+    return queryset
+
+
+class ConsultaOptimizadaMixin:
+    """
+    Para ModelViewSet/ReadOnlyModelViewSet: agrega al queryset las relaciones que
+    lee el serializador, de modo que una página del listado cuesta un número fijo de
+    consultas (una por relación "a muchos") sin importar cuántas filas traiga.
+    """
+
+    def get_queryset(self):
+        return optimizar_queryset(super().get_queryset(), self.get_serializer_class())
@@ -0,0 +1,172 @@
+# Archivo: central/contabilizacion.py
+
+from decimal import Decimal
+
+from django.db import IntegrityError, transaction
+from django.db.models import Case, IntegerField, When
+
+from .models import MovimientoContable, TransaccionEncabezado
+from .numeracion import siguiente_numero
+from .saldos import registrar_movimientos
+
+
+class ErrorContabilizacion(Exception):
+    """Un documento no se pudo convertir en asiento (configuración o datos incompletos)."""
+
+
+class Contabilizador:
+    """
+    Describe cómo se contabiliza un tipo de documento:
+
+    - modelo: modelo del documento (ej. FacturaEncabezado).
+    - generar(documento): retorna un dict con fecha, referencia, descripcion,
+      moneda_id, entidad_id, tasa_cambio y 'movimientos' = [(cuenta_id, 'D'/'C', monto)],
+      o None si el documento no genera asiento. Lanza ErrorContabilizacion si no puede.
+      Sin 'referencia', el asiento toma el siguiente número de la serie 'asientos'.
+    - campo_asiento: ForeignKey del documento donde se enlaza el asiento.
+    - pendientes(): queryset de documentos aún sin asiento (para procesos por lotes).
+    """
+
+    def __init__(self, nombre, modelo, generar, campo_asiento, pendientes):
+        self.nombre = nombre
+        self.modelo = modelo
+        self.generar = generar
+        self.campo_asiento = campo_asiento
+        self.pendientes = pendientes
+
+
+CONTABILIZADORES = {}
+
+
+def registrar_contabilizador(nombre, modelo, generar, campo_asiento, pendientes):
+    """Cada app registra sus documentos al iniciar (ver <app>/contabilizacion.py)."""
+    CONTABILIZADORES[nombre] = Contabilizador(nombre, modelo, generar, campo_asiento, pendientes)
+
+
+def obtener_contabilizador(nombre):
+    try:
+        return CONTABILIZADORES[nombre]
+    except KeyError:
+        raise ErrorContabilizacion(
+            f"Tipo de documento sin contabilizador: '{nombre}'. Registrados: {', '.join(sorted(CONTABILIZADORES))}."
+        )
+
+
+def validar_balance(asiento):
+    total_debito = sum((Decimal(str(m[2])) for m in asiento['movimientos'] if m[1] == 'D'), Decimal('0'))
+    total_credito = sum((Decimal(str(m[2])) for m in asiento['movimientos'] if m[1] == 'C'), Decimal('0'))
+    if abs(total_debito - total_credito) > Decimal('0.001'):
+        raise ErrorContabilizacion(
+            f"El asiento contable no balancea. Débito Total: {total_debito}, Crédito Total: {total_credito}."
+        )
+
+
+def contabilizar(nombre, documentos, omitir_errores=False):
+    """
+    Genera los asientos de una lista de documentos del mismo tipo con inserciones masivas:
+    un bulk_create de encabezados, uno de movimientos, un upsert de SaldoCuenta y un único
+    UPDATE (CASE ... WHEN) que enlaza cada documento con su asiento.
+
+    Con omitir_errores=False el primer documento inválido lanza ErrorContabilizacion y no
+    se escribe nada; con omitir_errores=True los inválidos se reportan y el resto se contabiliza.
+    Una referencia duplicada (IntegrityError) se trata igual: en el segundo caso el lote
+    se reintenta documento por documento y solo se reporta el que choca.
+    Retorna {'asientos': [...], 'errores': [{'documento': pk, 'error': mensaje}]}.
+    """
+    contabilizador = obtener_contabilizador(nombre)
+    documentos = list(documentos)
+
+    generados, errores = [], []
+    for documento in documentos:
+        try:
+            asiento = contabilizador.generar(documento)
+            if asiento is None:
+                continue
+            asiento['movimientos'] = [m for m in asiento['movimientos'] if m[2]]
+            validar_balance(asiento)
+        except ErrorContabilizacion as e:
+            if not omitir_errores:
+                raise
+            errores.append({'documento': documento.pk, 'error': str(e)})
+            continue
+        generados.append((documento, asiento))
+
+    if not generados:
+        return {'asientos': [], 'errores': errores}
+
+    try:
+        with transaction.atomic():
+            encabezados = _insertar(contabilizador, generados)
+    except IntegrityError as e:
+        # Referencia duplicada (ya contabilizada o insertada por otro proceso): se
+        # reintenta documento por documento para aislar el conflicto
+        if not omitir_errores:
+            raise ErrorContabilizacion(f"No se pudo registrar el lote de asientos: {e}")
+        encabezados = []
+        for generado in generados:
+            try:
+                with transaction.atomic():
+                    encabezados.extend(_insertar(contabilizador, [generado]))
+            except IntegrityError as e:
+                errores.append({'documento': generado[0].pk, 'error': str(e)})
+
+    return {'asientos': encabezados, 'errores': errores}
+
+
+def _insertar(contabilizador, generados):
+    """Escribe los asientos de [(documento, asiento)] y los enlaza con sus documentos."""
+    encabezados = TransaccionEncabezado.objects.bulk_create([
+        TransaccionEncabezado(
+            fecha=asiento['fecha'],
+            referencia=asiento.get('referencia') or siguiente_numero('asientos', asiento['fecha']),
+            descripcion=asiento['descripcion'],
+            entidad_id=asiento.get('entidad_id'),
+            moneda_id=asiento['moneda_id'],
+            tasa_cambio=asiento.get('tasa_cambio', Decimal('1')),
+        )
+        for _, asiento in generados
+    ])
+    movimientos = [
+        MovimientoContable(encabezado=encabezado, cuenta_id=cuenta_id, tipo_movimiento=tipo, monto=monto)
+        for encabezado, (_, asiento) in zip(encabezados, generados)
+        for cuenta_id, tipo, monto in asiento['movimientos']
+    ]
+    MovimientoContable.objects.bulk_create(movimientos, batch_size=1000)
+    registrar_movimientos(
+        (m.cuenta_id, m.encabezado.moneda_id, m.encabezado.fecha, m.tipo_movimiento, m.monto)
+        for m in movimientos
+    )
+
+    # Enlace de vuelta: un solo UPDATE para todos los documentos del lote
+    campo = contabilizador.modelo._meta.get_field(contabilizador.campo_asiento)
+    contabilizador.modelo.objects.filter(pk__in=[documento.pk for documento, _ in generados]).update(**{
+        campo.attname: Case(
+            *[When(pk=documento.pk, then=encabezado.pk) for (documento, _), encabezado in zip(generados, encabezados)],
+            output_field=IntegerField(),
+        )
+    })
+    for (documento, _), encabezado in zip(generados, encabezados):
+        setattr(documento, campo.name, encabezado)
+    return encabezados
+
+
+def contabilizar_pendientes(nombre, tamano_lote=1000, limite=None):
+    """
+    Contabiliza por lotes los documentos de un tipo que aún no tienen asiento.
+    Pensado para cierres de mes y procesos nocturnos; los errores no detienen la corrida.
+    """
+    contabilizador = obtener_contabilizador(nombre)
+    creados, errores, procesados, ultimo_pk = 0, [], 0, None
+    while limite is None or procesados < limite:
+        pendientes = contabilizador.pendientes().order_by('pk')
+        if ultimo_pk is not None:
+            pendientes = pendientes.filter(pk__gt=ultimo_pk)
+        lote = list(pendientes[:tamano_lote if limite is None else min(tamano_lote, limite - procesados)])
+        if not lote:
+            break
+        resultado = contabilizar(nombre, lote, omitir_errores=True)
+        creados += len(resultado['asientos'])
+        errores.extend(resultado['errores'])
+        procesados += len(lote)
+        ultimo_pk = lote[-1].pk
+    return {'procesados': procesados, 'creados': creados, 'errores': errores}
@@ -0,0 +1,283 @@
+# Archivo: central/importacion.py
+
+import csv
+import json
+from datetime import date
+from decimal import Decimal, InvalidOperation
+
+from django.db import DataError, IntegrityError, transaction
+
+from .models import CuentaContable, EntidadComercial, Moneda, MovimientoContable, TransaccionEncabezado
+from .saldos import registrar_movimientos
+
+# Columnas esperadas en CSV: una fila por movimiento; las filas consecutivas con la
+# misma referencia forman un asiento (los datos del encabezado se toman de la primera).
+COLUMNAS_CSV = [
+    'referencia', 'fecha', 'descripcion', 'moneda', 'entidad', 'tasa_cambio',
+    'cuenta', 'tipo_movimiento', 'monto',
+]
+
+
+# ------------------------------------------------------------------------------
+# LECTORES (un asiento a la vez, sin cargar el archivo completo)
+# ------------------------------------------------------------------------------
+
+def leer_ndjson(lineas):
+    """Un asiento por línea: {"referencia", "fecha", "descripcion", "moneda", "movimientos": [...]}"""
+    for numero_linea, linea in enumerate(lineas, start=1):
+        linea = linea.strip()
+        if not linea:
+            continue
+        try:
+            asiento = json.loads(linea)
+        except json.JSONDecodeError as e:
+            asiento = {'_error': f"JSON inválido: {e.msg}"}
+        if not isinstance(asiento, dict):
+            asiento = {'_error': "Cada línea debe ser un objeto JSON."}
+        yield numero_linea, asiento
+
+
+def leer_csv(lineas):
+    """Agrupa las filas consecutivas con la misma referencia en un asiento."""
+    lector = csv.DictReader(lineas)
+    actual, linea_inicio = None, None
+    for fila in lector:
+        referencia = (fila.get('referencia') or '').strip()
+        if actual is None or referencia != actual['referencia']:
+            if actual is not None:
+                yield linea_inicio, actual
+            linea_inicio = lector.line_num
+            actual = {
+                campo: (fila.get(campo) or '').strip()
+                for campo in ('referencia', 'fecha', 'descripcion', 'moneda', 'entidad', 'tasa_cambio')
+            }
+            actual['movimientos'] = []
+        actual['movimientos'].append({
+            'cuenta': (fila.get('cuenta') or '').strip(),
+            'tipo_movimiento': (fila.get('tipo_movimiento') or '').strip().upper(),
+            'monto': (fila.get('monto') or '').strip(),
+        })
+    if actual is not None:
+        yield linea_inicio, actual
+
+
+LECTORES = {
+    'ndjson': leer_ndjson,
+    'csv': leer_csv,
+}
+
+
+def _decimal_para(modelo, campo, valor):
+    """
+    Convierte 'valor' al Decimal que guardará el campo (redondeado a sus decimales)
+    o retorna None si no es un número finito o no cabe en max_digits: así un dato
+    desbordado se reporta como error del asiento y no como DataError del lote.
+    """
+    campo = modelo._meta.get_field(campo)
+    try:
+        numero = Decimal(str(valor))
+        if not numero.is_finite():
+            return None
+        numero = numero.quantize(Decimal(1).scaleb(-campo.decimal_places))
+    except InvalidOperation:
+        return None
+    if abs(numero) >= Decimal(10) ** (campo.max_digits - campo.decimal_places):
+        return None
+    return numero
+
+
+# ------------------------------------------------------------------------------
+# IMPORTADOR
+# ------------------------------------------------------------------------------
+
+class ImportadorAsientos:
+    """
+    Valida cada asiento en una sola pasada (débito = crédito, cuentas, moneda,
+    referencia única) y escribe los válidos por lotes con bulk_create. Un asiento
+    inválido se reporta y no detiene el resto del archivo.
+    """
+
+    def __init__(self, tamano_lote=500):
+        self.tamano_lote = tamano_lote
+        self.cuentas = dict(CuentaContable.objects.values_list('codigo', 'id'))
+        self.monedas = dict(Moneda.objects.values_list('codigo_iso', 'id'))
+        self.referencias_vistas = set()
+        self.procesados = 0
+        self.creados = 0
+        self.errores = []
+
+    def importar(self, asientos):
+        lote = []
+        for numero_linea, datos in asientos:
+            self.procesados += 1
+            asiento = self.validar(numero_linea, datos)
+            if asiento is None:
+                continue
+            lote.append(asiento)
+            if len(lote) >= self.tamano_lote:
+                self.escribir_lote(lote)
+                lote = []
+        if lote:
+            self.escribir_lote(lote)
+        return self.reporte()
+
+    def reporte(self):
+        return {
+            'procesados': self.procesados,
+            'creados': self.creados,
+            'con_errores': len(self.errores),
+            'errores': self.errores,
+        }
+
+    def registrar_error(self, numero_linea, referencia, errores):
+        self.errores.append({'linea': numero_linea, 'referencia': referencia, 'errores': errores})
+
+    # --- Validación ---
+
+    def validar(self, numero_linea, datos):
+        referencia = str(datos.get('referencia') or '').strip()
+        if '_error' in datos:
+            self.registrar_error(numero_linea, referencia, [datos['_error']])
+            return None
+
+        errores = []
+        if not referencia:
+            errores.append("La referencia es obligatoria.")
+        elif len(referencia) > 50:
+            errores.append("La referencia no puede superar 50 caracteres.")
+        elif referencia in self.referencias_vistas:
+            errores.append("Referencia duplicada dentro del archivo.")
+
+        try:
+            fecha = date.fromisoformat(str(datos.get('fecha') or ''))
+        except ValueError:
+            fecha = None
+            errores.append("Fecha inválida (formato esperado AAAA-MM-DD).")
+
+        moneda_id = self.monedas.get(str(datos.get('moneda') or '').strip().upper())
+        if moneda_id is None:
+            errores.append(f"Moneda desconocida: '{datos.get('moneda')}'.")
+
+        tasa_cambio = _decimal_para(TransaccionEncabezado, 'tasa_cambio', datos.get('tasa_cambio') or '1')
+        if tasa_cambio is None or tasa_cambio <= 0:
+            errores.append("Tasa de cambio inválida.")
+
+        movimientos = []
+        total_debito = total_credito = Decimal('0')
+        lineas = datos.get('movimientos') or []
+        if not isinstance(lineas, list):
+            errores.append("'movimientos' debe ser una lista.")
+            lineas = []
+        elif not lineas:
+            errores.append("Una transacción debe tener al menos un movimiento contable (Débito y Crédito).")
+        for posicion, linea in enumerate(lineas, start=1):
+            if not isinstance(linea, dict):
+                errores.append(f"Movimiento {posicion}: debe ser un objeto con cuenta, tipo_movimiento y monto.")
+                continue
+            cuenta_id = self.cuentas.get(str(linea.get('cuenta') or '').strip())
+            tipo = str(linea.get('tipo_movimiento') or '').upper()
+            monto = _decimal_para(MovimientoContable, 'monto', linea.get('monto'))
+            if cuenta_id is None:
+                errores.append(f"Movimiento {posicion}: cuenta desconocida '{linea.get('cuenta')}'.")
+            if tipo not in ('D', 'C'):
+                errores.append(f"Movimiento {posicion}: tipo_movimiento debe ser 'D' o 'C'.")
+            if monto is None or monto <= 0:
+                errores.append(f"Movimiento {posicion}: monto inválido '{linea.get('monto')}'.")
+                continue
+            if tipo == 'D':
+                total_debito += monto
+            elif tipo == 'C':
+                total_credito += monto
+            movimientos.append((cuenta_id, tipo, monto))
+
+        if lineas and total_debito != total_credito:
+            errores.append(
+                f"El asiento contable no balancea. Débito Total: {total_debito}, Crédito Total: {total_credito}."
+            )
+
+        if errores:
+            self.registrar_error(numero_linea, referencia, errores)
+            return None
+
+        self.referencias_vistas.add(referencia)
+        return {
+            'linea': numero_linea,
+            'encabezado': TransaccionEncabezado(
+                fecha=fecha,
+                referencia=referencia,
+                descripcion=str(datos.get('descripcion') or ''),
+                moneda_id=moneda_id,
+                tasa_cambio=tasa_cambio,
+            ),
+            'entidad': str(datos.get('entidad') or '').strip(),
+            'movimientos': movimientos,
+        }
+
+    # --- Escritura ---
+
+    def escribir_lote(self, lote):
+        """Resuelve entidades y referencias existentes con una consulta cada una y escribe el lote."""
+        identificaciones = {asiento['entidad'] for asiento in lote if asiento['entidad']}
+        entidades = dict(
+            EntidadComercial.objects.filter(identificacion_fiscal__in=identificaciones)
+            .values_list('identificacion_fiscal', 'id')
+        ) if identificaciones else {}
+        existentes = set(
+            TransaccionEncabezado.objects.filter(
+                referencia__in=[asiento['encabezado'].referencia for asiento in lote]
+            ).values_list('referencia', flat=True)
+        )
+
+        validos = []
+        for asiento in lote:
+            encabezado = asiento['encabezado']
+            if encabezado.referencia in existentes:
+                self.registrar_error(asiento['linea'], encabezado.referencia, ["La referencia ya existe."])
+                continue
+            if asiento['entidad']:
+                if asiento['entidad'] not in entidades:
+                    self.registrar_error(
+                        asiento['linea'], encabezado.referencia,
+                        [f"Entidad desconocida: '{asiento['entidad']}'."]
+                    )
+                    continue
+                encabezado.entidad_id = entidades[asiento['entidad']]
+            validos.append(asiento)
+
+        if not validos:
+            return
+        try:
+            with transaction.atomic():
+                self.insertar(validos)
+            self.creados += len(validos)
+        except (IntegrityError, DataError):
+            # Otro proceso insertó alguna referencia entre la validación y la escritura (o
+            # un valor no cabe en su columna): se reintenta asiento por asiento para aislarlo.
+            for asiento in validos:
+                try:
+                    with transaction.atomic():
+                        self.insertar([asiento])
+                    self.creados += 1
+                except (IntegrityError, DataError) as e:
+                    self.registrar_error(asiento['linea'], asiento['encabezado'].referencia, [str(e)])
+
+    def insertar(self, asientos):
+        encabezados = TransaccionEncabezado.objects.bulk_create([asiento['encabezado'] for asiento in asientos])
+        movimientos = [
+            MovimientoContable(encabezado=encabezado, cuenta_id=cuenta_id, tipo_movimiento=tipo, monto=monto)
+            for encabezado, asiento in zip(encabezados, asientos)
+            for cuenta_id, tipo, monto in asiento['movimientos']
+        ]
+        MovimientoContable.objects.bulk_create(movimientos, batch_size=1000)
+        # bulk_create no dispara señales: los saldos se acumulan aquí, en la misma transacción
+        registrar_movimientos(
+            (m.cuenta_id, m.encabezado.moneda_id, m.encabezado.fecha, m.tipo_movimiento, m.monto)
+            for m in movimientos
+        )
+
+
+def importar_asientos(lineas, formato='ndjson', tamano_lote=500):
+    """Importa asientos desde un iterable de líneas de texto (archivo abierto, upload, etc.)."""
+    if formato not in LECTORES:
+        raise ValueError(f"Formato no soportado: '{formato}'. Use: {', '.join(LECTORES)}.")
+    return ImportadorAsientos(tamano_lote=tamano_lote).importar(LECTORES[formato](lineas))
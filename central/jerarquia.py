@@ -0,0 +1,137 @@
+# Archivo: central/jerarquia.py
+
+from decimal import Decimal
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import F, Q, Sum
+
+from .models import CuentaContable, JerarquiaCuenta
+
+
+def validar_cuenta_padre(cuenta, cuenta_padre_id):
+    """Impide que una cuenta quede como hija de sí misma o de una de sus subcuentas."""
+    if not cuenta.pk or not cuenta_padre_id:
+        return
+    if cuenta_padre_id == cuenta.pk or JerarquiaCuenta.objects.filter(
+        ancestro_id=cuenta.pk, descendiente_id=cuenta_padre_id
+    ).exists():
+        raise ValidationError(
+            {'cuenta_padre': "La cuenta padre no puede ser la misma cuenta ni una de sus subcuentas."}
+        )
+
+
+def registrar_cuenta(cuenta):
+    """Crea las filas de jerarquía de una cuenta nueva (hereda los ancestros del padre)."""
+    filas = [JerarquiaCuenta(ancestro_id=cuenta.pk, descendiente_id=cuenta.pk, profundidad=0)]
+    if cuenta.cuenta_padre_id:
+        filas.extend(
+            JerarquiaCuenta(ancestro_id=ancestro_id, descendiente_id=cuenta.pk, profundidad=profundidad + 1)
+            for ancestro_id, profundidad in JerarquiaCuenta.objects.filter(
+                descendiente_id=cuenta.cuenta_padre_id
+            ).values_list('ancestro_id', 'profundidad')
+        )
+    JerarquiaCuenta.objects.bulk_create(filas)
+
+
+def mover_cuenta(cuenta):
+    """
+    Reubica el subárbol de una cuenta bajo su nuevo cuenta_padre:
+    borra los enlaces con los ancestros anteriores y crea el producto cruzado
+    (ancestros del nuevo padre x subárbol) con un solo bulk_create.
+    """
+    subarbol = list(
+        JerarquiaCuenta.objects.filter(ancestro_id=cuenta.pk).values_list('descendiente_id', 'profundidad')
+    )
+    ids_subarbol = [descendiente_id for descendiente_id, _ in subarbol]
+
+    JerarquiaCuenta.objects.filter(descendiente_id__in=ids_subarbol).exclude(
+        ancestro_id__in=ids_subarbol
+    ).delete()
+
+    if cuenta.cuenta_padre_id:
+        ancestros = JerarquiaCuenta.objects.filter(
+            descendiente_id=cuenta.cuenta_padre_id
+        ).values_list('ancestro_id', 'profundidad')
+        JerarquiaCuenta.objects.bulk_create([
+            JerarquiaCuenta(
+                ancestro_id=ancestro_id,
+                descendiente_id=descendiente_id,
+                profundidad=profundidad_ancestro + profundidad_descendiente + 1,
+            )
+            for ancestro_id, profundidad_ancestro in ancestros
+            for descendiente_id, profundidad_descendiente in subarbol
+        ])
+
+
+def desvincular_subarbol(cuenta):
+    """
+    Antes de borrar una cuenta: sus hijas pasan a ser raíces (on_delete=SET_NULL),
+    así que se eliminan los enlaces entre su subárbol y los ancestros de la cuenta.
+    Las filas de la propia cuenta se borran en cascada.
+    """
+    ids_subarbol = list(
+        JerarquiaCuenta.objects.filter(ancestro_id=cuenta.pk, profundidad__gt=0)
+        .values_list('descendiente_id', flat=True)
+    )
+    ids_ancestros = list(
+        JerarquiaCuenta.objects.filter(descendiente_id=cuenta.pk, profundidad__gt=0)
+        .values_list('ancestro_id', flat=True)
+    )
+    if ids_subarbol and ids_ancestros:
+        JerarquiaCuenta.objects.filter(
+            descendiente_id__in=ids_subarbol, ancestro_id__in=ids_ancestros
+        ).delete()
+
+
+def reconstruir_jerarquia():
+    """Recalcula toda la tabla de jerarquía desde cuenta_padre (una lectura, un bulk_create)."""
+    padres = dict(CuentaContable.objects.values_list('id', 'cuenta_padre_id'))
+    filas = []
+    for cuenta_id in padres:
+        actual, profundidad, visitadas = cuenta_id, 0, set()
+        while actual is not None:
+            if actual in visitadas:
+                raise ValidationError(f"Ciclo detectado en el plan de cuentas (cuenta {cuenta_id}).")
+            visitadas.add(actual)
+            filas.append(JerarquiaCuenta(ancestro_id=actual, descendiente_id=cuenta_id, profundidad=profundidad))
+            actual, profundidad = padres.get(actual), profundidad + 1
+
+    with transaction.atomic():
+        JerarquiaCuenta.objects.all().delete()
+        JerarquiaCuenta.objects.bulk_create(filas, batch_size=1000)
+    return len(filas)
+
+
+def saldos_subarbol(cuenta, anio=None, mes_desde=None, mes_hasta=None, moneda=None, niveles=None):
+    """
+    Totales consolidados de cada cuenta del subárbol de 'cuenta', en una sola consulta:
+    cada nodo suma los SaldoCuenta de todos sus descendientes vía la tabla de jerarquía.
+    'niveles' limita la profundidad de los nodos retornados (no la de la consolidación).
+    """
+    filtro_nodos = {'jerarquia_ancestros__ancestro': cuenta}
+    if niveles is not None:
+        filtro_nodos['jerarquia_ancestros__profundidad__lte'] = niveles
+
+    prefijo = 'jerarquia_descendientes__descendiente__saldos__'
+    filtro_saldos = Q()
+    if anio:
+        filtro_saldos &= Q(**{f'{prefijo}anio': anio})
+    if mes_desde:
+        filtro_saldos &= Q(**{f'{prefijo}mes__gte': mes_desde})
+    if mes_hasta:
+        filtro_saldos &= Q(**{f'{prefijo}mes__lte': mes_hasta})
+    if moneda:
+        filtro_saldos &= Q(**{f'{prefijo}moneda': moneda})
+
+    return (
+        CuentaContable.objects
+        .filter(**filtro_nodos)
+        .annotate(
+            nivel=F('jerarquia_ancestros__profundidad'),
+            total_debito=Sum(f'{prefijo}total_debito', filter=filtro_saldos, default=Decimal('0')),
+            total_credito=Sum(f'{prefijo}total_credito', filter=filtro_saldos, default=Decimal('0')),
+        )
+        .values('id', 'codigo', 'nombre', 'naturaleza', 'cuenta_padre', 'nivel', 'total_debito', 'total_credito')
+        .order_by('codigo')
+    )
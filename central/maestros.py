@@ -0,0 +1,144 @@
+# Archivo: central/maestros.py
+
+import threading
+import time
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from .models import CuentaContable, Moneda
+
+
+def ttl_maestros():
+    """Segundos que un proceso conserva su copia de los maestros (settings.HERMES_MAESTROS_TTL)."""
+    return getattr(settings, 'HERMES_MAESTROS_TTL', 60)
+
+
+class CacheMaestro:
+    """
+    Caché en memoria del proceso para datos maestros que casi nunca cambian.
+
+    Cada tabla tiene un número de versión guardado en el caché de Django
+    (settings.CACHES). Los Signals post_save/post_delete incrementan esa versión y
+    cada proceso, al ver una versión distinta a la suya, descarta su copia local.
+    Además la copia local vence a los HERMES_MAESTROS_TTL segundos: si el backend no
+    es compartido (LocMemCache) la invalidación no llega a los otros procesos y el
+    TTL es lo único que acota cuánto tiempo sirven datos desactualizados.
+    Los objetos retornados son compartidos: no deben modificarse.
+    """
+
+    def __init__(self, nombre):
+        self.nombre = nombre
+        self.clave_version = f"hermes:maestros:{nombre}:version"
+        self._datos = {}
+        self._version = None
+        self._vence = 0
+        self._lock = threading.Lock()
+
+    def _sincronizar(self):
+        version = cache.get(self.clave_version, 0)
+        ahora = time.monotonic()
+        with self._lock:
+            if version != self._version or ahora >= self._vence:
+                self._datos = {}
+                self._version = version
+                self._vence = ahora + ttl_maestros()
+        return version
+
+    def obtener(self, clave, cargar):
+        """Retorna el valor de 'clave' o lo carga con cargar() (las excepciones no se cachean)."""
+        version = self._sincronizar()
+        with self._lock:
+            if clave in self._datos:
+                return self._datos[clave]
+        valor = cargar()
+        with self._lock:
+            if self._version == version:
+                self._datos[clave] = valor
+        return valor
+
+    def obtener_varios(self, claves, cargar_varios):
+        """Igual que obtener() para varias claves; las faltantes se cargan en una sola consulta."""
+        version = self._sincronizar()
+        with self._lock:
+            encontrados = {clave: self._datos[clave] for clave in claves if clave in self._datos}
+        faltantes = [clave for clave in claves if clave not in encontrados]
+        if faltantes:
+            cargados = cargar_varios(faltantes)
+            with self._lock:
+                if self._version == version:
+                    self._datos.update(cargados)
+            encontrados.update(cargados)
+        return encontrados
+
+    def invalidar(self):
+        with self._lock:
+            self._datos = {}
+            self._version = None
+        try:
+            cache.incr(self.clave_version)
+        except ValueError:
+            cache.set(self.clave_version, 1, timeout=None)
+
+    def invalidar_en_transaccion(self):
+        """
+        Invalida ahora y de nuevo al confirmar la transacción: así ningún proceso
+        se queda con un valor leído antes del COMMIT.
+        """
+        self.invalidar()
+        transaction.on_commit(self.invalidar)
+
+
+MONEDAS = CacheMaestro('monedas')
+CUENTAS = CacheMaestro('cuentas')
+ALMACENES = CacheMaestro('almacenes')
+SERIES = CacheMaestro('series')
+
+
+# ------------------------------------------------------------------------------
+# ACCESOS DE USO COMÚN
+# ------------------------------------------------------------------------------
+
+def moneda_principal():
+    """Moneda con es_principal=True. Lanza Moneda.DoesNotExist si no hay ninguna."""
+    return MONEDAS.obtener('principal', lambda: Moneda.objects.get(es_principal=True))
+
+
+def cuenta_por_codigo(codigo):
+    """CuentaContable por código. Lanza CuentaContable.DoesNotExist si no existe."""
+    return CUENTAS.obtener(codigo, lambda: CuentaContable.objects.get(codigo=codigo))
+
+
+def cuentas_por_codigo(*codigos):
+    """
+    Varias cuentas en un solo viaje a la base de datos (solo si no están en caché).
+    Retorna un dict codigo -> CuentaContable; lanza CuentaContable.DoesNotExist si falta alguna.
+    """
+    def cargar(faltantes):
+        return {cuenta.codigo: cuenta for cuenta in CuentaContable.objects.filter(codigo__in=faltantes)}
+
+    cuentas = CUENTAS.obtener_varios(list(codigos), cargar)
+    faltantes = [codigo for codigo in codigos if codigo not in cuentas]
+    if faltantes:
+        raise CuentaContable.DoesNotExist(f"Cuentas contables no encontradas: {', '.join(faltantes)}")
+    return cuentas
+
+
+def almacen_por_id(almacen_id):
+    """Almacen por id. Lanza Almacen.DoesNotExist si no existe."""
+    Almacen = apps.get_model('inventario', 'Almacen')
+    return ALMACENES.obtener(('id', almacen_id), lambda: Almacen.objects.get(pk=almacen_id))
+
+
+def almacen_por_codigo(codigo):
+    """Almacen por código. Lanza Almacen.DoesNotExist si no existe."""
+    Almacen = apps.get_model('inventario', 'Almacen')
+    return ALMACENES.obtener(('codigo', codigo), lambda: Almacen.objects.get(codigo=codigo))
+
+
+def almacenes_activos():
+    """Almacenes con activo=True (lista compartida: no modificar)."""
+    Almacen = apps.get_model('inventario', 'Almacen')
+    return ALMACENES.obtener('activos', lambda: list(Almacen.objects.filter(activo=True).order_by('id')))
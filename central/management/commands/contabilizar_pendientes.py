@@ -0,0 +1,34 @@
+# Archivo: central/management/commands/contabilizar_pendientes.py
+
+from django.core.management.base import BaseCommand, CommandError
+
+from central.contabilizacion import CONTABILIZADORES, contabilizar_pendientes
+
+
+class Command(BaseCommand):
+    help = "Genera por lotes los asientos de los documentos que aún no están contabilizados."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'tipos', nargs='*',
+            help="Tipos de documento a contabilizar (por defecto todos los registrados)."
+        )
+        parser.add_argument('--lote', type=int, default=1000, help="Documentos por transacción.")
+        parser.add_argument('--limite', type=int, help="Máximo de documentos por tipo.")
+
+    def handle(self, *args, **options):
+        tipos = options['tipos'] or sorted(CONTABILIZADORES)
+        desconocidos = [tipo for tipo in tipos if tipo not in CONTABILIZADORES]
+        if desconocidos:
+            raise CommandError(
+                f"Tipos sin contabilizador: {', '.join(desconocidos)}. Registrados: {', '.join(sorted(CONTABILIZADORES))}."
+            )
+
+        for tipo in tipos:
+            resultado = contabilizar_pendientes(tipo, tamano_lote=options['lote'], limite=options['limite'])
+            for error in resultado['errores']:
+                self.stderr.write(f"  {tipo} #{error['documento']}: {error['error']}")
+            self.stdout.write(self.style.SUCCESS(
+                f"✅ {tipo}: {resultado['procesados']} procesados, {resultado['creados']} asientos, "
+                f"{len(resultado['errores'])} con errores."
+            ))
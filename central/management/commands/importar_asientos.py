@@ -0,0 +1,40 @@
+# Archivo: central/management/commands/importar_asientos.py
+
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from central.importacion import LECTORES, importar_asientos
+
+
+class Command(BaseCommand):
+    help = "Importa asientos contables masivamente desde un archivo NDJSON o CSV."
+
+    def add_arguments(self, parser):
+        parser.add_argument('archivo', help="Ruta del archivo a importar.")
+        parser.add_argument(
+            '--formato', choices=sorted(LECTORES),
+            help="Formato del archivo (por defecto se deduce de la extensión)."
+        )
+        parser.add_argument('--lote', type=int, default=500, help="Asientos por transacción.")
+        parser.add_argument('--reporte', help="Ruta donde guardar el reporte de errores en JSON.")
+
+    def handle(self, *args, **options):
+        ruta = Path(options['archivo'])
+        if not ruta.exists():
+            raise CommandError(f"No existe el archivo: {ruta}")
+        formato = options['formato'] or ('csv' if ruta.suffix.lower() == '.csv' else 'ndjson')
+
+        with ruta.open(encoding='utf-8', newline='') as archivo:
+            reporte = importar_asientos(archivo, formato=formato, tamano_lote=options['lote'])
+
+        if options['reporte']:
+            Path(options['reporte']).write_text(json.dumps(reporte, ensure_ascii=False, indent=2), encoding='utf-8')
+        for error in reporte['errores'][:20]:
+            self.stdout.write(f"Línea {error['linea']} ({error['referencia']}): {'; '.join(error['errores'])}")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Procesados: {reporte['procesados']} | Creados: {reporte['creados']} | "
+            f"Con errores: {reporte['con_errores']}"
+        ))
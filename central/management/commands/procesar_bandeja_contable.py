@@ -0,0 +1,60 @@
+# Archivo: central/management/commands/procesar_bandeja_contable.py
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from central.bandeja import MAX_INTENTOS, metricas_bandeja, procesar_lote, reintentar_fallidas
+
+
+class Command(BaseCommand):
+    help = "Worker de la bandeja de salida contable: genera los asientos de los documentos encolados."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--lote', type=int, default=500, help="Filas reclamadas por transacción.")
+        parser.add_argument('--max-intentos', type=int, default=MAX_INTENTOS,
+                            help="Intentos antes de pasar la fila a fallidas (dead letter).")
+        parser.add_argument('--continuo', action='store_true',
+                            help="No terminar al vaciar la cola; esperar nuevos documentos.")
+        parser.add_argument('--espera', type=float, default=2.0,
+                            help="Segundos de espera cuando la cola está vacía (modo continuo).")
+        parser.add_argument('--reintentar-fallidas', action='store_true',
+                            help="Devolver las filas fallidas a la cola antes de procesar.")
+        parser.add_argument('--metricas', action='store_true', help="Solo mostrar el estado de la cola.")
+
+    def handle(self, *args, **options):
+        if options['metricas']:
+            metricas = metricas_bandeja()
+            self.stdout.write(
+                f"Pendientes: {metricas['pendientes']} | Fallidas: {metricas['fallidas']} | "
+                f"Retraso: {metricas['retraso_segundos']:.0f}s"
+            )
+            for tipo, datos in metricas['por_tipo'].items():
+                self.stdout.write(
+                    f"  {tipo}: {datos['pendientes']} pendientes, {datos['fallidas']} fallidas, "
+                    f"retraso {datos['retraso_segundos']:.0f}s"
+                )
+            return
+
+        if options['reintentar_fallidas']:
+            self.stdout.write(f"Filas devueltas a la cola: {reintentar_fallidas()}")
+
+        totales = {'reclamadas': 0, 'contabilizadas': 0, 'reintentos': 0, 'fallidas': 0}
+        try:
+            while True:
+                resultado = procesar_lote(tamano_lote=options['lote'], max_intentos=options['max_intentos'])
+                for clave, valor in resultado.items():
+                    totales[clave] += valor
+                if resultado['fallidas']:
+                    self.stderr.write(f"  {resultado['fallidas']} filas pasaron a fallidas (dead letter).")
+                if resultado['reclamadas'] < options['lote']:
+                    if not options['continuo']:
+                        break
+                    time.sleep(options['espera'])
+        except KeyboardInterrupt:
+            pass
+
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Bandeja: {totales['contabilizadas']} contabilizadas, {totales['reintentos']} reprogramadas, "
+            f"{totales['fallidas']} fallidas."
+        ))
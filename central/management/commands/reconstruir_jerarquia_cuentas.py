@@ -0,0 +1,13 @@
+# Archivo: central/management/commands/reconstruir_jerarquia_cuentas.py
+
+from django.core.management.base import BaseCommand
+
+from central.jerarquia import reconstruir_jerarquia
+
+
+class Command(BaseCommand):
+    help = "Recalcula la tabla JerarquiaCuenta a partir de CuentaContable.cuenta_padre."
+
+    def handle(self, *args, **options):
+        filas = reconstruir_jerarquia()
+        self.stdout.write(self.style.SUCCESS(f"✅ Jerarquía del plan de cuentas reconstruida: {filas} filas."))
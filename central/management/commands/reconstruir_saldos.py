@@ -0,0 +1,17 @@
+# Archivo: central/management/commands/reconstruir_saldos.py
+
+from django.core.management.base import BaseCommand
+
+from central.saldos import reconstruir_saldos
+
+
+class Command(BaseCommand):
+    help = "Recalcula la tabla SaldoCuenta a partir de MovimientoContable."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--anio', type=int, help="Reconstruir solo este año fiscal.")
+        parser.add_argument('--lote', type=int, default=1000, help="Filas por bulk_create.")
+
+    def handle(self, *args, **options):
+        creados = reconstruir_saldos(anio=options['anio'], tamano_lote=options['lote'])
+        self.stdout.write(self.style.SUCCESS(f"✅ Saldos reconstruidos: {creados} filas."))
@@ -0,0 +1,28 @@
+# Archivo: central/management/commands/verificar_saldos.py
+
+from django.core.management.base import BaseCommand, CommandError
+
+from central.saldos import verificar_saldos
+
+
+class Command(BaseCommand):
+    help = "Compara SaldoCuenta contra MovimientoContable y reporta las diferencias."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--anio', type=int, help="Verificar solo este año fiscal.")
+
+    def handle(self, *args, **options):
+        diferencias = verificar_saldos(anio=options['anio'])
+        if not diferencias:
+            self.stdout.write(self.style.SUCCESS("✅ SaldoCuenta es consistente con el libro."))
+            return
+
+        for diferencia in diferencias:
+            self.stdout.write(
+                f"Cuenta {diferencia['cuenta_id']} {diferencia['anio']}-{diferencia['mes']:02d} "
+                f"moneda {diferencia['moneda_id']}: "
+                f"esperado {diferencia['esperado']} / registrado {diferencia['registrado']}"
+            )
+        raise CommandError(
+            f"{len(diferencias)} saldos inconsistentes. Ejecute 'reconstruir_saldos' para corregirlos."
+        )
@@ -0,0 +1,59 @@
+# Generated by Django 5.2.18 on 2026-10-17 16:04
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def poblar_saldos(apps, schema_editor):
+    """Calcula los saldos iniciales a partir de los asientos ya registrados."""
+    from django.db.models import Count, F, Q, Sum
+    from django.db.models.functions import ExtractMonth, ExtractYear
+
+    MovimientoContable = apps.get_model('central', 'MovimientoContable')
+    SaldoCuenta = apps.get_model('central', 'SaldoCuenta')
+    filas = (
+        MovimientoContable.objects
+        .values(
+            'cuenta_id',
+            moneda_id=F('encabezado__moneda_id'),
+            anio=ExtractYear('encabezado__fecha'),
+            mes=ExtractMonth('encabezado__fecha'),
+        )
+        .annotate(
+            total_debito=Sum('monto', filter=Q(tipo_movimiento='D'), default=0),
+            total_credito=Sum('monto', filter=Q(tipo_movimiento='C'), default=0),
+            cantidad_movimientos=Count('id'),
+        )
+        .order_by()
+    )
+    SaldoCuenta.objects.bulk_create((SaldoCuenta(**fila) for fila in filas.iterator()), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('central', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SaldoCuenta',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('anio', models.PositiveSmallIntegerField(verbose_name='Año Fiscal')),
+                ('mes', models.PositiveSmallIntegerField(help_text='Mes del período fiscal (1-12).', verbose_name='Mes')),
+                ('total_debito', models.DecimalField(decimal_places=2, default=0, max_digits=18, verbose_name='Total Débito')),
+                ('total_credito', models.DecimalField(decimal_places=2, default=0, max_digits=18, verbose_name='Total Crédito')),
+                ('cantidad_movimientos', models.IntegerField(default=0, help_text='Número de líneas contables acumuladas en este saldo.', verbose_name='Cantidad de Movimientos')),
+                ('cuenta', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='saldos', to='central.cuentacontable', verbose_name='Cuenta Contable')),
+                ('moneda', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='central.moneda', verbose_name='Moneda')),
+            ],
+            options={
+                'verbose_name': 'Saldo de Cuenta',
+                'verbose_name_plural': 'Saldos de Cuentas',
+                'ordering': ['cuenta', 'anio', 'mes'],
+                'unique_together': {('cuenta', 'anio', 'mes', 'moneda')},
+            },
+        ),
+        migrations.RunPython(poblar_saldos, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.18 on 2026-10-17 16:06
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def poblar_jerarquia(apps, schema_editor):
+    """Genera la tabla de jerarquía para el plan de cuentas existente."""
+    CuentaContable = apps.get_model('central', 'CuentaContable')
+    JerarquiaCuenta = apps.get_model('central', 'JerarquiaCuenta')
+    padres = dict(CuentaContable.objects.values_list('id', 'cuenta_padre_id'))
+    filas = []
+    for cuenta_id in padres:
+        actual, profundidad, visitadas = cuenta_id, 0, set()
+        while actual is not None and actual not in visitadas:
+            visitadas.add(actual)
+            filas.append(JerarquiaCuenta(ancestro_id=actual, descendiente_id=cuenta_id, profundidad=profundidad))
+            actual, profundidad = padres.get(actual), profundidad + 1
+    JerarquiaCuenta.objects.bulk_create(filas, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('central', '0002_saldocuenta'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JerarquiaCuenta',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('profundidad', models.PositiveSmallIntegerField(help_text='Niveles entre el ancestro y el descendiente (0 = la misma cuenta).', verbose_name='Profundidad')),
+                ('ancestro', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='jerarquia_descendientes', to='central.cuentacontable', verbose_name='Cuenta Ancestro')),
+                ('descendiente', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='jerarquia_ancestros', to='central.cuentacontable', verbose_name='Cuenta Descendiente')),
+            ],
+            options={
+                'verbose_name': 'Jerarquía de Cuenta',
+                'verbose_name_plural': 'Jerarquía del Plan de Cuentas',
+                'indexes': [models.Index(fields=['descendiente', 'profundidad'], name='central_jer_desc_prof_idx')],
+                'unique_together': {('ancestro', 'descendiente')},
+            },
+        ),
+        migrations.RunPython(poblar_jerarquia, migrations.RunPython.noop),
+    ]
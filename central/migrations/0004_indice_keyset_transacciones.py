@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-17 16:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('central', '0003_jerarquiacuenta'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='transaccionencabezado',
+            index=models.Index(fields=['-fecha', 'referencia'], name='central_trx_fecha_ref_idx'),
+        ),
+    ]
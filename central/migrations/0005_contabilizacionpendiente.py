@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-17 16:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('central', '0004_indice_keyset_transacciones'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ContabilizacionPendiente',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tipo_documento', models.CharField(help_text='Nombre del contabilizador registrado (ej. facturas, nominas, inventario).', max_length=30, verbose_name='Tipo de Documento')),
+                ('documento_id', models.BigIntegerField(verbose_name='ID del Documento')),
+                ('estado', models.CharField(choices=[('P', 'Pendiente'), ('C', 'Contabilizado'), ('F', 'Fallido')], default='P', max_length=1, verbose_name='Estado')),
+                ('intentos', models.PositiveSmallIntegerField(default=0, verbose_name='Intentos')),
+                ('ultimo_error', models.TextField(blank=True, default='', verbose_name='Último Error')),
+                ('fecha_creacion', models.DateTimeField(auto_now_add=True, verbose_name='Fecha de Creación')),
+                ('disponible_desde', models.DateTimeField(help_text='El worker no toma la fila antes de esta fecha (espera entre reintentos).', verbose_name='Disponible Desde')),
+                ('fecha_proceso', models.DateTimeField(blank=True, null=True, verbose_name='Fecha de Proceso')),
+            ],
+            options={
+                'verbose_name': 'Contabilización Pendiente',
+                'verbose_name_plural': 'Bandeja de Contabilización',
+                'ordering': ['id'],
+                'indexes': [models.Index(fields=['estado', 'disponible_desde'], name='central_bandeja_estado_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-17 16:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('central', '0005_contabilizacionpendiente'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SerieNumeracion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tipo_documento', models.CharField(help_text='Ej. facturas, ordenes_compra, asientos.', max_length=30, verbose_name='Tipo de Documento')),
+                ('prefijo', models.CharField(blank=True, default='', help_text='Texto antes del año y el consecutivo. Ej. FACT-', max_length=10, verbose_name='Prefijo')),
+                ('anio', models.PositiveSmallIntegerField(verbose_name='Año Fiscal')),
+                ('digitos', models.PositiveSmallIntegerField(default=6, help_text='Ancho del consecutivo, completado con ceros a la izquierda.', verbose_name='Dígitos')),
+                ('tamano_bloque', models.PositiveIntegerField(default=50, help_text='Números que reserva cada proceso por viaje a la base de datos. Es también el hueco máximo por proceso reiniciado. No modificar una vez creada.', verbose_name='Tamaño de Bloque')),
+                ('ultimo_numero', models.BigIntegerField(default=0, help_text='Solo se usa en bases de datos sin secuencias (la numeración va fila a fila).', verbose_name='Último Número')),
+            ],
+            options={
+                'verbose_name': 'Serie de Numeración',
+                'verbose_name_plural': 'Series de Numeración',
+                'ordering': ['tipo_documento', '-anio'],
+                'unique_together': {('tipo_documento', 'prefijo', 'anio')},
+            },
+        ),
+    ]
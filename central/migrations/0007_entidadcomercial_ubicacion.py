@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('central', '0006_serienumeracion'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='entidadcomercial',
+            name='latitud',
+            field=models.DecimalField(blank=True, decimal_places=6, max_digits=9, null=True, verbose_name='Latitud'),
+        ),
+        migrations.AddField(
+            model_name='entidadcomercial',
+            name='longitud',
+            field=models.DecimalField(blank=True, decimal_places=6, max_digits=9, null=True, verbose_name='Longitud'),
+        ),
+    ]
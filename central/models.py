@@ -142,6 +142,21 @@ class EntidadComercial(models.Model):
         blank=True,
         verbose_name=_("Dirección Principal"),
     )
+    # Ubicación: la usa la política 'cercania' al elegir el almacén de despacho
+    latitud = models.DecimalField(
+        max_digits=9,
+        decimal_places=6,
+        null=True,
+        blank=True,
+        verbose_name=_("Latitud"),
+    )
+    longitud = models.DecimalField(
+        max_digits=9,
+        decimal_places=6,
+        null=True,
+        blank=True,
+        verbose_name=_("Longitud"),
+    )
 
     # Condiciones Comerciales
     plazo_credito_dias = models.IntegerField(
@@ -262,6 +277,11 @@ class CuentaContable(models.Model):
         verbose_name=_("Activo"),
     )
 
+    def clean(self):
+        # Evita ciclos: la cuenta padre no puede ser la misma cuenta ni una de sus hijas
+        from .jerarquia import validar_cuenta_padre
+        validar_cuenta_padre(self, self.cuenta_padre_id)
+
     def __str__(self):
         return f"{self.codigo} - {self.nombre}"
 
@@ -323,6 +343,10 @@ class TransaccionEncabezado(models.Model):
         verbose_name = _("Asiento Contable")
         verbose_name_plural = _("Asientos Contables")
         ordering = ['-fecha', 'referencia']
+        # Índice compuesto con el mismo orden: respalda la paginación por keyset
+        indexes = [
+            models.Index(fields=['-fecha', 'referencia'], name='central_trx_fecha_ref_idx'),
+        ]
 
 
 # --- MODELO MOVIMIENTO CONTABLE (DETALLE) ---
@@ -364,4 +388,225 @@ class MovimientoContable(models.Model):
     class Meta:
         verbose_name = _("Movimiento Contable")
         verbose_name_plural = _("Movimientos Contables")
-        ordering = ['encabezado', 'tipo_movimiento']
\ No newline at end of file
+        ordering = ['encabezado', 'tipo_movimiento']
+
+# ==============================================================================
+# 5. SALDOS ACUMULADOS (LECTURA RÁPIDA PARA REPORTES)
+# ==============================================================================
+
+# --- MODELO SALDO CUENTA ---
+
+# Comentario: Acumulado de débitos y créditos por cuenta, período fiscal y moneda.
+# Se mantiene en la misma transacción que los MovimientoContable (ver central/saldos.py),
+# así los reportes leen una fila por cuenta y período en lugar de todo el libro.
+class SaldoCuenta(models.Model):
+    cuenta = models.ForeignKey(
+        'CuentaContable',
+        on_delete=models.CASCADE,
+        related_name='saldos',
+        verbose_name=_("Cuenta Contable"),
+    )
+    anio = models.PositiveSmallIntegerField(
+        verbose_name=_("Año Fiscal"),
+    )
+    mes = models.PositiveSmallIntegerField(
+        verbose_name=_("Mes"),
+        help_text=_("Mes del período fiscal (1-12).")
+    )
+    moneda = models.ForeignKey(
+        'Moneda',
+        on_delete=models.CASCADE,
+        verbose_name=_("Moneda"),
+    )
+    total_debito = models.DecimalField(
+        max_digits=18,
+        decimal_places=2,
+        default=0,
+        verbose_name=_("Total Débito"),
+    )
+    total_credito = models.DecimalField(
+        max_digits=18,
+        decimal_places=2,
+        default=0,
+        verbose_name=_("Total Crédito"),
+    )
+    cantidad_movimientos = models.IntegerField(
+        default=0,
+        verbose_name=_("Cantidad de Movimientos"),
+        help_text=_("Número de líneas contables acumuladas en este saldo.")
+    )
+
+    @property
+    def saldo(self):
+        return self.total_debito - self.total_credito
+
+    def __str__(self):
+        return f"{self.cuenta_id} {self.anio}-{self.mes:02d}: D {self.total_debito} / C {self.total_credito}"
+
+    class Meta:
+        verbose_name = _("Saldo de Cuenta")
+        verbose_name_plural = _("Saldos de Cuentas")
+        unique_together = ('cuenta', 'anio', 'mes', 'moneda')
+        ordering = ['cuenta', 'anio', 'mes']
+
+
+# ==============================================================================
+# 6. ÍNDICE JERÁRQUICO DEL PLAN DE CUENTAS (CLOSURE TABLE)
+# ==============================================================================
+
+# --- MODELO JERARQUÍA CUENTA ---
+
+# Comentario: Una fila por cada par ancestro/descendiente del plan de cuentas
+# (incluida la fila de la cuenta consigo misma, con profundidad 0). Permite
+# consolidar cualquier subárbol con una sola consulta, sin recorrer cuenta_padre.
+# Se mantiene automáticamente por Signals (ver central/jerarquia.py).
+class JerarquiaCuenta(models.Model):
+    ancestro = models.ForeignKey(
+        'CuentaContable',
+        on_delete=models.CASCADE,
+        related_name='jerarquia_descendientes',
+        verbose_name=_("Cuenta Ancestro"),
+    )
+    descendiente = models.ForeignKey(
+        'CuentaContable',
+        on_delete=models.CASCADE,
+        related_name='jerarquia_ancestros',
+        verbose_name=_("Cuenta Descendiente"),
+    )
+    profundidad = models.PositiveSmallIntegerField(
+        verbose_name=_("Profundidad"),
+        help_text=_("Niveles entre el ancestro y el descendiente (0 = la misma cuenta).")
+    )
+
+    def __str__(self):
+        return f"{self.ancestro_id} > {self.descendiente_id} ({self.profundidad})"
+
+    class Meta:
+        verbose_name = _("Jerarquía de Cuenta")
+        verbose_name_plural = _("Jerarquía del Plan de Cuentas")
+        unique_together = ('ancestro', 'descendiente')
+        indexes = [
+            models.Index(fields=['descendiente', 'profundidad'], name='central_jer_desc_prof_idx'),
+        ]
+
+
+# ==============================================================================
+# 7. BANDEJA DE SALIDA CONTABLE (CONTABILIZACIÓN DIFERIDA)
+# ==============================================================================
+
+ESTADO_BANDEJA_OPCIONES = [
+    ('P', 'Pendiente'),
+    ('C', 'Contabilizado'),
+    ('F', 'Fallido'),
+]
+
+# Comentario: Documento cuyo asiento se generará fuera de la petición (transactional outbox).
+# La fila se escribe en la misma transacción que el documento; el comando
+# procesar_bandeja_contable la reclama con SELECT ... FOR UPDATE SKIP LOCKED y la
+# contabiliza (ver central/bandeja.py). Tras agotar los reintentos queda en 'F' (dead letter).
+class ContabilizacionPendiente(models.Model):
+    tipo_documento = models.CharField(
+        max_length=30,
+        verbose_name=_("Tipo de Documento"),
+        help_text=_("Nombre del contabilizador registrado (ej. facturas, nominas, inventario).")
+    )
+    documento_id = models.BigIntegerField(
+        verbose_name=_("ID del Documento"),
+    )
+    estado = models.CharField(
+        max_length=1,
+        choices=ESTADO_BANDEJA_OPCIONES,
+        default='P',
+        verbose_name=_("Estado"),
+    )
+    intentos = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name=_("Intentos"),
+    )
+    ultimo_error = models.TextField(
+        blank=True,
+        default='',
+        verbose_name=_("Último Error"),
+    )
+    fecha_creacion = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name=_("Fecha de Creación"),
+    )
+    disponible_desde = models.DateTimeField(
+        verbose_name=_("Disponible Desde"),
+        help_text=_("El worker no toma la fila antes de esta fecha (espera entre reintentos).")
+    )
+    fecha_proceso = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name=_("Fecha de Proceso"),
+    )
+
+    def __str__(self):
+        return f"{self.tipo_documento} #{self.documento_id} ({self.get_estado_display()})"
+
+    class Meta:
+        verbose_name = _("Contabilización Pendiente")
+        verbose_name_plural = _("Bandeja de Contabilización")
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['estado', 'disponible_desde'], name='central_bandeja_estado_idx'),
+        ]
+
+
+# ==============================================================================
+# 8. SERIES DE NUMERACIÓN DE DOCUMENTOS
+# ==============================================================================
+
+# Comentario: Serie de numeración por tipo de documento, prefijo y año fiscal.
+# Los números salen de una secuencia de la base de datos (una por serie) y cada
+# proceso reserva bloques de 'tamano_bloque' números, así que no hay una fila
+# caliente que bloquear por documento (ver central/numeracion.py).
+class SerieNumeracion(models.Model):
+    tipo_documento = models.CharField(
+        max_length=30,
+        verbose_name=_("Tipo de Documento"),
+        help_text=_("Ej. facturas, ordenes_compra, asientos.")
+    )
+    prefijo = models.CharField(
+        max_length=10,
+        blank=True,
+        default='',
+        verbose_name=_("Prefijo"),
+        help_text=_("Texto antes del año y el consecutivo. Ej. FACT-")
+    )
+    anio = models.PositiveSmallIntegerField(
+        verbose_name=_("Año Fiscal"),
+    )
+    digitos = models.PositiveSmallIntegerField(
+        default=6,
+        verbose_name=_("Dígitos"),
+        help_text=_("Ancho del consecutivo, completado con ceros a la izquierda.")
+    )
+    tamano_bloque = models.PositiveIntegerField(
+        default=50,
+        verbose_name=_("Tamaño de Bloque"),
+        help_text=_("Números que reserva cada proceso por viaje a la base de datos. "
+                    "Es también el hueco máximo por proceso reiniciado. No modificar una vez creada.")
+    )
+    ultimo_numero = models.BigIntegerField(
+        default=0,
+        verbose_name=_("Último Número"),
+        help_text=_("Solo se usa en bases de datos sin secuencias (la numeración va fila a fila).")
+    )
+
+    @property
+    def nombre_secuencia(self):
+        return f"central_serie_numeracion_{self.pk}"
+
+    def formatear(self, numero):
+        return f"{self.prefijo}{self.anio}-{numero:0{self.digitos}d}"
+
+    def __str__(self):
+        return f"{self.tipo_documento}: {self.prefijo}{self.anio}"
+
+    class Meta:
+        verbose_name = _("Serie de Numeración")
+        verbose_name_plural = _("Series de Numeración")
+        unique_together = ('tipo_documento', 'prefijo', 'anio')
+        ordering = ['tipo_documento', '-anio']
@@ -0,0 +1,123 @@
+# Archivo: central/numeracion.py
+
+import threading
+
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .maestros import SERIES
+from .models import SerieNumeracion
+
+# Prefijo con el que se crea automáticamente la serie de cada tipo de documento
+PREFIJOS_POR_DEFECTO = {
+    'facturas': 'FACT-',
+    'ordenes_compra': 'OC-',
+    'asientos': 'AS-',
+}
+
+_bloques = {}
+_lock = threading.Lock()
+
+
+def usa_secuencias():
+    """Las secuencias nativas (nextval) solo existen en PostgreSQL."""
+    return connection.vendor == 'postgresql'
+
+
+def crear_secuencia(serie):
+    """Crea la secuencia de la serie: cada nextval() entrega el inicio de un bloque nuevo."""
+    if not usa_secuencias():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"CREATE SEQUENCE IF NOT EXISTS {connection.ops.quote_name(serie.nombre_secuencia)} "
+            f"START WITH 1 INCREMENT BY {int(serie.tamano_bloque)}"
+        )
+
+
+def eliminar_secuencia(serie):
+    with _lock:
+        _bloques.pop(serie.pk, None)
+    if not usa_secuencias():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f"DROP SEQUENCE IF EXISTS {connection.ops.quote_name(serie.nombre_secuencia)}")
+
+
+def obtener_serie(tipo_documento, anio, prefijo=None):
+    """Serie del tipo de documento y año fiscal (desde el caché de maestros); la crea si no existe."""
+    if prefijo is None:
+        prefijo = PREFIJOS_POR_DEFECTO.get(tipo_documento, '')
+
+    def cargar():
+        serie, _ = SerieNumeracion.objects.get_or_create(tipo_documento=tipo_documento, prefijo=prefijo, anio=anio)
+        return serie
+
+    return SERIES.obtener((tipo_documento, prefijo, anio), cargar)
+
+
+def _numeros_de_secuencia(serie, cantidad):
+    """
+    Toma 'cantidad' consecutivos del bloque local del proceso y, si no alcanzan,
+    reserva los bloques que falten con un solo SELECT nextval(). nextval() no se
+    revierte con la transacción ni bloquea filas: dos procesos nunca reciben el
+    mismo bloque y ninguno espera al otro.
+    """
+    numeros = []
+    with _lock:
+        siguiente, limite = _bloques.get(serie.pk, (1, 0))
+        tomados = min(cantidad, limite - siguiente + 1)
+        if tomados > 0:
+            numeros.extend(range(siguiente, siguiente + tomados))
+            siguiente += tomados
+
+        faltan = cantidad - len(numeros)
+        if faltan > 0:
+            bloques = -(-faltan // serie.tamano_bloque)
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT nextval(%s::regclass) FROM generate_series(1, %s)",
+                    [connection.ops.quote_name(serie.nombre_secuencia), bloques],
+                )
+                inicios = [fila[0] for fila in cursor.fetchall()]
+            for inicio in inicios:
+                fin = inicio + serie.tamano_bloque - 1
+                tomados = min(cantidad - len(numeros), serie.tamano_bloque)
+                numeros.extend(range(inicio, inicio + tomados))
+                siguiente, limite = inicio + tomados, fin
+
+        _bloques[serie.pk] = (siguiente, limite)
+    return numeros
+
+
+def _numeros_de_fila(serie, cantidad):
+    """Respaldo sin secuencias: incrementa ultimo_numero dentro de la transacción (sin huecos)."""
+    with transaction.atomic():
+        SerieNumeracion.objects.filter(pk=serie.pk).update(ultimo_numero=F('ultimo_numero') + cantidad)
+        fin = SerieNumeracion.objects.filter(pk=serie.pk).values_list('ultimo_numero', flat=True).get()
+    return list(range(fin - cantidad + 1, fin + 1))
+
+
+def reservar_numeros(tipo_documento, cantidad=1, fecha=None, prefijo=None):
+    """
+    Retorna 'cantidad' números formateados (ej. FACT-2026-000123) de la serie del
+    tipo de documento para el año fiscal de 'fecha' (hoy si no se indica).
+
+    Los números son únicos y crecientes dentro de cada proceso. Entre procesos se
+    intercalan por bloques y los números no usados de un bloque se pierden cuando
+    el proceso termina, de modo que el hueco máximo es tamano_bloque por proceso.
+    Con tamano_bloque=1 la serie es estrictamente creciente entre procesos.
+    """
+    anio = (fecha or timezone.localdate()).year
+    serie = obtener_serie(tipo_documento, anio, prefijo=prefijo)
+    if usa_secuencias():
+        numeros = _numeros_de_secuencia(serie, cantidad)
+    else:
+        numeros = _numeros_de_fila(serie, cantidad)
+    return [serie.formatear(numero) for numero in numeros]
+
+
+def siguiente_numero(tipo_documento, fecha=None, prefijo=None):
+    """Un solo número de la serie (ver reservar_numeros)."""
+    return reservar_numeros(tipo_documento, 1, fecha=fecha, prefijo=prefijo)[0]
@@ -0,0 +1,242 @@
+# Archivo: central/pagination.py
+
+import base64
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from functools import reduce
+from operator import and_, or_
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+# ------------------------------------------------------------------------------
+# CODIFICACIÓN DEL CURSOR
+# ------------------------------------------------------------------------------
+
+def _valor_serializable(valor):
+    if isinstance(valor, (date, datetime)):
+        return valor.isoformat()
+    if isinstance(valor, Decimal):
+        return str(valor)
+    return valor
+
+
+def codificar_cursor(datos):
+    """Convierte un dict en un token opaco y seguro para URL."""
+    texto = json.dumps(datos, default=_valor_serializable, separators=(',', ':'))
+    return base64.urlsafe_b64encode(texto.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decodificar_cursor(token):
+    """Inverso de codificar_cursor(). Lanza NotFound si el token es inválido."""
+    try:
+        relleno = '=' * (-len(token) % 4)
+        return json.loads(base64.urlsafe_b64decode(token + relleno).decode('utf-8'))
+    except (ValueError, TypeError):
+        raise NotFound("Cursor inválido.")
+
+
+# ------------------------------------------------------------------------------
+# PAGINACIÓN POR KEYSET
+# ------------------------------------------------------------------------------
+
+class PaginacionKeyset(BasePagination):
+    """
+    Paginación por cursor (keyset) sobre el ordenamiento del modelo.
+
+    En vez de OFFSET usa una condición "(campo1, campo2, ...) > (valores de la última fila)",
+    así que cualquier página cuesta lo mismo que la primera y no se ejecuta COUNT(*).
+    El orden se toma del queryset o de Meta.ordering; si ninguno de los campos es único
+    se agrega el pk como desempate. Los campos del orden deben ser no nulos.
+    Una vista puede fijar su propio orden con el atributo 'orden_keyset'.
+    """
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_param = 'page_size'
+    max_page_size = 1000
+    cursor_query_param = 'cursor'
+
+    def obtener_orden(self, queryset, view):
+        orden = getattr(view, 'orden_keyset', None) or queryset.query.order_by or queryset.model._meta.ordering
+        modelo = queryset.model
+        campos, hay_unico = [], False
+        for item in orden:
+            if not isinstance(item, str) or item == '?':
+                continue
+            descendente = item.startswith('-')
+            nombre = item.lstrip('-')
+            if nombre == 'pk':
+                nombre = modelo._meta.pk.name
+            if '__' not in nombre:
+                try:
+                    campo = modelo._meta.get_field(nombre)
+                except FieldDoesNotExist:
+                    continue
+                # Un ForeignKey se pagina por su columna (ej. encabezado_id)
+                nombre = campo.attname if campo.is_relation else nombre
+                hay_unico = hay_unico or campo.unique
+            campos.append((nombre, descendente))
+            if hay_unico:
+                break
+        if not hay_unico:
+            descendente = campos[-1][1] if campos else False
+            campos.append((modelo._meta.pk.attname, descendente))
+        return campos
+
+    def get_page_size(self, request):
+        try:
+            solicitado = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except (TypeError, ValueError):
+            return self.page_size
+        return max(1, min(solicitado, self.max_page_size))
+
+    @staticmethod
+    def valor_de(instancia, campo):
+        valor = instancia
+        for parte in campo.split('__'):
+            valor = getattr(valor, parte)
+        return valor
+
+    def condicion_despues_de(self, campos, valores, hacia_atras):
+        """(a, b, c) > (x, y, z) expresado como OR de ANDs, respetando la dirección de cada campo."""
+        alternativas = []
+        for posicion, (campo, descendente) in enumerate(campos):
+            mayor = descendente == hacia_atras
+            condicion = [Q(**{previo: valor}) for (previo, _), valor in zip(campos[:posicion], valores)]
+            condicion.append(Q(**{f"{campo}__{'gt' if mayor else 'lt'}": valores[posicion]}))
+            alternativas.append(reduce(and_, condicion))
+        return reduce(or_, alternativas)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.campos = self.obtener_orden(queryset, view)
+
+        token = request.query_params.get(self.cursor_query_param)
+        cursor = decodificar_cursor(token) if token else None
+        hacia_atras = bool(cursor and cursor.get('r'))
+
+        orden = [
+            f"{'-' if descendente != hacia_atras else ''}{campo}" for campo, descendente in self.campos
+        ]
+        queryset = queryset.order_by(*orden)
+        if cursor:
+            valores = cursor.get('v')
+            if not isinstance(valores, list) or len(valores) != len(self.campos):
+                raise NotFound("Cursor inválido.")
+            queryset = queryset.filter(self.condicion_despues_de(self.campos, valores, hacia_atras))
+
+        filas = list(queryset[:self.page_size + 1])
+        hay_mas = len(filas) > self.page_size
+        filas = filas[:self.page_size]
+        if hacia_atras:
+            filas.reverse()
+
+        self.primera = [self.valor_de(filas[0], campo) for campo, _ in self.campos] if filas else None
+        self.ultima = [self.valor_de(filas[-1], campo) for campo, _ in self.campos] if filas else None
+        self.hay_siguiente = hay_mas if not hacia_atras else bool(cursor)
+        self.hay_anterior = bool(cursor) if not hacia_atras else hay_mas
+        return filas
+
+    def enlace(self, valores, hacia_atras):
+        return replace_query_param(
+            self.base_url, self.cursor_query_param, codificar_cursor({'v': valores, 'r': int(hacia_atras)})
+        )
+
+    def get_next_link(self):
+        if not (self.hay_siguiente and self.ultima):
+            return None
+        return self.enlace(self.ultima, False)
+
+    def get_previous_link(self):
+        if not (self.hay_anterior and self.primera):
+            return None
+        return self.enlace(self.primera, True)
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                'name': self.cursor_query_param, 'required': False, 'in': 'query',
+                'description': 'Cursor de paginación (tomado de los enlaces next/previous).',
+                'schema': {'type': 'string'},
+            },
+            {
+                'name': self.page_size_query_param, 'required': False, 'in': 'query',
+                'description': 'Cantidad de resultados por página.',
+                'schema': {'type': 'integer'},
+            },
+        ]
+
+
+class PaginacionPorPaginas(PageNumberPagination):
+    """Paginación clásica con 'count' total (usa COUNT(*) y OFFSET)."""
+    page_size_query_param = 'page_size'
+    max_page_size = 1000
+
+
+class PaginacionHermes(BasePagination):
+    """
+    Paginación por defecto de la API.
+
+    Usa keyset (PaginacionKeyset) salvo que el cliente pida explícitamente la
+    paginación por número de página con ?page=N o ?paginacion=paginas; en ese
+    caso responde con el formato anterior, que incluye el total 'count'.
+    """
+
+    def __init__(self):
+        self.paginador = None
+
+    def elegir(self, request):
+        if 'page' in request.query_params or request.query_params.get('paginacion') == 'paginas':
+            return PaginacionPorPaginas()
+        return PaginacionKeyset()
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.paginador = self.elegir(request)
+        return self.paginador.paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        respuesta = self.paginador.get_paginated_response(data)
+        if isinstance(self.paginador, PaginacionPorPaginas):
+            # El parámetro 'paginacion' debe mantenerse en los enlaces para no cambiar de modo
+            for clave in ('next', 'previous'):
+                if respuesta.data.get(clave) and 'page=' not in respuesta.data[clave]:
+                    respuesta.data[clave] = replace_query_param(respuesta.data[clave], 'paginacion', 'paginas')
+        return respuesta
+
+    def get_paginated_response_schema(self, schema):
+        return PaginacionKeyset().get_paginated_response_schema(schema)
+
+    def get_schema_operation_parameters(self, view):
+        return PaginacionKeyset().get_schema_operation_parameters(view) + [
+            {
+                'name': 'page', 'required': False, 'in': 'query',
+                'description': 'Número de página (activa la paginación clásica con total "count").',
+                'schema': {'type': 'integer'},
+            },
+        ]
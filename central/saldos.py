@@ -0,0 +1,134 @@
+# Archivo: central/saldos.py
+
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import ExtractMonth, ExtractYear
+
+from .models import MovimientoContable, SaldoCuenta
+from .sql import upsert_sumando
+
+CLAVES_SALDO = ['cuenta', 'anio', 'mes', 'moneda']
+INCREMENTOS_SALDO = ['total_debito', 'total_credito', 'cantidad_movimientos']
+
+
+def registrar_movimientos(filas, signo=1):
+    """
+    Acumula (signo=1) o descuenta (signo=-1) movimientos en SaldoCuenta.
+
+    Cada fila es una tupla (cuenta_id, moneda_id, fecha, tipo_movimiento, monto).
+    Los movimientos se agrupan en memoria por cuenta/período/moneda y se escriben
+    con un único upsert por lote, por lo que sirve igual para un asiento que para
+    una carga masiva hecha con bulk_create.
+    """
+    acumulado = defaultdict(lambda: [Decimal('0'), Decimal('0'), 0])
+    for cuenta_id, moneda_id, fecha, tipo_movimiento, monto in filas:
+        totales = acumulado[(cuenta_id, fecha.year, fecha.month, moneda_id)]
+        monto = Decimal(str(monto)) * signo
+        if tipo_movimiento == 'D':
+            totales[0] += monto
+        else:
+            totales[1] += monto
+        totales[2] += signo
+
+    return upsert_sumando(
+        SaldoCuenta, CLAVES_SALDO, INCREMENTOS_SALDO,
+        [clave + tuple(totales) for clave, totales in acumulado.items()],
+    )
+
+
+def filas_de_movimientos(movimientos, encabezado=None):
+    """Convierte MovimientoContable en filas para registrar_movimientos()."""
+    for movimiento in movimientos:
+        cabecera = encabezado or movimiento.encabezado
+        yield (
+            movimiento.cuenta_id, cabecera.moneda_id, cabecera.fecha,
+            movimiento.tipo_movimiento, movimiento.monto,
+        )
+
+
+def calcular_saldos(anio=None):
+    """Agrega MovimientoContable desde cero, agrupado igual que SaldoCuenta."""
+    movimientos = MovimientoContable.objects.all()
+    if anio:
+        movimientos = movimientos.filter(encabezado__fecha__year=anio)
+    return (
+        movimientos
+        .values(
+            'cuenta_id',
+            moneda_id=F('encabezado__moneda_id'),
+            anio=ExtractYear('encabezado__fecha'),
+            mes=ExtractMonth('encabezado__fecha'),
+        )
+        .annotate(
+            total_debito=Sum('monto', filter=Q(tipo_movimiento='D'), default=Decimal('0')),
+            total_credito=Sum('monto', filter=Q(tipo_movimiento='C'), default=Decimal('0')),
+            cantidad_movimientos=Count('id'),
+        )
+        .order_by()
+    )
+
+
+def reconstruir_saldos(anio=None, tamano_lote=1000):
+    """Borra y vuelve a calcular SaldoCuenta (todo el libro o un solo año)."""
+    with transaction.atomic():
+        existentes = SaldoCuenta.objects.all()
+        if anio:
+            existentes = existentes.filter(anio=anio)
+        existentes.delete()
+
+        saldos = (SaldoCuenta(**fila) for fila in calcular_saldos(anio).iterator())
+        creados = 0
+        lote = []
+        for saldo in saldos:
+            lote.append(saldo)
+            if len(lote) >= tamano_lote:
+                creados += len(SaldoCuenta.objects.bulk_create(lote))
+                lote = []
+        if lote:
+            creados += len(SaldoCuenta.objects.bulk_create(lote))
+    return creados
+
+
+def verificar_saldos(anio=None):
+    """
+    Compara SaldoCuenta con el libro y retorna la lista de diferencias.
+    Una lista vacía significa que la tabla de saldos es consistente.
+    """
+    def clave(fila):
+        return (fila['cuenta_id'], fila['anio'], fila['mes'], fila['moneda_id'])
+
+    def totales(fila):
+        return (
+            Decimal(fila['total_debito']), Decimal(fila['total_credito']),
+            fila['cantidad_movimientos'],
+        )
+
+    esperados = {clave(fila): totales(fila) for fila in calcular_saldos(anio)}
+
+    registrados_qs = SaldoCuenta.objects.values(
+        'cuenta_id', 'anio', 'mes', 'moneda_id',
+        'total_debito', 'total_credito', 'cantidad_movimientos',
+    )
+    if anio:
+        registrados_qs = registrados_qs.filter(anio=anio)
+    registrados = {clave(fila): totales(fila) for fila in registrados_qs}
+
+    vacio = (Decimal('0'), Decimal('0'), 0)
+    diferencias = []
+    for llave in sorted(set(esperados) | set(registrados)):
+        esperado = esperados.get(llave, vacio)
+        registrado = registrados.get(llave, vacio)
+        if esperado != registrado:
+            cuenta_id, anio_fila, mes, moneda_id = llave
+            diferencias.append({
+                'cuenta_id': cuenta_id,
+                'anio': anio_fila,
+                'mes': mes,
+                'moneda_id': moneda_id,
+                'esperado': esperado,
+                'registrado': registrado,
+            })
+    return diferencias
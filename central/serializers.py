@@ -1,9 +1,13 @@
 # Archivo: central/serializers.py
 
 from rest_framework import serializers
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import transaction
 from .models import (Producto, EntidadComercial, Moneda,
     TransaccionEncabezado, MovimientoContable, CuentaContable,
 )
+from .jerarquia import validar_cuenta_padre
+from .numeracion import siguiente_numero
 
 # Serializador para Producto
 class ProductoSerializer(serializers.ModelSerializer):
@@ -24,6 +28,22 @@ class MonedaSerializer(serializers.ModelSerializer):
         model = Moneda
         fields = '__all__'
 
+# Serializador para CuentaContable (Plan de Cuentas)
+class CuentaContableSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = CuentaContable
+        fields = '__all__'
+
+    def validate(self, data):
+        """Rechaza una cuenta padre que cree un ciclo en la jerarquía."""
+        if self.instance and 'cuenta_padre' in data:
+            padre = data['cuenta_padre']
+            try:
+                validar_cuenta_padre(self.instance, padre.pk if padre else None)
+            except DjangoValidationError as e:
+                raise serializers.ValidationError(e.message_dict)
+        return data
+
 
 # Archivo: central/serializers.py (Continuación)
 
@@ -47,6 +67,8 @@ class TransaccionEncabezadoSerializer(serializers.ModelSerializer):
     class Meta:
         model = TransaccionEncabezado
         fields = '__all__' # Incluye todos los campos del encabezado + 'movimientos'
+        # Sin referencia, el asiento toma el siguiente número de la serie 'asientos'
+        extra_kwargs = {'referencia': {'required': False}}
     
     # --- Lógica de Validación Crítica ---
     def validate(self, data):
@@ -71,12 +93,16 @@ class TransaccionEncabezadoSerializer(serializers.ModelSerializer):
     # --- Lógica de Creación Anidada ---
     def create(self, validated_data):
         movimientos_data = validated_data.pop('movimientos')
+        if not validated_data.get('referencia'):
+            validated_data['referencia'] = siguiente_numero('asientos', validated_data['fecha'])
         
-        # 1. Crear el Encabezado
-        transaccion = TransaccionEncabezado.objects.create(**validated_data)
-        
-        # 2. Crear los Movimientos y asignarlos al Encabezado
-        for movimiento_data in movimientos_data:
-            MovimientoContable.objects.create(encabezado=transaccion, **movimiento_data)
+        # Todo en una transacción: las señales actualizan SaldoCuenta junto con el asiento
+        with transaction.atomic():
+            # 1. Crear el Encabezado
+            transaccion = TransaccionEncabezado.objects.create(**validated_data)
+            
+            # 2. Crear los Movimientos y asignarlos al Encabezado
+            for movimiento_data in movimientos_data:
+                MovimientoContable.objects.create(encabezado=transaccion, **movimiento_data)
         
         return transaccion
\ No newline at end of file
@@ -0,0 +1,145 @@
+# Archivo: central/signals.py
+
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from .jerarquia import desvincular_subarbol, mover_cuenta, registrar_cuenta, validar_cuenta_padre
+from .maestros import ALMACENES, CUENTAS, MONEDAS, SERIES
+from .models import CuentaContable, Moneda, MovimientoContable, SerieNumeracion, TransaccionEncabezado
+from .numeracion import crear_secuencia, eliminar_secuencia
+from .saldos import filas_de_movimientos, registrar_movimientos
+
+
+# ------------------------------------------------------------------------------
+# MANTENIMIENTO INCREMENTAL DE SaldoCuenta
+# ------------------------------------------------------------------------------
+
+@receiver(pre_save, sender=MovimientoContable)
+def recordar_movimiento_anterior(sender, instance, **kwargs):
+    """Guarda la versión previa de un movimiento editado para poder descontarla."""
+    instance._fila_saldo_anterior = None
+    if instance.pk:
+        anterior = MovimientoContable.objects.select_related('encabezado').filter(pk=instance.pk).first()
+        if anterior:
+            instance._fila_saldo_anterior = next(filas_de_movimientos([anterior]))
+
+
+@receiver(post_save, sender=MovimientoContable)
+def actualizar_saldo_post_movimiento(sender, instance, created, raw=False, **kwargs):
+    """
+    Acumula el movimiento en SaldoCuenta. Corre dentro de la misma transacción
+    que el guardado (los serializadores que crean asientos usan transaction.atomic).
+    """
+    if raw:
+        return
+    anterior = getattr(instance, '_fila_saldo_anterior', None)
+    if not created and anterior:
+        registrar_movimientos([anterior], signo=-1)
+    registrar_movimientos(filas_de_movimientos([instance]))
+
+
+@receiver(post_delete, sender=MovimientoContable)
+def descontar_saldo_post_borrado(sender, instance, **kwargs):
+    """Descuenta el movimiento borrado (también cuando se borra el asiento completo)."""
+    registrar_movimientos(filas_de_movimientos([instance]), signo=-1)
+
+
+@receiver(pre_save, sender=TransaccionEncabezado)
+def recordar_periodo_anterior(sender, instance, **kwargs):
+    """Detecta cambios de fecha o moneda que mueven el asiento a otro saldo."""
+    instance._cabecera_saldo_anterior = None
+    if instance.pk:
+        instance._cabecera_saldo_anterior = (
+            TransaccionEncabezado.objects.filter(pk=instance.pk).values('fecha', 'moneda_id').first()
+        )
+
+
+@receiver(post_save, sender=TransaccionEncabezado)
+def mover_saldos_post_encabezado(sender, instance, created, raw=False, **kwargs):
+    anterior = getattr(instance, '_cabecera_saldo_anterior', None)
+    if created or raw or not anterior:
+        return
+    mismo_periodo = (
+        anterior['fecha'].year == instance.fecha.year
+        and anterior['fecha'].month == instance.fecha.month
+        and anterior['moneda_id'] == instance.moneda_id
+    )
+    if mismo_periodo:
+        return
+
+    movimientos = list(instance.movimientos.all())
+    registrar_movimientos(
+        [(m.cuenta_id, anterior['moneda_id'], anterior['fecha'], m.tipo_movimiento, m.monto) for m in movimientos],
+        signo=-1,
+    )
+    registrar_movimientos(filas_de_movimientos(movimientos, encabezado=instance))
+
+
+# ------------------------------------------------------------------------------
+# MANTENIMIENTO DE LA JERARQUÍA DEL PLAN DE CUENTAS (JerarquiaCuenta)
+# ------------------------------------------------------------------------------
+
+@receiver(pre_save, sender=CuentaContable)
+def recordar_padre_anterior(sender, instance, raw=False, **kwargs):
+    """Detecta re-asignaciones de cuenta_padre y rechaza las que crearían ciclos."""
+    instance._cuenta_padre_anterior = None
+    if instance.pk and not raw:
+        instance._cuenta_padre_anterior = (
+            CuentaContable.objects.filter(pk=instance.pk).values_list('cuenta_padre_id', flat=True).first()
+        )
+        if instance._cuenta_padre_anterior != instance.cuenta_padre_id:
+            validar_cuenta_padre(instance, instance.cuenta_padre_id)
+
+
+@receiver(post_save, sender=CuentaContable)
+def actualizar_jerarquia_post_cuenta(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    if created:
+        registrar_cuenta(instance)
+    elif instance._cuenta_padre_anterior != instance.cuenta_padre_id:
+        mover_cuenta(instance)
+
+
+@receiver(pre_delete, sender=CuentaContable)
+def desvincular_jerarquia_pre_borrado(sender, instance, **kwargs):
+    desvincular_subarbol(instance)
+
+
+# ------------------------------------------------------------------------------
+# INVALIDACIÓN DEL CACHÉ DE DATOS MAESTROS (central/maestros.py)
+# ------------------------------------------------------------------------------
+
+@receiver([post_save, post_delete], sender=Moneda)
+def invalidar_cache_monedas(sender, **kwargs):
+    MONEDAS.invalidar_en_transaccion()
+
+
+@receiver([post_save, post_delete], sender=CuentaContable)
+def invalidar_cache_cuentas(sender, **kwargs):
+    CUENTAS.invalidar_en_transaccion()
+
+
+@receiver([post_save, post_delete], sender='inventario.Almacen')
+def invalidar_cache_almacenes(sender, **kwargs):
+    ALMACENES.invalidar_en_transaccion()
+
+
+@receiver([post_save, post_delete], sender=SerieNumeracion)
+def invalidar_cache_series(sender, **kwargs):
+    SERIES.invalidar_en_transaccion()
+
+
+# ------------------------------------------------------------------------------
+# SECUENCIAS DE LAS SERIES DE NUMERACIÓN (central/numeracion.py)
+# ------------------------------------------------------------------------------
+
+@receiver(post_save, sender=SerieNumeracion)
+def crear_secuencia_post_serie(sender, instance, created, **kwargs):
+    if created:
+        crear_secuencia(instance)
+
+
+@receiver(post_delete, sender=SerieNumeracion)
+def eliminar_secuencia_post_borrado(sender, instance, **kwargs):
+    eliminar_secuencia(instance)
@@ -0,0 +1,89 @@
+# Archivo: central/sql.py
+
+from django.db import connection
+
+# Máximo de filas por sentencia: mantiene el número de parámetros por debajo
+# del límite de SQLite y evita sentencias gigantes en PostgreSQL.
+FILAS_POR_SENTENCIA = 500
+
+
+def _upsert(modelo, claves, valores, filas, actualizacion, retornar=None, insertar=()):
+    """
+    Base de upsert_sumando/upsert_reemplazando: INSERT ... ON CONFLICT (claves)
+    DO UPDATE SET <actualizacion(tabla, columna)>. Los campos de 'insertar' solo
+    se escriben al insertar. Con 'retornar' (nombres de campos) agrega RETURNING
+    y devuelve las filas escritas; si no, su cantidad.
+    """
+    filas = sorted(filas, key=lambda fila: tuple(fila[:len(claves)]))
+    if not filas:
+        return [] if retornar else 0
+
+    campos = [modelo._meta.get_field(nombre) for nombre in list(claves) + list(valores) + list(insertar)]
+    qn = connection.ops.quote_name
+    tabla = qn(modelo._meta.db_table)
+    columnas = [qn(campo.column) for campo in campos]
+    columnas_clave = columnas[:len(claves)]
+    columnas_valor = columnas[len(claves):len(claves) + len(valores)]
+
+    actualizaciones = ', '.join(actualizacion(tabla, columna) for columna in columnas_valor)
+    marcador = '(' + ', '.join(['%s'] * len(campos)) + ')'
+    retorno = ''
+    if retornar:
+        retorno = ' RETURNING ' + ', '.join(
+            qn(modelo._meta.get_field(nombre).column) for nombre in retornar
+        )
+
+    escritas = []
+    with connection.cursor() as cursor:
+        for inicio in range(0, len(filas), FILAS_POR_SENTENCIA):
+            lote = filas[inicio:inicio + FILAS_POR_SENTENCIA]
+            parametros = []
+            for fila in lote:
+                parametros.extend(
+                    campo.get_db_prep_save(valor, connection) for campo, valor in zip(campos, fila)
+                )
+            cursor.execute(
+                f"INSERT INTO {tabla} ({', '.join(columnas)}) "
+                f"VALUES {', '.join([marcador] * len(lote))} "
+                f"ON CONFLICT ({', '.join(columnas_clave)}) DO UPDATE SET {actualizaciones}"
+                f"{retorno}",
+                parametros,
+            )
+            if retornar:
+                escritas.extend(cursor.fetchall())
+    return escritas if retornar else len(filas)
+
+
+def upsert_sumando(modelo, claves, incrementos, filas, retornar=None):
+    """
+    Inserta o acumula filas en una sola sentencia por lote:
+
+        INSERT ... ON CONFLICT (claves) DO UPDATE SET campo = campo + EXCLUDED.campo
+
+    'claves' e 'incrementos' son nombres de campos del modelo (los ForeignKey se
+    indican por su nombre, ej. 'producto'). Cada fila es una tupla con los valores
+    de las claves seguidos de los incrementos, en ese mismo orden.
+
+    Las claves deben tener una restricción única (unique_together). La sintaxis es
+    válida tanto en PostgreSQL como en SQLite (>= 3.24; RETURNING requiere >= 3.35).
+    Las filas se ordenan por clave para que transacciones concurrentes bloqueen en
+    el mismo orden. Con 'retornar' devuelve los valores ya acumulados.
+    """
+    return _upsert(
+        modelo, claves, incrementos, filas,
+        lambda tabla, columna: f"{columna} = {tabla}.{columna} + EXCLUDED.{columna}",
+        retornar=retornar,
+    )
+
+
+def upsert_reemplazando(modelo, claves, valores, filas, retornar=None, insertar=()):
+    """
+    Igual que upsert_sumando, pero el conflicto reemplaza los valores en lugar de
+    sumarlos: SET campo = EXCLUDED.campo. Los campos de 'insertar' (al final de
+    cada fila) solo se usan si la fila es nueva, ej. un NOT NULL sin valor por defecto.
+    """
+    return _upsert(
+        modelo, claves, valores, filas,
+        lambda tabla, columna: f"{columna} = EXCLUDED.{columna}",
+        retornar=retornar, insertar=insertar,
+    )
@@ -0,0 +1,77 @@
+# Archivo: central/tests_bandeja.py
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from central.bandeja import metricas_bandeja, procesar_lote, reintentar_fallidas
+from central.models import ContabilizacionPendiente, CuentaContable, Moneda, Producto, TransaccionEncabezado
+from inventario.models import Almacen, MovimientoInventario
+from inventario.serializers import MovimientoInventarioSerializer
+
+# ==============================================================================
+# PRUEBAS DE LA BANDEJA DE SALIDA CONTABLE (CONTABILIZACIÓN DIFERIDA)
+# ==============================================================================
+
+@override_settings(HERMES_CONTABILIZACION_DIFERIDA=True)
+class BandejaContableTests(TestCase):
+
+    def setUp(self):
+        Moneda.objects.create(codigo_iso='USD', nombre='Dólar', simbolo='$', es_principal=True)
+        CuentaContable.objects.create(codigo='613505', nombre='Costo de Venta', tipo='G', naturaleza='D')
+        CuentaContable.objects.create(codigo='143505', nombre='Inventario', tipo='A', naturaleza='D')
+        self.producto = Producto.objects.create(
+            nombre='Producto Test', codigo_sku='TEST-001',
+            precio_venta=100, costo_unitario=50, unidad_medida='Unidad'
+        )
+        self.almacen = Almacen.objects.create(nombre='Almacén Test', codigo='ALM-TEST')
+
+    def crear_salida(self, referencia, producto=None):
+        serializer = MovimientoInventarioSerializer(data={
+            'tipo_movimiento': 'S', 'producto': (producto or self.producto).id,
+            'almacen': self.almacen.id, 'cantidad': 2, 'referencia_doc': referencia,
+        })
+        serializer.is_valid(raise_exception=True)
+        return serializer.save()
+
+    def test_modo_diferido_encola_y_el_worker_contabiliza(self):
+        """La petición solo escribe la fila de bandeja; el worker genera y enlaza el asiento"""
+        movimiento = self.crear_salida('S-1')
+        self.assertIsNone(movimiento.asiento_contable_nucleo)
+        self.assertFalse(TransaccionEncabezado.objects.exists())
+        self.assertEqual(metricas_bandeja()['por_tipo']['inventario']['pendientes'], 1)
+
+        resultado = procesar_lote()
+        self.assertEqual((resultado['reclamadas'], resultado['contabilizadas']), (1, 1))
+        movimiento.refresh_from_db()
+        self.assertEqual(movimiento.asiento_contable_nucleo.movimientos.count(), 2)
+        self.assertEqual(metricas_bandeja()['pendientes'], 0)
+
+        # Una fila repetida del mismo documento no genera un segundo asiento
+        ContabilizacionPendiente.objects.create(
+            tipo_documento='inventario', documento_id=movimiento.id, disponible_desde=timezone.now()
+        )
+        self.assertEqual(procesar_lote()['contabilizadas'], 1)
+        self.assertEqual(TransaccionEncabezado.objects.count(), 1)
+
+    def test_reintentos_y_dead_letter(self):
+        """Un documento inválido se reprograma y, al agotar los intentos, queda como fallido"""
+        sin_costo = Producto.objects.create(
+            nombre='Sin Costo', codigo_sku='TEST-002', precio_venta=10, unidad_medida='Unidad'
+        )
+        self.crear_salida('S-1', producto=sin_costo)
+
+        self.assertEqual(procesar_lote(max_intentos=2)['reintentos'], 1)
+        fila = ContabilizacionPendiente.objects.get()
+        self.assertEqual((fila.estado, fila.intentos), ('P', 1))
+        self.assertIn('no tiene costo unitario', fila.ultimo_error)
+        # Aún en espera de reintento: el worker no la toma
+        self.assertEqual(procesar_lote()['reclamadas'], 0)
+
+        ContabilizacionPendiente.objects.update(disponible_desde=fila.fecha_creacion)
+        self.assertEqual(procesar_lote(max_intentos=2)['fallidas'], 1)
+        self.assertEqual(metricas_bandeja()['fallidas'], 1)
+
+        sin_costo.costo_unitario = 5
+        sin_costo.save()
+        self.assertEqual(reintentar_fallidas(), 1)
+        self.assertEqual(procesar_lote()['contabilizadas'], 1)
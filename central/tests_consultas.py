@@ -0,0 +1,74 @@
+# Archivo: central/tests_consultas.py
+
+from django.contrib.auth.models import User, Group
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from central.consultas import relaciones_de_serializador
+from central.models import Producto
+from facturacion.models import FacturaEncabezado
+from facturacion.serializers import FacturaEncabezadoSerializer
+from inventario.models import Almacen, Stock
+from inventario.serializers import StockSerializer
+from nomina.models import NominaEncabezado
+from nomina.serializers import NominaEncabezadoSerializer
+
+# ==============================================================================
+# PRUEBAS DE OPTIMIZACIÓN AUTOMÁTICA DE CONSULTAS (select/prefetch_related)
+# ==============================================================================
+
+class RelacionesSerializadorTests(TestCase):
+
+    def test_fuentes_con_puntos(self):
+        """source='producto.nombre' se traduce en select_related; los pk no cuestan consultas"""
+        seleccion, prefetch = relaciones_de_serializador(StockSerializer(), Stock)
+        self.assertEqual(seleccion, ['almacen', 'producto'])
+        self.assertEqual(prefetch, [])
+
+    def test_anidado_many_con_su_propio_select(self):
+        """detalles (many=True) se precarga con el select_related de su serializador"""
+        seleccion, prefetch = relaciones_de_serializador(FacturaEncabezadoSerializer(), FacturaEncabezado)
+        self.assertEqual(seleccion, ['cliente'])
+        self.assertEqual([p.prefetch_to for p in prefetch], ['detalles'])
+        self.assertEqual(prefetch[0].queryset.query.select_related, {'producto': {}})
+
+    def test_varias_fuentes(self):
+        seleccion, prefetch = relaciones_de_serializador(NominaEncabezadoSerializer(), NominaEncabezado)
+        self.assertEqual(seleccion, ['empleado', 'periodo'])
+        self.assertEqual(prefetch[0].queryset.query.select_related, {'concepto': {}})
+
+
+class ListadoConsultasFijasTests(APITestCase):
+
+    def setUp(self):
+        user = User.objects.create_user(username='inventario', password='test123')
+        user.groups.add(Group.objects.create(name='Inventario'))
+        self.client.force_authenticate(user=user)
+        self.almacen = Almacen.objects.create(nombre='Almacén Test', codigo='ALM-TEST')
+
+    def crear_stock(self, cantidad):
+        inicio = Producto.objects.count()
+        productos = Producto.objects.bulk_create([
+            Producto(nombre=f'P{inicio + i}', codigo_sku=f'SKU-{inicio + i}', precio_venta=1, unidad_medida='Unidad')
+            for i in range(cantidad)
+        ])
+        Stock.objects.bulk_create([Stock(producto=p, almacen=self.almacen, cantidad=1) for p in productos])
+
+    def consultas_listado(self):
+        with CaptureQueriesContext(connection) as consultas:
+            response = self.client.get('/api/inventario/stock/?page_size=50')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return len(consultas.captured_queries), len(response.data['results'])
+
+    def test_consultas_no_dependen_del_tamano_de_pagina(self):
+        self.crear_stock(3)
+        pocas, filas = self.consultas_listado()
+        self.assertEqual(filas, 3)
+
+        self.crear_stock(30)
+        muchas, filas = self.consultas_listado()
+        self.assertEqual(filas, 33)
+        self.assertEqual(pocas, muchas)
@@ -0,0 +1,101 @@
+# Archivo: central/tests_contabilizacion.py
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from central.contabilizacion import ErrorContabilizacion, contabilizar, contabilizar_pendientes
+from central.maestros import cuentas_por_codigo, moneda_principal
+from central.models import CuentaContable, Moneda, Producto, SaldoCuenta, TransaccionEncabezado
+from central.saldos import verificar_saldos
+from inventario.models import Almacen, MovimientoInventario
+
+# ==============================================================================
+# PRUEBAS DEL MOTOR DE CONTABILIZACIÓN POR LOTES
+# ==============================================================================
+
+class ContabilizacionLotesTests(TestCase):
+
+    def setUp(self):
+        Moneda.objects.create(codigo_iso='USD', nombre='Dólar', simbolo='$', es_principal=True)
+        self.cuenta_costo = CuentaContable.objects.create(
+            codigo='613505', nombre='Costo de Venta', tipo='G', naturaleza='D'
+        )
+        CuentaContable.objects.create(codigo='143505', nombre='Inventario', tipo='A', naturaleza='D')
+        self.producto = Producto.objects.create(
+            nombre='Producto Test', codigo_sku='TEST-001',
+            precio_venta=100, costo_unitario=50, unidad_medida='Unidad'
+        )
+        self.sin_costo = Producto.objects.create(
+            nombre='Sin Costo', codigo_sku='TEST-002', precio_venta=10, unidad_medida='Unidad'
+        )
+        self.almacen = Almacen.objects.create(nombre='Almacén Test', codigo='ALM-TEST')
+
+    def salida(self, referencia, producto=None, cantidad=1):
+        return MovimientoInventario.objects.create(
+            tipo_movimiento='S', producto=producto or self.producto, almacen=self.almacen,
+            cantidad=cantidad, referencia_doc=referencia
+        )
+
+    def test_lote_crea_asientos_y_enlaza_documentos(self):
+        """Un lote de salidas genera un asiento por documento, enlazado con un solo UPDATE"""
+        movimientos = [self.salida(f'S-{i}', cantidad=i) for i in range(1, 6)]
+        # Maestros en caché, como en un proceso que ya contabilizó antes
+        moneda_principal()
+        cuentas_por_codigo('613505', '143505')
+
+        with self.assertNumQueries(6):
+            # SAVEPOINT, 2 bulk_create, upsert de saldos, UPDATE de enlace, RELEASE
+            resultado = contabilizar('inventario', movimientos)
+
+        self.assertEqual(len(resultado['asientos']), 5)
+        for movimiento in MovimientoInventario.objects.select_related('asiento_contable_nucleo'):
+            asiento = movimiento.asiento_contable_nucleo
+            self.assertEqual(asiento.referencia, f"Costo-Venta-{movimiento.referencia_doc}-{movimiento.id}")
+            self.assertEqual(asiento.movimientos.get(tipo_movimiento='D').monto, 50 * movimiento.cantidad)
+
+        self.assertEqual(SaldoCuenta.objects.get(cuenta=self.cuenta_costo).total_debito, 50 * 15)
+        self.assertEqual(verificar_saldos(), [])
+
+    def test_error_aborta_el_lote_salvo_omitir_errores(self):
+        """Sin omitir_errores nada se escribe; con omitir_errores se reportan los inválidos"""
+        movimientos = [self.salida('S-1'), self.salida('S-2', producto=self.sin_costo)]
+
+        with self.assertRaises(ErrorContabilizacion):
+            contabilizar('inventario', movimientos)
+        self.assertFalse(TransaccionEncabezado.objects.exists())
+
+        resultado = contabilizar('inventario', movimientos, omitir_errores=True)
+        self.assertEqual(len(resultado['asientos']), 1)
+        self.assertEqual(resultado['errores'][0]['documento'], movimientos[1].id)
+        self.assertIn('no tiene costo unitario', resultado['errores'][0]['error'])
+
+    def test_referencia_duplicada_solo_rechaza_ese_documento(self):
+        """Un asiento cuya referencia ya existe no detiene el resto del lote"""
+        movimientos = [self.salida('S-1'), self.salida('S-2')]
+        TransaccionEncabezado.objects.create(
+            fecha=movimientos[0].fecha, referencia=f"Costo-Venta-S-1-{movimientos[0].id}",
+            descripcion='Registrado a mano', moneda=Moneda.objects.get(),
+        )
+
+        with self.assertRaises(ErrorContabilizacion):
+            contabilizar('inventario', movimientos)
+
+        resultado = contabilizar('inventario', movimientos, omitir_errores=True)
+        self.assertEqual(len(resultado['asientos']), 1)
+        self.assertEqual([error['documento'] for error in resultado['errores']], [movimientos[0].id])
+        self.assertEqual(verificar_saldos(), [])
+
+    def test_pendientes_por_lotes(self):
+        """contabilizar_pendientes recorre por lotes solo los documentos sin asiento"""
+        for i in range(5):
+            self.salida(f'S-{i}')
+        MovimientoInventario.objects.create(
+            tipo_movimiento='E', producto=self.producto, almacen=self.almacen, cantidad=10, referencia_doc='E-1'
+        )
+
+        resultado = contabilizar_pendientes('inventario', tamano_lote=2)
+        self.assertEqual((resultado['procesados'], resultado['creados']), (5, 5))
+        self.assertEqual(contabilizar_pendientes('inventario')['procesados'], 0)
+
+        call_command('contabilizar_pendientes', 'inventario', stdout=open('/dev/null', 'w'))
+        self.assertEqual(TransaccionEncabezado.objects.count(), 5)
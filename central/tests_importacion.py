@@ -0,0 +1,112 @@
+# Archivo: central/tests_importacion.py
+
+import io
+import json
+
+from django.contrib.auth.models import User, Group
+from django.core.files.uploadedfile import SimpleUploadedFile
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from central.importacion import importar_asientos
+from central.models import CuentaContable, Moneda, SaldoCuenta, TransaccionEncabezado
+from central.saldos import verificar_saldos
+
+# ==============================================================================
+# PRUEBAS DE IMPORTACIÓN MASIVA DE ASIENTOS
+# ==============================================================================
+
+class ImportacionAsientosTests(APITestCase):
+
+    def setUp(self):
+        Moneda.objects.create(codigo_iso='USD', nombre='Dólar Americano', simbolo='$', es_principal=True)
+        self.caja = CuentaContable.objects.create(codigo='110505', nombre='Caja General', tipo='A', naturaleza='D')
+        CuentaContable.objects.create(codigo='413505', nombre='Ventas', tipo='I', naturaleza='C')
+        self.user = User.objects.create_user(username='contador', password='test123')
+        self.user.groups.add(Group.objects.create(name='Contabilidad'))
+
+    def asiento(self, referencia, debito, credito, cuenta_credito='413505'):
+        return json.dumps({
+            'referencia': referencia,
+            'fecha': '2024-06-30',
+            'descripcion': 'Saldo migrado',
+            'moneda': 'USD',
+            'movimientos': [
+                {'cuenta': '110505', 'tipo_movimiento': 'D', 'monto': debito},
+                {'cuenta': cuenta_credito, 'tipo_movimiento': 'C', 'monto': credito},
+            ],
+        })
+
+    def test_ndjson_reporta_errores_sin_abortar_el_lote(self):
+        """Los asientos inválidos se reportan y los válidos se crean igual"""
+        lineas = [
+            self.asiento('MIG-1', '100.00', '100.00'),
+            self.asiento('MIG-2', '100.00', '90.00'),              # Desbalanceado
+            self.asiento('MIG-3', '10.00', '10.00', '999999'),     # Cuenta inexistente
+            '{esto no es json',
+            self.asiento('MIG-1', '5.00', '5.00'),                 # Referencia repetida
+            self.asiento('MIG-4', '20.00', '20.00'),
+        ]
+        reporte = importar_asientos(io.StringIO('\n'.join(lineas)), formato='ndjson', tamano_lote=2)
+
+        self.assertEqual(reporte['procesados'], 6)
+        self.assertEqual(reporte['creados'], 2)
+        self.assertEqual([error['linea'] for error in reporte['errores']], [2, 3, 4, 5])
+        self.assertIn('no balancea', reporte['errores'][0]['errores'][0])
+        self.assertEqual(TransaccionEncabezado.objects.count(), 2)
+
+        # bulk_create no dispara señales: el importador mantiene SaldoCuenta por su cuenta
+        self.assertEqual(SaldoCuenta.objects.get(cuenta=self.caja).total_debito, 120)
+        self.assertEqual(verificar_saldos(), [])
+
+    def test_valores_no_numericos_o_desbordados_se_reportan(self):
+        """NaN, montos o tasas que no caben en la columna y movimientos mal formados no abortan el lote"""
+        fuera_de_rango = json.loads(self.asiento('MIG-4', '10.00', '10.00'))
+        fuera_de_rango['tasa_cambio'] = '123456789'
+        mal_formado = json.loads(self.asiento('MIG-5', '10.00', '10.00'))
+        mal_formado['movimientos'].append('110505')
+        lineas = [
+            self.asiento('MIG-1', 'NaN', 'NaN'),
+            self.asiento('MIG-2', '1e20', '1e20'),
+            self.asiento('MIG-3', 'Infinity', 'Infinity'),
+            json.dumps(fuera_de_rango),
+            json.dumps(mal_formado),
+            self.asiento('MIG-6', '20.00', '20.00'),
+        ]
+        reporte = importar_asientos(io.StringIO('\n'.join(lineas)), formato='ndjson')
+
+        self.assertEqual(reporte['creados'], 1)
+        self.assertEqual([error['linea'] for error in reporte['errores']], [1, 2, 3, 4, 5])
+        self.assertIn("monto inválido 'NaN'", reporte['errores'][0]['errores'][0])
+        self.assertIn("Tasa de cambio inválida.", reporte['errores'][3]['errores'])
+        self.assertIn("Movimiento 3: debe ser un objeto", reporte['errores'][4]['errores'][0])
+
+    def test_csv_agrupa_filas_por_referencia(self):
+        """Las filas consecutivas con la misma referencia forman un asiento"""
+        contenido = (
+            "referencia,fecha,descripcion,moneda,entidad,tasa_cambio,cuenta,tipo_movimiento,monto\n"
+            "MIG-10,2024-01-31,Apertura,USD,,1,110505,D,300.00\n"
+            "MIG-10,2024-01-31,Apertura,USD,,1,413505,C,300.00\n"
+            "MIG-11,2024-01-31,Apertura,USD,,1,110505,D,50.00\n"
+            "MIG-11,2024-01-31,Apertura,USD,,1,413505,C,50.00\n"
+        )
+        reporte = importar_asientos(io.StringIO(contenido), formato='csv')
+        self.assertEqual(reporte['creados'], 2)
+        self.assertEqual(TransaccionEncabezado.objects.get(referencia='MIG-10').movimientos.count(), 2)
+
+    def test_api_importar_rechaza_referencias_existentes(self):
+        """El endpoint acepta un archivo y reporta las referencias ya registradas"""
+        self.client.force_authenticate(user=self.user)
+        contenido = '\n'.join([self.asiento('MIG-1', '1.00', '1.00'), self.asiento('MIG-2', '2.00', '2.00')])
+
+        primera = self.client.post('/api/transacciones/importar/', {
+            'archivo': SimpleUploadedFile('asientos.ndjson', contenido.encode('utf-8')),
+        }, format='multipart')
+        self.assertEqual(primera.status_code, status.HTTP_200_OK)
+        self.assertEqual(primera.data['creados'], 2)
+
+        segunda = self.client.post('/api/transacciones/importar/', {
+            'archivo': SimpleUploadedFile('asientos.ndjson', contenido.encode('utf-8')),
+        }, format='multipart')
+        self.assertEqual(segunda.data['creados'], 0)
+        self.assertEqual(segunda.data['errores'][0]['errores'], ['La referencia ya existe.'])
@@ -0,0 +1,107 @@
+# Archivo: central/tests_jerarquia.py
+
+from datetime import date
+
+from django.contrib.auth.models import User, Group
+from django.core.exceptions import ValidationError
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from central.jerarquia import reconstruir_jerarquia, saldos_subarbol
+from central.models import CuentaContable, JerarquiaCuenta, Moneda, MovimientoContable, TransaccionEncabezado
+
+# ==============================================================================
+# PRUEBAS DE LA JERARQUÍA DEL PLAN DE CUENTAS (JerarquiaCuenta)
+# ==============================================================================
+
+class JerarquiaCuentaTests(APITestCase):
+
+    def setUp(self):
+        self.moneda = Moneda.objects.create(
+            codigo_iso='USD', nombre='Dólar Americano', simbolo='$', es_principal=True
+        )
+        self.activo = CuentaContable.objects.create(codigo='1', nombre='Activo', tipo='A', naturaleza='D')
+        self.disponible = CuentaContable.objects.create(
+            codigo='11', nombre='Disponible', tipo='A', naturaleza='D', cuenta_padre=self.activo
+        )
+        self.caja = CuentaContable.objects.create(
+            codigo='1105', nombre='Caja', tipo='A', naturaleza='D', cuenta_padre=self.disponible
+        )
+        self.caja_general = CuentaContable.objects.create(
+            codigo='110505', nombre='Caja General', tipo='A', naturaleza='D', cuenta_padre=self.caja
+        )
+        self.caja_menor = CuentaContable.objects.create(
+            codigo='110510', nombre='Caja Menor', tipo='A', naturaleza='D', cuenta_padre=self.caja
+        )
+        self.ingresos = CuentaContable.objects.create(codigo='4', nombre='Ingresos', tipo='I', naturaleza='C')
+
+        self.user = User.objects.create_user(username='contador', password='test123')
+        self.user.groups.add(Group.objects.create(name='Contabilidad'))
+
+    def registrar_asiento(self, referencia, cuenta, monto):
+        asiento = TransaccionEncabezado.objects.create(
+            fecha=date(2025, 1, 10), referencia=referencia, descripcion='Prueba', moneda=self.moneda
+        )
+        MovimientoContable.objects.create(encabezado=asiento, cuenta=cuenta, tipo_movimiento='D', monto=monto)
+        MovimientoContable.objects.create(encabezado=asiento, cuenta=self.ingresos, tipo_movimiento='C', monto=monto)
+
+    def ancestros(self, cuenta):
+        return set(
+            JerarquiaCuenta.objects.filter(descendiente=cuenta).values_list('ancestro__codigo', 'profundidad')
+        )
+
+    def test_creacion_registra_todos_los_ancestros(self):
+        """Una cuenta nueva hereda la cadena completa de ancestros"""
+        self.assertEqual(
+            self.ancestros(self.caja_general),
+            {('110505', 0), ('1105', 1), ('11', 2), ('1', 3)},
+        )
+
+    def test_reasignar_padre_mueve_todo_el_subarbol(self):
+        """Al cambiar cuenta_padre, el subárbol completo cambia de ancestros"""
+        otra_rama = CuentaContable.objects.create(
+            codigo='12', nombre='Inversiones', tipo='A', naturaleza='D', cuenta_padre=self.activo
+        )
+        self.caja.cuenta_padre = otra_rama
+        self.caja.save()
+
+        self.assertEqual(
+            self.ancestros(self.caja_menor),
+            {('110510', 0), ('1105', 1), ('12', 2), ('1', 3)},
+        )
+        total_filas = JerarquiaCuenta.objects.count()
+        self.assertEqual(reconstruir_jerarquia(), total_filas)
+
+    def test_ciclo_es_rechazado(self):
+        """Una cuenta no puede colgar de una de sus subcuentas"""
+        self.disponible.cuenta_padre = self.caja_general
+        with self.assertRaises(ValidationError):
+            self.disponible.save()
+
+    def test_borrar_cuenta_convierte_hijas_en_raices(self):
+        """Las hijas de una cuenta borrada pierden los ancestros de esa cuenta"""
+        self.caja.delete()
+        self.assertEqual(self.ancestros(self.caja_general), {('110505', 0)})
+
+    def test_saldos_subarbol_en_una_consulta(self):
+        """El subárbol completo se consolida con una sola consulta"""
+        self.registrar_asiento('AS-1', self.caja_general, 100)
+        self.registrar_asiento('AS-2', self.caja_menor, 25)
+
+        with self.assertNumQueries(1):
+            nodos = {nodo['codigo']: nodo for nodo in saldos_subarbol(self.disponible, anio=2025)}
+
+        self.assertEqual(set(nodos), {'11', '1105', '110505', '110510'})
+        self.assertEqual(nodos['11']['total_debito'], 125)
+        self.assertEqual(nodos['1105']['nivel'], 1)
+        self.assertEqual(nodos['110510']['total_debito'], 25)
+
+    def test_api_saldos_consolidados(self):
+        """El endpoint de saldos respeta el límite de niveles"""
+        self.registrar_asiento('AS-1', self.caja_general, 80)
+        self.client.force_authenticate(user=self.user)
+
+        response = self.client.get(f'/api/cuentas/{self.activo.id}/saldos/', {'niveles': 1, 'anio': 2025})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([nodo['codigo'] for nodo in response.data], ['1', '11'])
+        self.assertEqual(response.data[0]['saldo'], 80)
@@ -0,0 +1,56 @@
+# Archivo: central/tests_maestros.py
+
+from django.test import TestCase, override_settings
+
+from central.maestros import cuenta_por_codigo, cuentas_por_codigo, moneda_principal, almacen_por_id
+from central.models import CuentaContable, Moneda
+from inventario.models import Almacen
+
+# ==============================================================================
+# PRUEBAS DEL CACHÉ DE DATOS MAESTROS
+# ==============================================================================
+
+class CacheMaestrosTests(TestCase):
+
+    def setUp(self):
+        self.moneda = Moneda.objects.create(codigo_iso='USD', nombre='Dólar', simbolo='$', es_principal=True)
+        self.caja = CuentaContable.objects.create(codigo='110505', nombre='Caja', tipo='A', naturaleza='D')
+        self.ventas = CuentaContable.objects.create(codigo='413505', nombre='Ventas', tipo='I', naturaleza='C')
+        self.almacen = Almacen.objects.create(nombre='Principal', codigo='PRI')
+
+    def test_segunda_lectura_no_consulta_la_base_de_datos(self):
+        """Después de la primera lectura los maestros se sirven desde memoria"""
+        moneda_principal()
+        cuentas_por_codigo('110505', '413505')
+        almacen_por_id(self.almacen.id)
+        with self.assertNumQueries(0):
+            self.assertEqual(moneda_principal(), self.moneda)
+            self.assertEqual(cuenta_por_codigo('110505'), self.caja)
+            self.assertEqual(cuentas_por_codigo('413505', '110505')['413505'], self.ventas)
+            self.assertEqual(almacen_por_id(self.almacen.id), self.almacen)
+
+    @override_settings(HERMES_MAESTROS_TTL=0)
+    def test_copia_local_vence_sin_invalidacion(self):
+        """Un cambio que no pasó por los Signals de este proceso se ve al vencer el TTL"""
+        self.assertEqual(cuenta_por_codigo('110505').nombre, 'Caja')
+        CuentaContable.objects.filter(pk=self.caja.pk).update(nombre='Caja General')
+        self.assertEqual(cuenta_por_codigo('110505').nombre, 'Caja General')
+
+    def test_guardar_invalida_el_cache(self):
+        """post_save sobre el maestro descarta la copia en memoria"""
+        self.assertEqual(cuenta_por_codigo('110505').nombre, 'Caja')
+        self.caja.nombre = 'Caja General'
+        self.caja.save()
+        self.assertEqual(cuenta_por_codigo('110505').nombre, 'Caja General')
+
+        self.moneda.es_principal = False
+        self.moneda.save()
+        with self.assertRaises(Moneda.DoesNotExist):
+            moneda_principal()
+
+    def test_cuentas_faltantes_no_se_cachean(self):
+        """Una cuenta inexistente lanza DoesNotExist y queda disponible al crearse"""
+        with self.assertRaises(CuentaContable.DoesNotExist):
+            cuentas_por_codigo('110505', '240805')
+        CuentaContable.objects.create(codigo='240805', nombre='IVA', tipo='P', naturaleza='C')
+        self.assertEqual(cuentas_por_codigo('110505', '240805')['240805'].nombre, 'IVA')
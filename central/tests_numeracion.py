@@ -0,0 +1,51 @@
+# Archivo: central/tests_numeracion.py
+
+from datetime import date
+
+from django.test import TestCase
+
+from central.models import CuentaContable, Moneda, SerieNumeracion
+from central.numeracion import reservar_numeros, siguiente_numero, usa_secuencias
+from central.serializers import TransaccionEncabezadoSerializer
+
+# ==============================================================================
+# PRUEBAS DE LAS SERIES DE NUMERACIÓN
+# ==============================================================================
+
+class SerieNumeracionTests(TestCase):
+
+    def test_serie_por_tipo_y_anio(self):
+        """Cada tipo de documento y año fiscal tiene su propio consecutivo y prefijo"""
+        self.assertEqual(siguiente_numero('facturas', date(2026, 3, 1)), 'FACT-2026-000001')
+        self.assertEqual(siguiente_numero('facturas', date(2026, 5, 1)), 'FACT-2026-000002')
+        self.assertEqual(siguiente_numero('facturas', date(2027, 1, 2)), 'FACT-2027-000001')
+        self.assertEqual(siguiente_numero('ordenes_compra', date(2026, 3, 1)), 'OC-2026-000001')
+        self.assertEqual(SerieNumeracion.objects.count(), 3)
+
+    def test_bloques_reservados_por_proceso(self):
+        """Los números de un bloque se entregan sin volver a la base de datos"""
+        SerieNumeracion.objects.create(tipo_documento='asientos', prefijo='AS-', anio=2026, tamano_bloque=10, digitos=4)
+        self.assertEqual(
+            reservar_numeros('asientos', 12, fecha=date(2026, 1, 1)),
+            [f"AS-2026-{n:04d}" for n in range(1, 13)]
+        )
+        if usa_secuencias():
+            # Quedan 8 números del segundo bloque: no hay consultas
+            with self.assertNumQueries(0):
+                numeros = reservar_numeros('asientos', 8, fecha=date(2026, 1, 1))
+            self.assertEqual(numeros[-1], 'AS-2026-0020')
+
+    def test_asiento_sin_referencia_toma_numero_de_serie(self):
+        """Un asiento manual sin referencia recibe el siguiente número de la serie 'asientos'"""
+        moneda = Moneda.objects.create(codigo_iso='USD', nombre='Dólar', simbolo='$', es_principal=True)
+        caja = CuentaContable.objects.create(codigo='110505', nombre='Caja', tipo='A', naturaleza='D')
+        ventas = CuentaContable.objects.create(codigo='413505', nombre='Ventas', tipo='I', naturaleza='C')
+        serializer = TransaccionEncabezadoSerializer(data={
+            'fecha': '2026-02-01', 'descripcion': 'Venta de contado', 'moneda': moneda.id,
+            'movimientos': [
+                {'cuenta': caja.id, 'tipo_movimiento': 'D', 'monto': '100.00'},
+                {'cuenta': ventas.id, 'tipo_movimiento': 'C', 'monto': '100.00'},
+            ],
+        })
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        self.assertEqual(serializer.save().referencia, 'AS-2026-000001')
@@ -0,0 +1,72 @@
+# Archivo: central/tests_paginacion.py
+
+from datetime import date, timedelta
+
+from django.contrib.auth.models import User, Group
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from central.models import Moneda, TransaccionEncabezado
+
+# ==============================================================================
+# PRUEBAS DE PAGINACIÓN POR KEYSET
+# ==============================================================================
+
+class PaginacionKeysetTests(APITestCase):
+
+    def setUp(self):
+        moneda = Moneda.objects.create(codigo_iso='USD', nombre='Dólar', simbolo='$', es_principal=True)
+        # Varias transacciones por fecha: el orden (-fecha, referencia) tiene empates en fecha
+        TransaccionEncabezado.objects.bulk_create([
+            TransaccionEncabezado(
+                fecha=date(2025, 1, 1) + timedelta(days=i % 4),
+                referencia=f"AS-{i:03d}",
+                descripcion='Prueba',
+                moneda=moneda,
+            )
+            for i in range(23)
+        ])
+        self.esperado = list(TransaccionEncabezado.objects.values_list('referencia', flat=True))
+
+        user = User.objects.create_user(username='contador', password='test123')
+        user.groups.add(Group.objects.create(name='Contabilidad'))
+        self.client.force_authenticate(user=user)
+
+    def test_recorre_todas_las_paginas_sin_saltos_ni_repetidos(self):
+        """Avanzar y retroceder por cursor devuelve exactamente el orden de Meta.ordering"""
+        url, paginas = '/api/transacciones/?page_size=5', []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotIn('count', response.data)
+            paginas.append([fila['referencia'] for fila in response.data['results']])
+            ultima_respuesta, url = response, response.data['next']
+
+        self.assertEqual([ref for pagina in paginas for ref in pagina], self.esperado)
+
+        # Retroceder desde la última página
+        url, hacia_atras = ultima_respuesta.data['previous'], []
+        while url:
+            response = self.client.get(url)
+            hacia_atras.insert(0, [fila['referencia'] for fila in response.data['results']])
+            url = response.data['previous']
+        self.assertEqual(hacia_atras, paginas[:-1])
+
+    def test_pagina_profunda_no_usa_count_ni_offset(self):
+        """Una página intermedia se resuelve con un filtro por keyset, sin COUNT ni OFFSET"""
+        siguiente = self.client.get('/api/transacciones/?page_size=10').data['next']
+        with CaptureQueriesContext(connection) as consultas:
+            response = self.client.get(siguiente)
+        self.assertEqual(len(response.data['results']), 10)
+        sql = ' '.join(consulta['sql'] for consulta in consultas.captured_queries).upper()
+        self.assertNotIn('COUNT(', sql)
+        self.assertNotIn('OFFSET', sql)
+
+    def test_paginacion_por_numero_sigue_disponible(self):
+        """Con ?page=N se obtiene la paginación clásica con el total"""
+        response = self.client.get('/api/transacciones/?page=2&page_size=10')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 23)
+        self.assertEqual([fila['referencia'] for fila in response.data['results']], self.esperado[10:20])
@@ -0,0 +1,99 @@
+# Archivo: central/tests_saldos.py
+
+from datetime import date
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from central.models import CuentaContable, Moneda, MovimientoContable, SaldoCuenta, TransaccionEncabezado
+from central.saldos import verificar_saldos
+from central.serializers import TransaccionEncabezadoSerializer
+
+# ==============================================================================
+# PRUEBAS DE SALDOS INCREMENTALES (SaldoCuenta)
+# ==============================================================================
+
+class SaldoCuentaTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.moneda = Moneda.objects.create(
+            codigo_iso='USD', nombre='Dólar Americano', simbolo='$', es_principal=True
+        )
+        cls.cuenta_caja = CuentaContable.objects.create(
+            codigo='110505', nombre='Caja General', tipo='A', naturaleza='D'
+        )
+        cls.cuenta_ingreso = CuentaContable.objects.create(
+            codigo='413505', nombre='Ventas de Mercancía', tipo='I', naturaleza='C'
+        )
+
+    def crear_asiento(self, referencia, monto, fecha=date(2025, 3, 15)):
+        serializer = TransaccionEncabezadoSerializer(data={
+            'fecha': fecha.isoformat(),
+            'referencia': referencia,
+            'descripcion': 'Asiento de prueba',
+            'moneda': self.moneda.id,
+            'movimientos': [
+                {'cuenta': self.cuenta_caja.id, 'tipo_movimiento': 'D', 'monto': str(monto)},
+                {'cuenta': self.cuenta_ingreso.id, 'tipo_movimiento': 'C', 'monto': str(monto)},
+            ]
+        })
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        return serializer.save()
+
+    def test_creacion_de_asientos_acumula_saldos(self):
+        """Varios asientos del mismo período se acumulan en una sola fila por cuenta"""
+        self.crear_asiento('AS-001', 100)
+        self.crear_asiento('AS-002', 50.25)
+
+        saldo_caja = SaldoCuenta.objects.get(cuenta=self.cuenta_caja, anio=2025, mes=3)
+        self.assertEqual(saldo_caja.total_debito, 150.25)
+        self.assertEqual(saldo_caja.total_credito, 0)
+        self.assertEqual(saldo_caja.cantidad_movimientos, 2)
+
+        saldo_ingreso = SaldoCuenta.objects.get(cuenta=self.cuenta_ingreso, anio=2025, mes=3)
+        self.assertEqual(saldo_ingreso.total_credito, 150.25)
+        self.assertEqual(verificar_saldos(), [])
+
+    def test_borrado_de_asiento_descuenta_saldos(self):
+        """Borrar un asiento (con sus movimientos en cascada) descuenta los saldos"""
+        self.crear_asiento('AS-001', 100)
+        asiento = self.crear_asiento('AS-002', 40)
+        asiento.delete()
+
+        saldo_caja = SaldoCuenta.objects.get(cuenta=self.cuenta_caja, anio=2025, mes=3)
+        self.assertEqual(saldo_caja.total_debito, 100)
+        self.assertEqual(saldo_caja.cantidad_movimientos, 1)
+        self.assertEqual(verificar_saldos(), [])
+
+    def test_cambio_de_fecha_mueve_el_saldo_de_periodo(self):
+        """Si el asiento cambia de mes, su saldo se mueve al nuevo período"""
+        asiento = self.crear_asiento('AS-001', 100)
+        asiento.fecha = date(2025, 4, 1)
+        asiento.save()
+
+        self.assertEqual(
+            SaldoCuenta.objects.get(cuenta=self.cuenta_caja, anio=2025, mes=3).total_debito, 0
+        )
+        self.assertEqual(
+            SaldoCuenta.objects.get(cuenta=self.cuenta_caja, anio=2025, mes=4).total_debito, 100
+        )
+        self.assertEqual(verificar_saldos(), [])
+
+    def test_verificar_detecta_desvio_y_reconstruir_lo_corrige(self):
+        """Un UPDATE directo (sin señales) se detecta y se corrige con el comando"""
+        asiento = self.crear_asiento('AS-001', 100)
+        MovimientoContable.objects.filter(encabezado=asiento, tipo_movimiento='D').update(monto=90)
+        MovimientoContable.objects.filter(encabezado=asiento, tipo_movimiento='C').update(monto=90)
+
+        self.assertEqual(len(verificar_saldos()), 2)
+        with self.assertRaises(CommandError):
+            call_command('verificar_saldos', stdout=StringIO())
+
+        call_command('reconstruir_saldos', stdout=StringIO())
+        self.assertEqual(verificar_saldos(), [])
+        self.assertEqual(
+            SaldoCuenta.objects.get(cuenta=self.cuenta_caja, anio=2025, mes=3).total_debito, 90
+        )
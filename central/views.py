@@ -1,8 +1,17 @@
 # Archivo: central/views.py (Reemplazar la sección de 'permission_classes')
 
-from rest_framework import viewsets
-from .models import Producto, EntidadComercial, Moneda, TransaccionEncabezado
-from .serializers import ProductoSerializer, EntidadComercialSerializer, MonedaSerializer, TransaccionEncabezadoSerializer
+import io
+from rest_framework import viewsets, status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+from .models import Producto, EntidadComercial, Moneda, TransaccionEncabezado, CuentaContable
+from .serializers import (ProductoSerializer, EntidadComercialSerializer, MonedaSerializer,
+    TransaccionEncabezadoSerializer, CuentaContableSerializer,
+)
+from .jerarquia import saldos_subarbol
+from .importacion import LECTORES, importar_asientos
+from .bandeja import metricas_bandeja
+from .consultas import ConsultaOptimizadaMixin
 from central.permissions import IsContabilidadUser, IsInventarioUser # <-- NUEVA IMPORTACIÓN
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from django.http import HttpResponse
@@ -15,7 +24,7 @@ def home(request):
 
 # 1. ProductoViewSet (Maestro de Inventario)
 
-class ProductoViewSet(viewsets.ModelViewSet):
+class ProductoViewSet(ConsultaOptimizadaMixin, viewsets.ModelViewSet):
     queryset = Producto.objects.all()
     serializer_class = ProductoSerializer
     
@@ -28,22 +37,86 @@ class ProductoViewSet(viewsets.ModelViewSet):
         return [permission() for permission in permission_classes] 
 
 # 2. EntidadComercialViewSet (Maestro de Clientes/Proveedores)
-class EntidadComercialViewSet(viewsets.ModelViewSet):
+class EntidadComercialViewSet(ConsultaOptimizadaMixin, viewsets.ModelViewSet):
     queryset = EntidadComercial.objects.all()
     serializer_class = EntidadComercialSerializer
     # Usaremos el mismo permiso, ya que la gestión de clientes suele ser compartida.
     permission_classes = [IsInventarioUser] 
 
 # 3. MonedaViewSet (Maestro Crítico)
-class MonedaViewSet(viewsets.ModelViewSet):
+class MonedaViewSet(ConsultaOptimizadaMixin, viewsets.ModelViewSet):
     queryset = Moneda.objects.all()
     serializer_class = MonedaSerializer
     # Solo el Superusuario o el Admin (el staff) debería poder cambiar la moneda principal.
     permission_classes = [IsAdminUser] 
 
 # 4. TransaccionEncabezadoViewSet (Motor Contable Crítico)
-class TransaccionEncabezadoViewSet(viewsets.ModelViewSet):
+class TransaccionEncabezadoViewSet(ConsultaOptimizadaMixin, viewsets.ModelViewSet):
     queryset = TransaccionEncabezado.objects.all()
     serializer_class = TransaccionEncabezadoSerializer
     # Solo los usuarios del grupo 'Contabilidad' pueden crear asientos.
-    permission_classes = [IsContabilidadUser]
\ No newline at end of file
+    permission_classes = [IsContabilidadUser]
+
+    @action(detail=False, methods=['post'])
+    def importar(self, request):
+        """
+        Importación masiva de asientos. Recibe un archivo 'archivo' (multipart) en formato
+        NDJSON o CSV y retorna un reporte con los errores de cada asiento rechazado.
+        Parámetros opcionales: formato (ndjson/csv), lote (asientos por transacción).
+        """
+        archivo = request.FILES.get('archivo')
+        if archivo is None:
+            return Response({'error': "Debe enviar el archivo en el campo 'archivo'"}, status=status.HTTP_400_BAD_REQUEST)
+
+        formato = request.query_params.get('formato') or (
+            'csv' if archivo.name.lower().endswith('.csv') else 'ndjson'
+        )
+        if formato not in LECTORES:
+            return Response({'error': f"Formato no soportado: {formato}"}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            tamano_lote = int(request.query_params.get('lote', 500))
+        except ValueError:
+            return Response({'error': 'El parámetro lote debe ser entero'}, status=status.HTTP_400_BAD_REQUEST)
+
+        lineas = io.TextIOWrapper(archivo.file, encoding='utf-8', newline='')
+        reporte = importar_asientos(lineas, formato=formato, tamano_lote=max(tamano_lote, 1))
+        return Response(reporte)
+
+    @action(detail=False, methods=['get'])
+    def bandeja(self, request):
+        """
+        Estado de la contabilización diferida: filas pendientes, fallidas (dead letter)
+        y retraso en segundos de la más antigua, en total y por tipo de documento.
+        """
+        return Response(metricas_bandeja())
+
+# 5. CuentaContableViewSet (Plan de Cuentas y saldos consolidados)
+class CuentaContableViewSet(ConsultaOptimizadaMixin, viewsets.ModelViewSet):
+    queryset = CuentaContable.objects.all()
+    serializer_class = CuentaContableSerializer
+    permission_classes = [IsContabilidadUser]
+
+    @action(detail=True, methods=['get'])
+    def saldos(self, request, pk=None):
+        """
+        Totales consolidados del subárbol de la cuenta (una sola consulta).
+        Parámetros opcionales: anio, mes_desde, mes_hasta, moneda, niveles.
+        """
+        cuenta = self.get_object()
+        try:
+            filtros = {
+                nombre: int(request.query_params[nombre])
+                for nombre in ('anio', 'mes_desde', 'mes_hasta', 'moneda', 'niveles')
+                if request.query_params.get(nombre)
+            }
+        except ValueError:
+            return Response(
+                {'error': 'Los parámetros anio, mes_desde, mes_hasta, moneda y niveles deben ser enteros'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        nodos = [
+            dict(nodo, saldo=nodo['total_debito'] - nodo['total_credito'])
+            for nodo in saldos_subarbol(cuenta, **filtros)
+        ]
+        return Response(nodos)
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 16:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('central', '0004_indice_keyset_transacciones'),
+        ('compras', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='ordencompra',
+            index=models.Index(fields=['-fecha_emision', 'numero_orden'], name='compras_oc_fecha_numero_idx'),
+        ),
+    ]
@@ -81,6 +81,10 @@ class OrdenCompra(models.Model):
         verbose_name = _("Orden de Compra")
         verbose_name_plural = _("Órdenes de Compra")
         ordering = ['-fecha_emision', 'numero_orden']
+        # Índice compuesto con el mismo orden: respalda la paginación por keyset
+        indexes = [
+            models.Index(fields=['-fecha_emision', 'numero_orden'], name='compras_oc_fecha_numero_idx'),
+        ]
 
 
 class OrdenCompraDetalle(models.Model):
@@ -5,6 +5,7 @@ from django.db import transaction
 from .models import OrdenCompra, OrdenCompraDetalle, RecepcionCompra
 from central.models import CuentaContable, TransaccionEncabezado, MovimientoContable
 from inventario.models import MovimientoInventario, Almacen
+from central.numeracion import siguiente_numero
 
 class OrdenCompraDetalleSerializer(serializers.ModelSerializer):
     producto_nombre = serializers.CharField(source='producto.nombre', read_only=True)
@@ -29,9 +30,13 @@ class OrdenCompraSerializer(serializers.ModelSerializer):
             'impuesto', 'total', 'estado', 'detalles'
         ]
         read_only_fields = ['subtotal', 'impuesto', 'total']
+        # Si no se envía, el número se toma de la serie 'ordenes_compra' (central/numeracion.py)
+        extra_kwargs = {'numero_orden': {'required': False}}
     
     def create(self, validated_data):
         detalles_data = validated_data.pop('detalles')
+        if not validated_data.get('numero_orden'):
+            validated_data['numero_orden'] = siguiente_numero('ordenes_compra', validated_data['fecha_emision'])
         
         with transaction.atomic():
             # Crear orden de compra
@@ -5,9 +5,10 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from .models import OrdenCompra, RecepcionCompra
 from .serializers import OrdenCompraSerializer, RecepcionCompraSerializer
+from central.consultas import ConsultaOptimizadaMixin
 from central.permissions import IsInventarioUser
 
-class OrdenCompraViewSet(viewsets.ModelViewSet):
+class OrdenCompraViewSet(ConsultaOptimizadaMixin, viewsets.ModelViewSet):
     queryset = OrdenCompra.objects.all()
     serializer_class = OrdenCompraSerializer
     permission_classes = [IsInventarioUser]  # Inventario gestiona compras
@@ -36,7 +37,7 @@ class OrdenCompraViewSet(viewsets.ModelViewSet):
             status=status.HTTP_400_BAD_REQUEST
         )
 
-class RecepcionCompraViewSet(viewsets.ModelViewSet):
+class RecepcionCompraViewSet(ConsultaOptimizadaMixin, viewsets.ModelViewSet):
     queryset = RecepcionCompra.objects.all()
     serializer_class = RecepcionCompraSerializer
     permission_classes = [IsInventarioUser]
\ No newline at end of file
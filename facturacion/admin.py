@@ -10,10 +10,10 @@ class FacturaDetalleInline(admin.TabularInline):
 
 @admin.register(FacturaEncabezado)
 class FacturaEncabezadoAdmin(admin.ModelAdmin):
-    list_display = ('numero_factura', 'fecha_emision', 'cliente', 'total', 'estado')
+    list_display = ('numero_factura', 'fecha_emision', 'cliente', 'total', 'saldo_pendiente', 'estado')
     list_filter = ('estado', 'fecha_emision')
     search_fields = ('numero_factura', 'cliente__nombre_comercial')
-    readonly_fields = ('subtotal', 'impuesto', 'total')
+    readonly_fields = ('subtotal', 'impuesto', 'total', 'saldo_pendiente', 'fecha_anulacion', 'asiento_anulacion')
     inlines = [FacturaDetalleInline]
 
 @admin.register(Pago)
@@ -0,0 +1,134 @@
+# Archivo: facturacion/anulacion.py
+
+from django.db import transaction
+from django.utils import timezone
+
+from central.bandeja import contabilizar_o_encolar
+from inventario.existencias import crear_movimientos
+from inventario.models import MovimientoInventario
+from .contabilizacion import PREFIJO_ANULACION, anulaciones_pendientes
+from .models import FacturaEncabezado
+
+
+class AnuladorLote:
+    """
+    Anula muchas facturas con sus reversos en bloque. Por cada lote de
+    'tamano_lote' facturas, en una sola transacción:
+
+    - bloquea las facturas (SELECT ... FOR UPDATE) y descarta las que no se pueden
+      anular: inexistentes, no emitidas o con pagos registrados;
+    - pasa todas las válidas a 'A' con un único UPDATE;
+    - crea con crear_movimientos una entrada 'E' por cada salida de inventario de
+      las facturas (mismo producto, almacén, cantidad y costo total), de modo que Stock se
+      ajusta con un upsert por producto/almacén y no por línea;
+    - contabiliza por lotes el reverso del asiento de cada factura y el reverso del
+      costo de venta de cada entrada (o los encola en modo diferido).
+
+    Como en la facturación en lote, un error contable no impide la anulación: el
+    reverso queda pendiente y se reporta como advertencia.
+    """
+
+    def __init__(self, tamano_lote=500, fecha=None):
+        self.tamano_lote = tamano_lote
+        self.fecha = fecha or timezone.localdate()
+        self.procesadas = 0
+        self.anuladas = []
+        self.errores = []
+        self.advertencias = []
+
+    def anular(self, facturas):
+        """'facturas' es una lista de ids; los repetidos se procesan una vez."""
+        ids = list(dict.fromkeys(facturas))
+        self.procesadas = len(ids)
+        for inicio in range(0, len(ids), self.tamano_lote):
+            with transaction.atomic():
+                self.anular_lote(ids[inicio:inicio + self.tamano_lote])
+        return self.reporte()
+
+    def reporte(self):
+        return {
+            'procesadas': self.procesadas,
+            'anuladas': len(self.anuladas),
+            'con_errores': len(self.errores),
+            'facturas': self.anuladas,
+            'errores': self.errores,
+            'advertencias': self.advertencias,
+        }
+
+    def registrar_error(self, factura_id, numero_factura, error):
+        self.errores.append({'id': factura_id, 'numero_factura': numero_factura, 'error': error})
+
+    # --- Validación ---
+
+    def validar(self, ids):
+        """Bloquea las facturas del lote (en orden de id) y retorna {id: numero_factura} de las anulables."""
+        encontradas = {
+            factura_id: (numero, estado, saldo_pendiente, total)
+            for factura_id, numero, estado, saldo_pendiente, total in
+            FacturaEncabezado.objects.select_for_update().filter(pk__in=ids).order_by('pk')
+            .values_list('id', 'numero_factura', 'estado', 'saldo_pendiente', 'total')
+        }
+        validas = {}
+        for factura_id in ids:
+            if factura_id not in encontradas:
+                self.registrar_error(factura_id, None, "La factura no existe.")
+                continue
+            numero, estado, saldo_pendiente, total = encontradas[factura_id]
+            if estado != 'E':
+                self.registrar_error(factura_id, numero, "Solo se pueden anular facturas emitidas.")
+            elif saldo_pendiente < total:
+                self.registrar_error(factura_id, numero, "La factura tiene pagos registrados.")
+            else:
+                validas[factura_id] = numero
+        return validas
+
+    # --- Escritura ---
+
+    def anular_lote(self, ids):
+        validas = self.validar(ids)
+        if not validas:
+            return
+        FacturaEncabezado.objects.filter(pk__in=validas).update(estado='A', fecha_anulacion=self.fecha)
+
+        # Entradas que devuelven al inventario cada salida de las facturas anuladas
+        numeros = {f"FACT-{numero}": numero for numero in validas.values()}
+        salidas = MovimientoInventario.objects.filter(
+            tipo_movimiento='S', referencia_doc__in=numeros
+        ).order_by('id').values_list(
+            'referencia_doc', 'producto_id', 'almacen_id', 'cantidad', 'costo_unitario', 'costo_total'
+        )
+        # El costo total de la salida viaja tal cual: recalcularlo con el costo unitario
+        # redondeado descuadraría el reverso del costo de venta
+        entradas = [
+            {
+                'tipo_movimiento': 'E',
+                'producto': producto_id,
+                'almacen': almacen_id,
+                'cantidad': cantidad,
+                'costo_unitario': costo_unitario,
+                'costo_total': costo_total,
+                'referencia_doc': f"{PREFIJO_ANULACION}{numeros[referencia_doc]}",
+            }
+            for referencia_doc, producto_id, almacen_id, cantidad, costo_unitario, costo_total in salidas
+        ]
+        if entradas:
+            movimientos = crear_movimientos(entradas, contabilizar=False)
+            self.contabilizar('anulaciones_inventario', movimientos, {
+                movimiento.pk: movimiento.referencia_doc for movimiento in movimientos
+            })
+
+        facturas = list(anulaciones_pendientes().filter(pk__in=validas))
+        self.contabilizar('anulaciones_factura', facturas, validas)
+        self.anuladas.extend({'id': factura_id, 'numero_factura': numero} for factura_id, numero in validas.items())
+
+    def contabilizar(self, nombre, documentos, etiquetas):
+        resultado = contabilizar_o_encolar(nombre, documentos, omitir_errores=True)
+        if resultado is not None:
+            self.advertencias.extend(
+                {'documento': etiquetas[error['documento']], 'error': error['error']} for error in resultado['errores']
+            )
+
+
+def anular_facturas(facturas, tamano_lote=500, fecha=None):
+    """Anula facturas (lista de ids) con sus reversos en bloque y retorna el reporte (ver AnuladorLote)."""
+    return AnuladorLote(tamano_lote=tamano_lote, fecha=fecha).anular(facturas)
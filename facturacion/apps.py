@@ -6,4 +6,10 @@ from django.utils.translation import gettext_lazy as _
 class FacturacionConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'facturacion'
-    verbose_name = _("Módulo de Facturación")
\ No newline at end of file
+    verbose_name = _("Módulo de Facturación")
+
+    def ready(self):
+        # Registra el asiento de facturación en el motor de contabilización
+        import facturacion.contabilizacion
+        # Mantiene el saldo pendiente de las facturas al registrar o borrar pagos
+        import facturacion.signals
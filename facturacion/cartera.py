@@ -0,0 +1,105 @@
+# Archivo: facturacion/cartera.py
+
+from collections import defaultdict
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db.models import Case, CharField, DecimalField, F, Q, Sum, Value, When
+
+from .models import FacturaEncabezado
+
+# Tramos de antigüedad por días vencidos: (nombre, desde, hasta); None = sin límite
+TRAMOS_ANTIGUEDAD = [
+    ('por_vencer', None, -1),
+    ('dias_0_30', 0, 30),
+    ('dias_31_60', 31, 60),
+    ('dias_61_90', 61, 90),
+    ('mas_de_90', 91, None),
+]
+
+
+def aplicar_pagos(pagos):
+    """
+    Descuenta pagos [(factura_id, monto)] del saldo pendiente con un solo UPDATE:
+
+        saldo_pendiente = saldo_pendiente - monto
+
+    La resta la hace la base de datos sobre la fila bloqueada (dos pagos simultáneos
+    de la misma factura no se pisan). En la misma sentencia, una factura emitida
+    cuyo saldo llega a cero pasa a 'P' y una pagada que vuelve a deber (pago borrado,
+    monto negativo) regresa a 'E'. Retorna el número de facturas actualizadas.
+    """
+    acumulado = defaultdict(Decimal)
+    for factura_id, monto in pagos:
+        acumulado[factura_id] += Decimal(str(monto))
+    acumulado = {factura_id: monto for factura_id, monto in acumulado.items() if monto}
+    if not acumulado:
+        return 0
+
+    monto = Case(
+        *[When(pk=factura_id, then=Value(monto)) for factura_id, monto in acumulado.items()],
+        output_field=DecimalField(max_digits=12, decimal_places=2),
+    )
+    # Las condiciones comparan con el saldo anterior: saldo - monto <= 0 equivale a saldo <= monto
+    return FacturaEncabezado.objects.filter(pk__in=acumulado).update(
+        saldo_pendiente=F('saldo_pendiente') - monto,
+        estado=Case(
+            When(Q(estado='E') & Q(saldo_pendiente__lte=monto), then=Value('P')),
+            When(Q(estado='P') & Q(saldo_pendiente__gt=monto), then=Value('E')),
+            default=F('estado'),
+            output_field=CharField(),
+        ),
+    )
+
+
+def cartera_abierta():
+    """Facturas emitidas con saldo: el mismo filtro que el índice parcial fact_cartera_abierta_idx."""
+    return FacturaEncabezado.objects.filter(estado='E', saldo_pendiente__gt=0)
+
+
+def antiguedad_cartera(fecha_corte, cliente=None):
+    """
+    Cuentas por cobrar a 'fecha_corte' por tramos de días vencidos (según
+    fecha_vencimiento), en total y por cliente. Una sola consulta agrupada sobre la
+    cartera abierta: los tramos se convierten en rangos de fecha_vencimiento.
+    """
+    facturas = cartera_abierta()
+    if cliente is not None:
+        facturas = facturas.filter(cliente_id=cliente)
+
+    tramos = {}
+    for nombre, desde, hasta in TRAMOS_ANTIGUEDAD:
+        # Más días vencidos = vencimiento más antiguo: los límites se invierten
+        condicion = Q()
+        if desde is not None:
+            condicion &= Q(fecha_vencimiento__lte=fecha_corte - timedelta(days=desde))
+        if hasta is not None:
+            condicion &= Q(fecha_vencimiento__gte=fecha_corte - timedelta(days=hasta))
+        tramos[nombre] = Sum('saldo_pendiente', filter=condicion, default=Decimal('0'))
+
+    clientes = list(
+        facturas.order_by()
+        .values('cliente_id', 'cliente__nombre_comercial')
+        .annotate(saldo_total=Sum('saldo_pendiente'), **tramos)
+        .order_by('-saldo_total')
+    )
+    # 'total' es un campo del modelo: la anotación se llama saldo_total
+    for fila in clientes:
+        fila['total'] = fila.pop('saldo_total')
+    totales = {nombre: Decimal('0') for nombre, _, _ in TRAMOS_ANTIGUEDAD}
+    totales['total'] = Decimal('0')
+    for fila in clientes:
+        for nombre in totales:
+            totales[nombre] += fila[nombre]
+    return {
+        'fecha_corte': fecha_corte,
+        'totales': totales,
+        'clientes': [
+            {
+                'cliente': fila['cliente_id'],
+                'cliente_nombre': fila['cliente__nombre_comercial'],
+                **{nombre: fila[nombre] for nombre in totales},
+            }
+            for fila in clientes
+        ],
+    }
@@ -0,0 +1,127 @@
+# Archivo: facturacion/contabilizacion.py
+
+from decimal import Decimal
+
+from central.contabilizacion import ErrorContabilizacion, registrar_contabilizador
+from central.maestros import cuentas_por_codigo, moneda_principal
+from central.models import CuentaContable, Moneda
+from inventario.contabilizacion import CUENTA_COSTO_VENTA, CUENTA_INVENTARIO
+from inventario.models import MovimientoInventario
+from .models import FacturaEncabezado
+
+# Cuentas del asiento de facturación (ajustar códigos según el plan contable)
+CUENTA_INGRESOS = '413505'  # Ventas
+CUENTA_IVA = '240805'       # IVA por cobrar
+CUENTA_CLIENTES = '130505'  # Clientes
+
+# Referencia de los asientos y entradas de inventario que revierten una factura anulada
+PREFIJO_ANULACION = 'ANUL-'
+INVERSO = {'D': 'C', 'C': 'D'}
+
+
+def asiento_factura(factura):
+    """Débito a Clientes por el total; crédito a Ingresos (subtotal) e IVA (impuesto)."""
+    try:
+        cuentas = cuentas_por_codigo(CUENTA_INGRESOS, CUENTA_IVA, CUENTA_CLIENTES)
+    except CuentaContable.DoesNotExist as e:
+        raise ErrorContabilizacion(f"Cuenta contable no encontrada: {e}")
+
+    return {
+        'fecha': factura.fecha_emision,
+        'referencia': f"FACT-{factura.numero_factura}",
+        'descripcion': f"Facturación a {factura.cliente.nombre_comercial}",
+        'entidad_id': factura.cliente_id,
+        'moneda_id': factura.moneda_id,
+        'movimientos': [
+            (cuentas[CUENTA_CLIENTES].id, 'D', factura.total),
+            (cuentas[CUENTA_INGRESOS].id, 'C', factura.subtotal),
+            (cuentas[CUENTA_IVA].id, 'C', factura.impuesto),
+        ],
+    }
+
+
+def facturas_pendientes():
+    return (
+        FacturaEncabezado.objects
+        .filter(asiento_contable__isnull=True)
+        .exclude(estado='A')
+        .select_related('cliente')
+    )
+
+
+registrar_contabilizador('facturas', FacturaEncabezado, asiento_factura, 'asiento_contable', facturas_pendientes)
+
+
+def asiento_anulacion_factura(factura):
+    """
+    Reverso del asiento de la factura: los mismos movimientos con débito y crédito
+    intercambiados, a la fecha de anulación. Una factura anulada antes de
+    contabilizarse no tiene nada que revertir (y ya no se contabilizará).
+    """
+    if factura.asiento_contable_id is None:
+        return None
+    original = factura.asiento_contable
+    return {
+        'fecha': factura.fecha_anulacion or original.fecha,
+        'referencia': f"{PREFIJO_ANULACION}{original.referencia}"[:50],
+        'descripcion': f"Anulación de la factura {factura.numero_factura}",
+        'entidad_id': original.entidad_id,
+        'moneda_id': original.moneda_id,
+        'tasa_cambio': original.tasa_cambio,
+        'movimientos': [
+            (movimiento.cuenta_id, INVERSO[movimiento.tipo_movimiento], movimiento.monto)
+            for movimiento in original.movimientos.all()
+        ],
+    }
+
+
+def anulaciones_pendientes():
+    # Los movimientos del asiento original se precargan: el lote no consulta por factura
+    return (
+        FacturaEncabezado.objects
+        .filter(estado='A', asiento_contable__isnull=False, asiento_anulacion__isnull=True)
+        .select_related('asiento_contable')
+        .prefetch_related('asiento_contable__movimientos')
+    )
+
+
+registrar_contabilizador(
+    'anulaciones_factura', FacturaEncabezado, asiento_anulacion_factura, 'asiento_anulacion', anulaciones_pendientes
+)
+
+
+def asiento_reverso_costo_venta(movimiento):
+    """Entrada que devuelve al inventario una salida facturada: débito a Inventario, crédito a Costo de Venta."""
+    if movimiento.tipo_movimiento != 'E' or not movimiento.costo_total:
+        return None
+    try:
+        cuentas = cuentas_por_codigo(CUENTA_COSTO_VENTA, CUENTA_INVENTARIO)
+        moneda_base = moneda_principal()
+    except CuentaContable.DoesNotExist as e:
+        raise ErrorContabilizacion(f"Cuenta contable no encontrada: {e}")
+    except Moneda.DoesNotExist:
+        raise ErrorContabilizacion("No hay una moneda marcada como principal (es_principal=True).")
+    costo_total = movimiento.costo_total.quantize(Decimal('0.01'))
+    return {
+        'fecha': movimiento.fecha,
+        'referencia': f"Reverso-Costo-{movimiento.referencia_doc}-{movimiento.id}"[:50],
+        'descripcion': f"Reverso del costo de venta por {movimiento.referencia_doc}",
+        'entidad_id': None,
+        'moneda_id': moneda_base.id,
+        'movimientos': [
+            (cuentas[CUENTA_INVENTARIO].id, 'D', costo_total),
+            (cuentas[CUENTA_COSTO_VENTA].id, 'C', costo_total),
+        ],
+    }
+
+
+def reversos_costo_pendientes():
+    return MovimientoInventario.objects.filter(
+        tipo_movimiento='E', referencia_doc__startswith=PREFIJO_ANULACION, asiento_contable_nucleo__isnull=True
+    )
+
+
+registrar_contabilizador(
+    'anulaciones_inventario', MovimientoInventario, asiento_reverso_costo_venta,
+    'asiento_contable_nucleo', reversos_costo_pendientes
+)
@@ -0,0 +1,231 @@
+# Archivo: facturacion/documentos.py
+
+import hashlib
+import json
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connections
+from django.db.models import Prefetch
+from django.template.loader import render_to_string
+
+from .models import FacturaDetalle, FacturaEncabezado
+
+FORMATOS_DOCUMENTO = {'html': 'text/html; charset=utf-8', 'pdf': 'application/pdf'}
+
+# Cambiar al modificar la plantilla o el diseño del PDF: invalida todo el caché de documentos
+VERSION_DOCUMENTOS = '1'
+
+
+def directorio_documentos():
+    """Almacén de documentos generados (settings.HERMES_DOCUMENTOS_DIR)."""
+    return Path(getattr(settings, 'HERMES_DOCUMENTOS_DIR', Path(settings.BASE_DIR) / 'documentos_facturas'))
+
+
+# ------------------------------------------------------------------------------
+# CONTENIDO Y HUELLA
+# ------------------------------------------------------------------------------
+
+def facturas_para_documento(facturas=None):
+    """
+    Agrega al queryset todo lo que se imprime: un número fijo de consultas por lote.
+    Los prefetch que ya traiga (ej. los de ConsultaOptimizadaMixin) se descartan:
+    dos Prefetch('detalles') con distinto queryset no se pueden combinar.
+    """
+    facturas = FacturaEncabezado.objects.all() if facturas is None else facturas
+    return facturas.select_related('cliente', 'moneda').prefetch_related(None).prefetch_related(
+        Prefetch('detalles', queryset=FacturaDetalle.objects.select_related('producto').order_by('id'))
+    )
+
+
+def contenido_factura(factura):
+    """Todo lo que aparece en el documento, como texto: es la entrada del render y de la huella."""
+    return {
+        'numero_factura': factura.numero_factura,
+        'fecha_emision': factura.fecha_emision.isoformat(),
+        'fecha_vencimiento': factura.fecha_vencimiento.isoformat(),
+        'estado': factura.estado,
+        'cliente': {
+            'nombre': factura.cliente.nombre_comercial,
+            'identificacion': factura.cliente.identificacion_fiscal,
+            'direccion': factura.cliente.direccion_principal or '',
+        },
+        'moneda': factura.moneda.codigo_iso,
+        'detalles': [
+            {
+                'sku': detalle.producto.codigo_sku,
+                'descripcion': detalle.producto.nombre,
+                'cantidad': str(detalle.cantidad),
+                'precio_unitario': str(detalle.precio_unitario),
+                'subtotal': str(detalle.subtotal),
+            }
+            for detalle in factura.detalles.all()
+        ],
+        'subtotal': str(factura.subtotal),
+        'impuesto': str(factura.impuesto),
+        'total': str(factura.total),
+    }
+
+
+def huella_documento(contenido, formato):
+    """SHA-256 del contenido canónico: dos facturas que se imprimen igual comparten documento."""
+    canonico = json.dumps([VERSION_DOCUMENTOS, formato, contenido], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(canonico.encode('utf-8')).hexdigest()
+
+
+def ruta_documento(huella, formato):
+    return directorio_documentos() / huella[:2] / f"{huella}.{formato}"
+
+
+# ------------------------------------------------------------------------------
+# RENDER (funciones puras: corren igual en este proceso o en el pool)
+# ------------------------------------------------------------------------------
+
+def _texto_pdf(texto):
+    return texto.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+def pdf_de_lineas(lineas, lineas_por_pagina=60):
+    """
+    PDF 1.4 mínimo (texto Courier en A4), sin dependencias externas. Suficiente
+    para imprimir y adjuntar facturas; el texto usa WinAnsiEncoding (cp1252).
+    """
+    paginas = [lineas[i:i + lineas_por_pagina] for i in range(0, len(lineas), lineas_por_pagina)] or [[]]
+    objetos = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # Pages: se completa al conocer las páginas
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Courier /Encoding /WinAnsiEncoding >>",
+    ]
+    hijos = []
+    for pagina in paginas:
+        flujo = "BT /F1 9 Tf 12 TL 40 800 Td " + " ".join(f"({_texto_pdf(linea)}) '" for linea in pagina) + " ET"
+        flujo = flujo.encode('cp1252', errors='replace')
+        objetos.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(flujo), flujo))
+        objetos.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % (len(objetos))
+        )
+        hijos.append(len(objetos))
+    objetos[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(b"%d 0 R" % hijo for hijo in hijos), len(hijos)
+    )
+
+    salida = bytearray(b"%PDF-1.4\n")
+    posiciones = []
+    for numero, objeto in enumerate(objetos, start=1):
+        posiciones.append(len(salida))
+        salida += b"%d 0 obj\n%s\nendobj\n" % (numero, objeto)
+    inicio_xref = len(salida)
+    salida += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objetos) + 1)
+    salida += b"".join(b"%010d 00000 n \n" % posicion for posicion in posiciones)
+    salida += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objetos) + 1, inicio_xref)
+    return bytes(salida)
+
+
+def _lineas_factura(contenido):
+    cliente = contenido['cliente']
+    lineas = [
+        f"FACTURA {contenido['numero_factura']}" + ("   *** ANULADA ***" if contenido['estado'] == 'A' else ''),
+        '',
+        f"Emision: {contenido['fecha_emision']}   Vencimiento: {contenido['fecha_vencimiento']}",
+        f"Cliente: {cliente['nombre']} ({cliente['identificacion']})",
+    ]
+    if cliente['direccion']:
+        lineas.append(f"Direccion: {cliente['direccion']}")
+    lineas += [f"Moneda: {contenido['moneda']}", '', f"{'SKU':<14}{'Descripcion':<34}{'Cant.':>10}{'Precio':>12}{'Subtotal':>14}"]
+    lineas.append('-' * 84)
+    for linea in contenido['detalles']:
+        lineas.append(
+            f"{linea['sku'][:13]:<14}{linea['descripcion'][:33]:<34}{linea['cantidad']:>10}"
+            f"{linea['precio_unitario']:>12}{linea['subtotal']:>14}"
+        )
+    lineas.append('-' * 84)
+    for etiqueta in ('subtotal', 'impuesto', 'total'):
+        lineas.append(f"{etiqueta.capitalize():>70}{contenido[etiqueta]:>14}")
+    return lineas
+
+
+def renderizar(contenido, formato):
+    """Bytes del documento en 'formato' ('html' o 'pdf')."""
+    if formato == 'html':
+        return render_to_string('facturacion/factura.html', contenido).encode('utf-8')
+    if formato == 'pdf':
+        return pdf_de_lineas(_lineas_factura(contenido))
+    raise ValueError(f"Formato no soportado: '{formato}'. Use: {', '.join(FORMATOS_DOCUMENTO)}.")
+
+
+def _renderizar_tarea(tarea):
+    contenido, formato = tarea
+    return renderizar(contenido, formato)
+
+
+def _inicializar_proceso():
+    """Cada proceso del pool configura Django (plantillas) y no comparte conexiones del padre."""
+    import django
+    from django.apps import apps
+    if not apps.ready:
+        django.setup()
+    connections.close_all()
+
+
+# ------------------------------------------------------------------------------
+# CACHÉ POR CONTENIDO Y LOTES
+# ------------------------------------------------------------------------------
+
+def _guardar(ruta, datos):
+    """Escritura atómica: un lector concurrente ve el archivo completo o no lo ve."""
+    ruta.parent.mkdir(parents=True, exist_ok=True)
+    descriptor, temporal = tempfile.mkstemp(dir=ruta.parent, suffix='.tmp')
+    with os.fdopen(descriptor, 'wb') as archivo:
+        archivo.write(datos)
+    os.replace(temporal, ruta)
+
+
+def renderizar_facturas(facturas, formato='pdf', procesos=1):
+    """
+    Genera (o toma del almacén) el documento de cada factura. 'facturas' es un
+    queryset o lista de ids. Retorna {factura_id: ruta del archivo}.
+
+    Los documentos se guardan por la huella de su contenido (content-addressed):
+    reimprimir o reenviar una factura sin cambios no vuelve a renderizar, y una
+    factura editada (o anulada) produce otra huella. Los que faltan se renderizan
+    en un pool de 'procesos' procesos (1 = en este mismo proceso).
+    """
+    if formato not in FORMATOS_DOCUMENTO:
+        raise ValueError(f"Formato no soportado: '{formato}'. Use: {', '.join(FORMATOS_DOCUMENTO)}.")
+    if not hasattr(facturas, 'model'):
+        facturas = FacturaEncabezado.objects.filter(pk__in=list(facturas))
+
+    rutas, faltantes = {}, {}
+    for factura in facturas_para_documento(facturas).iterator(chunk_size=2000):
+        contenido = contenido_factura(factura)
+        ruta = ruta_documento(huella_documento(contenido, formato), formato)
+        rutas[factura.pk] = ruta
+        if ruta not in faltantes and not ruta.exists():
+            faltantes[ruta] = contenido
+
+    if faltantes:
+        tareas = [(contenido, formato) for contenido in faltantes.values()]
+        if procesos <= 1 or len(tareas) <= 1:
+            documentos = map(_renderizar_tarea, tareas)
+            for ruta, datos in zip(faltantes, documentos):
+                _guardar(ruta, datos)
+        else:
+            # Las conexiones abiertas no deben heredarse a los procesos hijos
+            connections.close_all()
+            with ProcessPoolExecutor(max_workers=procesos, initializer=_inicializar_proceso) as pool:
+                documentos = pool.map(_renderizar_tarea, tareas, chunksize=max(1, len(tareas) // (procesos * 4)))
+                for ruta, datos in zip(faltantes, documentos):
+                    _guardar(ruta, datos)
+    return rutas
+
+
+def documento_factura(factura_id, formato='pdf'):
+    """Bytes del documento de una factura (desde el almacén si ya existe)."""
+    rutas = renderizar_facturas([factura_id], formato=formato)
+    if factura_id not in rutas:
+        raise FacturaEncabezado.DoesNotExist(f"La factura {factura_id} no existe.")
+    return rutas[factura_id].read_bytes()
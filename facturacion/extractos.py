@@ -0,0 +1,329 @@
+# Archivo: facturacion/extractos.py
+
+import csv
+import hashlib
+import re
+from bisect import bisect_left, bisect_right, insort
+from collections import Counter, defaultdict
+from datetime import date
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+
+from .cartera import aplicar_pagos, cartera_abierta
+from .models import Pago
+
+# Columnas esperadas en CSV: una fila por movimiento del extracto
+COLUMNAS_CSV = ['fecha', 'monto', 'referencia', 'descripcion', 'identificacion']
+
+# Fragmentos de texto que pueden ser un número de factura o una identificación fiscal
+_TOKEN = re.compile(r'[A-Z0-9][A-Z0-9-]*[A-Z0-9]')
+_ETIQUETA_OFX = re.compile(r'<([A-Za-z.]+)>([^<\r\n]*)')
+
+
+def tolerancia_conciliacion():
+    """Diferencia máxima entre el movimiento y el saldo de la factura (settings.HERMES_CONCILIACION_TOLERANCIA)."""
+    return Decimal(str(getattr(settings, 'HERMES_CONCILIACION_TOLERANCIA', '0.50')))
+
+
+# ------------------------------------------------------------------------------
+# LECTORES (un movimiento a la vez, sin cargar el archivo completo)
+# ------------------------------------------------------------------------------
+
+def leer_csv(lineas):
+    """Columnas: fecha (AAAA-MM-DD), monto, referencia, descripcion e identificacion (opcional)."""
+    lector = csv.DictReader(lineas)
+    for fila in lector:
+        yield lector.line_num, {campo: (fila.get(campo) or '').strip() for campo in COLUMNAS_CSV}
+
+
+def leer_ofx(lineas):
+    """
+    Extractos OFX 1.x (SGML) y 2.x (XML): un movimiento por bloque <STMTTRN>.
+    FITID se usa como referencia y NAME/MEMO como descripción.
+    """
+    actual, linea_inicio = None, None
+    for numero_linea, linea in enumerate(lineas, start=1):
+        for etiqueta, valor in _ETIQUETA_OFX.findall(linea):
+            etiqueta = etiqueta.upper()
+            if etiqueta == 'STMTTRN':
+                actual, linea_inicio = {}, numero_linea
+            elif actual is not None:
+                actual[etiqueta] = valor.strip()
+        if actual is not None and '</STMTTRN>' in linea.upper():
+            fecha = actual.get('DTPOSTED', '')[:8]
+            yield linea_inicio, {
+                'fecha': f"{fecha[:4]}-{fecha[4:6]}-{fecha[6:8]}" if len(fecha) == 8 else '',
+                'monto': actual.get('TRNAMT', ''),
+                'referencia': actual.get('FITID', ''),
+                'descripcion': ' '.join(filter(None, [actual.get('NAME'), actual.get('MEMO')])),
+                'identificacion': '',
+            }
+            actual = None
+
+
+LECTORES = {
+    'csv': leer_csv,
+    'ofx': leer_ofx,
+}
+
+
+# ------------------------------------------------------------------------------
+# CONCILIADOR
+# ------------------------------------------------------------------------------
+
+def referencia_sintetica(fecha, monto, descripcion, ocurrencia):
+    """
+    Referencia estable para un movimiento sin referencia bancaria: huella de
+    (fecha, monto, descripción) y el número de ocurrencia de esa combinación en
+    el extracto. Reimportar el mismo archivo produce las mismas referencias.
+    """
+    huella = hashlib.sha256(f"{fecha.isoformat()}|{monto}|{descripcion}|{ocurrencia}".encode('utf-8'))
+    return f"EXT-{huella.hexdigest()[:32]}"
+
+
+def _centavos(monto):
+    return int((monto * 100).to_integral_value(rounding=ROUND_HALF_UP))
+
+
+class ConciliadorExtracto:
+    """
+    Concilia un extracto bancario contra la cartera abierta en una sola pasada.
+
+    La cartera se lee una vez y se indexa en memoria por número de factura, por
+    identificación fiscal del cliente y por saldo (en centavos). Cada movimiento
+    (crédito) se busca con estas reglas, en orden:
+
+    1. 'referencia': un número de factura aparece en la referencia o descripción y
+       el monto no supera su saldo más la tolerancia (se aceptan abonos parciales).
+    2. 'cliente_monto': la identificación del cliente aparece en el movimiento y
+       una sola de sus facturas tiene saldo igual al monto (± tolerancia).
+    3. 'monto': una sola factura de toda la cartera tiene saldo igual al monto.
+
+    Cada conciliación descuenta el saldo en memoria, así que dos movimientos no
+    pagan dos veces la misma deuda. Con confirmar=True los pagos se crean por
+    lotes con bulk_create y los saldos se aplican con un UPDATE por lote
+    (aplicar_pagos). Un movimiento cuya referencia ya existe como Pago se omite:
+    importar dos veces el mismo extracto no duplica pagos, ni siquiera en dos
+    importaciones simultáneas (las referencias de transferencia son únicas en la
+    base). Los movimientos sin referencia reciben una sintética a partir de fecha,
+    monto y descripción (referencia_sintetica), así que también se deduplican.
+    """
+
+    def __init__(self, tolerancia=None, confirmar=True, tamano_lote=1000, metodo_pago='TB'):
+        self.tolerancia = tolerancia_conciliacion() if tolerancia is None else Decimal(str(tolerancia))
+        self.confirmar = confirmar
+        self.tamano_lote = tamano_lote
+        self.metodo_pago = metodo_pago
+        self.procesadas = 0
+        self.conciliadas = []
+        self.pendientes = []
+        self.duplicadas = 0
+        self.pagos_creados = 0
+        self.sin_referencia = Counter()
+        self.cargar_cartera()
+
+    def cargar_cartera(self):
+        self.saldos = {}
+        self.numeros = {}
+        self.por_numero = {}
+        self.por_cliente = defaultdict(set)
+        # (centavos del saldo, factura_id) ordenado: los rangos de monto se buscan con bisect
+        self.por_monto = []
+        for factura_id, numero, saldo, identificacion in cartera_abierta().values_list(
+            'id', 'numero_factura', 'saldo_pendiente', 'cliente__identificacion_fiscal'
+        ).iterator(chunk_size=5000):
+            self.saldos[factura_id] = saldo
+            self.numeros[factura_id] = numero
+            self.por_numero[numero.upper()] = factura_id
+            self.por_cliente[identificacion.upper()].add(factura_id)
+            self.por_monto.append((_centavos(saldo), factura_id))
+        self.por_monto.sort()
+
+    def conciliar(self, movimientos):
+        lote = []
+        for numero_linea, datos in movimientos:
+            self.procesadas += 1
+            movimiento = self.validar(numero_linea, datos)
+            if movimiento is None:
+                continue
+            lote.append(movimiento)
+            if len(lote) >= self.tamano_lote:
+                self.procesar_lote(lote)
+                lote = []
+        if lote:
+            self.procesar_lote(lote)
+        return self.reporte()
+
+    def reporte(self):
+        return {
+            'procesadas': self.procesadas,
+            'conciliadas': len(self.conciliadas),
+            'pendientes': len(self.pendientes),
+            'duplicadas': self.duplicadas,
+            'pagos_creados': self.pagos_creados,
+            'monto_conciliado': sum((fila['monto'] for fila in self.conciliadas), Decimal('0')),
+            'detalle_conciliadas': self.conciliadas,
+            'detalle_pendientes': self.pendientes,
+        }
+
+    def registrar_pendiente(self, numero_linea, referencia, motivo, candidatas=()):
+        self.pendientes.append({
+            'linea': numero_linea, 'referencia': referencia, 'motivo': motivo,
+            'candidatas': [self.numeros[factura_id] for factura_id in sorted(candidatas)],
+        })
+
+    # --- Validación ---
+
+    def validar(self, numero_linea, datos):
+        referencia = datos.get('referencia', '')
+        try:
+            fecha = date.fromisoformat(datos.get('fecha', ''))
+        except ValueError:
+            self.registrar_pendiente(numero_linea, referencia, "Fecha inválida (formato esperado AAAA-MM-DD).")
+            return None
+        try:
+            monto = Decimal(datos.get('monto', '').replace(',', '')).quantize(Decimal('0.01'))
+        except InvalidOperation:
+            self.registrar_pendiente(numero_linea, referencia, f"Monto inválido '{datos.get('monto')}'.")
+            return None
+        if monto <= 0:
+            # Débitos (cargos del banco, pagos a proveedores): no son cobros de facturas
+            self.registrar_pendiente(numero_linea, referencia, "No es un crédito.")
+            return None
+        descripcion = datos.get('descripcion', '')
+        texto = f"{referencia} {descripcion}".upper()
+        if not referencia:
+            clave = (fecha, monto, descripcion.strip().upper())
+            self.sin_referencia[clave] += 1
+            referencia = referencia_sintetica(*clave, self.sin_referencia[clave])
+        return {
+            'linea': numero_linea,
+            'fecha': fecha,
+            'monto': monto,
+            'referencia': referencia[:50],
+            'tokens': set(_TOKEN.findall(texto)),
+            'identificacion': datos.get('identificacion', '').upper(),
+        }
+
+    # --- Búsqueda en los índices ---
+
+    def _vigentes(self, facturas):
+        return {factura_id for factura_id in facturas if self.saldos[factura_id] > 0}
+
+    def _por_monto(self, monto, facturas=None):
+        """Facturas con saldo dentro de monto ± tolerancia (dos búsquedas binarias, sin importar la tolerancia)."""
+        centro, margen = _centavos(monto), _centavos(self.tolerancia)
+        desde = bisect_left(self.por_monto, (centro - margen,))
+        hasta = bisect_right(self.por_monto, (centro + margen, float('inf')))
+        encontradas = self._vigentes(factura_id for _, factura_id in self.por_monto[desde:hasta])
+        return encontradas if facturas is None else encontradas & facturas
+
+    def buscar(self, movimiento):
+        """Retorna (factura_id, regla, candidatas): factura_id None si no hay una única coincidencia."""
+        monto = movimiento['monto']
+
+        por_referencia = self._vigentes(
+            self.por_numero[token] for token in movimiento['tokens'] if token in self.por_numero
+        )
+        if len(por_referencia) == 1:
+            factura_id = next(iter(por_referencia))
+            if monto <= self.saldos[factura_id] + self.tolerancia:
+                return factura_id, 'referencia', por_referencia
+            return None, 'El monto supera el saldo de la factura referenciada.', por_referencia
+        if len(por_referencia) > 1:
+            return None, 'Referencia a varias facturas.', por_referencia
+
+        identificaciones = ({movimiento['identificacion']} if movimiento['identificacion'] else set()) | movimiento['tokens']
+        del_cliente = set()
+        for identificacion in identificaciones:
+            del_cliente |= self.por_cliente.get(identificacion, set())
+        if del_cliente:
+            candidatas = self._por_monto(monto, self._vigentes(del_cliente))
+            if len(candidatas) == 1:
+                return next(iter(candidatas)), 'cliente_monto', candidatas
+            if candidatas:
+                return None, 'Varias facturas del cliente con ese saldo.', candidatas
+
+        candidatas = self._por_monto(monto)
+        if len(candidatas) == 1:
+            return next(iter(candidatas)), 'monto', candidatas
+        if candidatas:
+            return None, 'Varias facturas con ese saldo.', candidatas
+        return None, 'Sin coincidencia.', set()
+
+    def consumir(self, factura_id, monto):
+        """Descuenta el cobro del saldo en memoria y mueve la factura en el índice de montos."""
+        anterior = (_centavos(self.saldos[factura_id]), factura_id)
+        posicion = bisect_left(self.por_monto, anterior)
+        if posicion < len(self.por_monto) and self.por_monto[posicion] == anterior:
+            del self.por_monto[posicion]
+        self.saldos[factura_id] -= monto
+        if self.saldos[factura_id] > 0:
+            insort(self.por_monto, (_centavos(self.saldos[factura_id]), factura_id))
+
+    # --- Escritura ---
+
+    def procesar_lote(self, lote):
+        existentes = set(
+            Pago.objects.filter(referencia__in=[m['referencia'] for m in lote])
+            .values_list('referencia', flat=True)
+        )
+        pagos = []
+        for movimiento in lote:
+            if movimiento['referencia'] in existentes:
+                self.duplicadas += 1
+                continue
+            factura_id, regla, candidatas = self.buscar(movimiento)
+            if factura_id is None:
+                self.registrar_pendiente(movimiento['linea'], movimiento['referencia'], regla, candidatas)
+                continue
+            self.consumir(factura_id, movimiento['monto'])
+            existentes.add(movimiento['referencia'])
+            self.conciliadas.append({
+                'linea': movimiento['linea'], 'referencia': movimiento['referencia'],
+                'factura': factura_id, 'numero_factura': self.numeros[factura_id],
+                'monto': movimiento['monto'], 'regla': regla,
+            })
+            pagos.append(Pago(
+                factura_id=factura_id, fecha_pago=movimiento['fecha'], monto=movimiento['monto'],
+                metodo_pago=self.metodo_pago, referencia=movimiento['referencia'],
+            ))
+
+        if self.confirmar and pagos:
+            try:
+                with transaction.atomic():
+                    self.insertar(pagos)
+                self.pagos_creados += len(pagos)
+            except IntegrityError:
+                # Una importación concurrente registró alguna de estas referencias entre la
+                # consulta de existentes y la escritura: se reintenta pago por pago
+                for pago in pagos:
+                    try:
+                        with transaction.atomic():
+                            self.insertar([pago])
+                        self.pagos_creados += 1
+                    except IntegrityError:
+                        self.descartar(pago.referencia)
+
+    def insertar(self, pagos):
+        Pago.objects.bulk_create(pagos, batch_size=1000)
+        # bulk_create no dispara señales: los saldos se aplican aquí, en la misma transacción
+        aplicar_pagos((pago.factura_id, pago.monto) for pago in pagos)
+
+    def descartar(self, referencia):
+        """
+        La referencia ya fue registrada por otra importación: cuenta como duplicada.
+        El saldo en memoria sigue descontado, porque ese pago sí existe en la base.
+        """
+        self.duplicadas += 1
+        self.conciliadas = [fila for fila in self.conciliadas if fila['referencia'] != referencia]
+
+
+def importar_extracto(lineas, formato='csv', tolerancia=None, confirmar=True, tamano_lote=1000):
+    """Concilia un extracto desde un iterable de líneas de texto (archivo abierto, upload, etc.)."""
+    if formato not in LECTORES:
+        raise ValueError(f"Formato no soportado: '{formato}'. Use: {', '.join(LECTORES)}.")
+    conciliador = ConciliadorExtracto(tolerancia=tolerancia, confirmar=confirmar, tamano_lote=tamano_lote)
+    return conciliador.conciliar(LECTORES[formato](lineas))
@@ -0,0 +1,225 @@
+# Archivo: facturacion/lotes.py
+
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import DatabaseError, transaction
+
+from central.bandeja import contabilizar_o_encolar
+from central.models import EntidadComercial, Moneda, Producto
+from central.numeracion import reservar_numeros
+from inventario.asignacion import ErrorAsignacion, asignar_salidas, ubicacion
+from inventario.existencias import crear_movimientos
+from .models import FacturaDetalle, FacturaEncabezado
+
+TASA_IMPUESTO = Decimal('0.18')  # 18% IVA - ajustar según configuración
+
+
+def _excede(modelo, campo, valor):
+    """True si 'valor' no cabe en el max_digits del campo (la base lo rechazaría con DataError)."""
+    campo = modelo._meta.get_field(campo)
+    return abs(valor) >= Decimal(10) ** (campo.max_digits - campo.decimal_places)
+
+
+def _descartar_ids(factura):
+    """Tras revertir un bulk_create, los objetos conservan ids que ya no existen."""
+    for objeto in [factura['encabezado'], *factura['detalles']]:
+        objeto.pk = None
+        objeto._state.adding = True
+
+
+class FacturadorLote:
+    """
+    Crea muchas facturas con sus efectos en bloque: productos, clientes, monedas y
+    números existentes se leen una sola vez para todo el pedido; cada lote de
+    'tamano_lote' facturas se escribe con un bulk_create de encabezados, uno de
+    detalles, un lote de salidas de inventario (Stock se ajusta con un upsert por
+    producto/almacén) y una contabilización por lotes.
+
+    Una factura inválida (incluidos montos que no caben en sus columnas) se reporta
+    y no detiene el resto. Si un lote falla al escribir (número duplicado por otro
+    proceso, existencias insuficientes en modo estricto, cualquier otro error de
+    base de datos) se reintenta factura por factura para aislar la que falla.
+    """
+
+    def __init__(self, tamano_lote=500, politica=None):
+        self.tamano_lote = tamano_lote
+        self.politica = politica
+        self.procesadas = 0
+        self.creadas = []
+        self.errores = []
+        self.advertencias = []
+
+    def facturar(self, facturas):
+        """'facturas' es una lista de (indice, datos validados por FacturaLoteSerializer)."""
+        facturas = list(facturas)
+        self.cargar_referencias(facturas)
+        lote = []
+        for indice, datos in facturas:
+            self.procesadas += 1
+            factura = self.validar(indice, datos)
+            if factura is None:
+                continue
+            lote.append(factura)
+            if len(lote) >= self.tamano_lote:
+                self.escribir_lote(lote)
+                lote = []
+        if lote:
+            self.escribir_lote(lote)
+        return self.reporte()
+
+    def reporte(self):
+        return {
+            'procesadas': self.procesadas,
+            'creadas': len(self.creadas),
+            'con_errores': len(self.errores),
+            'facturas': self.creadas,
+            'errores': self.errores,
+            'advertencias': self.advertencias,
+        }
+
+    def registrar_error(self, indice, numero_factura, errores):
+        self.errores.append({'indice': indice, 'numero_factura': numero_factura, 'errores': errores})
+
+    # --- Validación ---
+
+    def cargar_referencias(self, facturas):
+        """Una consulta por tabla para todo el pedido, sin importar cuántas facturas traiga."""
+        productos = {detalle['producto'] for _, datos in facturas for detalle in datos['detalles']}
+        clientes = {datos['cliente'] for _, datos in facturas}
+        numeros = [datos['numero_factura'] for _, datos in facturas if datos.get('numero_factura')]
+        self.productos = Producto.objects.only('id', 'tipo').in_bulk(productos)
+        self.clientes = EntidadComercial.objects.filter(tipo__in=['C', 'A']).in_bulk(clientes)
+        self.monedas = set(Moneda.objects.values_list('id', flat=True))
+        self.numeros_vistos = set(
+            FacturaEncabezado.objects.filter(numero_factura__in=numeros).values_list('numero_factura', flat=True)
+        )
+
+    def validar(self, indice, datos):
+        numero_factura = datos.get('numero_factura') or None
+        errores = []
+        if numero_factura is not None and numero_factura in self.numeros_vistos:
+            errores.append(f"El número de factura {numero_factura} ya existe.")
+        cliente = self.clientes.get(datos['cliente'])
+        if cliente is None:
+            errores.append(f"Cliente desconocido: {datos['cliente']}.")
+        if datos['moneda'] not in self.monedas:
+            errores.append(f"Moneda desconocida: {datos['moneda']}.")
+        faltantes = sorted({d['producto'] for d in datos['detalles'] if d['producto'] not in self.productos})
+        if faltantes:
+            errores.append(f"Productos inexistentes: {faltantes}.")
+        if errores:
+            self.registrar_error(indice, numero_factura, errores)
+            return None
+
+        if numero_factura is not None:
+            self.numeros_vistos.add(numero_factura)
+        detalles = [
+            FacturaDetalle(
+                producto=self.productos[detalle['producto']],
+                cantidad=detalle['cantidad'],
+                precio_unitario=detalle['precio_unitario'],
+                subtotal=(detalle['cantidad'] * detalle['precio_unitario']).quantize(Decimal('0.01')),
+            )
+            for detalle in datos['detalles']
+        ]
+        subtotal = sum((detalle.subtotal for detalle in detalles), Decimal('0'))
+        impuesto = (subtotal * TASA_IMPUESTO).quantize(Decimal('0.01'))
+        desbordados = [
+            f"Detalle {posicion}: el subtotal {detalle.subtotal} excede el máximo permitido."
+            for posicion, detalle in enumerate(detalles)
+            if _excede(FacturaDetalle, 'subtotal', detalle.subtotal)
+        ]
+        if _excede(FacturaEncabezado, 'total', subtotal + impuesto):
+            desbordados.append(f"El total {subtotal + impuesto} excede el máximo permitido.")
+        if desbordados:
+            if numero_factura is not None:
+                self.numeros_vistos.discard(numero_factura)
+            self.registrar_error(indice, numero_factura, desbordados)
+            return None
+        encabezado = FacturaEncabezado(
+            numero_factura=numero_factura,
+            fecha_emision=datos['fecha_emision'],
+            fecha_vencimiento=datos['fecha_vencimiento'],
+            cliente=cliente,
+            moneda_id=datos['moneda'],
+            subtotal=subtotal,
+            impuesto=impuesto,
+            total=subtotal + impuesto,
+            saldo_pendiente=subtotal + impuesto,
+            **({'estado': datos['estado']} if datos.get('estado') else {}),
+        )
+        return {'indice': indice, 'encabezado': encabezado, 'detalles': detalles}
+
+    # --- Escritura ---
+
+    def numerar(self, lote):
+        """Reserva de una vez los números de las facturas que no traen uno (un pedido por año fiscal)."""
+        por_anio = defaultdict(list)
+        for factura in lote:
+            if not factura['encabezado'].numero_factura:
+                por_anio[factura['encabezado'].fecha_emision.year].append(factura['encabezado'])
+        for encabezados in por_anio.values():
+            numeros = reservar_numeros('facturas', len(encabezados), fecha=encabezados[0].fecha_emision)
+            for encabezado, numero in zip(encabezados, numeros):
+                encabezado.numero_factura = numero
+
+    def escribir_lote(self, lote):
+        self.numerar(lote)
+        try:
+            with transaction.atomic():
+                self.insertar(lote)
+        except (DatabaseError, ErrorAsignacion):
+            for factura in lote:
+                _descartar_ids(factura)
+                try:
+                    with transaction.atomic():
+                        self.insertar([factura])
+                except (DatabaseError, ErrorAsignacion) as e:
+                    self.registrar_error(factura['indice'], factura['encabezado'].numero_factura, [str(e)])
+
+    def insertar(self, lote):
+        encabezados = FacturaEncabezado.objects.bulk_create([factura['encabezado'] for factura in lote])
+        detalles = []
+        for factura, encabezado in zip(lote, encabezados):
+            for detalle in factura['detalles']:
+                detalle.factura = encabezado
+                detalles.append(detalle)
+        FacturaDetalle.objects.bulk_create(detalles, batch_size=1000)
+
+        # Salidas de inventario de todas las facturas del lote en una sola asignación
+        fisicas = [detalle for detalle in detalles if detalle.producto.tipo == 'P']
+        if fisicas:
+            plan = asignar_salidas(
+                [(detalle.producto_id, detalle.cantidad) for detalle in fisicas],
+                politica=self.politica,
+                origenes=[ubicacion(detalle.factura.cliente) for detalle in fisicas],
+            )
+            crear_movimientos([
+                {
+                    'tipo_movimiento': 'S',
+                    'producto': detalle.producto_id,
+                    'almacen': almacen_id,
+                    'cantidad': cantidad,
+                    'referencia_doc': f"FACT-{detalle.factura.numero_factura}",
+                }
+                for detalle, asignado in zip(fisicas, plan)
+                for almacen_id, cantidad in asignado
+            ], contabilizar=False)
+
+        # Como en la factura individual, un error contable no impide crearla: queda pendiente
+        resultado = contabilizar_o_encolar('facturas', encabezados, omitir_errores=True)
+        indices = {encabezado.pk: factura['indice'] for factura, encabezado in zip(lote, encabezados)}
+        if resultado is not None:
+            self.advertencias.extend(
+                {'indice': indices[error['documento']], 'error': error['error']} for error in resultado['errores']
+            )
+        self.creadas.extend(
+            {'indice': factura['indice'], 'id': encabezado.pk, 'numero_factura': encabezado.numero_factura}
+            for factura, encabezado in zip(lote, encabezados)
+        )
+
+
+def crear_facturas_en_lote(facturas, tamano_lote=500, politica=None):
+    """Crea facturas [(indice, datos)] en bloque y retorna el reporte (ver FacturadorLote)."""
+    return FacturadorLote(tamano_lote=tamano_lote, politica=politica).facturar(facturas)
@@ -0,0 +1,50 @@
+# Archivo: facturacion/management/commands/importar_extracto.py
+
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from facturacion.extractos import LECTORES, importar_extracto
+
+
+class Command(BaseCommand):
+    help = "Concilia un extracto bancario (CSV u OFX) contra la cartera abierta y registra los pagos."
+
+    def add_arguments(self, parser):
+        parser.add_argument('archivo', help="Ruta del extracto.")
+        parser.add_argument(
+            '--formato', choices=sorted(LECTORES),
+            help="Formato del archivo (por defecto se deduce de la extensión)."
+        )
+        parser.add_argument(
+            '--tolerancia', help="Diferencia máxima entre monto y saldo (por defecto HERMES_CONCILIACION_TOLERANCIA)."
+        )
+        parser.add_argument('--lote', type=int, default=1000, help="Movimientos por transacción.")
+        parser.add_argument('--simular', action='store_true', help="Solo reporta las coincidencias, sin crear pagos.")
+        parser.add_argument('--reporte', help="Ruta donde guardar el reporte completo en JSON.")
+
+    def handle(self, *args, **options):
+        ruta = Path(options['archivo'])
+        if not ruta.exists():
+            raise CommandError(f"No existe el archivo: {ruta}")
+        formato = options['formato'] or ('ofx' if ruta.suffix.lower() in ('.ofx', '.qfx') else 'csv')
+
+        with ruta.open(encoding='utf-8', newline='') as archivo:
+            reporte = importar_extracto(
+                archivo, formato=formato, tolerancia=options['tolerancia'],
+                confirmar=not options['simular'], tamano_lote=options['lote'],
+            )
+
+        if options['reporte']:
+            Path(options['reporte']).write_text(
+                json.dumps(reporte, ensure_ascii=False, indent=2, default=str), encoding='utf-8'
+            )
+        for pendiente in reporte['detalle_pendientes'][:20]:
+            self.stdout.write(f"Línea {pendiente['linea']} ({pendiente['referencia']}): {pendiente['motivo']}")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Procesadas: {reporte['procesadas']} | Conciliadas: {reporte['conciliadas']} | "
+            f"Pendientes: {reporte['pendientes']} | Duplicadas: {reporte['duplicadas']} | "
+            f"Pagos creados: {reporte['pagos_creados']}"
+        ))
@@ -0,0 +1,41 @@
+# Archivo: facturacion/management/commands/renderizar_facturas.py
+
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from facturacion.documentos import FORMATOS_DOCUMENTO, renderizar_facturas
+from facturacion.models import FacturaEncabezado
+
+
+class Command(BaseCommand):
+    help = "Genera los documentos (PDF/HTML) de las facturas; los que no cambiaron se toman del almacén."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--desde', help="Fecha de emisión inicial (AAAA-MM-DD).")
+        parser.add_argument('--hasta', help="Fecha de emisión final (AAAA-MM-DD).")
+        parser.add_argument(
+            '--estado', choices=[codigo for codigo, _ in FacturaEncabezado.ESTADO_FACTURA],
+            help="Solo facturas en este estado."
+        )
+        parser.add_argument('--formato', choices=sorted(FORMATOS_DOCUMENTO), default='pdf')
+        parser.add_argument('--procesos', type=int, default=1, help="Procesos para renderizar en paralelo.")
+
+    def handle(self, *args, **options):
+        facturas = FacturaEncabezado.objects.all()
+        try:
+            if options['desde']:
+                facturas = facturas.filter(fecha_emision__gte=date.fromisoformat(options['desde']))
+            if options['hasta']:
+                facturas = facturas.filter(fecha_emision__lte=date.fromisoformat(options['hasta']))
+        except ValueError:
+            raise CommandError("Las fechas deben tener formato AAAA-MM-DD.")
+        if options['estado']:
+            facturas = facturas.filter(estado=options['estado'])
+
+        rutas = renderizar_facturas(facturas, formato=options['formato'], procesos=options['procesos'])
+
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Facturas: {len(rutas)} | Documentos distintos: {len(set(rutas.values()))} | "
+            f"Formato: {options['formato']}"
+        ))
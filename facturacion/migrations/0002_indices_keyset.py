@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-17 16:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('central', '0004_indice_keyset_transacciones'),
+        ('facturacion', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='facturaencabezado',
+            index=models.Index(fields=['-fecha_emision', 'numero_factura'], name='fact_fecha_numero_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='pago',
+            index=models.Index(fields=['-fecha_pago', '-id'], name='fact_pago_fecha_id_idx'),
+        ),
+    ]
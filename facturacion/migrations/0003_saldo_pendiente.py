@@ -0,0 +1,42 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:40
+
+from django.db import migrations, models
+from django.db.models import DecimalField, F, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+
+def calcular_saldos_existentes(apps, schema_editor):
+    """Saldo = total - pagos; las facturas emitidas sin saldo pasan a pagadas."""
+    FacturaEncabezado = apps.get_model('facturacion', 'FacturaEncabezado')
+    Pago = apps.get_model('facturacion', 'Pago')
+    pagado = (
+        Pago.objects.filter(factura=OuterRef('pk'))
+        .order_by()
+        .values('factura')
+        .annotate(total=Sum('monto'))
+        .values('total')
+    )
+    FacturaEncabezado.objects.update(saldo_pendiente=F('total') - Coalesce(
+        Subquery(pagado), Value(0), output_field=DecimalField(max_digits=12, decimal_places=2)
+    ))
+    FacturaEncabezado.objects.filter(estado='E', saldo_pendiente__lte=0).update(estado='P')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('facturacion', '0002_indices_keyset'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='facturaencabezado',
+            name='saldo_pendiente',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=12, verbose_name='Saldo Pendiente'),
+        ),
+        migrations.RunPython(calcular_saldos_existentes, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='facturaencabezado',
+            index=models.Index(condition=models.Q(('estado', 'E'), ('saldo_pendiente__gt', 0)), fields=['fecha_vencimiento', 'cliente'], name='fact_cartera_abierta_idx'),
+        ),
+    ]
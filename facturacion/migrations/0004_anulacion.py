@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-17 21:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('central', '0007_entidadcomercial_ubicacion'),
+        ('facturacion', '0003_saldo_pendiente'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='facturaencabezado',
+            name='fecha_anulacion',
+            field=models.DateField(blank=True, null=True, verbose_name='Fecha de Anulación'),
+        ),
+        migrations.AddField(
+            model_name='facturaencabezado',
+            name='asiento_anulacion',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='facturas_anuladas', to='central.transaccionencabezado', verbose_name='Asiento de Anulación'),
+        ),
+    ]
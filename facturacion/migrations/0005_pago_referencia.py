@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('facturacion', '0004_anulacion'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='pago',
+            index=models.Index(fields=['referencia'], name='fact_pago_referencia_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='pago',
+            constraint=models.UniqueConstraint(condition=models.Q(('metodo_pago', 'TB'), models.Q(('referencia', ''), _negated=True)), fields=('referencia',), name='fact_pago_referencia_tb_uniq'),
+        ),
+    ]
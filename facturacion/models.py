@@ -64,6 +64,13 @@ class FacturaEncabezado(models.Model):
         default=0,
         verbose_name=_("Total")
     )
+    # Total menos pagos: lo mantienen los Signals de Pago (ver facturacion/cartera.py)
+    saldo_pendiente = models.DecimalField(
+        max_digits=12,
+        decimal_places=2,
+        default=0,
+        verbose_name=_("Saldo Pendiente")
+    )
     
     # Estado y control
     estado = models.CharField(
@@ -81,6 +88,20 @@ class FacturaEncabezado(models.Model):
         blank=True,
         verbose_name=_("Asiento Contable Relacionado")
     )
+    # Anulación: el asiento de reverso lo genera facturacion/anulacion.py
+    fecha_anulacion = models.DateField(
+        null=True,
+        blank=True,
+        verbose_name=_("Fecha de Anulación")
+    )
+    asiento_anulacion = models.ForeignKey(
+        'central.TransaccionEncabezado',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='facturas_anuladas',
+        verbose_name=_("Asiento de Anulación")
+    )
     
     def __str__(self):
         return f"Factura {self.numero_factura} - {self.cliente.nombre_comercial}"
@@ -89,6 +110,15 @@ class FacturaEncabezado(models.Model):
         verbose_name = _("Factura")
         verbose_name_plural = _("Facturas")
         ordering = ['-fecha_emision', 'numero_factura']
+        # Índice compuesto con el mismo orden: respalda la paginación por keyset
+        indexes = [
+            models.Index(fields=['-fecha_emision', 'numero_factura'], name='fact_fecha_numero_idx'),
+            # Cartera abierta: el reporte de antigüedad no recorre las facturas pagadas
+            models.Index(
+                fields=['fecha_vencimiento', 'cliente'], name='fact_cartera_abierta_idx',
+                condition=models.Q(estado='E', saldo_pendiente__gt=0),
+            ),
+        ]
 
 
 class FacturaDetalle(models.Model):
@@ -179,4 +209,17 @@ class Pago(models.Model):
     class Meta:
         verbose_name = _("Pago")
         verbose_name_plural = _("Pagos")
-        ordering = ['-fecha_pago']
\ No newline at end of file
+        ordering = ['-fecha_pago']
+        indexes = [
+            models.Index(fields=['-fecha_pago', '-id'], name='fact_pago_fecha_id_idx'),
+            models.Index(fields=['referencia'], name='fact_pago_referencia_idx'),
+        ]
+        constraints = [
+            # Una transferencia se registra una sola vez aunque dos importaciones del
+            # mismo extracto corran a la vez (ver extractos.ConciliadorExtracto)
+            models.UniqueConstraint(
+                fields=['referencia'],
+                condition=models.Q(metodo_pago='TB') & ~models.Q(referencia=''),
+                name='fact_pago_referencia_tb_uniq',
+            ),
+        ]
\ No newline at end of file
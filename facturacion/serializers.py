@@ -3,8 +3,12 @@
 from rest_framework import serializers
 from django.db import transaction
 from .models import FacturaEncabezado, FacturaDetalle, Pago
-from central.models import CuentaContable, TransaccionEncabezado, MovimientoContable
-from inventario.models import MovimientoInventario
+from central.bandeja import contabilizar_o_encolar
+from central.contabilizacion import ErrorContabilizacion
+from central.numeracion import siguiente_numero
+from inventario.asignacion import POLITICAS_ASIGNACION, ErrorAsignacion, asignar_salidas, ubicacion
+from inventario.existencias import crear_movimientos
+from .lotes import TASA_IMPUESTO
 
 class FacturaDetalleSerializer(serializers.ModelSerializer):
     producto_nombre = serializers.CharField(source='producto.nombre', read_only=True)
@@ -17,18 +21,28 @@ class FacturaDetalleSerializer(serializers.ModelSerializer):
 class FacturaEncabezadoSerializer(serializers.ModelSerializer):
     detalles = FacturaDetalleSerializer(many=True)
     cliente_nombre = serializers.CharField(source='cliente.nombre_comercial', read_only=True)
+    # Política para elegir los almacenes de salida; por defecto HERMES_POLITICA_ASIGNACION
+    politica_asignacion = serializers.ChoiceField(choices=POLITICAS_ASIGNACION, write_only=True, required=False)
     
     class Meta:
         model = FacturaEncabezado
         fields = [
             'id', 'numero_factura', 'fecha_emision', 'fecha_vencimiento',
             'cliente', 'cliente_nombre', 'moneda', 'subtotal', 'impuesto', 
-            'total', 'estado', 'detalles', 'asiento_contable'
+            'total', 'saldo_pendiente', 'estado', 'detalles', 'asiento_contable',
+            'fecha_anulacion', 'asiento_anulacion', 'politica_asignacion'
         ]
-        read_only_fields = ['subtotal', 'impuesto', 'total', 'asiento_contable']
+        read_only_fields = [
+            'subtotal', 'impuesto', 'total', 'saldo_pendiente', 'asiento_contable', 'fecha_anulacion', 'asiento_anulacion'
+        ]
+        # Si no se envía, el número se toma de la serie 'facturas' (central/numeracion.py)
+        extra_kwargs = {'numero_factura': {'required': False}}
     
     def create(self, validated_data):
         detalles_data = validated_data.pop('detalles')
+        politica = validated_data.pop('politica_asignacion', None)
+        if not validated_data.get('numero_factura'):
+            validated_data['numero_factura'] = siguiente_numero('facturas', validated_data['fecha_emision'])
         
         with transaction.atomic():
             # Crear factura
@@ -36,6 +50,7 @@ class FacturaEncabezadoSerializer(serializers.ModelSerializer):
             
             # Crear detalles y calcular totales
             total_subtotal = 0
+            salidas = []
             for detalle_data in detalles_data:
                 producto = detalle_data['producto']
                 cantidad = detalle_data['cantidad']
@@ -56,22 +71,20 @@ class FacturaEncabezadoSerializer(serializers.ModelSerializer):
                 
                 # Si es producto físico, generar salida de inventario
                 if producto.tipo == 'P':  # Producto Físico
-                    MovimientoInventario.objects.create(
-                        tipo_movimiento='S',  # Salida
-                        producto=producto,
-                        almacen_id=1,  # Almacén principal - ajustar según necesidad
-                        cantidad=cantidad,
-                        referencia_doc=f"FACT-{factura.numero_factura}"
-                    )
+                    salidas.append((producto.pk, cantidad))
+            
+            if salidas:
+                self.crear_salidas_inventario(factura, salidas, politica)
             
             # Calcular impuestos y total
-            impuesto = total_subtotal * 0.18  # 18% IVA - ajustar según configuración
+            impuesto = total_subtotal * TASA_IMPUESTO
             total = total_subtotal + impuesto
             
             # Actualizar factura con totales
             factura.subtotal = total_subtotal
             factura.impuesto = impuesto
             factura.total = total
+            factura.saldo_pendiente = total
             factura.save()
             
             # Generar asiento contable automático
@@ -79,56 +92,59 @@ class FacturaEncabezadoSerializer(serializers.ModelSerializer):
             
             return factura
     
+    def crear_salidas_inventario(self, factura, salidas, politica):
+        """
+        Reparte las líneas físicas entre almacenes (inventario/asignacion.py) y crea
+        las salidas en un solo lote. El costo de venta queda pendiente para
+        contabilizar_pendientes, igual que antes.
+        """
+        try:
+            plan = asignar_salidas(salidas, politica=politica, origen=ubicacion(factura.cliente))
+        except ErrorAsignacion as e:
+            raise serializers.ValidationError({'detalles': str(e)})
+        crear_movimientos([
+            {
+                'tipo_movimiento': 'S',
+                'producto': producto_id,
+                'almacen': almacen_id,
+                'cantidad': cantidad,
+                'referencia_doc': f"FACT-{factura.numero_factura}",
+            }
+            for (producto_id, _), asignado in zip(salidas, plan)
+            for almacen_id, cantidad in asignado
+        ], contabilizar=False)
+    
     def crear_asiento_contable(self, factura):
-        """Crea el asiento contable automáticamente para la factura"""
+        """Crea el asiento contable automáticamente para la factura (motor de contabilización)"""
         try:
-            # Buscar cuentas contables (ajustar códigos según tu plan contable)
-            cuenta_ingresos = CuentaContable.objects.get(codigo='413505')  # Ventas
-            cuenta_iva = CuentaContable.objects.get(codigo='240805')       # IVA por cobrar
-            cuenta_clientes = CuentaContable.objects.get(codigo='130505')  # Clientes
-            
-            # Crear encabezado del asiento
-            asiento = TransaccionEncabezado.objects.create(
-                fecha=factura.fecha_emision,
-                referencia=f"FACT-{factura.numero_factura}",
-                descripcion=f"Facturación a {factura.cliente.nombre_comercial}",
-                entidad=factura.cliente,
-                moneda=factura.moneda,
-                tasa_cambio=1.0
-            )
-            
-            # Movimientos contables
-            # Débito: Clientes (Activo - aumenta)
-            MovimientoContable.objects.create(
-                encabezado=asiento,
-                cuenta=cuenta_clientes,
-                tipo_movimiento='D',
-                monto=factura.total
-            )
-            
-            # Crédito: Ingresos por ventas (Ingreso - aumenta)
-            MovimientoContable.objects.create(
-                encabezado=asiento,
-                cuenta=cuenta_ingresos,
-                tipo_movimiento='C',
-                monto=factura.subtotal
-            )
-            
-            # Crédito: IVA por cobrar (Pasivo - aumenta)
-            MovimientoContable.objects.create(
-                encabezado=asiento,
-                cuenta=cuenta_iva,
-                tipo_movimiento='C',
-                monto=factura.impuesto
-            )
-            
-            # Enlazar asiento con factura
-            factura.asiento_contable = asiento
-            factura.save()
-            
-        except CuentaContable.DoesNotExist as e:
+            contabilizar_o_encolar('facturas', [factura])
+        except ErrorContabilizacion as e:
             # En producción, esto debería manejarse mejor
-            print(f"ERROR: Cuenta contable no encontrada: {e}")
+            print(f"ERROR: {e}")
+
+class FacturaLoteDetalleSerializer(serializers.Serializer):
+    """Línea de una factura del lote; el producto se valida en bloque en FacturadorLote."""
+    producto = serializers.IntegerField()
+    cantidad = serializers.DecimalField(max_digits=10, decimal_places=2, min_value=0)
+    precio_unitario = serializers.DecimalField(max_digits=10, decimal_places=2, min_value=0)
+
+
+class FacturaLoteSerializer(serializers.Serializer):
+    """
+    Factura del lote (facturacion/lotes.py). Cliente, moneda y productos se reciben
+    como ids y se validan en bloque para todo el pedido, no una consulta por factura.
+    """
+    numero_factura = serializers.CharField(max_length=20, required=False)
+    fecha_emision = serializers.DateField()
+    fecha_vencimiento = serializers.DateField()
+    cliente = serializers.IntegerField()
+    moneda = serializers.IntegerField()
+    # Anulada y Pagada solo se alcanzan por anulación o pagos, nunca al crear
+    estado = serializers.ChoiceField(
+        choices=[(clave, nombre) for clave, nombre in FacturaEncabezado.ESTADO_FACTURA if clave in ('B', 'E')],
+        required=False,
+    )
+    detalles = FacturaLoteDetalleSerializer(many=True, allow_empty=False)
 
 class PagoSerializer(serializers.ModelSerializer):
     class Meta:
@@ -0,0 +1,35 @@
+# Archivo: facturacion/signals.py
+
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .cartera import aplicar_pagos
+from .models import Pago
+
+
+# ------------------------------------------------------------------------------
+# MANTENIMIENTO DEL SALDO PENDIENTE DE LAS FACTURAS (facturacion/cartera.py)
+# ------------------------------------------------------------------------------
+
+@receiver(pre_save, sender=Pago)
+def recordar_pago_anterior(sender, instance, **kwargs):
+    """Guarda factura y monto previos de un pago editado para poder revertirlos."""
+    instance._pago_anterior = None
+    if instance.pk:
+        instance._pago_anterior = Pago.objects.filter(pk=instance.pk).values_list('factura_id', 'monto').first()
+
+
+@receiver(post_save, sender=Pago)
+def aplicar_pago_post_guardado(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    anterior = getattr(instance, '_pago_anterior', None)
+    pagos = [(instance.factura_id, instance.monto)]
+    if not created and anterior:
+        pagos.append((anterior[0], -anterior[1]))
+    aplicar_pagos(pagos)
+
+
+@receiver(post_delete, sender=Pago)
+def revertir_pago_post_borrado(sender, instance, **kwargs):
+    aplicar_pagos([(instance.factura_id, -instance.monto)])
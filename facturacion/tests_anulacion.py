@@ -0,0 +1,132 @@
+# Archivo: facturacion/tests_anulacion.py
+
+from datetime import date
+from decimal import Decimal
+
+from django.db import connection
+from django.db.models import Q, Sum
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from facturacion.anulacion import anular_facturas
+from facturacion.lotes import crear_facturas_en_lote
+from facturacion.models import FacturaEncabezado, Pago
+from inventario.models import Almacen, MovimientoInventario, Stock, ValorizacionStock
+from central.models import CuentaContable, EntidadComercial, Moneda, MovimientoContable, Producto
+
+# ==============================================================================
+# PRUEBAS DE ANULACIÓN DE FACTURAS EN LOTE
+# ==============================================================================
+
+class AnulacionLoteTests(TestCase):
+
+    def setUp(self):
+        self.moneda = Moneda.objects.create(codigo_iso='USD', nombre='Dólar', simbolo='$', es_principal=True)
+        for codigo, nombre, tipo, naturaleza in (
+            ('130505', 'Clientes', 'A', 'D'), ('413505', 'Ventas', 'I', 'C'), ('240805', 'IVA', 'P', 'C'),
+            ('613505', 'Costo de Venta', 'G', 'D'), ('143505', 'Inventario', 'A', 'D'),
+        ):
+            CuentaContable.objects.create(codigo=codigo, nombre=nombre, tipo=tipo, naturaleza=naturaleza)
+        self.cliente = EntidadComercial.objects.create(
+            nombre_comercial='Cliente Test', identificacion_fiscal='123-456789', tipo='C'
+        )
+        self.almacen = Almacen.objects.create(nombre='Principal', codigo='ALM-P')
+        self.tornillo, self.servicio = Producto.objects.bulk_create([
+            Producto(nombre='Tornillo', codigo_sku='TOR-1', precio_venta=2, costo_unitario=1, unidad_medida='Unidad'),
+            Producto(nombre='Instalación', codigo_sku='SRV-1', tipo='S', precio_venta=50, unidad_medida='Hora'),
+        ])
+        MovimientoInventario.objects.create(
+            tipo_movimiento='E', producto=self.tornillo, almacen=self.almacen, cantidad=1000, referencia_doc='INI'
+        )
+
+    def facturar(self, *numeros):
+        reporte = crear_facturas_en_lote(list(enumerate([
+            {
+                'numero_factura': numero,
+                'fecha_emision': date(2026, 3, 1),
+                'fecha_vencimiento': date(2026, 3, 31),
+                'cliente': self.cliente.id,
+                'moneda': self.moneda.id,
+                'estado': 'E',
+                'detalles': [
+                    {'producto': self.tornillo.id, 'cantidad': Decimal('3'), 'precio_unitario': Decimal('2')},
+                    {'producto': self.servicio.id, 'cantidad': Decimal('1'), 'precio_unitario': Decimal('50')},
+                ],
+            }
+            for numero in numeros
+        ])))
+        return [factura['id'] for factura in reporte['facturas']]
+
+    def existencia(self):
+        return Stock.objects.get(producto=self.tornillo, almacen=self.almacen).cantidad
+
+    def test_anula_y_revierte_asiento_e_inventario(self):
+        ids = self.facturar('F-1', 'F-2')
+        self.assertEqual(self.existencia(), Decimal('994'))
+
+        reporte = anular_facturas(ids, fecha=date(2026, 3, 15))
+
+        self.assertEqual((reporte['anuladas'], reporte['con_errores'], reporte['advertencias']), (2, 0, []))
+        self.assertEqual(self.existencia(), Decimal('1000'))
+        factura = FacturaEncabezado.objects.get(numero_factura='F-1')
+        self.assertEqual((factura.estado, factura.fecha_anulacion), ('A', date(2026, 3, 15)))
+
+        # El reverso intercambia débitos y créditos: cada cuenta de la factura queda en cero
+        reverso = factura.asiento_anulacion
+        self.assertEqual((reverso.referencia, reverso.fecha), ('ANUL-FACT-F-1', date(2026, 3, 15)))
+        movimientos = MovimientoContable.objects.filter(encabezado__in=[factura.asiento_contable, reverso])
+        for fila in movimientos.values('cuenta').annotate(
+            debito=Sum('monto', filter=Q(tipo_movimiento='D')), credito=Sum('monto', filter=Q(tipo_movimiento='C'))
+        ):
+            self.assertEqual(fila['debito'], fila['credito'])
+
+        entrada = MovimientoInventario.objects.get(referencia_doc='ANUL-F-1')
+        self.assertEqual((entrada.tipo_movimiento, entrada.cantidad), ('E', Decimal('3')))
+        self.assertIsNotNone(entrada.asiento_contable_nucleo_id)
+
+    def test_reverso_conserva_el_costo_total_de_la_salida(self):
+        """Con un costo promedio de más de 4 decimales, costo_unitario * cantidad no es el costo de la salida"""
+        MovimientoInventario.objects.create(
+            tipo_movimiento='E', producto=self.tornillo, almacen=self.almacen, cantidad=1,
+            costo_unitario=Decimal('1.0334'), referencia_doc='INI-2'
+        )
+        valor_inicial = ValorizacionStock.objects.get(producto=self.tornillo, almacen=self.almacen).valor_total
+
+        anular_facturas(self.facturar('F-1'))
+
+        salida = MovimientoInventario.objects.get(referencia_doc='FACT-F-1')
+        entrada = MovimientoInventario.objects.get(referencia_doc='ANUL-F-1')
+        self.assertEqual(salida.costo_total, Decimal('3.0001'))
+        self.assertNotEqual(salida.costo_unitario * salida.cantidad, salida.costo_total)
+        self.assertEqual(entrada.costo_total, salida.costo_total)
+        valor = ValorizacionStock.objects.get(producto=self.tornillo, almacen=self.almacen).valor_total
+        self.assertEqual(valor, valor_inicial)
+
+    def test_facturas_no_anulables_se_reportan(self):
+        emitida, anulada, con_pago = self.facturar('F-1', 'F-2', 'F-3')
+        anular_facturas([anulada])
+        Pago.objects.create(factura_id=con_pago, fecha_pago=date(2026, 3, 5), monto=Decimal('10'), metodo_pago='TB')
+
+        reporte = anular_facturas([emitida, anulada, con_pago, 999999])
+
+        self.assertEqual([factura['numero_factura'] for factura in reporte['facturas']], ['F-1'])
+        self.assertEqual(
+            [(error['numero_factura'], error['error']) for error in reporte['errores']],
+            [
+                ('F-2', "Solo se pueden anular facturas emitidas."),
+                ('F-3', "La factura tiene pagos registrados."),
+                (None, "La factura no existe."),
+            ]
+        )
+        # La factura ya anulada no devuelve su inventario dos veces
+        self.assertEqual(MovimientoInventario.objects.filter(referencia_doc='ANUL-F-2').count(), 1)
+        self.assertEqual(self.existencia(), Decimal('997'))
+
+    def test_consultas_no_crecen_con_las_facturas(self):
+        anular_facturas(self.facturar('F-0'))
+        pocas_ids = self.facturar(*[f'A-{i}' for i in range(5)])
+        muchas_ids = self.facturar(*[f'B-{i}' for i in range(50)])
+        with CaptureQueriesContext(connection) as pocas:
+            anular_facturas(pocas_ids)
+        with CaptureQueriesContext(connection) as muchas:
+            anular_facturas(muchas_ids)
+        self.assertEqual(len(muchas), len(pocas))
@@ -0,0 +1,71 @@
+# Archivo: facturacion/tests_cartera.py
+
+from datetime import date
+from decimal import Decimal
+
+from django.test import TestCase
+from facturacion.cartera import antiguedad_cartera
+from facturacion.models import FacturaEncabezado, Pago
+from central.models import EntidadComercial, Moneda
+
+# ==============================================================================
+# PRUEBAS DE SALDO PENDIENTE Y ANTIGÜEDAD DE CARTERA
+# ==============================================================================
+
+class CarteraTests(TestCase):
+
+    def setUp(self):
+        self.moneda = Moneda.objects.create(codigo_iso='USD', nombre='Dólar', simbolo='$', es_principal=True)
+        self.cliente = EntidadComercial.objects.create(
+            nombre_comercial='Cliente Test', identificacion_fiscal='123-456789', tipo='C'
+        )
+
+    def factura(self, numero, total, vencimiento):
+        return FacturaEncabezado.objects.create(
+            numero_factura=numero, fecha_emision=date(2026, 1, 1), fecha_vencimiento=vencimiento,
+            cliente=self.cliente, moneda=self.moneda, total=total, saldo_pendiente=total, estado='E',
+        )
+
+    def pago(self, factura, monto):
+        return Pago.objects.create(factura=factura, fecha_pago=date(2026, 2, 1), monto=monto, metodo_pago='TB')
+
+    def test_pagos_descuentan_el_saldo_y_cierran_la_factura(self):
+        factura = self.factura('F-1', Decimal('100'), date(2026, 2, 1))
+        self.pago(factura, Decimal('40'))
+        factura.refresh_from_db()
+        self.assertEqual((factura.saldo_pendiente, factura.estado), (Decimal('60'), 'E'))
+
+        ultimo = self.pago(factura, Decimal('60'))
+        factura.refresh_from_db()
+        self.assertEqual((factura.saldo_pendiente, factura.estado), (Decimal('0'), 'P'))
+
+        # Borrar un pago reabre la factura
+        ultimo.delete()
+        factura.refresh_from_db()
+        self.assertEqual((factura.saldo_pendiente, factura.estado), (Decimal('60'), 'E'))
+
+    def test_editar_un_pago_ajusta_la_diferencia(self):
+        factura = self.factura('F-1', Decimal('100'), date(2026, 2, 1))
+        pago = self.pago(factura, Decimal('40'))
+        pago.monto = Decimal('100')
+        pago.save()
+        factura.refresh_from_db()
+        self.assertEqual((factura.saldo_pendiente, factura.estado), (Decimal('0'), 'P'))
+
+    def test_antiguedad_por_tramos(self):
+        corte = date(2026, 6, 30)
+        self.factura('F-1', Decimal('10'), date(2026, 7, 15))   # por vencer
+        self.factura('F-2', Decimal('20'), date(2026, 6, 30))   # 0 días
+        self.factura('F-3', Decimal('30'), date(2026, 5, 1))    # 60 días
+        self.factura('F-4', Decimal('40'), date(2026, 1, 31))   # más de 90
+        pagada = self.factura('F-5', Decimal('50'), date(2026, 1, 31))
+        self.pago(pagada, Decimal('50'))
+
+        reporte = antiguedad_cartera(corte)
+
+        self.assertEqual(reporte['totales'], {
+            'por_vencer': Decimal('10'), 'dias_0_30': Decimal('20'), 'dias_31_60': Decimal('30'),
+            'dias_61_90': Decimal('0'), 'mas_de_90': Decimal('40'), 'total': Decimal('100'),
+        })
+        self.assertEqual(len(reporte['clientes']), 1)
+        self.assertEqual(reporte['clientes'][0]['total'], Decimal('100'))
@@ -0,0 +1,107 @@
+# Archivo: facturacion/tests_documentos.py
+
+import tempfile
+from datetime import date
+from decimal import Decimal
+
+from django.contrib.auth.models import Group, User
+from django.test import TestCase, override_settings
+from rest_framework import status
+from rest_framework.test import APITestCase
+from facturacion.documentos import directorio_documentos, documento_factura, renderizar_facturas
+from facturacion.models import FacturaDetalle, FacturaEncabezado
+from central.models import EntidadComercial, Moneda, Producto
+
+# ==============================================================================
+# PRUEBAS DE DOCUMENTOS DE FACTURA (RENDER EN LOTE Y CACHÉ POR CONTENIDO)
+# ==============================================================================
+
+class DocumentosFacturaMixin:
+
+    def setUp(self):
+        directorio = tempfile.TemporaryDirectory()
+        self.addCleanup(directorio.cleanup)
+        ajustes = override_settings(HERMES_DOCUMENTOS_DIR=directorio.name)
+        ajustes.enable()
+        self.addCleanup(ajustes.disable)
+
+        moneda = Moneda.objects.create(codigo_iso='USD', nombre='Dólar', simbolo='$', es_principal=True)
+        cliente = EntidadComercial.objects.create(nombre_comercial='Acme', identificacion_fiscal='900111', tipo='C')
+        producto = Producto.objects.create(nombre='Tornillo', codigo_sku='TOR-1', precio_venta=2, unidad_medida='Unidad')
+        self.facturas = []
+        for numero in ('F-1', 'F-2', 'F-3'):
+            factura = FacturaEncabezado.objects.create(
+                numero_factura=numero, fecha_emision=date(2026, 3, 1), fecha_vencimiento=date(2026, 3, 31),
+                cliente=cliente, moneda=moneda, subtotal=Decimal('6'), impuesto=Decimal('1.08'),
+                total=Decimal('7.08'), estado='E',
+            )
+            FacturaDetalle.objects.create(
+                factura=factura, producto=producto, cantidad=3, precio_unitario=Decimal('2'), subtotal=Decimal('6')
+            )
+            self.facturas.append(factura)
+
+
+class DocumentosFacturaTests(DocumentosFacturaMixin, TestCase):
+
+    def archivos(self):
+        return sorted(directorio_documentos().rglob('*.pdf'))
+
+    def test_renderiza_el_lote_con_consultas_fijas(self):
+        with self.assertNumQueries(2):  # facturas (con cliente y moneda), detalles (con producto)
+            rutas = renderizar_facturas(FacturaEncabezado.objects.all())
+        self.assertEqual(len(rutas), 3)
+        self.assertEqual(len(self.archivos()), 3)
+        self.assertTrue(rutas[self.facturas[0].pk].read_bytes().startswith(b'%PDF-1.4'))
+
+    def test_factura_sin_cambios_no_se_vuelve_a_renderizar(self):
+        primera = renderizar_facturas(FacturaEncabezado.objects.all())
+        modificados = {ruta: ruta.stat().st_mtime_ns for ruta in self.archivos()}
+        segunda = renderizar_facturas(FacturaEncabezado.objects.all())
+        self.assertEqual(primera, segunda)
+        self.assertEqual({ruta: ruta.stat().st_mtime_ns for ruta in self.archivos()}, modificados)
+
+    def test_factura_editada_o_anulada_cambia_de_huella(self):
+        factura = self.facturas[0]
+        original = renderizar_facturas([factura.pk])[factura.pk]
+
+        FacturaEncabezado.objects.filter(pk=factura.pk).update(estado='A')
+        anulada = renderizar_facturas([factura.pk])[factura.pk]
+        self.assertNotEqual(anulada, original)
+        self.assertTrue(original.exists())
+
+        FacturaDetalle.objects.filter(factura=factura).update(cantidad=4)
+        self.assertNotEqual(renderizar_facturas([factura.pk])[factura.pk], anulada)
+
+    def test_html(self):
+        contenido = documento_factura(self.facturas[1].pk, formato='html').decode('utf-8')
+        self.assertIn('F-2', contenido)
+        self.assertIn('TOR-1', contenido)
+
+    def test_factura_inexistente(self):
+        with self.assertRaises(FacturaEncabezado.DoesNotExist):
+            documento_factura(999999)
+
+
+class DocumentosFacturaAPITests(DocumentosFacturaMixin, APITestCase):
+
+    def setUp(self):
+        super().setUp()
+        usuario = User.objects.create_user(username='contabilidad_user', password='test123')
+        usuario.groups.add(Group.objects.create(name='Contabilidad'))
+        self.client.force_authenticate(user=usuario)
+
+    def test_documentos_en_lote(self):
+        ids = [factura.pk for factura in self.facturas[:2]]
+        response = self.client.post(
+            '/api/facturacion/facturas/documentos/', {'facturas': ids + [999999], 'formato': 'pdf'}, format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(sorted(response.data['documentos']), ids)
+        self.assertEqual(response.data['no_encontradas'], [999999])
+
+    def test_documento_individual(self):
+        factura = self.facturas[0]
+        response = self.client.get(f'/api/facturacion/facturas/{factura.pk}/documento/', {'formato': 'html'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn(b'F-1', response.content)
+        self.assertEqual(response['Content-Type'], 'text/html; charset=utf-8')
@@ -0,0 +1,123 @@
+# Archivo: facturacion/tests_extractos.py
+
+import io
+from datetime import date
+from decimal import Decimal
+from unittest import mock
+
+from django.test import TestCase
+from facturacion.extractos import importar_extracto
+from facturacion.models import FacturaEncabezado, Pago
+from central.models import EntidadComercial, Moneda
+
+# ==============================================================================
+# PRUEBAS DE IMPORTACIÓN DE EXTRACTOS Y CONCILIACIÓN AUTOMÁTICA DE PAGOS
+# ==============================================================================
+
+CABECERA = "fecha,monto,referencia,descripcion,identificacion\n"
+
+
+class ExtractoBancarioTests(TestCase):
+
+    def setUp(self):
+        moneda = Moneda.objects.create(codigo_iso='USD', nombre='Dólar', simbolo='$', es_principal=True)
+        self.acme = EntidadComercial.objects.create(nombre_comercial='Acme', identificacion_fiscal='900111', tipo='C')
+        self.beta = EntidadComercial.objects.create(nombre_comercial='Beta', identificacion_fiscal='900222', tipo='C')
+        self.facturas = {}
+        for numero, cliente, total in (
+            ('F-100', self.acme, '500.00'), ('F-101', self.acme, '250.00'),
+            ('F-200', self.beta, '250.00'), ('F-201', self.beta, '730.25'),
+        ):
+            self.facturas[numero] = FacturaEncabezado.objects.create(
+                numero_factura=numero, fecha_emision=date(2026, 1, 1), fecha_vencimiento=date(2026, 2, 1),
+                cliente=cliente, moneda=moneda, total=Decimal(total), saldo_pendiente=Decimal(total), estado='E',
+            )
+
+    def importar(self, filas, **opciones):
+        return importar_extracto(io.StringIO(CABECERA + ''.join(filas)), **opciones)
+
+    def saldo(self, numero):
+        factura = FacturaEncabezado.objects.get(numero_factura=numero)
+        return factura.saldo_pendiente, factura.estado
+
+    def test_reglas_de_conciliacion(self):
+        reporte = self.importar([
+            "2026-02-03,200.00,TRX-1,Abono F-100,\n",          # referencia (abono parcial)
+            "2026-02-03,250.00,TRX-2,Transferencia,900222\n",  # cliente + monto
+            "2026-02-03,730.00,TRX-3,Pago proveedor,\n",       # monto único dentro de la tolerancia
+            "2026-02-03,-50.00,TRX-4,Comisión,\n",             # débito
+        ])
+
+        self.assertEqual(
+            [(fila['numero_factura'], fila['regla']) for fila in reporte['detalle_conciliadas']],
+            [('F-100', 'referencia'), ('F-200', 'cliente_monto'), ('F-201', 'monto')]
+        )
+        self.assertEqual(reporte['pagos_creados'], 3)
+        self.assertEqual(self.saldo('F-100'), (Decimal('300.00'), 'E'))
+        self.assertEqual(self.saldo('F-200'), (Decimal('0.00'), 'P'))
+        self.assertEqual(self.saldo('F-201'), (Decimal('0.25'), 'E'))
+        self.assertEqual([fila['motivo'] for fila in reporte['detalle_pendientes']], ["No es un crédito."])
+
+    def test_monto_ambiguo_queda_pendiente(self):
+        reporte = self.importar(["2026-02-03,250.00,TRX-1,Transferencia,\n"])
+        self.assertEqual(reporte['conciliadas'], 0)
+        self.assertEqual(reporte['detalle_pendientes'][0]['candidatas'], ['F-101', 'F-200'])
+
+    def test_dos_movimientos_no_pagan_dos_veces(self):
+        """El saldo se descuenta en memoria: el segundo movimiento ya no coincide por monto"""
+        reporte = self.importar([
+            "2026-02-03,730.25,TRX-1,Pago,\n",
+            "2026-02-04,730.25,TRX-2,Pago,\n",
+        ])
+        self.assertEqual(reporte['conciliadas'], 1)
+        self.assertEqual(reporte['pendientes'], 1)
+
+    def test_reimportar_no_duplica_pagos(self):
+        filas = ["2026-02-03,200.00,TRX-1,Abono F-100,\n"]
+        self.importar(filas)
+        reporte = self.importar(filas)
+        self.assertEqual(reporte['duplicadas'], 1)
+        self.assertEqual(Pago.objects.count(), 1)
+
+    def test_reimportar_sin_referencia_no_duplica_pagos(self):
+        """Sin referencia bancaria se deduplica por fecha, monto y descripción"""
+        filas = [
+            "2026-02-03,100.00,,Abono F-100,\n",
+            "2026-02-03,100.00,,Abono F-100,\n",  # segundo abono idéntico en el mismo extracto
+        ]
+        self.assertEqual(self.importar(filas)['pagos_creados'], 2)
+        reporte = self.importar(filas)
+        self.assertEqual((reporte['duplicadas'], reporte['pagos_creados']), (2, 0))
+        self.assertEqual(self.saldo('F-100'), (Decimal('300.00'), 'E'))
+
+    def test_importacion_concurrente_no_duplica_pagos(self):
+        """Si otra importación registra la referencia después de la consulta, la restricción única la descarta"""
+        Pago.objects.create(
+            factura=self.facturas['F-100'], fecha_pago=date(2026, 2, 3), monto=Decimal('200.00'),
+            metodo_pago='TB', referencia='TRX-1',
+        )
+        sin_existentes = Pago.objects.none()
+        with mock.patch.object(Pago.objects, 'filter', return_value=sin_existentes):
+            reporte = self.importar([
+                "2026-02-03,200.00,TRX-1,Abono F-100,\n",
+                "2026-02-03,250.00,TRX-2,Transferencia,900222\n",
+            ])
+        self.assertEqual((reporte['duplicadas'], reporte['pagos_creados'], reporte['conciliadas']), (1, 1, 1))
+        self.assertEqual(Pago.objects.filter(referencia='TRX-1').count(), 1)
+        self.assertEqual(self.saldo('F-200'), (Decimal('0.00'), 'P'))
+
+    def test_simular_no_crea_pagos(self):
+        reporte = self.importar(["2026-02-03,200.00,TRX-1,Abono F-100,\n"], confirmar=False)
+        self.assertEqual((reporte['conciliadas'], reporte['pagos_creados']), (1, 0))
+        self.assertFalse(Pago.objects.exists())
+
+    def test_ofx(self):
+        ofx = (
+            "OFXHEADER:100\n<OFX><BANKMSGSRSV1><STMTTRNRS><STMTRS><BANKTRANLIST>\n"
+            "<STMTTRN>\n<TRNTYPE>CREDIT\n<DTPOSTED>20260203120000\n<TRNAMT>500.00\n"
+            "<FITID>OFX-1\n<NAME>ACME\n<MEMO>Pago factura F-100\n</STMTTRN>\n"
+            "</BANKTRANLIST></STMTRS></STMTTRNRS></BANKMSGSRSV1></OFX>\n"
+        )
+        reporte = importar_extracto(io.StringIO(ofx), formato='ofx')
+        self.assertEqual(reporte['detalle_conciliadas'][0]['numero_factura'], 'F-100')
+        self.assertEqual(self.saldo('F-100'), (Decimal('0.00'), 'P'))
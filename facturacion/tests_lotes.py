@@ -0,0 +1,102 @@
+# Archivo: facturacion/tests_lotes.py
+
+from datetime import date
+from decimal import Decimal
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from facturacion.lotes import crear_facturas_en_lote
+from facturacion.models import FacturaDetalle, FacturaEncabezado
+from inventario.models import Almacen, MovimientoInventario, Stock
+from central.models import CuentaContable, EntidadComercial, Moneda, Producto
+
+# ==============================================================================
+# PRUEBAS DE FACTURACIÓN EN LOTE
+# ==============================================================================
+
+class FacturacionLoteTests(TestCase):
+
+    def setUp(self):
+        self.moneda = Moneda.objects.create(codigo_iso='USD', nombre='Dólar', simbolo='$', es_principal=True)
+        for codigo, nombre, tipo, naturaleza in (
+            ('130505', 'Clientes', 'A', 'D'), ('413505', 'Ventas', 'I', 'C'), ('240805', 'IVA', 'P', 'C'),
+        ):
+            CuentaContable.objects.create(codigo=codigo, nombre=nombre, tipo=tipo, naturaleza=naturaleza)
+        self.cliente = EntidadComercial.objects.create(
+            nombre_comercial='Cliente Test', identificacion_fiscal='123-456789', tipo='C'
+        )
+        self.almacen = Almacen.objects.create(nombre='Principal', codigo='ALM-P')
+        self.tornillo, self.servicio = Producto.objects.bulk_create([
+            Producto(nombre='Tornillo', codigo_sku='TOR-1', precio_venta=2, costo_unitario=1, unidad_medida='Unidad'),
+            Producto(nombre='Instalación', codigo_sku='SRV-1', tipo='S', precio_venta=50, unidad_medida='Hora'),
+        ])
+        # Existencia suficiente para todas las pruebas: ningún lote deja el stock en negativo
+        MovimientoInventario.objects.create(
+            tipo_movimiento='E', producto=self.tornillo, almacen=self.almacen, cantidad=1000, referencia_doc='INI'
+        )
+
+    def factura(self, numero, **cambios):
+        datos = {
+            'numero_factura': numero,
+            'fecha_emision': date(2026, 3, 1),
+            'fecha_vencimiento': date(2026, 3, 31),
+            'cliente': self.cliente.id,
+            'moneda': self.moneda.id,
+            'detalles': [
+                {'producto': self.tornillo.id, 'cantidad': Decimal('3'), 'precio_unitario': Decimal('2')},
+                {'producto': self.servicio.id, 'cantidad': Decimal('1'), 'precio_unitario': Decimal('50')},
+            ],
+        }
+        datos.update(cambios)
+        return datos
+
+    def test_crea_facturas_con_detalles_salidas_y_asientos(self):
+        reporte = crear_facturas_en_lote(list(enumerate([self.factura('F-1'), self.factura('F-2')])))
+
+        self.assertEqual((reporte['creadas'], reporte['con_errores'], reporte['advertencias']), (2, 0, []))
+        factura = FacturaEncabezado.objects.get(numero_factura='F-1')
+        self.assertEqual((factura.subtotal, factura.impuesto, factura.total),
+                         (Decimal('56'), Decimal('10.08'), Decimal('66.08')))
+        self.assertIsNotNone(factura.asiento_contable_id)
+        self.assertEqual(FacturaDetalle.objects.count(), 4)
+        # Solo el producto físico sale del inventario
+        self.assertEqual(MovimientoInventario.objects.filter(tipo_movimiento='S').count(), 2)
+        self.assertEqual(Stock.objects.get(producto=self.tornillo, almacen=self.almacen).cantidad, Decimal('994'))
+
+    def test_errores_por_factura_no_detienen_el_lote(self):
+        facturas = [
+            self.factura('F-1'),
+            self.factura('F-1'),
+            self.factura('F-3', cliente=999999),
+            self.factura('F-4', detalles=[{'producto': 999999, 'cantidad': Decimal('1'), 'precio_unitario': Decimal('1')}]),
+        ]
+        reporte = crear_facturas_en_lote(list(enumerate(facturas)))
+
+        self.assertEqual(reporte['creadas'], 1)
+        self.assertEqual([error['indice'] for error in reporte['errores']], [1, 2, 3])
+        self.assertEqual(list(FacturaEncabezado.objects.values_list('numero_factura', flat=True)), ['F-1'])
+
+    def test_montos_desbordados_se_reportan_por_factura(self):
+        """Un subtotal que no cabe en su columna es un error de la factura, no un DataError del lote"""
+        enorme = [{'producto': self.servicio.id, 'cantidad': Decimal('100000'), 'precio_unitario': Decimal('100000')}]
+        reporte = crear_facturas_en_lote(list(enumerate([self.factura('F-1', detalles=enorme), self.factura('F-2')])))
+
+        self.assertEqual(reporte['creadas'], 1)
+        self.assertEqual([error['indice'] for error in reporte['errores']], [0])
+        self.assertIn('excede el máximo permitido', reporte['errores'][0]['errores'][0])
+
+    def test_numeracion_automatica(self):
+        reporte = crear_facturas_en_lote(list(enumerate([self.factura(None), self.factura(None)])))
+        numeros = [factura['numero_factura'] for factura in reporte['facturas']]
+        self.assertEqual(len(set(numeros)), 2)
+        self.assertTrue(all(numero.startswith('FACT-2026-') for numero in numeros))
+
+    def test_consultas_no_crecen_con_las_facturas(self):
+        """Los maestros y cuentas quedan en caché tras el primer lote"""
+        crear_facturas_en_lote(list(enumerate([self.factura('F-0')])))
+        with CaptureQueriesContext(connection) as pocas:
+            crear_facturas_en_lote(list(enumerate([self.factura(f'A-{i}') for i in range(5)])))
+        with CaptureQueriesContext(connection) as muchas:
+            crear_facturas_en_lote(list(enumerate([self.factura(f'B-{i}') for i in range(50)])))
+        self.assertEqual(len(muchas), len(pocas))
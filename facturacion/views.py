@@ -1,32 +1,181 @@
 # Archivo: facturacion/views.py
 
+import io
+from datetime import date
+from decimal import Decimal, InvalidOperation
+
+from django.conf import settings
+from django.http import HttpResponse
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from .models import FacturaEncabezado, Pago
-from .serializers import FacturaEncabezadoSerializer, PagoSerializer
+from .serializers import FacturaEncabezadoSerializer, FacturaLoteSerializer, PagoSerializer
+from .lotes import crear_facturas_en_lote
+from .extractos import LECTORES, importar_extracto
+from .documentos import FORMATOS_DOCUMENTO, renderizar_facturas
+from .anulacion import anular_facturas
+from inventario.asignacion import POLITICAS_ASIGNACION
+from central.consultas import ConsultaOptimizadaMixin
 from central.permissions import IsContabilidadUser
 
-class FacturaViewSet(viewsets.ModelViewSet):
+class FacturaViewSet(ConsultaOptimizadaMixin, viewsets.ModelViewSet):
     queryset = FacturaEncabezado.objects.all()
     serializer_class = FacturaEncabezadoSerializer
     permission_classes = [IsContabilidadUser]  # Solo contabilidad puede facturar
     
+    @action(detail=False, methods=['post'])
+    def lote(self, request):
+        """
+        Facturación masiva (procesos B2B nocturnos). Recibe una lista de facturas
+        {numero_factura?, fecha_emision, fecha_vencimiento, cliente, moneda, estado?,
+        detalles: [{producto, cantidad, precio_unitario}]} y retorna un reporte con
+        las facturas creadas y los errores de cada factura rechazada (por índice).
+        Parámetros opcionales: lote (facturas por transacción) y politica (asignación
+        de almacenes).
+        """
+        if not isinstance(request.data, list) or not request.data:
+            return Response({'error': 'Debe enviar una lista de facturas'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            tamano_lote = int(request.query_params.get('lote', 500))
+        except ValueError:
+            return Response({'error': 'El parámetro lote debe ser entero'}, status=status.HTTP_400_BAD_REQUEST)
+        politica = request.query_params.get('politica') or None
+        if politica is not None and politica not in POLITICAS_ASIGNACION:
+            return Response(
+                {'error': f"politica debe ser una de: {', '.join(POLITICAS_ASIGNACION)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        # La forma de cada factura se valida por separado: una mal formada no rechaza el resto
+        validas, errores = [], []
+        for indice, datos in enumerate(request.data):
+            serializer = FacturaLoteSerializer(data=datos)
+            if serializer.is_valid():
+                validas.append((indice, serializer.validated_data))
+            else:
+                numero = datos.get('numero_factura') if isinstance(datos, dict) else None
+                errores.append({'indice': indice, 'numero_factura': numero, 'errores': serializer.errors})
+
+        reporte = crear_facturas_en_lote(validas, tamano_lote=max(tamano_lote, 1), politica=politica)
+        reporte['procesadas'] += len(errores)
+        reporte['con_errores'] += len(errores)
+        reporte['errores'] = sorted(errores + reporte['errores'], key=lambda error: error['indice'])
+        return Response(reporte)
+
+    @action(detail=True, methods=['get'])
+    def documento(self, request, pk=None):
+        """Documento imprimible de la factura: ?formato=pdf (por defecto) o html."""
+        formato = request.query_params.get('formato', 'pdf')
+        if formato not in FORMATOS_DOCUMENTO:
+            return Response(
+                {'error': f"formato debe ser uno de: {', '.join(FORMATOS_DOCUMENTO)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        factura = self.get_object()
+        ruta = renderizar_facturas(FacturaEncabezado.objects.filter(pk=factura.pk), formato=formato)[factura.pk]
+        respuesta = HttpResponse(ruta.read_bytes(), content_type=FORMATOS_DOCUMENTO[formato])
+        respuesta['Content-Disposition'] = f'inline; filename="factura-{factura.numero_factura}.{formato}"'
+        # La huella del contenido sirve como ETag: el cliente puede reutilizar su copia
+        respuesta['ETag'] = f'"{ruta.stem}"'
+        return respuesta
+
+    @action(detail=False, methods=['post'])
+    def documentos(self, request):
+        """
+        Prepara los documentos de muchas facturas (envíos masivos). Recibe
+        {facturas: [ids], formato: pdf|html} y retorna {factura_id: huella}; los ya
+        generados con el mismo contenido no se vuelven a renderizar.
+        """
+        formato = request.data.get('formato', 'pdf')
+        ids = request.data.get('facturas')
+        if formato not in FORMATOS_DOCUMENTO or not isinstance(ids, list) or not ids:
+            return Response(
+                {'error': f"Debe enviar una lista de facturas y un formato ({', '.join(FORMATOS_DOCUMENTO)})"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            ids = [int(factura_id) for factura_id in ids]
+        except (TypeError, ValueError):
+            return Response({'error': 'Los ids de factura deben ser enteros'}, status=status.HTTP_400_BAD_REQUEST)
+        rutas = renderizar_facturas(
+            FacturaEncabezado.objects.filter(pk__in=ids), formato=formato,
+            procesos=getattr(settings, 'HERMES_DOCUMENTOS_PROCESOS', 1),
+        )
+        return Response({
+            'formato': formato,
+            'documentos': {factura_id: ruta.stem for factura_id, ruta in rutas.items()},
+            'no_encontradas': sorted(set(ids) - set(rutas)),
+        })
+
     @action(detail=True, methods=['post'])
     def anular(self, request, pk=None):
-        """Anular una factura"""
+        """Anular una factura: revierte su asiento contable y devuelve sus salidas al inventario"""
         factura = self.get_object()
-        if factura.estado == 'E':  # Solo se puede anular facturas emitidas
-            factura.estado = 'A'
-            factura.save()
-            # Aquí se podría revertir el asiento contable y el movimiento de inventario
-            return Response({'status': 'Factura anulada'})
+        reporte = anular_facturas([factura.pk])
+        if reporte['anuladas']:
+            return Response({'status': 'Factura anulada', 'advertencias': reporte['advertencias']})
         return Response(
-            {'error': 'Solo se pueden anular facturas emitidas'}, 
+            {'error': reporte['errores'][0]['error']},
             status=status.HTTP_400_BAD_REQUEST
         )
 
-class PagoViewSet(viewsets.ModelViewSet):
+    @action(detail=False, methods=['post'], url_path='anular-lote')
+    def anular_lote(self, request):
+        """
+        Anulación masiva. Recibe {facturas: [ids], fecha?: AAAA-MM-DD} y retorna un
+        reporte con las facturas anuladas y el motivo de cada una rechazada.
+        Parámetro opcional: lote (facturas por transacción).
+        """
+        ids = request.data.get('facturas')
+        if not isinstance(ids, list) or not ids:
+            return Response({'error': 'Debe enviar una lista de facturas'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            ids = [int(factura_id) for factura_id in ids]
+            tamano_lote = int(request.query_params.get('lote', 500))
+            fecha = date.fromisoformat(request.data['fecha']) if request.data.get('fecha') else None
+        except (TypeError, ValueError):
+            return Response(
+                {'error': 'Los ids de factura y el parámetro lote deben ser enteros; la fecha, AAAA-MM-DD'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        return Response(anular_facturas(ids, tamano_lote=max(tamano_lote, 1), fecha=fecha))
+
+class PagoViewSet(ConsultaOptimizadaMixin, viewsets.ModelViewSet):
     queryset = Pago.objects.all()
     serializer_class = PagoSerializer
-    permission_classes = [IsContabilidadUser]
\ No newline at end of file
+    permission_classes = [IsContabilidadUser]
+
+    @action(detail=False, methods=['post'], url_path='importar-extracto')
+    def importar_extracto(self, request):
+        """
+        Concilia un extracto bancario contra las facturas abiertas y crea los pagos
+        conciliados. Recibe un archivo 'archivo' (multipart) CSV u OFX. Parámetros
+        opcionales: formato (csv/ofx), tolerancia, simular=1 (solo reporta) y lote.
+        """
+        archivo = request.FILES.get('archivo')
+        if archivo is None:
+            return Response({'error': "Debe enviar el archivo en el campo 'archivo'"}, status=status.HTTP_400_BAD_REQUEST)
+
+        parametros = request.query_params
+        formato = parametros.get('formato') or (
+            'ofx' if archivo.name.lower().endswith(('.ofx', '.qfx')) else 'csv'
+        )
+        if formato not in LECTORES:
+            return Response({'error': f"Formato no soportado: {formato}"}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            tamano_lote = int(parametros.get('lote', 1000))
+            tolerancia = Decimal(parametros['tolerancia']) if parametros.get('tolerancia') else None
+        except (ValueError, InvalidOperation):
+            return Response(
+                {'error': 'lote debe ser entero y tolerancia un número'}, status=status.HTTP_400_BAD_REQUEST
+            )
+        if tolerancia is not None and (not tolerancia.is_finite() or tolerancia < 0):
+            return Response({'error': 'tolerancia debe ser un número no negativo'}, status=status.HTTP_400_BAD_REQUEST)
+
+        lineas = io.TextIOWrapper(archivo.file, encoding='utf-8', newline='')
+        reporte = importar_extracto(
+            lineas, formato=formato, tolerancia=tolerancia,
+            confirmar=parametros.get('simular') not in ('1', 'true'), tamano_lote=max(tamano_lote, 1),
+        )
+        return Response(reporte)
\ No newline at end of file
@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -91,6 +92,27 @@ DATABASES = {
     }
 }
 
+# Cache
+# El caché de maestros (central/maestros.py) y el de disponibilidad por SKU se
+# invalidan a través de este backend: con varios workers debe ser compartido (Redis,
+# requiere el paquete 'redis'). Sin HERMES_REDIS_URL se usa LocMemCache, que es de
+# cada proceso: la invalidación no llega a los demás workers y sus copias solo se
+# renuevan al vencer HERMES_MAESTROS_TTL / HERMES_DISPONIBILIDAD_TTL.
+HERMES_REDIS_URL = os.environ.get('HERMES_REDIS_URL')
+if HERMES_REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': HERMES_REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -147,13 +169,50 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.IsAuthenticated',
     ],
     
-    # Paginación para manejar grandes listas de datos (ej. 100 productos por página)
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    # Paginación para manejar grandes listas de datos (ej. 100 productos por página).
+    # Por defecto es por cursor (keyset): cada página cuesta lo mismo y no hace COUNT(*).
+    # Con ?page=N (o ?paginacion=paginas) se usa la paginación clásica con total 'count'.
+    'DEFAULT_PAGINATION_CLASS': 'central.pagination.PaginacionHermes',
     'PAGE_SIZE': 100,
 
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
 }
 
+# Contabilización diferida (bandeja de salida): con True, facturación, inventario y nómina
+# solo encolan el documento y el comando 'procesar_bandeja_contable' genera los asientos.
+HERMES_CONTABILIZACION_DIFERIDA = False
+
+# Método de valorización del inventario: 'promedio' (costo promedio ponderado) o 'peps' (capas FIFO).
+# Define el costo de las salidas y del asiento de costo de venta (ver inventario/valorizacion.py).
+HERMES_METODO_VALORIZACION = 'promedio'
+
+# Punto de reorden para los Stock sin umbral propio: por debajo se abre una alerta de stock bajo.
+HERMES_PUNTO_REORDEN_POR_DEFECTO = 10
+
+# Almacén desde el que salen las líneas de factura (ver inventario/asignacion.py):
+# 'prioridad' (Almacen.prioridad), 'cercania' (más cercano al cliente) o 'mayor_stock'.
+# Con HERMES_ASIGNACION_ESTRICTA = True una factura sin existencias suficientes se rechaza;
+# si no, el faltante sale del primer almacén de la política (stock negativo).
+HERMES_POLITICA_ASIGNACION = 'prioridad'
+HERMES_ASIGNACION_ESTRICTA = False
+
+# Segundos que un proceso puede servir maestros (monedas, cuentas, almacenes, series) desde
+# su copia en memoria sin volver a leerlos: acota la desactualización si el caché no es compartido.
+HERMES_MAESTROS_TTL = 60
+
+# Segundos que la consulta de disponibilidad por SKU puede responder desde el caché
+# (ver inventario/disponibilidad.py). Cada cambio de Stock borra la entrada del producto.
+HERMES_DISPONIBILIDAD_TTL = 5
+
+# Diferencia máxima aceptada entre un movimiento del extracto bancario y el saldo de la
+# factura con la que se concilia (ver facturacion/extractos.py).
+HERMES_CONCILIACION_TOLERANCIA = '0.50'
+
+# Documentos de factura (HTML/PDF) guardados por la huella de su contenido (ver
+# facturacion/documentos.py) y procesos con que el endpoint de lotes los renderiza.
+HERMES_DOCUMENTOS_DIR = BASE_DIR / 'documentos_facturas'
+HERMES_DOCUMENTOS_PROCESOS = 1
+
 # Archivo: hermes_project/settings.py
 
 # (Añadir esta nueva sección al final del archivo)
@@ -4,11 +4,11 @@ from django.contrib import admin
 from django.urls import path, include
 from rest_framework import routers
 from central.views import (ProductoViewSet, EntidadComercialViewSet, MonedaViewSet,
-    TransaccionEncabezadoViewSet,
+    TransaccionEncabezadoViewSet, CuentaContableViewSet,
 )
 from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
 from inventario.views import (
-    AlmacenViewSet, StockViewSet, MovimientoInventarioViewSet,
+    AlmacenViewSet, StockViewSet, MovimientoInventarioViewSet, ConteoFisicoViewSet,
 )
 from facturacion.views import FacturaViewSet, PagoViewSet
 from compras.views import OrdenCompraViewSet, RecepcionCompraViewSet
@@ -26,6 +26,7 @@ router.register(r'productos', ProductoViewSet)
 router.register(r'entidades', EntidadComercialViewSet)
 router.register(r'monedas', MonedaViewSet)
 router.register(r'transacciones', TransaccionEncabezadoViewSet)
+router.register(r'cuentas', CuentaContableViewSet)
 
 # FACTURACION
 router.register(r'facturacion/facturas', FacturaViewSet)
@@ -35,6 +36,7 @@ router.register(r'facturacion/pagos', PagoViewSet)
 router.register(r'inventario/almacenes', AlmacenViewSet)
 router.register(r'inventario/stock', StockViewSet)
 router.register(r'inventario/movimientos', MovimientoInventarioViewSet) # <-- ¡La clave!
+router.register(r'inventario/conteos', ConteoFisicoViewSet)
 
 # COMPRAS
 router.register(r'compras/ordenes', OrdenCompraViewSet)
@@ -1,19 +1,22 @@
 # Archivo: inventario/admin.py
 
 from django.contrib import admin
-from .models import Almacen, Stock, MovimientoInventario
+from .models import (Almacen, Stock, MovimientoInventario, CorteStock, CorteStockDetalle,
+    ValorizacionStock, CapaCosto, AlertaStockBajo, ResumenDiarioMovimiento, ConteoFisico,
+)
 
 # 1. Almacén (Simple)
 @admin.register(Almacen)
 class AlmacenAdmin(admin.ModelAdmin):
-    list_display = ('nombre', 'codigo', 'activo')
+    list_display = ('nombre', 'codigo', 'prioridad', 'activo')
+    list_editable = ('prioridad',)
     search_fields = ('nombre', 'codigo')
     list_filter = ('activo',)
 
-# 2. Stock (Solo lectura, se actualiza por Signals)
+# 2. Stock (Solo lectura salvo el punto de reorden, se actualiza por Signals)
 @admin.register(Stock)
 class StockAdmin(admin.ModelAdmin):
-    list_display = ('producto', 'almacen', 'cantidad')
+    list_display = ('producto', 'almacen', 'cantidad', 'punto_reorden')
     search_fields = ('producto__nombre', 'almacen__nombre')
     list_filter = ('almacen',)
     readonly_fields = ('producto', 'almacen', 'cantidad') # Para evitar edición manual
@@ -29,4 +32,58 @@ class MovimientoInventarioAdmin(admin.ModelAdmin):
     autocomplete_fields = ('producto', 'almacen')
     
     # Mantenemos raw_id_fields solo para el enlace contable
-    raw_id_fields = ('asiento_contable_nucleo',)
\ No newline at end of file
+    raw_id_fields = ('asiento_contable_nucleo',)
+
+# 4. Cortes de Stock (Solo lectura, se generan con 'generar_corte_stock')
+class CorteStockDetalleInline(admin.TabularInline):
+    model = CorteStockDetalle
+    extra = 0
+    readonly_fields = ('producto', 'almacen', 'cantidad', 'valor')
+
+@admin.register(CorteStock)
+class CorteStockAdmin(admin.ModelAdmin):
+    list_display = ('fecha', 'fecha_creacion')
+    readonly_fields = ('fecha',)
+    inlines = [CorteStockDetalleInline]
+
+# 5. Valorización (Solo lectura, se mantiene en cada movimiento)
+@admin.register(ValorizacionStock)
+class ValorizacionStockAdmin(admin.ModelAdmin):
+    list_display = ('producto', 'almacen', 'cantidad', 'valor_total', 'costo_salidas')
+    search_fields = ('producto__nombre', 'almacen__nombre')
+    list_filter = ('almacen',)
+    readonly_fields = ('producto', 'almacen', 'cantidad', 'valor_total', 'costo_salidas')
+
+@admin.register(CapaCosto)
+class CapaCostoAdmin(admin.ModelAdmin):
+    list_display = ('id', 'producto', 'almacen', 'cantidad_inicial', 'cantidad_disponible', 'costo_unitario')
+    list_filter = ('almacen',)
+    raw_id_fields = ('movimiento',)
+    readonly_fields = ('producto', 'almacen', 'movimiento', 'cantidad_inicial', 'cantidad_disponible', 'costo_unitario')
+
+# 6. Alertas de Stock Bajo (Solo lectura, se mantienen al cambiar Stock)
+@admin.register(AlertaStockBajo)
+class AlertaStockBajoAdmin(admin.ModelAdmin):
+    list_display = ('producto', 'almacen', 'cantidad', 'punto_reorden', 'fecha_apertura')
+    list_filter = ('almacen',)
+    search_fields = ('producto__nombre', 'producto__codigo_sku')
+    readonly_fields = ('producto', 'almacen', 'cantidad', 'punto_reorden', 'fecha_apertura')
+
+# 7. Resumen Diario de Movimientos (Solo lectura, se acumula en cada movimiento)
+@admin.register(ResumenDiarioMovimiento)
+class ResumenDiarioMovimientoAdmin(admin.ModelAdmin):
+    list_display = ('fecha', 'producto', 'almacen', 'tipo_movimiento', 'cantidad', 'movimientos', 'costo_total')
+    list_filter = ('tipo_movimiento', 'almacen')
+    date_hierarchy = 'fecha'
+    readonly_fields = ('fecha', 'producto', 'almacen', 'tipo_movimiento', 'cantidad', 'movimientos', 'costo_total')
+
+# 8. Conteos Físicos (Los detalles se cargan por API; pueden ser decenas de miles)
+@admin.register(ConteoFisico)
+class ConteoFisicoAdmin(admin.ModelAdmin):
+    list_display = ('id', 'almacen', 'descripcion', 'estado', 'fecha_apertura', 'fecha_cierre')
+    list_filter = ('estado', 'almacen')
+    readonly_fields = ('almacen', 'estado', 'fecha_apertura', 'fecha_cierre')
+
+    def has_add_permission(self, request):
+        # Se abren por API para congelar el Stock del almacén (inventario/conteos.py)
+        return False
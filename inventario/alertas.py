@@ -0,0 +1,82 @@
+# Archivo: inventario/alertas.py
+
+from decimal import Decimal
+from functools import reduce
+from operator import or_
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+
+from central.sql import upsert_reemplazando
+from .models import AlertaStockBajo, Stock
+
+# Campos que retorna el upsert de Stock para evaluar alertas sin otra lectura
+CAMPOS_ALERTA = ['producto', 'almacen', 'cantidad', 'punto_reorden']
+
+
+def punto_reorden_por_defecto():
+    """Umbral para los Stock sin punto_reorden propio (settings.HERMES_PUNTO_REORDEN_POR_DEFECTO)."""
+    return Decimal(str(getattr(settings, 'HERMES_PUNTO_REORDEN_POR_DEFECTO', 10)))
+
+
+def actualizar_alertas(filas):
+    """
+    Abre, actualiza o cierra alertas a partir de filas
+    (producto_id, almacen_id, cantidad_anterior, cantidad, punto_reorden).
+
+    Un stock por debajo del umbral abre (o refresca) su alerta con un upsert. Un
+    stock por encima solo cuesta una consulta si venía de estar por debajo
+    (cantidad_anterior None = desconocida, se cierra por si acaso): los movimientos
+    de productos con existencia sana no tocan la tabla de alertas.
+    """
+    defecto = punto_reorden_por_defecto()
+    abrir, cerrar = [], []
+    for producto_id, almacen_id, anterior, cantidad, punto_reorden in filas:
+        umbral = punto_reorden if punto_reorden is not None else defecto
+        if cantidad < umbral:
+            abrir.append((producto_id, almacen_id, cantidad, umbral))
+        elif anterior is None or anterior < umbral:
+            cerrar.append(Q(producto_id=producto_id, almacen_id=almacen_id))
+
+    if abrir:
+        upsert_reemplazando(AlertaStockBajo, ['producto', 'almacen'], ['cantidad', 'punto_reorden'], abrir)
+    if cerrar:
+        AlertaStockBajo.objects.filter(reduce(or_, cerrar)).delete()
+    return len(abrir), len(cerrar)
+
+
+def sincronizar_alertas(stocks=None, tamano_lote=500):
+    """
+    Recalcula las alertas de los Stock indicados (todos si stocks es None). Se usa
+    al cambiar puntos de reorden y para reconstruir la tabla completa.
+    """
+    if stocks is None:
+        stocks = Stock.objects.all()
+    filas = stocks.order_by('pk').values_list('producto_id', 'almacen_id', 'cantidad', 'punto_reorden')
+    lote = []
+    for producto_id, almacen_id, cantidad, punto_reorden in filas.iterator(chunk_size=tamano_lote):
+        lote.append((producto_id, almacen_id, None, cantidad, punto_reorden))
+        if len(lote) >= tamano_lote:
+            actualizar_alertas(lote)
+            lote = []
+    if lote:
+        actualizar_alertas(lote)
+
+
+def fijar_puntos_reorden(filas):
+    """
+    Asigna puntos de reorden (producto_id, almacen_id, punto_reorden o None) con un
+    solo upsert sobre Stock (crea la fila en cero si aún no existe) y ajusta sus alertas.
+    """
+    with transaction.atomic():
+        escritas = upsert_reemplazando(
+            Stock, ['producto', 'almacen'], ['punto_reorden'],
+            [(producto_id, almacen_id, punto, 0) for producto_id, almacen_id, punto in filas],
+            retornar=CAMPOS_ALERTA, insertar=['cantidad'],
+        )
+        actualizar_alertas(
+            (producto_id, almacen_id, None, cantidad, punto)
+            for producto_id, almacen_id, cantidad, punto in escritas
+        )
+    return len(escritas)
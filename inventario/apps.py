@@ -10,4 +10,6 @@ class InventarioConfig(AppConfig):
 
     def ready(self):
         # Importa el archivo de señales cuando la aplicación esté lista
-        import inventario.signals
\ No newline at end of file
+        import inventario.signals
+        # Registra el asiento de costo de venta en el motor de contabilización
+        import inventario.contabilizacion
\ No newline at end of file
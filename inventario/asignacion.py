@@ -0,0 +1,151 @@
+# Archivo: inventario/asignacion.py
+
+import math
+from decimal import Decimal
+from functools import reduce
+from operator import or_
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+
+from central.maestros import almacenes_activos
+from .models import Stock
+
+POLITICAS_ASIGNACION = ('prioridad', 'cercania', 'mayor_stock')
+
+
+class ErrorAsignacion(Exception):
+    """No hay almacenes activos o, en modo estricto, existencias suficientes para una línea."""
+
+
+def politica_asignacion():
+    """Política por defecto (settings.HERMES_POLITICA_ASIGNACION)."""
+    politica = getattr(settings, 'HERMES_POLITICA_ASIGNACION', 'prioridad')
+    if politica not in POLITICAS_ASIGNACION:
+        raise ValueError(
+            f"HERMES_POLITICA_ASIGNACION inválida: '{politica}'. Opciones: {', '.join(POLITICAS_ASIGNACION)}."
+        )
+    return politica
+
+
+def ubicacion(objeto):
+    """(latitud, longitud) de un cliente o almacén; None si le falta alguna coordenada."""
+    if objeto.latitud is None or objeto.longitud is None:
+        return None
+    return objeto.latitud, objeto.longitud
+
+
+def _distancia_km(origen, almacen):
+    """Distancia de círculo máximo (haversine); infinita si falta alguna coordenada."""
+    if origen is None or almacen.latitud is None or almacen.longitud is None:
+        return math.inf
+    lat1, lon1 = (math.radians(float(valor)) for valor in origen)
+    lat2, lon2 = math.radians(float(almacen.latitud)), math.radians(float(almacen.longitud))
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 6371 * 2 * math.asin(math.sqrt(a))
+
+
+def _orden(almacenes, politica, producto_id, disponible, origen):
+    """Almacenes en el orden en que la política los usa para un producto."""
+    if politica == 'mayor_stock':
+        clave = lambda almacen: (-disponible.get((producto_id, almacen.id), 0), almacen.prioridad, almacen.id)
+    elif politica == 'cercania':
+        clave = lambda almacen: (_distancia_km(origen, almacen), almacen.prioridad, almacen.id)
+    else:
+        clave = lambda almacen: (almacen.prioridad, almacen.id)
+    return sorted(almacenes, key=clave)
+
+
+def _planificar(lineas, almacenes, politica, disponible, origenes, estricto):
+    """
+    Reparte cada línea entre almacenes en el orden de la política, consumiendo
+    'disponible' (se modifica). Retorna una lista de [(almacen_id, cantidad)] por línea.
+    """
+    plan = []
+    for (producto_id, cantidad), origen in zip(lineas, origenes):
+        restante, asignado = Decimal(str(cantidad)), []
+        orden = _orden(almacenes, politica, producto_id, disponible, origen)
+        for almacen in orden:
+            if restante <= 0:
+                break
+            existencia = disponible.get((producto_id, almacen.id), Decimal('0'))
+            tomado = min(restante, existencia)
+            if tomado > 0:
+                asignado.append((almacen.id, tomado))
+                disponible[(producto_id, almacen.id)] = existencia - tomado
+                restante -= tomado
+        if restante > 0:
+            if estricto:
+                raise ErrorAsignacion(
+                    f"Existencias insuficientes del producto {producto_id}: faltan {restante} unidades."
+                )
+            # El faltante sale del primer almacén de la política (queda en negativo)
+            primero = orden[0].id
+            asignado = [(almacen_id, tomado + restante if almacen_id == primero else tomado)
+                        for almacen_id, tomado in asignado]
+            if primero not in {almacen_id for almacen_id, _ in asignado}:
+                asignado.insert(0, (primero, restante))
+        plan.append(asignado)
+    return plan
+
+
+def asignar_salidas(lineas, politica=None, origen=None, estricto=None, origenes=None):
+    """
+    Elige el almacén de salida de cada línea [(producto_id, cantidad)] y retorna,
+    alineada con 'lineas', una lista de [(almacen_id, cantidad)] (una línea puede
+    repartirse entre varios almacenes).
+
+    - Una sola lectura de Stock para todos los productos de la factura.
+    - Las filas elegidas se bloquean con SELECT ... FOR UPDATE en orden
+      (producto, almacen), el mismo orden en que escribe registrar_deltas_stock:
+      dos facturas concurrentes nunca se bloquean en orden cruzado.
+    - Si al bloquear una fila cambió su existencia, se vuelve a planificar solo con
+      las filas ya bloqueadas (sin tomar bloqueos nuevos).
+
+    Debe llamarse dentro de la transacción que crea los movimientos, para que los
+    bloqueos duren hasta que se escriba el Stock. 'origen' es (latitud, longitud)
+    del cliente para la política 'cercania'; 'origenes' (alineada con 'lineas')
+    permite asignar de una vez líneas de varias facturas con clientes distintos.
+    """
+    politica = politica or politica_asignacion()
+    if estricto is None:
+        estricto = getattr(settings, 'HERMES_ASIGNACION_ESTRICTA', False)
+    almacenes = almacenes_activos()
+    if not almacenes:
+        raise ErrorAsignacion("No hay almacenes activos para despachar.")
+    if not lineas:
+        return []
+    if origenes is None:
+        origenes = [origen] * len(lineas)
+
+    ids_almacen = [almacen.id for almacen in almacenes]
+    productos = {producto_id for producto_id, _ in lineas}
+    leido = {
+        (producto_id, almacen_id): cantidad
+        for producto_id, almacen_id, cantidad in Stock.objects
+        .filter(producto_id__in=productos, almacen_id__in=ids_almacen, cantidad__gt=0)
+        .values_list('producto_id', 'almacen_id', 'cantidad')
+    }
+    plan = _planificar(lineas, almacenes, politica, dict(leido), origenes, estricto=estricto)
+
+    elegidas = sorted({
+        (producto_id, almacen_id)
+        for (producto_id, _), asignado in zip(lineas, plan)
+        for almacen_id, _ in asignado
+        if (producto_id, almacen_id) in leido
+    })
+    if not elegidas:
+        return plan
+    # Sin savepoint propio: los bloqueos pertenecen a la transacción del llamador
+    with transaction.atomic(savepoint=False):
+        bloqueado = {
+            (producto_id, almacen_id): cantidad
+            for producto_id, almacen_id, cantidad in Stock.objects.select_for_update()
+            .filter(reduce(or_, (Q(producto_id=p, almacen_id=a) for p, a in elegidas)))
+            .order_by('producto_id', 'almacen_id')
+            .values_list('producto_id', 'almacen_id', 'cantidad')
+        }
+    if any(bloqueado.get(clave) != leido[clave] for clave in elegidas):
+        plan = _planificar(lineas, almacenes, politica, dict(bloqueado), origenes, estricto=estricto)
+    return plan
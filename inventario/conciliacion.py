@@ -0,0 +1,103 @@
+# Archivo: inventario/conciliacion.py
+
+from concurrent.futures import ProcessPoolExecutor
+from decimal import Decimal
+
+from django.db import connection, connections, transaction
+from django.db.models import Max, Min, Sum
+
+from .cortes import DELTA_MOVIMIENTO
+from .existencias import registrar_deltas_stock
+from .models import MovimientoInventario, Stock
+
+
+def rangos_de_productos(tamano_rango=2000):
+    """Divide los ids de producto con movimientos o stock en rangos [desde, hasta] de 'tamano_rango' ids."""
+    limites = [
+        modelo.objects.aggregate(minimo=Min('producto_id'), maximo=Max('producto_id'))
+        for modelo in (MovimientoInventario, Stock)
+    ]
+    minimos = [limite['minimo'] for limite in limites if limite['minimo'] is not None]
+    if not minimos:
+        return []
+    minimo, maximo = min(minimos), max(limite['maximo'] for limite in limites if limite['maximo'] is not None)
+    return [(desde, min(desde + tamano_rango - 1, maximo)) for desde in range(minimo, maximo + 1, tamano_rango)]
+
+
+def diferencias_en_rango(desde, hasta, corregir=False):
+    """
+    Compara Stock con la suma de MovimientoInventario para los productos con id en
+    [desde, hasta]. Retorna [(producto_id, almacen_id, esperado, actual)] de las
+    combinaciones que no cuadran.
+
+    En PostgreSQL ambas lecturas se hacen en una transacción REPEATABLE READ: ven
+    la misma foto aunque sigan llegando movimientos. Con corregir=True la
+    diferencia se aplica como delta sobre Stock (registrar_deltas_stock), así que
+    un movimiento confirmado entre la lectura y la corrección no se pierde.
+    """
+    # SET TRANSACTION debe ser la primera sentencia: solo aplica si no hay una transacción abierta
+    foto_consistente = connection.vendor == 'postgresql' and not connection.in_atomic_block
+    with transaction.atomic():
+        if foto_consistente:
+            with connection.cursor() as cursor:
+                cursor.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ")
+        esperado = {
+            (producto_id, almacen_id): cantidad
+            for producto_id, almacen_id, cantidad in MovimientoInventario.objects
+            .filter(producto_id__gte=desde, producto_id__lte=hasta)
+            .order_by()
+            .values('producto_id', 'almacen_id')
+            .annotate(cantidad=Sum(DELTA_MOVIMIENTO))
+            .values_list('producto_id', 'almacen_id', 'cantidad')
+        }
+        actual = {
+            (producto_id, almacen_id): cantidad
+            for producto_id, almacen_id, cantidad in Stock.objects
+            .filter(producto_id__gte=desde, producto_id__lte=hasta)
+            .values_list('producto_id', 'almacen_id', 'cantidad')
+        }
+
+    diferencias = []
+    for clave in sorted(esperado.keys() | actual.keys()):
+        cantidad_esperada = esperado.get(clave) or Decimal('0')
+        cantidad_actual = actual.get(clave) or Decimal('0')
+        if cantidad_esperada != cantidad_actual:
+            diferencias.append(clave + (cantidad_esperada, cantidad_actual))
+
+    if corregir and diferencias:
+        with transaction.atomic():
+            registrar_deltas_stock(
+                (producto_id, almacen_id, cantidad_esperada - cantidad_actual)
+                for producto_id, almacen_id, cantidad_esperada, cantidad_actual in diferencias
+            )
+    return diferencias
+
+
+def _inicializar_proceso():
+    """Cada proceso del pool abre sus propias conexiones (no comparte las del padre)."""
+    import django
+    from django.apps import apps
+    if not apps.ready:
+        django.setup()
+    connections.close_all()
+
+
+def conciliar_stock(tamano_rango=2000, procesos=1, corregir=False):
+    """
+    Recalcula Stock desde MovimientoInventario por rangos de ids de producto,
+    repartidos entre 'procesos' procesos (1 = en este mismo proceso). Retorna la
+    lista completa de diferencias (producto_id, almacen_id, esperado, actual).
+    """
+    rangos = rangos_de_productos(tamano_rango)
+    if procesos <= 1 or len(rangos) <= 1:
+        resultados = [diferencias_en_rango(desde, hasta, corregir) for desde, hasta in rangos]
+    else:
+        # Las conexiones abiertas no deben heredarse a los procesos hijos
+        connections.close_all()
+        with ProcessPoolExecutor(max_workers=procesos, initializer=_inicializar_proceso) as pool:
+            resultados = list(pool.map(
+                diferencias_en_rango,
+                [desde for desde, _ in rangos], [hasta for _, hasta in rangos], [corregir] * len(rangos),
+            ))
+    return [diferencia for resultado in resultados for diferencia in resultado]
+
@@ -0,0 +1,66 @@
+# Archivo: inventario/contabilizacion.py
+
+from decimal import Decimal
+
+from central.contabilizacion import ErrorContabilizacion, registrar_contabilizador
+from central.maestros import cuentas_por_codigo, moneda_principal
+from central.models import CuentaContable, Moneda
+from .models import MovimientoInventario
+
+CUENTA_COSTO_VENTA = '613505'
+CUENTA_INVENTARIO = '143505'
+
+
+def asiento_costo_venta(movimiento):
+    """Solo las SALIDAS ('S') registran Costo de Venta: débito a Costo, crédito a Inventario."""
+    if movimiento.tipo_movimiento != 'S':
+        return None
+    try:
+        moneda_base = moneda_principal()
+    except Moneda.DoesNotExist:
+        raise ErrorContabilizacion(
+            "ERROR DE CONFIGURACIÓN: No hay una moneda marcada como principal (es_principal=True)."
+        )
+    try:
+        cuentas = cuentas_por_codigo(CUENTA_COSTO_VENTA, CUENTA_INVENTARIO)
+    except CuentaContable.DoesNotExist:
+        raise ErrorContabilizacion(
+            "ERROR DE CONFIGURACIÓN: Faltan cuentas contables críticas (613505 para Costo de Venta o 143505 para Inventario)."
+        )
+
+    # Costo calculado por el motor de valorización (promedio o PEPS, ver inventario/valorizacion.py).
+    # Una salida valorizada cuando el producto no tenía costo toma el costo actual del
+    # producto: así un reintento tras corregirlo sí se contabiliza.
+    costo_total = movimiento.costo_total
+    if costo_total is None and movimiento.producto.costo_unitario is not None:
+        costo_total = Decimal(str(movimiento.producto.costo_unitario)) * Decimal(str(movimiento.cantidad))
+    if costo_total is None:
+        raise ErrorContabilizacion(
+            f"El producto '{movimiento.producto.nombre}' no tiene costo unitario definido. No se puede registrar el costo de venta."
+        )
+    costo_total = costo_total.quantize(Decimal('0.01'))
+
+    return {
+        'fecha': movimiento.fecha,
+        'referencia': f"Costo-Venta-{movimiento.referencia_doc}-{movimiento.id}",
+        'descripcion': f"Registro automático de costo de venta para {movimiento.referencia_doc}",
+        'entidad_id': None,
+        'moneda_id': moneda_base.id,
+        'movimientos': [
+            (cuentas[CUENTA_COSTO_VENTA].id, 'D', costo_total),
+            (cuentas[CUENTA_INVENTARIO].id, 'C', costo_total),
+        ],
+    }
+
+
+def salidas_pendientes():
+    return (
+        MovimientoInventario.objects
+        .filter(tipo_movimiento='S', asiento_contable_nucleo__isnull=True)
+        .select_related('producto')
+    )
+
+
+registrar_contabilizador(
+    'inventario', MovimientoInventario, asiento_costo_venta, 'asiento_contable_nucleo', salidas_pendientes
+)
@@ -0,0 +1,164 @@
+# Archivo: inventario/conteos.py
+
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Case, Count, DecimalField, F, Q, Sum, Value, When
+from django.utils import timezone
+
+from central.models import Producto
+from central.sql import upsert_reemplazando
+from .existencias import crear_movimientos
+from .models import ConteoFisico, ConteoFisicoDetalle, Stock
+
+
+class ErrorConteo(Exception):
+    """Operación inválida sobre un conteo físico (estado, productos inexistentes)."""
+
+
+def _conteo_abierto(conteo_id, bloquear=False):
+    conteos = ConteoFisico.objects.select_for_update() if bloquear else ConteoFisico.objects
+    try:
+        conteo = conteos.get(pk=conteo_id)
+    except ConteoFisico.DoesNotExist:
+        raise ErrorConteo(f"El conteo {conteo_id} no existe.")
+    if conteo.estado != 'A':
+        raise ErrorConteo(f"El conteo {conteo_id} está {conteo.get_estado_display().lower()}.")
+    return conteo
+
+
+def abrir_conteo(almacen_id, descripcion='', tamano_lote=1000):
+    """
+    Abre un conteo del almacén y congela su Stock actual: una fila de detalle por
+    SKU con cantidad_sistema. Las diferencias se calculan siempre contra esta foto.
+    Los movimientos registrados mientras el conteo está abierto no la modifican,
+    así que conviene contar con el almacén detenido.
+    """
+    with transaction.atomic():
+        conteo = ConteoFisico.objects.create(almacen_id=almacen_id, descripcion=descripcion)
+        existencias = (
+            Stock.objects.filter(almacen_id=almacen_id)
+            .order_by()
+            .values_list('producto_id', 'cantidad')
+        )
+        lote = []
+        for producto_id, cantidad in existencias.iterator(chunk_size=tamano_lote):
+            lote.append(ConteoFisicoDetalle(conteo=conteo, producto_id=producto_id, cantidad_sistema=cantidad))
+            if len(lote) >= tamano_lote:
+                ConteoFisicoDetalle.objects.bulk_create(lote)
+                lote = []
+        if lote:
+            ConteoFisicoDetalle.objects.bulk_create(lote)
+    return conteo
+
+
+def registrar_conteo(conteo_id, filas):
+    """
+    Carga cantidades contadas [(producto_id, cantidad)] con un upsert por lote. Un
+    SKU repetido en la misma carga se suma (varios escaneos); una carga posterior
+    del mismo SKU reemplaza lo contado. Los SKU que no estaban en Stock se agregan
+    con cantidad_sistema 0. Retorna el número de SKU escritos.
+    """
+    contado = defaultdict(Decimal)
+    for producto_id, cantidad in filas:
+        contado[producto_id] += Decimal(str(cantidad))
+    if not contado:
+        return 0
+
+    faltantes = set(contado) - set(Producto.objects.filter(pk__in=contado).values_list('pk', flat=True))
+    if faltantes:
+        raise ErrorConteo(f"Productos inexistentes: {sorted(faltantes)}.")
+    with transaction.atomic():
+        # Bloquea el conteo: una carga no se cruza con su cierre o cancelación
+        conteo = _conteo_abierto(conteo_id, bloquear=True)
+        return upsert_reemplazando(
+            ConteoFisicoDetalle, ['conteo', 'producto'], ['cantidad_contada'],
+            [(conteo.pk, producto_id, cantidad, 0) for producto_id, cantidad in contado.items()],
+            insertar=['cantidad_sistema'],
+        )
+
+
+def _diferencia(omitidos_en_cero=False):
+    """Expresión contado - sistema; los SKU no contados quedan sin diferencia (o en -sistema)."""
+    sin_contar = -F('cantidad_sistema') if omitidos_en_cero else Value(None)
+    return Case(
+        When(cantidad_contada__isnull=False, then=F('cantidad_contada') - F('cantidad_sistema')),
+        default=sin_contar,
+        output_field=DecimalField(max_digits=10, decimal_places=2),
+    )
+
+
+def calcular_diferencias(conteo_id, omitidos_en_cero=False):
+    """
+    Calcula la diferencia (contado - sistema) de todos los SKU del conteo con un
+    solo UPDATE en la base de datos. Los SKU no contados quedan sin diferencia,
+    salvo con omitidos_en_cero=True (conteo completo: lo no contado no existe).
+    """
+    return ConteoFisicoDetalle.objects.filter(conteo_id=conteo_id).update(
+        diferencia=_diferencia(omitidos_en_cero)
+    )
+
+
+def detalles_conteo(conteo):
+    """
+    Detalles del conteo con 'diferencia_actual': la guardada al cerrar o, con el
+    conteo abierto, contado - sistema calculado en la misma consulta (sin escribir).
+    """
+    diferencia = _diferencia() if conteo.estado == 'A' else F('diferencia')
+    return ConteoFisicoDetalle.objects.filter(conteo_id=conteo.pk).annotate(diferencia_actual=diferencia)
+
+
+def resumen_conteo(conteo):
+    """Totales del conteo: SKU congelados, contados, con diferencia y unidades sobrantes/faltantes."""
+    return detalles_conteo(conteo).aggregate(
+        skus=Count('id'),
+        contados=Count('id', filter=Q(cantidad_contada__isnull=False)),
+        con_diferencia=Count('id', filter=~Q(diferencia_actual=0) & Q(diferencia_actual__isnull=False)),
+        sobrantes=Sum('diferencia_actual', filter=Q(diferencia_actual__gt=0), default=Decimal('0')),
+        faltantes=Sum('diferencia_actual', filter=Q(diferencia_actual__lt=0), default=Decimal('0')),
+    )
+
+
+def cerrar_conteo(conteo_id, omitidos_en_cero=False):
+    """
+    Calcula las diferencias y publica los ajustes distintos de cero como un solo
+    lote de MovimientoInventario (entradas por sobrante, salidas por faltante,
+    referencia CONTEO-<id>) vía crear_movimientos. Todo en una transacción: si el
+    lote falla, el conteo sigue abierto. Retorna el resumen del conteo.
+    """
+    with transaction.atomic():
+        conteo = _conteo_abierto(conteo_id, bloquear=True)
+        calcular_diferencias(conteo.pk, omitidos_en_cero=omitidos_en_cero)
+        ajustes = (
+            ConteoFisicoDetalle.objects.filter(conteo=conteo, diferencia__isnull=False)
+            .exclude(diferencia=0)
+            .order_by('producto_id')
+            .values_list('producto_id', 'diferencia')
+        )
+        datos = [
+            {
+                'tipo_movimiento': 'E' if diferencia > 0 else 'S',
+                'producto': producto_id,
+                'almacen': conteo.almacen_id,
+                'cantidad': abs(diferencia),
+                'referencia_doc': conteo.referencia,
+            }
+            for producto_id, diferencia in ajustes
+        ]
+        if datos:
+            crear_movimientos(datos)
+        conteo.estado = 'C'
+        conteo.fecha_cierre = timezone.now()
+        conteo.save(update_fields=['estado', 'fecha_cierre'])
+    return dict(resumen_conteo(conteo), ajustes=len(datos))
+
+
+def cancelar_conteo(conteo_id):
+    """Descarta un conteo abierto sin generar ajustes."""
+    with transaction.atomic():
+        conteo = _conteo_abierto(conteo_id, bloquear=True)
+        conteo.estado = 'X'
+        conteo.fecha_cierre = timezone.now()
+        conteo.save(update_fields=['estado', 'fecha_cierre'])
+    return conteo
@@ -0,0 +1,105 @@
+# Archivo: inventario/cortes.py
+
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Case, DecimalField, F, Sum, Value, When
+from django.db.models.functions import Coalesce
+
+from .models import CorteStock, CorteStockDetalle, MovimientoInventario
+
+# Variación con signo de cada movimiento (entradas suman, salidas restan), calculada en la base de datos
+DELTA_MOVIMIENTO = Case(
+    When(tipo_movimiento='E', then=F('cantidad')),
+    When(tipo_movimiento='S', then=-F('cantidad')),
+    default=0,
+    output_field=DecimalField(max_digits=14, decimal_places=2),
+)
+
+# Variación con signo del valor del inventario (costo de entradas menos costo de salidas)
+DELTA_VALOR = Case(
+    When(tipo_movimiento='E', then=Coalesce(F('costo_total'), Value(Decimal('0')))),
+    When(tipo_movimiento='S', then=-Coalesce(F('costo_total'), Value(Decimal('0')))),
+    default=Value(Decimal('0')),
+    output_field=DecimalField(max_digits=18, decimal_places=4),
+)
+
+
+def corte_anterior(fecha):
+    """Corte más reciente con fecha <= 'fecha' (None si no hay ninguno)."""
+    return CorteStock.objects.filter(fecha__lte=fecha).order_by('-fecha').first()
+
+
+def saldos_a_fecha(fecha, productos=None, almacenes=None):
+    """
+    Existencias y su valor al cierre de 'fecha' como
+    {(producto_id, almacen_id): (cantidad, valor)}.
+
+    Parte del corte más cercano anterior y suma solo los movimientos posteriores
+    a él (agrupados en la base de datos), así que el costo depende de la distancia
+    al último corte y no del tamaño total de MovimientoInventario.
+    Las combinaciones que tuvieron movimientos se incluyen aunque su existencia sea
+    cero (el corte también las guarda); solo se omiten las que nunca tuvieron stock.
+    """
+    corte = corte_anterior(fecha)
+    existencias = defaultdict(Decimal)
+    valores = defaultdict(Decimal)
+
+    movimientos = MovimientoInventario.objects.filter(fecha__lte=fecha)
+    if corte is not None:
+        detalles = corte.detalles.all()
+        if productos is not None:
+            detalles = detalles.filter(producto_id__in=productos)
+        if almacenes is not None:
+            detalles = detalles.filter(almacen_id__in=almacenes)
+        for producto_id, almacen_id, cantidad, valor in detalles.values_list(
+            'producto_id', 'almacen_id', 'cantidad', 'valor'
+        ):
+            existencias[(producto_id, almacen_id)] += cantidad
+            valores[(producto_id, almacen_id)] += valor
+        movimientos = movimientos.filter(fecha__gt=corte.fecha)
+
+    if productos is not None:
+        movimientos = movimientos.filter(producto_id__in=productos)
+    if almacenes is not None:
+        movimientos = movimientos.filter(almacen_id__in=almacenes)
+    deltas = (
+        movimientos
+        .order_by()
+        .values('producto_id', 'almacen_id')
+        .annotate(delta=Sum(DELTA_MOVIMIENTO), delta_valor=Sum(DELTA_VALOR))
+        .values_list('producto_id', 'almacen_id', 'delta', 'delta_valor')
+    )
+    for producto_id, almacen_id, delta, delta_valor in deltas:
+        existencias[(producto_id, almacen_id)] += delta
+        valores[(producto_id, almacen_id)] += delta_valor
+
+    return {clave: (cantidad, valores[clave]) for clave, cantidad in existencias.items()}
+
+
+def stock_a_fecha(fecha, productos=None, almacenes=None):
+    """Existencias al cierre de 'fecha' como {(producto_id, almacen_id): cantidad} (ver saldos_a_fecha)."""
+    return {
+        clave: cantidad for clave, (cantidad, _) in saldos_a_fecha(fecha, productos, almacenes).items()
+    }
+
+
+def generar_corte(fecha, tamano_lote=1000):
+    """
+    Escribe (o reemplaza) el corte al cierre de 'fecha'. Debe ejecutarse para días
+    ya cerrados: un movimiento registrado después con la misma fecha no quedaría
+    incluido. Retorna el CorteStock creado.
+    """
+    with transaction.atomic():
+        # Se borra primero para recalcular desde el corte anterior, no desde el que se reemplaza
+        CorteStock.objects.filter(fecha=fecha).delete()
+        saldos = saldos_a_fecha(fecha)
+        corte = CorteStock.objects.create(fecha=fecha)
+        CorteStockDetalle.objects.bulk_create([
+            CorteStockDetalle(
+                corte=corte, producto_id=producto_id, almacen_id=almacen_id, cantidad=cantidad, valor=valor
+            )
+            for (producto_id, almacen_id), (cantidad, valor) in saldos.items()
+        ], batch_size=tamano_lote)
+    return corte
@@ -0,0 +1,87 @@
+# Archivo: inventario/disponibilidad.py
+
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from central.maestros import ttl_maestros
+from central.models import Producto
+
+
+def _clave_sku(sku):
+    return f"hermes:disponibilidad:sku:{sku}"
+
+
+def _clave_producto(producto_id):
+    return f"hermes:disponibilidad:producto:{producto_id}"
+
+
+def ttl_disponibilidad():
+    """Segundos que una existencia puede servirse del caché (settings.HERMES_DISPONIBILIDAD_TTL)."""
+    return getattr(settings, 'HERMES_DISPONIBILIDAD_TTL', 5)
+
+
+def invalidar_disponibilidad(productos):
+    """
+    Descarta del caché la disponibilidad de 'productos' (ids), ahora y al confirmar
+    la transacción: ninguna lectura hecha antes del COMMIT sobrevive a él.
+    """
+    claves = [_clave_producto(producto_id) for producto_id in set(productos)]
+    if claves:
+        cache.delete_many(claves)
+        transaction.on_commit(lambda: cache.delete_many(claves))
+
+
+def disponibilidad_por_sku(skus):
+    """
+    Existencias por almacén de varios SKU en una sola consulta (solo para los que
+    no están en caché). Retorna (disponibles, no_encontrados), con
+    disponibles = {sku: {'producto', 'total', 'almacenes': {almacen_id: cantidad}}}.
+
+    El caché (settings.CACHES) guarda dos entradas:
+    - sku -> id de producto, por HERMES_MAESTROS_TTL segundos (los SKU casi nunca cambian).
+    - id de producto -> existencias, por HERMES_DISPONIBILIDAD_TTL segundos; se
+      borra cada vez que cambia su Stock (registrar_deltas_stock). El TTL solo acota
+      la carrera entre una lectura y un COMMIT simultáneo y, con un caché por proceso
+      (LocMemCache), el tiempo que otro worker puede servir existencias viejas.
+    Cada entrada de existencias recuerda su SKU: si el producto cambió de código,
+    la entrada no se usa y el SKU se vuelve a resolver en la base de datos.
+    """
+    skus = list(dict.fromkeys(skus))
+    ids = cache.get_many([_clave_sku(sku) for sku in skus])
+    por_sku = {sku: ids[_clave_sku(sku)] for sku in skus if _clave_sku(sku) in ids}
+    en_cache = cache.get_many([_clave_producto(producto_id) for producto_id in por_sku.values()])
+
+    disponibles = {}
+    for sku, producto_id in por_sku.items():
+        datos = en_cache.get(_clave_producto(producto_id))
+        if datos is not None and datos['sku'] == sku:
+            disponibles[sku] = datos
+
+    faltantes = [sku for sku in skus if sku not in disponibles]
+    if faltantes:
+        # LEFT JOIN producto -> stock: los productos sin Stock vuelven con almacén None
+        leidos = {}
+        for sku, producto_id, almacen_id, cantidad in (
+            Producto.objects.filter(codigo_sku__in=faltantes)
+            .order_by()
+            .values_list('codigo_sku', 'id', 'stock__almacen_id', 'stock__cantidad')
+        ):
+            datos = leidos.setdefault(sku, {'sku': sku, 'producto': producto_id, 'total': Decimal('0'), 'almacenes': {}})
+            if almacen_id is not None:
+                datos['almacenes'][almacen_id] = cantidad
+                datos['total'] += cantidad
+        cache.set_many({_clave_sku(sku): datos['producto'] for sku, datos in leidos.items()}, timeout=ttl_maestros())
+        cache.set_many(
+            {_clave_producto(datos['producto']): datos for datos in leidos.values()}, timeout=ttl_disponibilidad()
+        )
+        disponibles.update(leidos)
+
+    resultado = {
+        sku: {'producto': disponibles[sku]['producto'], 'total': disponibles[sku]['total'],
+              'almacenes': disponibles[sku]['almacenes']}
+        for sku in skus if sku in disponibles
+    }
+    return resultado, [sku for sku in skus if sku not in disponibles]
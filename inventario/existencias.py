@@ -0,0 +1,120 @@
+# Archivo: inventario/existencias.py
+
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import transaction
+
+from central.bandeja import contabilizar_o_encolar
+from central.models import Producto
+from central.sql import upsert_sumando
+from .alertas import CAMPOS_ALERTA, actualizar_alertas
+from .disponibilidad import invalidar_disponibilidad
+from .models import Almacen, MovimientoInventario, Stock
+from .resumenes import registrar_resumen_diario
+from .valorizacion import valorizar_movimientos
+
+# Signo con el que cada tipo de movimiento afecta la existencia
+SIGNO_MOVIMIENTO = {'E': 1, 'S': -1}
+
+
+def delta_de_movimiento(movimiento):
+    """Variación de existencia de un movimiento: (producto_id, almacen_id, cantidad con signo)."""
+    signo = SIGNO_MOVIMIENTO.get(movimiento.tipo_movimiento, 0)
+    return movimiento.producto_id, movimiento.almacen_id, Decimal(str(movimiento.cantidad)) * signo
+
+
+def registrar_deltas_stock(deltas):
+    """
+    Aplica variaciones (producto_id, almacen_id, delta) a Stock con un único upsert
+    por lote:
+
+        INSERT ... ON CONFLICT (producto, almacen) DO UPDATE SET cantidad = cantidad + EXCLUDED.cantidad
+
+    La suma la hace la base de datos sobre la fila bloqueada, así que dos movimientos
+    concurrentes del mismo producto/almacén nunca se pisan (no hay lectura previa).
+    Las variaciones del mismo producto/almacén se agrupan antes de escribir, las
+    alertas de stock bajo se abren o cierran según el resultado y la disponibilidad
+    en caché de esos productos se descarta.
+    """
+    acumulado = defaultdict(Decimal)
+    for producto_id, almacen_id, delta in deltas:
+        acumulado[(producto_id, almacen_id)] += Decimal(str(delta))
+    escritas = upsert_sumando(
+        Stock, ['producto', 'almacen'], ['cantidad'],
+        [clave + (delta,) for clave, delta in acumulado.items()],
+        retornar=CAMPOS_ALERTA,
+    )
+    # El mismo upsert retorna la existencia nueva: las alertas se ajustan sin releer Stock
+    actualizar_alertas(
+        (producto_id, almacen_id, cantidad - acumulado[(producto_id, almacen_id)], cantidad, punto_reorden)
+        for producto_id, almacen_id, cantidad, punto_reorden in escritas
+    )
+    invalidar_disponibilidad(producto_id for producto_id, _ in acumulado)
+    return len(escritas)
+
+
+def registrar_movimientos_stock(movimientos):
+    """Aplica a Stock una lista de MovimientoInventario ya guardados."""
+    return registrar_deltas_stock(delta_de_movimiento(movimiento) for movimiento in movimientos)
+
+
+class ErrorMovimientos(Exception):
+    """Un lote de movimientos hace referencia a productos o almacenes inexistentes."""
+
+
+def validar_referencias(datos):
+    """Verifica en dos consultas que existan todos los productos y almacenes de 'datos'."""
+    productos = {dato['producto'] for dato in datos}
+    almacenes = {dato['almacen'] for dato in datos}
+    faltantes_productos = productos - set(Producto.objects.filter(pk__in=productos).values_list('pk', flat=True))
+    faltantes_almacenes = almacenes - set(Almacen.objects.filter(pk__in=almacenes).values_list('pk', flat=True))
+    if faltantes_productos or faltantes_almacenes:
+        raise ErrorMovimientos(
+            f"Productos inexistentes: {sorted(faltantes_productos)}. Almacenes inexistentes: {sorted(faltantes_almacenes)}."
+        )
+
+
+def crear_movimientos(datos, contabilizar=True):
+    """
+    Crea un lote de movimientos con un solo bulk_create y aplica su efecto en Stock
+    con un upsert por (producto, almacen) distinto, en lugar de un Signal por línea.
+    El estado final de Stock es el mismo que si se hubieran creado uno a uno.
+
+    Cada elemento de 'datos' es un dict con tipo_movimiento, producto (id),
+    almacen (id), cantidad, referencia_doc y opcionalmente costo_unitario y
+    costo_total (una entrada con costo_total se valoriza por ese valor). El lote
+    se valoriza completo y las salidas se contabilizan en el mismo lote (o se
+    encolan en modo diferido). Con contabilizar=False las salidas quedan pendientes
+    para contabilizar_pendientes, como las creadas por el Signal. Lanza
+    ErrorMovimientos si falta algún producto o almacén; ErrorContabilizacion aborta
+    el lote completo.
+    """
+    validar_referencias(datos)
+
+    with transaction.atomic():
+        movimientos = MovimientoInventario.objects.bulk_create([
+            MovimientoInventario(
+                tipo_movimiento=dato['tipo_movimiento'],
+                producto_id=dato['producto'],
+                almacen_id=dato['almacen'],
+                cantidad=dato['cantidad'],
+                costo_unitario=dato.get('costo_unitario'),
+                costo_total=dato.get('costo_total'),
+                referencia_doc=dato['referencia_doc'],
+            )
+            for dato in datos
+        ], batch_size=1000)
+        registrar_movimientos_stock(movimientos)
+        valorizar_movimientos(movimientos)
+        registrar_resumen_diario(movimientos)
+
+        salidas = [movimiento for movimiento in movimientos if movimiento.tipo_movimiento == 'S']
+        if contabilizar and salidas:
+            # El generador del asiento de costo de venta usa el producto (nombre y costo de respaldo)
+            por_id = Producto.objects.in_bulk({movimiento.producto_id for movimiento in salidas})
+            for movimiento in salidas:
+                movimiento.producto = por_id[movimiento.producto_id]
+            contabilizar_o_encolar('inventario', salidas)
+
+    return movimientos
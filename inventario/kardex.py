@@ -0,0 +1,117 @@
+# Archivo: inventario/kardex.py
+
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.db.models import F, Q, Sum, Window
+
+from .cortes import DELTA_MOVIMIENTO, DELTA_VALOR, saldos_a_fecha
+from .models import MovimientoInventario
+
+CAMPOS_KARDEX = ['id', 'fecha', 'tipo_movimiento', 'almacen_id', 'cantidad', 'referencia_doc',
+                 'costo_unitario', 'costo_total']
+
+
+def _movimientos(producto_id, almacen_id=None, desde=None, hasta=None):
+    movimientos = MovimientoInventario.objects.filter(producto_id=producto_id)
+    if almacen_id is not None:
+        movimientos = movimientos.filter(almacen_id=almacen_id)
+    if desde is not None:
+        movimientos = movimientos.filter(fecha__gte=desde)
+    if hasta is not None:
+        movimientos = movimientos.filter(fecha__lte=hasta)
+    return movimientos
+
+
+def saldo_inicial(producto_id, almacen_id=None, desde=None):
+    """
+    (cantidad, valor) al cierre del día anterior a 'desde'. Ambos parten del corte
+    de stock más cercano y suman solo los movimientos posteriores a él.
+    """
+    if desde is None:
+        return Decimal('0'), Decimal('0')
+    saldos = saldos_a_fecha(
+        desde - timedelta(days=1), productos=[producto_id],
+        almacenes=[almacen_id] if almacen_id is not None else None,
+    )
+    cantidad = sum((cantidad for cantidad, _ in saldos.values()), Decimal('0'))
+    valor = sum((valor for _, valor in saldos.values()), Decimal('0'))
+    return cantidad, valor
+
+
+def kardex(producto_id, almacen_id=None, desde=None, hasta=None, cursor=None, tamano=50):
+    """
+    Una página del kardex del producto: movimientos en orden (fecha, id) con el
+    saldo y el valor acumulados después de cada uno.
+
+    Los acumulados se calculan en la base de datos con SUM(...) OVER (ORDER BY
+    fecha, id) sobre las filas de la página. El cursor (dict con 'v' = [fecha, id]
+    de la fila límite, 's'/'c' = saldo y valor en ese punto y 'r' = 1 hacia atrás)
+    arrastra el saldo entre páginas: ninguna página vuelve a sumar el historial y
+    cada una cuesta lo mismo gracias al índice (producto, fecha, id).
+
+    Retorna {'saldo_inicial', 'valor_inicial', 'filas', 'siguiente', 'anterior'},
+    donde 'siguiente'/'anterior' son los cursores de las páginas vecinas o None.
+    """
+    movimientos = _movimientos(producto_id, almacen_id, desde, hasta)
+    hacia_atras = bool(cursor and cursor.get('r'))
+    if cursor:
+        try:
+            fecha, pk = cursor['v']
+            fecha = date.fromisoformat(fecha) if isinstance(fecha, str) else fecha
+            pk = int(pk)
+            saldo, valor = Decimal(str(cursor['s'])), Decimal(str(cursor['c']))
+        except (KeyError, TypeError, ValueError, ArithmeticError):
+            raise ValueError("Cursor de kardex inválido.")
+        if hacia_atras:
+            movimientos = movimientos.filter(Q(fecha__lt=fecha) | Q(fecha=fecha, id__lt=pk))
+        else:
+            movimientos = movimientos.filter(Q(fecha__gt=fecha) | Q(fecha=fecha, id__gt=pk))
+    else:
+        saldo, valor = saldo_inicial(producto_id, almacen_id, desde)
+
+    orden = [F('fecha').desc(), F('id').desc()] if hacia_atras else [F('fecha').asc(), F('id').asc()]
+    filas = list(
+        movimientos
+        .annotate(
+            delta=DELTA_MOVIMIENTO,
+            delta_valor=DELTA_VALOR,
+            acumulado=Window(Sum(DELTA_MOVIMIENTO), order_by=orden),
+            acumulado_valor=Window(Sum(DELTA_VALOR), order_by=orden),
+        )
+        .order_by(*orden)
+        .values(*CAMPOS_KARDEX, 'delta', 'delta_valor', 'acumulado', 'acumulado_valor')[:tamano + 1]
+    )
+    hay_mas = len(filas) > tamano
+    filas = filas[:tamano]
+
+    for fila in filas:
+        if hacia_atras:
+            # El cursor trae el saldo antes de la fila límite: se descuenta lo posterior a cada fila
+            fila['saldo'] = saldo - fila['acumulado'] + fila['delta']
+            fila['valor'] = valor - fila['acumulado_valor'] + fila['delta_valor']
+        else:
+            fila['saldo'] = saldo + fila['acumulado']
+            fila['valor'] = valor + fila['acumulado_valor']
+    if hacia_atras:
+        filas.reverse()
+
+    # Saldo y valor justo antes de la primera fila de la página
+    if filas:
+        saldo = filas[0]['saldo'] - filas[0]['delta']
+        valor = filas[0]['valor'] - filas[0]['delta_valor']
+
+    siguiente = anterior = None
+    if filas:
+        ultima = filas[-1]
+        if hay_mas if not hacia_atras else bool(cursor):
+            siguiente = {'v': [ultima['fecha'], ultima['id']], 's': ultima['saldo'], 'c': ultima['valor'], 'r': 0}
+        if bool(cursor) if not hacia_atras else hay_mas:
+            anterior = {'v': [filas[0]['fecha'], filas[0]['id']], 's': saldo, 'c': valor, 'r': 1}
+
+    for fila in filas:
+        fila['entrada'] = fila['cantidad'] if fila['tipo_movimiento'] == 'E' else Decimal('0')
+        fila['salida'] = fila['cantidad'] if fila['tipo_movimiento'] == 'S' else Decimal('0')
+        for auxiliar in ('delta', 'delta_valor', 'acumulado', 'acumulado_valor'):
+            del fila[auxiliar]
+    return {'saldo_inicial': saldo, 'valor_inicial': valor, 'filas': filas, 'siguiente': siguiente, 'anterior': anterior}
@@ -0,0 +1,46 @@
+# Archivo: inventario/management/commands/conciliar_stock.py
+
+import os
+import time
+
+from django.core.management.base import BaseCommand
+
+from inventario.conciliacion import conciliar_stock
+
+
+class Command(BaseCommand):
+    help = (
+        "Recalcula la existencia esperada por producto y almacén desde MovimientoInventario "
+        "y la compara con Stock. Con --corregir ajusta Stock a lo que indican los movimientos."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rango', type=int, default=2000, help="Ids de producto por tarea.")
+        parser.add_argument('--procesos', type=int, default=os.cpu_count() or 1,
+                            help="Procesos en paralelo (1 = sin pool).")
+        parser.add_argument('--corregir', action='store_true',
+                            help="Aplicar las diferencias a Stock (por defecto solo se informan).")
+        parser.add_argument('--mostrar', type=int, default=50, help="Diferencias a listar en la salida.")
+
+    def handle(self, *args, **options):
+        inicio = time.monotonic()
+        diferencias = conciliar_stock(
+            tamano_rango=options['rango'], procesos=options['procesos'], corregir=options['corregir']
+        )
+        for producto_id, almacen_id, esperado, actual in diferencias[:options['mostrar']]:
+            self.stdout.write(
+                f"  Producto {producto_id} / Almacén {almacen_id}: Stock {actual}, movimientos {esperado} "
+                f"(diferencia {esperado - actual})"
+            )
+        if len(diferencias) > options['mostrar']:
+            self.stdout.write(f"  ... y {len(diferencias) - options['mostrar']} más.")
+
+        segundos = time.monotonic() - inicio
+        if not diferencias:
+            self.stdout.write(self.style.SUCCESS(f"✅ Stock cuadra con los movimientos ({segundos:.1f}s)."))
+        elif options['corregir']:
+            self.stdout.write(self.style.SUCCESS(f"✅ {len(diferencias)} existencias corregidas ({segundos:.1f}s)."))
+        else:
+            self.stdout.write(self.style.WARNING(
+                f"⚠️ {len(diferencias)} existencias no cuadran ({segundos:.1f}s). Use --corregir para ajustarlas."
+            ))
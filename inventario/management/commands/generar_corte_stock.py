@@ -0,0 +1,33 @@
+# Archivo: inventario/management/commands/generar_corte_stock.py
+
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from inventario.cortes import generar_corte
+
+
+class Command(BaseCommand):
+    help = (
+        "Genera el corte de stock (snapshot) al cierre de un día. Pensado para ejecutarse "
+        "a diario desde cron; por defecto usa el día de ayer."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--fecha', help="Día del corte (AAAA-MM-DD). Por defecto, ayer.")
+        parser.add_argument('--lote', type=int, default=1000, help="Filas por bulk_create.")
+
+    def handle(self, *args, **options):
+        if options['fecha']:
+            try:
+                fecha = date.fromisoformat(options['fecha'])
+            except ValueError:
+                raise CommandError("La fecha debe tener el formato AAAA-MM-DD.")
+        else:
+            fecha = timezone.localdate() - timedelta(days=1)
+
+        corte = generar_corte(fecha, tamano_lote=options['lote'])
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Corte de stock al {corte.fecha}: {corte.detalles.count()} existencias."
+        ))
@@ -0,0 +1,22 @@
+# Archivo: inventario/management/commands/reconstruir_alertas_stock.py
+
+from django.core.management.base import BaseCommand
+
+from inventario.alertas import sincronizar_alertas
+from inventario.models import AlertaStockBajo
+
+
+class Command(BaseCommand):
+    help = (
+        "Recalcula la tabla de alertas de stock bajo desde Stock. Solo es necesario tras "
+        "cambiar HERMES_PUNTO_REORDEN_POR_DEFECTO o cargar Stock sin pasar por el ORM."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--lote', type=int, default=500, help="Filas de Stock por lote.")
+
+    def handle(self, *args, **options):
+        sincronizar_alertas(tamano_lote=options['lote'])
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Alertas de stock bajo abiertas: {AlertaStockBajo.objects.count()}."
+        ))
@@ -0,0 +1,29 @@
+# Archivo: inventario/management/commands/reconstruir_resumen_movimientos.py
+
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from inventario.resumenes import reconstruir_resumen_diario
+
+
+class Command(BaseCommand):
+    help = (
+        "Recalcula el resumen diario de movimientos desde MovimientoInventario. Sin fechas "
+        "reconstruye todo el historial (carga inicial); con --desde/--hasta, solo esos días."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--desde', help="Primer día a recalcular (AAAA-MM-DD).")
+        parser.add_argument('--hasta', help="Último día a recalcular (AAAA-MM-DD).")
+        parser.add_argument('--lote', type=int, default=1000, help="Filas por bulk_create.")
+
+    def handle(self, *args, **options):
+        try:
+            desde = date.fromisoformat(options['desde']) if options['desde'] else None
+            hasta = date.fromisoformat(options['hasta']) if options['hasta'] else None
+        except ValueError:
+            raise CommandError("Las fechas deben tener el formato AAAA-MM-DD.")
+
+        escritas = reconstruir_resumen_diario(desde, hasta, tamano_lote=options['lote'])
+        self.stdout.write(self.style.SUCCESS(f"✅ Resumen diario reconstruido: {escritas} filas."))
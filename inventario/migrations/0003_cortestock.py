@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-17 16:45
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('central', '0006_serienumeracion'),
+        ('inventario', '0002_indice_keyset_movimientos'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CorteStock',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('fecha', models.DateField(help_text='Incluye todos los movimientos hasta este día, inclusive.', unique=True, verbose_name='Fecha de Corte')),
+                ('fecha_creacion', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Corte de Stock',
+                'verbose_name_plural': 'Cortes de Stock',
+                'ordering': ['-fecha'],
+            },
+        ),
+        migrations.CreateModel(
+            name='CorteStockDetalle',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('cantidad', models.DecimalField(decimal_places=2, max_digits=12, verbose_name='Cantidad al Corte')),
+                ('almacen', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, to='inventario.almacen', verbose_name='Almacén')),
+                ('corte', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='detalles', to='inventario.cortestock', verbose_name='Corte')),
+                ('producto', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, to='central.producto', verbose_name='Producto')),
+            ],
+            options={
+                'verbose_name': 'Detalle de Corte de Stock',
+                'verbose_name_plural': 'Detalles de Cortes de Stock',
+                'unique_together': {('corte', 'producto', 'almacen')},
+            },
+        ),
+    ]
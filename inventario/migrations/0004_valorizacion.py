@@ -0,0 +1,81 @@
+# Generated by Django 5.2.18 on 2026-10-17 17:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def valorizar_stock_existente(apps, schema_editor):
+    """Valoriza las existencias actuales al costo del producto y abre una capa PEPS por cada una."""
+    Stock = apps.get_model('inventario', 'Stock')
+    ValorizacionStock = apps.get_model('inventario', 'ValorizacionStock')
+    CapaCosto = apps.get_model('inventario', 'CapaCosto')
+    valorizaciones, capas = [], []
+    for stock in Stock.objects.select_related('producto').iterator():
+        costo = stock.producto.costo_unitario or 0
+        valorizaciones.append(ValorizacionStock(
+            producto_id=stock.producto_id, almacen_id=stock.almacen_id, cantidad=stock.cantidad,
+            valor_total=stock.cantidad * costo if stock.cantidad > 0 else 0,
+        ))
+        if stock.cantidad > 0:
+            capas.append(CapaCosto(
+                producto_id=stock.producto_id, almacen_id=stock.almacen_id, cantidad_inicial=stock.cantidad,
+                cantidad_disponible=stock.cantidad, costo_unitario=costo,
+            ))
+    ValorizacionStock.objects.bulk_create(valorizaciones, batch_size=1000)
+    CapaCosto.objects.bulk_create(capas, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('central', '0006_serienumeracion'),
+        ('inventario', '0003_cortestock'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='movimientoinventario',
+            name='costo_unitario',
+            field=models.DecimalField(blank=True, decimal_places=4, help_text='Costo unitario de la entrada. Si se omite se usa el costo del producto.', max_digits=12, null=True, verbose_name='Costo Unitario'),
+        ),
+        migrations.AddField(
+            model_name='movimientoinventario',
+            name='costo_total',
+            field=models.DecimalField(blank=True, decimal_places=4, help_text='Valor con el que el movimiento entró o salió del inventario.', max_digits=16, null=True, verbose_name='Costo Total'),
+        ),
+        migrations.CreateModel(
+            name='ValorizacionStock',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('cantidad', models.DecimalField(decimal_places=2, default=0, max_digits=12, verbose_name='Cantidad Valorizada')),
+                ('valor_total', models.DecimalField(decimal_places=4, default=0, max_digits=16, verbose_name='Valor del Inventario')),
+                ('costo_salidas', models.DecimalField(decimal_places=4, default=0, help_text='Costo de venta acumulado de todas las salidas de este producto y almacén.', max_digits=16, verbose_name='Costo Acumulado de Salidas')),
+                ('almacen', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, to='inventario.almacen', verbose_name='Almacén')),
+                ('producto', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, to='central.producto', verbose_name='Producto')),
+            ],
+            options={
+                'verbose_name': 'Valorización de Stock',
+                'verbose_name_plural': 'Valorización del Inventario',
+                'unique_together': {('producto', 'almacen')},
+            },
+        ),
+        migrations.CreateModel(
+            name='CapaCosto',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('cantidad_inicial', models.DecimalField(decimal_places=2, max_digits=10, verbose_name='Cantidad Inicial')),
+                ('cantidad_disponible', models.DecimalField(decimal_places=2, max_digits=10, verbose_name='Cantidad Disponible')),
+                ('costo_unitario', models.DecimalField(decimal_places=4, max_digits=12, verbose_name='Costo Unitario')),
+                ('almacen', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, to='inventario.almacen', verbose_name='Almacén')),
+                ('movimiento', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='capas_costo', to='inventario.movimientoinventario', verbose_name='Entrada que abrió la capa')),
+                ('producto', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, to='central.producto', verbose_name='Producto')),
+            ],
+            options={
+                'verbose_name': 'Capa de Costo',
+                'verbose_name_plural': 'Capas de Costo (PEPS)',
+                'ordering': ['id'],
+                'indexes': [models.Index(condition=models.Q(('cantidad_disponible__gt', 0)), fields=['producto', 'almacen', 'id'], name='inv_capa_abierta_idx')],
+            },
+        ),
+        migrations.RunPython(valorizar_stock_existente, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 5.2.18 on 2026-10-17 17:15
+
+import django.db.models.deletion
+import django.db.models.functions.datetime
+from django.conf import settings
+from django.db import migrations, models
+
+
+def abrir_alertas_existentes(apps, schema_editor):
+    """Abre las alertas del stock actual con el umbral por defecto."""
+    Stock = apps.get_model('inventario', 'Stock')
+    AlertaStockBajo = apps.get_model('inventario', 'AlertaStockBajo')
+    umbral = getattr(settings, 'HERMES_PUNTO_REORDEN_POR_DEFECTO', 10)
+    AlertaStockBajo.objects.bulk_create([
+        AlertaStockBajo(producto_id=producto_id, almacen_id=almacen_id, cantidad=cantidad, punto_reorden=umbral)
+        for producto_id, almacen_id, cantidad in Stock.objects.filter(cantidad__lt=umbral)
+        .values_list('producto_id', 'almacen_id', 'cantidad')
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('central', '0006_serienumeracion'),
+        ('inventario', '0004_valorizacion'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='stock',
+            name='punto_reorden',
+            field=models.DecimalField(blank=True, decimal_places=2, help_text='Por debajo de esta cantidad se abre una alerta de stock bajo. Vacío = HERMES_PUNTO_REORDEN_POR_DEFECTO.', max_digits=10, null=True, verbose_name='Punto de Reorden'),
+        ),
+        migrations.CreateModel(
+            name='AlertaStockBajo',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('cantidad', models.DecimalField(decimal_places=2, max_digits=10, verbose_name='Cantidad Actual')),
+                ('punto_reorden', models.DecimalField(decimal_places=2, max_digits=10, verbose_name='Punto de Reorden')),
+                ('fecha_apertura', models.DateTimeField(db_default=django.db.models.functions.datetime.Now(), verbose_name='Fecha de Apertura')),
+                ('almacen', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='inventario.almacen', verbose_name='Almacén')),
+                ('producto', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='central.producto', verbose_name='Producto')),
+            ],
+            options={
+                'verbose_name': 'Alerta de Stock Bajo',
+                'verbose_name_plural': 'Alertas de Stock Bajo',
+                'ordering': ['fecha_apertura'],
+                'unique_together': {('producto', 'almacen')},
+            },
+        ),
+        migrations.RunPython(abrir_alertas_existentes, migrations.RunPython.noop),
+    ]
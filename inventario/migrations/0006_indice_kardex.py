@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-17 17:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventario', '0005_alertas_stock_bajo'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='movimientoinventario',
+            index=models.Index(fields=['producto', 'fecha', 'id'], name='inv_mov_kardex_idx'),
+        ),
+    ]
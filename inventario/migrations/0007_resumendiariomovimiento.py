@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-17 18:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('central', '0006_serienumeracion'),
+        ('inventario', '0006_indice_kardex'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResumenDiarioMovimiento',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('fecha', models.DateField(verbose_name='Fecha')),
+                ('tipo_movimiento', models.CharField(choices=[('E', 'Entrada (Compra/Ajuste Positivo)'), ('S', 'Salida (Venta/Ajuste Negativo)')], max_length=1, verbose_name='Tipo de Movimiento')),
+                ('cantidad', models.DecimalField(decimal_places=2, default=0, max_digits=14, verbose_name='Cantidad Total')),
+                ('movimientos', models.PositiveIntegerField(default=0, verbose_name='Número de Movimientos')),
+                ('costo_total', models.DecimalField(decimal_places=4, default=0, max_digits=18, verbose_name='Costo Total')),
+                ('almacen', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='inventario.almacen', verbose_name='Almacén')),
+                ('producto', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='central.producto', verbose_name='Producto')),
+            ],
+            options={
+                'verbose_name': 'Resumen Diario de Movimientos',
+                'verbose_name_plural': 'Resúmenes Diarios de Movimientos',
+                'ordering': ['-fecha'],
+                'indexes': [models.Index(fields=['producto', 'fecha'], name='inv_resumen_producto_idx')],
+                'unique_together': {('fecha', 'producto', 'almacen', 'tipo_movimiento')},
+            },
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 5.2.18 on 2026-10-17 18:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('central', '0006_serienumeracion'),
+        ('inventario', '0007_resumendiariomovimiento'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ConteoFisico',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('descripcion', models.CharField(blank=True, max_length=200, verbose_name='Descripción')),
+                ('estado', models.CharField(choices=[('A', 'Abierto'), ('C', 'Cerrado'), ('X', 'Cancelado')], default='A', max_length=1, verbose_name='Estado')),
+                ('fecha_apertura', models.DateTimeField(auto_now_add=True)),
+                ('fecha_cierre', models.DateTimeField(blank=True, null=True)),
+                ('almacen', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, to='inventario.almacen', verbose_name='Almacén')),
+            ],
+            options={
+                'verbose_name': 'Conteo Físico',
+                'verbose_name_plural': 'Conteos Físicos',
+                'ordering': ['-fecha_apertura'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ConteoFisicoDetalle',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('cantidad_sistema', models.DecimalField(decimal_places=2, default=0, help_text='Stock congelado al abrir el conteo.', max_digits=10, verbose_name='Cantidad en Sistema')),
+                ('cantidad_contada', models.DecimalField(blank=True, decimal_places=2, help_text='Vacío = SKU aún no contado.', max_digits=10, null=True, verbose_name='Cantidad Contada')),
+                ('diferencia', models.DecimalField(blank=True, decimal_places=2, help_text='Contado menos sistema; se calcula al cerrar el conteo.', max_digits=10, null=True, verbose_name='Diferencia')),
+                ('conteo', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='detalles', to='inventario.conteofisico', verbose_name='Conteo')),
+                ('producto', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, to='central.producto', verbose_name='Producto')),
+            ],
+            options={
+                'verbose_name': 'Detalle de Conteo Físico',
+                'verbose_name_plural': 'Detalles de Conteos Físicos',
+                'unique_together': {('conteo', 'producto')},
+            },
+        ),
+    ]
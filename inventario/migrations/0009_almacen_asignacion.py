@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventario', '0008_conteofisico'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='almacen',
+            name='prioridad',
+            field=models.PositiveSmallIntegerField(default=100, help_text='Menor número = se despacha primero desde este almacén.', verbose_name='Prioridad de Despacho'),
+        ),
+        migrations.AddField(
+            model_name='almacen',
+            name='latitud',
+            field=models.DecimalField(blank=True, decimal_places=6, max_digits=9, null=True, verbose_name='Latitud'),
+        ),
+        migrations.AddField(
+            model_name='almacen',
+            name='longitud',
+            field=models.DecimalField(blank=True, decimal_places=6, max_digits=9, null=True, verbose_name='Longitud'),
+        ),
+    ]
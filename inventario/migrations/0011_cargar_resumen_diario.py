@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-17 22:10
+
+from decimal import Decimal
+
+from django.db import migrations
+from django.db.models import Count, Sum
+
+
+def cargar_resumen_diario(apps, schema_editor):
+    """Carga inicial de ResumenDiarioMovimiento con el historial (ver reconstruir_resumen_diario)."""
+    MovimientoInventario = apps.get_model('inventario', 'MovimientoInventario')
+    ResumenDiarioMovimiento = apps.get_model('inventario', 'ResumenDiarioMovimiento')
+    agrupados = (
+        MovimientoInventario.objects
+        .order_by()
+        .values('fecha', 'producto_id', 'almacen_id', 'tipo_movimiento')
+        .annotate(total_cantidad=Sum('cantidad'), total_movimientos=Count('id'), total_costo=Sum('costo_total'))
+    )
+    ResumenDiarioMovimiento.objects.all().delete()
+    lote = []
+    for fila in agrupados.iterator(chunk_size=1000):
+        lote.append(ResumenDiarioMovimiento(
+            fecha=fila['fecha'], producto_id=fila['producto_id'], almacen_id=fila['almacen_id'],
+            tipo_movimiento=fila['tipo_movimiento'], cantidad=fila['total_cantidad'],
+            movimientos=fila['total_movimientos'], costo_total=fila['total_costo'] or Decimal('0'),
+        ))
+        if len(lote) >= 1000:
+            ResumenDiarioMovimiento.objects.bulk_create(lote)
+            lote = []
+    ResumenDiarioMovimiento.objects.bulk_create(lote)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventario', '0010_indice_referencia_doc'),
+    ]
+
+    operations = [
+        migrations.RunPython(cargar_resumen_diario, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:40
+
+from decimal import Decimal
+
+from django.db import migrations, models
+from django.db.models import Case, F, Sum, Value, When
+from django.db.models.functions import Coalesce
+
+
+def cargar_valor_cortes(apps, schema_editor):
+    """Valor de los cortes existentes: costo de entradas menos salidas hasta cada fecha (ver cortes.DELTA_VALOR)."""
+    CorteStock = apps.get_model('inventario', 'CorteStock')
+    CorteStockDetalle = apps.get_model('inventario', 'CorteStockDetalle')
+    MovimientoInventario = apps.get_model('inventario', 'MovimientoInventario')
+    delta_valor = Case(
+        When(tipo_movimiento='E', then=Coalesce(F('costo_total'), Value(Decimal('0')))),
+        When(tipo_movimiento='S', then=-Coalesce(F('costo_total'), Value(Decimal('0')))),
+        default=Value(Decimal('0')),
+        output_field=models.DecimalField(max_digits=18, decimal_places=4),
+    )
+    for corte in CorteStock.objects.order_by('fecha'):
+        valores = {
+            (producto_id, almacen_id): valor
+            for producto_id, almacen_id, valor in MovimientoInventario.objects.filter(fecha__lte=corte.fecha)
+            .order_by()
+            .values('producto_id', 'almacen_id')
+            .annotate(valor=Sum(delta_valor))
+            .values_list('producto_id', 'almacen_id', 'valor')
+        }
+        detalles = list(CorteStockDetalle.objects.filter(corte=corte))
+        for detalle in detalles:
+            detalle.valor = valores.get((detalle.producto_id, detalle.almacen_id)) or Decimal('0')
+        CorteStockDetalle.objects.bulk_update(detalles, ['valor'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventario', '0011_cargar_resumen_diario'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cortestockdetalle',
+            name='valor',
+            field=models.DecimalField(decimal_places=4, default=0, help_text='Costo acumulado de entradas menos salidas hasta la fecha del corte.', max_digits=18, verbose_name='Valor al Corte'),
+        ),
+        migrations.RunPython(cargar_valor_cortes, migrations.RunPython.noop),
+    ]
@@ -1,6 +1,7 @@
 # Archivo: inventario/models.py
 
 from django.db import models
+from django.db.models.functions import Now
 from django.utils.translation import gettext_lazy as _
 # Importamos modelos del Núcleo
 from central.models import Producto 
@@ -22,6 +23,26 @@ class Almacen(models.Model):
         verbose_name=_("Código de Almacén")
     )
     activo = models.BooleanField(default=True)
+    # Asignación de salidas de facturas entre almacenes (ver inventario/asignacion.py)
+    prioridad = models.PositiveSmallIntegerField(
+        default=100,
+        verbose_name=_("Prioridad de Despacho"),
+        help_text=_("Menor número = se despacha primero desde este almacén.")
+    )
+    latitud = models.DecimalField(
+        max_digits=9,
+        decimal_places=6,
+        null=True,
+        blank=True,
+        verbose_name=_("Latitud")
+    )
+    longitud = models.DecimalField(
+        max_digits=9,
+        decimal_places=6,
+        null=True,
+        blank=True,
+        verbose_name=_("Longitud")
+    )
 
     def __str__(self):
         return self.nombre
@@ -52,6 +73,15 @@ class Stock(models.Model):
         default=0,
         verbose_name=_("Cantidad en Stock")
     )
+    punto_reorden = models.DecimalField(
+        max_digits=10,
+        decimal_places=2,
+        null=True,
+        blank=True,
+        verbose_name=_("Punto de Reorden"),
+        help_text=_("Por debajo de esta cantidad se abre una alerta de stock bajo. "
+                    "Vacío = HERMES_PUNTO_REORDEN_POR_DEFECTO.")
+    )
 
     def __str__(self):
         return f"{self.producto.nombre} en {self.almacen.nombre}: {self.cantidad}"
@@ -99,6 +129,24 @@ class MovimientoInventario(models.Model):
         verbose_name=_("Referencia de Documento"),
         help_text=_("Ej. Número de Factura, Orden de Compra.")
     )
+    # Valorización: en entradas, costo de adquisición (por defecto el del producto);
+    # en salidas lo calcula el motor de valorización (promedio o PEPS)
+    costo_unitario = models.DecimalField(
+        max_digits=12,
+        decimal_places=4,
+        null=True,
+        blank=True,
+        verbose_name=_("Costo Unitario"),
+        help_text=_("Costo unitario de la entrada. Si se omite se usa el costo del producto.")
+    )
+    costo_total = models.DecimalField(
+        max_digits=16,
+        decimal_places=4,
+        null=True,
+        blank=True,
+        verbose_name=_("Costo Total"),
+        help_text=_("Valor con el que el movimiento entró o salió del inventario.")
+    )
     # Enlace crítico al Núcleo: Registra el asiento contable generado
     asiento_contable_nucleo = models.ForeignKey(
         'central.TransaccionEncabezado',
@@ -114,4 +162,370 @@ class MovimientoInventario(models.Model):
     class Meta:
         verbose_name = _("Movimiento de Inventario")
         verbose_name_plural = _("Movimientos de Inventario")
-        ordering = ['-fecha']
\ No newline at end of file
+        ordering = ['-fecha']
+        # Índice compuesto (fecha, id): respalda la paginación por keyset
+        indexes = [
+            models.Index(fields=['-fecha', '-id'], name='inv_mov_fecha_id_idx'),
+            # Kardex: movimientos de un producto en orden (ver inventario/kardex.py)
+            models.Index(fields=['producto', 'fecha', 'id'], name='inv_mov_kardex_idx'),
+            # Movimientos de un documento (ej. las salidas de una factura al anularla)
+            models.Index(fields=['referencia_doc'], name='inv_mov_referencia_idx'),
+        ]
+
+
+# ----------------------------------------------------------------------
+# 4. CORTES DE STOCK (Snapshots periódicos para consultas históricas)
+# ----------------------------------------------------------------------
+
+# Existencias al cierre de 'fecha' (todos los movimientos con fecha <= fecha).
+# El stock a una fecha cualquiera se obtiene del corte más cercano anterior más
+# los movimientos posteriores a él (ver inventario/cortes.py).
+class CorteStock(models.Model):
+    fecha = models.DateField(
+        unique=True,
+        verbose_name=_("Fecha de Corte"),
+        help_text=_("Incluye todos los movimientos hasta este día, inclusive.")
+    )
+    fecha_creacion = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"Corte de stock al {self.fecha}"
+
+    class Meta:
+        verbose_name = _("Corte de Stock")
+        verbose_name_plural = _("Cortes de Stock")
+        ordering = ['-fecha']
+
+
+class CorteStockDetalle(models.Model):
+    corte = models.ForeignKey(
+        CorteStock,
+        on_delete=models.CASCADE,
+        related_name='detalles',
+        verbose_name=_("Corte")
+    )
+    producto = models.ForeignKey(
+        Producto,
+        on_delete=models.PROTECT,
+        verbose_name=_("Producto")
+    )
+    almacen = models.ForeignKey(
+        Almacen,
+        on_delete=models.PROTECT,
+        verbose_name=_("Almacén")
+    )
+    cantidad = models.DecimalField(
+        max_digits=12,
+        decimal_places=2,
+        verbose_name=_("Cantidad al Corte")
+    )
+    valor = models.DecimalField(
+        max_digits=18,
+        decimal_places=4,
+        default=0,
+        verbose_name=_("Valor al Corte"),
+        help_text=_("Costo acumulado de entradas menos salidas hasta la fecha del corte.")
+    )
+
+    def __str__(self):
+        return f"{self.corte.fecha} {self.producto_id}/{self.almacen_id}: {self.cantidad}"
+
+    class Meta:
+        verbose_name = _("Detalle de Corte de Stock")
+        verbose_name_plural = _("Detalles de Cortes de Stock")
+        unique_together = ('corte', 'producto', 'almacen')
+
+
+# ----------------------------------------------------------------------
+# 5. VALORIZACIÓN DEL INVENTARIO (Costo promedio y capas PEPS/FIFO)
+# ----------------------------------------------------------------------
+
+# Cantidad y valor del inventario por Producto y Almacén, mantenidos en cada
+# movimiento (ver inventario/valorizacion.py). El inventario valorizado se lee
+# sumando estas filas, sin recorrer el historial de movimientos.
+class ValorizacionStock(models.Model):
+    producto = models.ForeignKey(
+        Producto,
+        on_delete=models.PROTECT,
+        verbose_name=_("Producto")
+    )
+    almacen = models.ForeignKey(
+        Almacen,
+        on_delete=models.PROTECT,
+        verbose_name=_("Almacén")
+    )
+    cantidad = models.DecimalField(
+        max_digits=12,
+        decimal_places=2,
+        default=0,
+        verbose_name=_("Cantidad Valorizada")
+    )
+    valor_total = models.DecimalField(
+        max_digits=16,
+        decimal_places=4,
+        default=0,
+        verbose_name=_("Valor del Inventario")
+    )
+    costo_salidas = models.DecimalField(
+        max_digits=16,
+        decimal_places=4,
+        default=0,
+        verbose_name=_("Costo Acumulado de Salidas"),
+        help_text=_("Costo de venta acumulado de todas las salidas de este producto y almacén.")
+    )
+
+    @property
+    def costo_promedio(self):
+        return self.valor_total / self.cantidad if self.cantidad else None
+
+    def __str__(self):
+        return f"{self.producto.nombre} en {self.almacen.nombre}: {self.cantidad} = {self.valor_total}"
+
+    class Meta:
+        verbose_name = _("Valorización de Stock")
+        verbose_name_plural = _("Valorización del Inventario")
+        unique_together = ('producto', 'almacen')
+
+
+# Capa de costo PEPS (FIFO): cada entrada abre una capa y las salidas consumen
+# primero las capas más antiguas. Solo se usan con HERMES_METODO_VALORIZACION = 'peps'.
+class CapaCosto(models.Model):
+    producto = models.ForeignKey(
+        Producto,
+        on_delete=models.PROTECT,
+        verbose_name=_("Producto")
+    )
+    almacen = models.ForeignKey(
+        Almacen,
+        on_delete=models.PROTECT,
+        verbose_name=_("Almacén")
+    )
+    movimiento = models.ForeignKey(
+        MovimientoInventario,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='capas_costo',
+        verbose_name=_("Entrada que abrió la capa")
+    )
+    cantidad_inicial = models.DecimalField(
+        max_digits=10,
+        decimal_places=2,
+        verbose_name=_("Cantidad Inicial")
+    )
+    cantidad_disponible = models.DecimalField(
+        max_digits=10,
+        decimal_places=2,
+        verbose_name=_("Cantidad Disponible")
+    )
+    costo_unitario = models.DecimalField(
+        max_digits=12,
+        decimal_places=4,
+        verbose_name=_("Costo Unitario")
+    )
+
+    def __str__(self):
+        return f"Capa {self.id} {self.producto_id}/{self.almacen_id}: {self.cantidad_disponible} a {self.costo_unitario}"
+
+    class Meta:
+        verbose_name = _("Capa de Costo")
+        verbose_name_plural = _("Capas de Costo (PEPS)")
+        ordering = ['id']
+        # Capas abiertas de un producto/almacén, en orden de llegada
+        indexes = [
+            models.Index(
+                fields=['producto', 'almacen', 'id'], name='inv_capa_abierta_idx',
+                condition=models.Q(cantidad_disponible__gt=0),
+            ),
+        ]
+
+
+
+# ----------------------------------------------------------------------
+# 6. ALERTAS DE STOCK BAJO (Se mantienen al cambiar Stock)
+# ----------------------------------------------------------------------
+
+# Una fila por producto/almacén cuya existencia está por debajo de su punto de
+# reorden. Se abre cuando el stock cruza el umbral hacia abajo y se borra cuando
+# se recupera (ver inventario/alertas.py): los reportes leen solo esta tabla.
+class AlertaStockBajo(models.Model):
+    producto = models.ForeignKey(
+        Producto,
+        on_delete=models.CASCADE,
+        verbose_name=_("Producto")
+    )
+    almacen = models.ForeignKey(
+        Almacen,
+        on_delete=models.CASCADE,
+        verbose_name=_("Almacén")
+    )
+    cantidad = models.DecimalField(
+        max_digits=10,
+        decimal_places=2,
+        verbose_name=_("Cantidad Actual")
+    )
+    punto_reorden = models.DecimalField(
+        max_digits=10,
+        decimal_places=2,
+        verbose_name=_("Punto de Reorden")
+    )
+    fecha_apertura = models.DateTimeField(
+        db_default=Now(),
+        verbose_name=_("Fecha de Apertura")
+    )
+
+    def __str__(self):
+        return f"Stock bajo {self.producto_id}/{self.almacen_id}: {self.cantidad} < {self.punto_reorden}"
+
+    class Meta:
+        verbose_name = _("Alerta de Stock Bajo")
+        verbose_name_plural = _("Alertas de Stock Bajo")
+        unique_together = ('producto', 'almacen')
+        ordering = ['fecha_apertura']
+
+
+# ----------------------------------------------------------------------
+# 7. RESUMEN DIARIO DE MOVIMIENTOS (Series de tiempo para reportes)
+# ----------------------------------------------------------------------
+
+# Totales por día, producto, almacén y tipo, acumulados al registrar cada
+# movimiento (ver inventario/resumenes.py). Un gráfico de 12 meses lee a lo sumo
+# una fila por día y combinación en vez de recorrer MovimientoInventario.
+class ResumenDiarioMovimiento(models.Model):
+    fecha = models.DateField(verbose_name=_("Fecha"))
+    producto = models.ForeignKey(
+        Producto,
+        on_delete=models.CASCADE,
+        verbose_name=_("Producto")
+    )
+    almacen = models.ForeignKey(
+        Almacen,
+        on_delete=models.CASCADE,
+        verbose_name=_("Almacén")
+    )
+    tipo_movimiento = models.CharField(
+        max_length=1,
+        choices=TIPO_MOVIMIENTO_CHOICES,
+        verbose_name=_("Tipo de Movimiento")
+    )
+    cantidad = models.DecimalField(
+        max_digits=14,
+        decimal_places=2,
+        default=0,
+        verbose_name=_("Cantidad Total")
+    )
+    movimientos = models.PositiveIntegerField(
+        default=0,
+        verbose_name=_("Número de Movimientos")
+    )
+    costo_total = models.DecimalField(
+        max_digits=18,
+        decimal_places=4,
+        default=0,
+        verbose_name=_("Costo Total")
+    )
+
+    def __str__(self):
+        return f"{self.fecha} {self.producto_id}/{self.almacen_id} {self.tipo_movimiento}: {self.cantidad}"
+
+    class Meta:
+        verbose_name = _("Resumen Diario de Movimientos")
+        verbose_name_plural = _("Resúmenes Diarios de Movimientos")
+        unique_together = ('fecha', 'producto', 'almacen', 'tipo_movimiento')
+        ordering = ['-fecha']
+        # La restricción única sirve para rangos de fechas; este índice, para las series de un producto
+        indexes = [
+            models.Index(fields=['producto', 'fecha'], name='inv_resumen_producto_idx'),
+        ]
+
+
+# ----------------------------------------------------------------------
+# 8. CONTEO FÍSICO (Sesiones de inventario físico por almacén)
+# ----------------------------------------------------------------------
+
+ESTADO_CONTEO_CHOICES = [
+    ('A', 'Abierto'),
+    ('C', 'Cerrado'),
+    ('X', 'Cancelado'),
+]
+
+# Al abrir el conteo se congela el Stock del almacén en sus detalles; las
+# cantidades contadas se cargan en lote y al cerrar se publica un solo lote de
+# ajustes con la diferencia de cada SKU (ver inventario/conteos.py).
+class ConteoFisico(models.Model):
+    almacen = models.ForeignKey(
+        Almacen,
+        on_delete=models.PROTECT,
+        verbose_name=_("Almacén")
+    )
+    descripcion = models.CharField(
+        max_length=200,
+        blank=True,
+        verbose_name=_("Descripción")
+    )
+    estado = models.CharField(
+        max_length=1,
+        choices=ESTADO_CONTEO_CHOICES,
+        default='A',
+        verbose_name=_("Estado")
+    )
+    fecha_apertura = models.DateTimeField(auto_now_add=True)
+    fecha_cierre = models.DateTimeField(null=True, blank=True)
+
+    @property
+    def referencia(self):
+        """Referencia de documento de los ajustes que genera el conteo."""
+        return f"CONTEO-{self.pk}"
+
+    def __str__(self):
+        return f"Conteo {self.pk} - {self.almacen.nombre} ({self.get_estado_display()})"
+
+    class Meta:
+        verbose_name = _("Conteo Físico")
+        verbose_name_plural = _("Conteos Físicos")
+        ordering = ['-fecha_apertura']
+
+
+class ConteoFisicoDetalle(models.Model):
+    conteo = models.ForeignKey(
+        ConteoFisico,
+        on_delete=models.CASCADE,
+        related_name='detalles',
+        verbose_name=_("Conteo")
+    )
+    producto = models.ForeignKey(
+        Producto,
+        on_delete=models.PROTECT,
+        verbose_name=_("Producto")
+    )
+    cantidad_sistema = models.DecimalField(
+        max_digits=10,
+        decimal_places=2,
+        default=0,
+        verbose_name=_("Cantidad en Sistema"),
+        help_text=_("Stock congelado al abrir el conteo.")
+    )
+    cantidad_contada = models.DecimalField(
+        max_digits=10,
+        decimal_places=2,
+        null=True,
+        blank=True,
+        verbose_name=_("Cantidad Contada"),
+        help_text=_("Vacío = SKU aún no contado.")
+    )
+    diferencia = models.DecimalField(
+        max_digits=10,
+        decimal_places=2,
+        null=True,
+        blank=True,
+        verbose_name=_("Diferencia"),
+        help_text=_("Contado menos sistema; se calcula al cerrar el conteo.")
+    )
+
+    def __str__(self):
+        return f"Conteo {self.conteo_id} / {self.producto_id}: {self.cantidad_contada} vs {self.cantidad_sistema}"
+
+    class Meta:
+        verbose_name = _("Detalle de Conteo Físico")
+        verbose_name_plural = _("Detalles de Conteos Físicos")
+        unique_together = ('conteo', 'producto')
@@ -0,0 +1,101 @@
+# Archivo: inventario/resumenes.py
+
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncMonth
+
+from central.sql import upsert_sumando
+from .models import MovimientoInventario, ResumenDiarioMovimiento
+
+CLAVES_RESUMEN = ['fecha', 'producto', 'almacen', 'tipo_movimiento']
+TOTALES_RESUMEN = ['cantidad', 'movimientos', 'costo_total']
+
+
+def registrar_resumen_diario(movimientos):
+    """
+    Suma movimientos ya guardados (y valorizados) al resumen diario con un upsert
+    por (fecha, producto, almacen, tipo). Se llama desde el Signal y desde
+    crear_movimientos, después de valorizar_movimientos para incluir el costo.
+    """
+    acumulado = defaultdict(lambda: [Decimal('0'), 0, Decimal('0')])
+    for movimiento in movimientos:
+        totales = acumulado[(movimiento.fecha, movimiento.producto_id, movimiento.almacen_id, movimiento.tipo_movimiento)]
+        totales[0] += Decimal(str(movimiento.cantidad))
+        totales[1] += 1
+        totales[2] += movimiento.costo_total or Decimal('0')
+    return upsert_sumando(
+        ResumenDiarioMovimiento, CLAVES_RESUMEN, TOTALES_RESUMEN,
+        [clave + tuple(totales) for clave, totales in acumulado.items()],
+    )
+
+
+def reconstruir_resumen_diario(desde=None, hasta=None, tamano_lote=1000):
+    """
+    Recalcula el resumen de los días [desde, hasta] (todo el historial si se omiten)
+    agrupando MovimientoInventario en la base de datos. Sirve para la carga inicial
+    y para corregir ediciones o borrados de movimientos. Retorna las filas escritas.
+    """
+    movimientos = MovimientoInventario.objects.all()
+    resumenes = ResumenDiarioMovimiento.objects.all()
+    if desde is not None:
+        movimientos = movimientos.filter(fecha__gte=desde)
+        resumenes = resumenes.filter(fecha__gte=desde)
+    if hasta is not None:
+        movimientos = movimientos.filter(fecha__lte=hasta)
+        resumenes = resumenes.filter(fecha__lte=hasta)
+
+    agrupados = (
+        movimientos
+        .order_by()
+        .values('fecha', 'producto_id', 'almacen_id', 'tipo_movimiento')
+        .annotate(total_cantidad=Sum('cantidad'), total_movimientos=Count('id'), total_costo=Sum('costo_total'))
+    )
+    escritas, lote = 0, []
+    with transaction.atomic():
+        resumenes.delete()
+        for fila in agrupados.iterator(chunk_size=tamano_lote):
+            lote.append(ResumenDiarioMovimiento(
+                fecha=fila['fecha'], producto_id=fila['producto_id'], almacen_id=fila['almacen_id'],
+                tipo_movimiento=fila['tipo_movimiento'], cantidad=fila['total_cantidad'],
+                movimientos=fila['total_movimientos'], costo_total=fila['total_costo'] or Decimal('0'),
+            ))
+            if len(lote) >= tamano_lote:
+                ResumenDiarioMovimiento.objects.bulk_create(lote)
+                escritas, lote = escritas + len(lote), []
+        if lote:
+            ResumenDiarioMovimiento.objects.bulk_create(lote)
+            escritas += len(lote)
+    return escritas
+
+
+def serie_movimientos(desde, hasta, producto=None, almacen=None, agrupacion='dia'):
+    """
+    Entradas y salidas por día (o por mes) entre 'desde' y 'hasta', leídas del
+    resumen diario: [{'periodo', 'entradas', 'salidas', 'movimientos', 'costo_salidas'}].
+    """
+    resumenes = ResumenDiarioMovimiento.objects.filter(fecha__gte=desde, fecha__lte=hasta)
+    if producto is not None:
+        resumenes = resumenes.filter(producto_id=producto)
+    if almacen is not None:
+        resumenes = resumenes.filter(almacen_id=almacen)
+    filas = resumenes.order_by().annotate(periodo=TruncMonth('fecha') if agrupacion == 'mes' else F('fecha'))
+    serie = {}
+    for fila in (
+        filas.values('periodo', 'tipo_movimiento')
+        .annotate(total_cantidad=Sum('cantidad'), total_movimientos=Sum('movimientos'), total_costo=Sum('costo_total'))
+        .order_by('periodo')
+    ):
+        punto = serie.setdefault(fila['periodo'], {
+            'periodo': fila['periodo'], 'entradas': Decimal('0'), 'salidas': Decimal('0'),
+            'movimientos': 0, 'costo_salidas': Decimal('0'),
+        })
+        punto['movimientos'] += fila['total_movimientos']
+        if fila['tipo_movimiento'] == 'E':
+            punto['entradas'] += fila['total_cantidad']
+        else:
+            punto['salidas'] += fila['total_cantidad']
+            punto['costo_salidas'] += fila['total_costo']
+    return list(serie.values())
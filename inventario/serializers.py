@@ -1,8 +1,10 @@
 from rest_framework import serializers
 from django.db import transaction
-from .models import Almacen, Stock, MovimientoInventario
-# Importamos modelos del Núcleo que vamos a usar para la contabilidad
-from central.models import CuentaContable, Moneda, TransaccionEncabezado, MovimientoContable
+from .models import Almacen, Stock, MovimientoInventario, AlertaStockBajo, ConteoFisico, ConteoFisicoDetalle
+from .conteos import abrir_conteo
+# El asiento de costo de venta lo genera el motor de contabilización del Núcleo
+from central.bandeja import contabilizar_o_encolar
+from central.contabilizacion import ErrorContabilizacion
 
 
 class AlmacenSerializer(serializers.ModelSerializer):
@@ -25,62 +27,92 @@ class MovimientoInventarioSerializer(serializers.ModelSerializer):
     class Meta:
         model = MovimientoInventario
         fields = '__all__'
-        read_only_fields = ['asiento_contable_nucleo']
+        read_only_fields = ['asiento_contable_nucleo', 'costo_total']
 
     def create(self, validated_data):
         with transaction.atomic():
             movimiento = MovimientoInventario.objects.create(**validated_data)
 
-            # Solo para SALIDAS ('S') se registra Costo de Venta
-            if movimiento.tipo_movimiento == 'S':
-                try:
-                    # ✅ Corregido: usar 'es_principal'
-                    moneda_base = Moneda.objects.get(es_principal=True)
-                    cuenta_costo = CuentaContable.objects.get(codigo='613505')
-                    cuenta_inventario = CuentaContable.objects.get(codigo='143505')
-                except Moneda.DoesNotExist:
-                    raise serializers.ValidationError(
-                        "ERROR DE CONFIGURACIÓN: No hay una moneda marcada como principal (es_principal=True)."
-                    )
-                except CuentaContable.DoesNotExist as e:
-                    # Mejor manejo del error
-                    raise serializers.ValidationError(
-                        "ERROR DE CONFIGURACIÓN: Faltan cuentas contables críticas (613505 para Costo de Venta o 143505 para Inventario)."
-                    )
-
-                # Verificar que el producto tenga costo_unitario
-                if movimiento.producto.costo_unitario is None:
-                    raise serializers.ValidationError(
-                        f"El producto '{movimiento.producto.nombre}' no tiene costo unitario definido. No se puede registrar el costo de venta."
-                    )
-
-                costo_total = movimiento.producto.costo_unitario * movimiento.cantidad
-
-                # ✅ Corregido: eliminar 'tipo_transaccion' (campo inexistente)
-                asiento_encabezado = TransaccionEncabezado.objects.create(
-                    fecha=movimiento.fecha,
-                    moneda=moneda_base,
-                    referencia=f"Costo-Venta-{movimiento.referencia_doc}-{movimiento.id}",
-                    descripcion=f"Registro automático de costo de venta para {movimiento.referencia_doc}",
-                    entidad=None  # Opcional, puedes dejarlo None
-                )
-
-                # Crear los movimientos contables
-                MovimientoContable.objects.create(
-                    encabezado=asiento_encabezado,  # ✅ 'encabezado', no 'transaccion_encabezado'
-                    cuenta=cuenta_costo,            # ✅ 'cuenta', no 'cuenta_contable'
-                    tipo_movimiento='D',
-                    monto=costo_total
-                )
-                MovimientoContable.objects.create(
-                    encabezado=asiento_encabezado,
-                    cuenta=cuenta_inventario,
-                    tipo_movimiento='C',
-                    monto=costo_total
-                )
-
-                # Enlazar el asiento al movimiento de inventario
-                movimiento.asiento_contable_nucleo = asiento_encabezado
-                movimiento.save()
-
-            return movimiento
\ No newline at end of file
+            # Solo las SALIDAS ('S') registran Costo de Venta; el motor de contabilización
+            # genera el asiento y lo enlaza al movimiento (asiento_contable_nucleo).
+            # En modo diferido solo se encola y el worker lo contabiliza después.
+            try:
+                contabilizar_o_encolar('inventario', [movimiento])
+            except ErrorContabilizacion as e:
+                raise serializers.ValidationError(str(e))
+
+            return movimiento
+
+
+class MovimientoLoteSerializer(serializers.Serializer):
+    """
+    Línea de un lote de movimientos. Producto y almacén se reciben como ids y se
+    validan en bloque en crear_movimientos() (no una consulta por línea).
+    """
+    tipo_movimiento = serializers.ChoiceField(choices=MovimientoInventario._meta.get_field('tipo_movimiento').choices)
+    producto = serializers.IntegerField()
+    almacen = serializers.IntegerField()
+    cantidad = serializers.DecimalField(max_digits=10, decimal_places=2, min_value=0)
+    referencia_doc = serializers.CharField(max_length=100)
+    costo_unitario = serializers.DecimalField(max_digits=12, decimal_places=4, min_value=0, required=False)
+
+
+class PuntoReordenSerializer(serializers.Serializer):
+    """Umbral de reorden de un producto en un almacén (null = usar el valor por defecto)."""
+    producto = serializers.IntegerField()
+    almacen = serializers.IntegerField()
+    punto_reorden = serializers.DecimalField(max_digits=10, decimal_places=2, min_value=0, allow_null=True)
+
+
+class DisponibilidadSerializer(serializers.Serializer):
+    """SKU a consultar en una sola petición de disponibilidad."""
+    skus = serializers.ListField(child=serializers.CharField(max_length=50), min_length=1, max_length=500)
+
+
+class AlertaStockBajoSerializer(serializers.ModelSerializer):
+    producto_nombre = serializers.CharField(source='producto.nombre', read_only=True)
+    codigo_sku = serializers.CharField(source='producto.codigo_sku', read_only=True)
+    almacen_nombre = serializers.CharField(source='almacen.nombre', read_only=True)
+
+    class Meta:
+        model = AlertaStockBajo
+        fields = '__all__'
+
+
+
+class ConteoFisicoSerializer(serializers.ModelSerializer):
+    """Al crear, abre el conteo y congela el Stock del almacén (inventario/conteos.py)."""
+    almacen_nombre = serializers.CharField(source='almacen.nombre', read_only=True)
+    referencia = serializers.CharField(read_only=True)
+
+    class Meta:
+        model = ConteoFisico
+        fields = '__all__'
+        read_only_fields = ['estado', 'fecha_apertura', 'fecha_cierre']
+
+    def create(self, validated_data):
+        return abrir_conteo(validated_data['almacen'].pk, descripcion=validated_data.get('descripcion', ''))
+
+
+class ConteoFisicoDetalleSerializer(serializers.ModelSerializer):
+    producto_nombre = serializers.CharField(source='producto.nombre', read_only=True)
+    codigo_sku = serializers.CharField(source='producto.codigo_sku', read_only=True)
+    # Anotada por conteos.detalles_conteo (calculada al vuelo si el conteo sigue abierto)
+    diferencia = serializers.DecimalField(
+        source='diferencia_actual', max_digits=10, decimal_places=2, read_only=True, allow_null=True
+    )
+
+    class Meta:
+        model = ConteoFisicoDetalle
+        fields = ['id', 'producto', 'producto_nombre', 'codigo_sku', 'cantidad_sistema', 'cantidad_contada', 'diferencia']
+
+
+class ConteoLineaSerializer(serializers.Serializer):
+    """Cantidad contada de un SKU; los productos se validan en bloque en registrar_conteo()."""
+    producto = serializers.IntegerField()
+    cantidad = serializers.DecimalField(max_digits=10, decimal_places=2, min_value=0)
+
+
+class CerrarConteoSerializer(serializers.Serializer):
+    """Opciones de cierre; BooleanField interpreta "false"/"0" de un formulario como False."""
+    omitidos_en_cero = serializers.BooleanField(default=False)
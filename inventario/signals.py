@@ -1,35 +1,43 @@
 # Archivo: inventario/signals.py
 
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
-from django.db import transaction
+from central.models import Producto
 from .models import MovimientoInventario, Stock
+from .alertas import sincronizar_alertas
+from .disponibilidad import invalidar_disponibilidad
+from .existencias import registrar_movimientos_stock
+from .resumenes import registrar_resumen_diario
+from .valorizacion import valorizar_movimientos
 
 @receiver(post_save, sender=MovimientoInventario)
 def actualizar_stock_post_movimiento(sender, instance, created, **kwargs):
     """
     Se ejecuta después de que un MovimientoInventario es creado (guardado).
-    Actualiza la tabla Stock sumando o restando la cantidad movida.
+    Suma o resta la cantidad movida en Stock con una sola sentencia atómica
+    (upsert, ver inventario/existencias.py): sin get_or_create ni save().
+    Luego actualiza la valorización del inventario, el costo del movimiento y
+    el resumen diario de movimientos.
     """
     # Solo actuar cuando se crea un nuevo movimiento
     if created:
-        producto = instance.producto
-        almacen = instance.almacen
-        cantidad_movida = instance.cantidad
-        tipo = instance.tipo_movimiento
+        registrar_movimientos_stock([instance])
+        valorizar_movimientos([instance])
+        registrar_resumen_diario([instance])
 
-        with transaction.atomic():
-            # Obtener o crear la entrada de Stock
-            stock, created = Stock.objects.get_or_create(
-                producto=producto, 
-                almacen=almacen,
-                defaults={'cantidad': 0} 
-            )
 
-            # Aplicar el movimiento
-            if tipo == 'E':  # Entrada (Suma stock)
-                stock.cantidad += cantidad_movida
-            elif tipo == 'S':  # Salida (Resta stock)
-                stock.cantidad -= cantidad_movida
-            
-            stock.save()
\ No newline at end of file
+@receiver(post_save, sender=Stock)
+def sincronizar_alerta_post_stock(sender, instance, raw=False, **kwargs):
+    """
+    Ediciones de Stock hechas con save() (ej. el punto de reorden desde el admin).
+    Los movimientos escriben Stock con upsert y ajustan sus alertas sin pasar por aquí.
+    """
+    if not raw:
+        sincronizar_alertas(Stock.objects.filter(pk=instance.pk))
+
+
+@receiver([post_save, post_delete], sender=Stock)
+@receiver([post_save, post_delete], sender=Producto)
+def invalidar_disponibilidad_post_cambio(sender, instance, **kwargs):
+    """Stock editado fuera de los movimientos, o producto con otro SKU: descarta su disponibilidad en caché."""
+    invalidar_disponibilidad([instance.pk if sender is Producto else instance.producto_id])
@@ -0,0 +1,96 @@
+# Archivo: inventario/tests_alertas.py
+
+from decimal import Decimal
+
+from django.test import TestCase, override_settings
+from inventario.alertas import fijar_puntos_reorden, sincronizar_alertas
+from inventario.existencias import crear_movimientos
+from inventario.models import AlertaStockBajo, Almacen, MovimientoInventario, Stock
+from central.models import Producto
+
+# ==============================================================================
+# PRUEBAS DE ALERTAS DE STOCK BAJO (PUNTO DE REORDEN)
+# ==============================================================================
+
+@override_settings(HERMES_PUNTO_REORDEN_POR_DEFECTO=10)
+class AlertasStockBajoTests(TestCase):
+
+    def setUp(self):
+        self.producto = Producto.objects.create(
+            nombre='Producto Test', codigo_sku='TEST-001', precio_venta=100, costo_unitario=10, unidad_medida='Unidad'
+        )
+        self.almacen = Almacen.objects.create(nombre='Almacén Test', codigo='ALM-TEST')
+
+    def movimiento(self, tipo, cantidad):
+        return MovimientoInventario.objects.create(
+            tipo_movimiento=tipo, producto=self.producto, almacen=self.almacen,
+            cantidad=cantidad, referencia_doc=f'{tipo}-{cantidad}'
+        )
+
+    def alerta(self):
+        return AlertaStockBajo.objects.filter(producto=self.producto, almacen=self.almacen).first()
+
+    def test_alerta_se_abre_y_se_cierra(self):
+        """La alerta existe solo mientras el stock está por debajo del umbral"""
+        self.movimiento('E', 5)
+        alerta = self.alerta()
+        self.assertIsNotNone(alerta)
+        self.assertEqual((alerta.cantidad, alerta.punto_reorden), (Decimal('5'), Decimal('10')))
+        self.assertIsNotNone(alerta.fecha_apertura)
+
+        self.movimiento('E', 3)
+        self.assertEqual(self.alerta().cantidad, Decimal('8'))
+
+        self.movimiento('E', 20)
+        self.assertIsNone(self.alerta())
+
+        self.movimiento('S', 25)
+        self.assertEqual(self.alerta().cantidad, Decimal('3'))
+
+    def test_stock_sano_no_toca_alertas(self):
+        """Un movimiento que deja el stock sobre el umbral no consulta la tabla de alertas"""
+        self.movimiento('E', 50)
+        with self.assertNumQueries(10):
+            # INSERT del movimiento + upsert de Stock + 7 de valorización + resumen diario: ninguna de alertas
+            self.movimiento('S', 5)
+        self.assertFalse(AlertaStockBajo.objects.exists())
+
+    def test_lote_abre_alertas(self):
+        """crear_movimientos evalúa las alertas de todas las filas de Stock afectadas"""
+        otro = Almacen.objects.create(nombre='Almacén 2', codigo='ALM-2')
+        crear_movimientos([
+            {'tipo_movimiento': 'E', 'producto': self.producto.pk, 'almacen': self.almacen.pk, 'cantidad': 4, 'referencia_doc': 'L-1'},
+            {'tipo_movimiento': 'E', 'producto': self.producto.pk, 'almacen': otro.pk, 'cantidad': 40, 'referencia_doc': 'L-2'},
+        ])
+        self.assertEqual(
+            list(AlertaStockBajo.objects.values_list('almacen_id', 'cantidad')),
+            [(self.almacen.pk, Decimal('4'))]
+        )
+
+    def test_fijar_punto_reorden(self):
+        """Cambiar el umbral abre o cierra la alerta sin mover stock"""
+        self.movimiento('E', 15)
+        self.assertIsNone(self.alerta())
+
+        fijar_puntos_reorden([(self.producto.pk, self.almacen.pk, Decimal('20'))])
+        self.assertEqual(self.alerta().punto_reorden, Decimal('20'))
+        self.assertEqual(Stock.objects.get(producto=self.producto, almacen=self.almacen).cantidad, Decimal('15'))
+
+        fijar_puntos_reorden([(self.producto.pk, self.almacen.pk, Decimal('5'))])
+        self.assertIsNone(self.alerta())
+
+    def test_fijar_punto_reorden_crea_stock(self):
+        """Un punto de reorden para un par sin stock crea la fila en cero y su alerta"""
+        fijar_puntos_reorden([(self.producto.pk, self.almacen.pk, Decimal('1'))])
+        self.assertEqual(Stock.objects.get(producto=self.producto, almacen=self.almacen).cantidad, 0)
+        self.assertEqual(self.alerta().cantidad, Decimal('0'))
+
+    def test_sincronizar_alertas(self):
+        """La reconstrucción completa deja la tabla igual al estado de Stock"""
+        self.movimiento('E', 5)
+        AlertaStockBajo.objects.all().delete()
+        with override_settings(HERMES_PUNTO_REORDEN_POR_DEFECTO=3):
+            sincronizar_alertas()
+            self.assertIsNone(self.alerta())
+        sincronizar_alertas()
+        self.assertEqual(self.alerta().cantidad, Decimal('5'))
@@ -0,0 +1,73 @@
+# Archivo: inventario/tests_asignacion.py
+
+from decimal import Decimal
+
+from django.test import TestCase, override_settings
+from inventario.asignacion import ErrorAsignacion, asignar_salidas
+from inventario.models import Almacen, MovimientoInventario
+from central.models import Producto
+
+# ==============================================================================
+# PRUEBAS DE ASIGNACIÓN DE SALIDAS ENTRE ALMACENES
+# ==============================================================================
+
+class AsignacionSalidasTests(TestCase):
+
+    def setUp(self):
+        # Norte: prioridad 1, lejos. Sur: prioridad 2, cerca del cliente y con más stock.
+        self.norte = Almacen.objects.create(
+            nombre='Norte', codigo='ALM-N', prioridad=1, latitud=Decimal('10.5'), longitud=Decimal('-66.9')
+        )
+        self.sur = Almacen.objects.create(
+            nombre='Sur', codigo='ALM-S', prioridad=2, latitud=Decimal('4.6'), longitud=Decimal('-74.1')
+        )
+        self.producto = Producto.objects.create(
+            nombre='Tornillo', codigo_sku='TOR-1', precio_venta=2, costo_unitario=1, unidad_medida='Unidad'
+        )
+        for almacen, cantidad in ((self.norte, 5), (self.sur, 20)):
+            MovimientoInventario.objects.create(
+                tipo_movimiento='E', producto=self.producto, almacen=almacen, cantidad=cantidad, referencia_doc='INI'
+            )
+
+    def test_prioridad_reparte_entre_almacenes(self):
+        plan = asignar_salidas([(self.producto.id, 8)], politica='prioridad')
+        self.assertEqual(plan, [[(self.norte.id, Decimal('5')), (self.sur.id, Decimal('3'))]])
+
+    def test_mayor_stock(self):
+        plan = asignar_salidas([(self.producto.id, 8)], politica='mayor_stock')
+        self.assertEqual(plan, [[(self.sur.id, Decimal('8'))]])
+
+    def test_cercania_usa_el_origen(self):
+        plan = asignar_salidas([(self.producto.id, 8)], politica='cercania', origen=(Decimal('4.7'), Decimal('-74.0')))
+        self.assertEqual(plan, [[(self.sur.id, Decimal('8'))]])
+
+    def test_lineas_repetidas_consumen_la_misma_existencia(self):
+        plan = asignar_salidas([(self.producto.id, 4), (self.producto.id, 4)], politica='prioridad')
+        self.assertEqual(plan, [
+            [(self.norte.id, Decimal('4'))],
+            [(self.norte.id, Decimal('1')), (self.sur.id, Decimal('3'))],
+        ])
+
+    def test_faltante_va_al_primer_almacen(self):
+        plan = asignar_salidas([(self.producto.id, 30)], politica='prioridad', estricto=False)
+        self.assertEqual(plan, [[(self.norte.id, Decimal('10')), (self.sur.id, Decimal('20'))]])
+
+    def test_estricto_rechaza_el_faltante(self):
+        with self.assertRaises(ErrorAsignacion):
+            asignar_salidas([(self.producto.id, 30)], politica='prioridad', estricto=True)
+
+    def test_almacenes_inactivos_no_participan(self):
+        self.norte.activo = False
+        self.norte.save()
+        plan = asignar_salidas([(self.producto.id, 8)], politica='prioridad')
+        self.assertEqual(plan, [[(self.sur.id, Decimal('8'))]])
+
+    @override_settings(HERMES_POLITICA_ASIGNACION='mayor_stock')
+    def test_politica_por_defecto_desde_settings(self):
+        plan = asignar_salidas([(self.producto.id, 2)])
+        self.assertEqual(plan, [[(self.sur.id, Decimal('2'))]])
+
+    def test_lectura_y_bloqueo_en_dos_consultas(self):
+        asignar_salidas([(self.producto.id, 8)], politica='prioridad')
+        with self.assertNumQueries(2):
+            asignar_salidas([(self.producto.id, 8)], politica='prioridad')
@@ -0,0 +1,66 @@
+# Archivo: inventario/tests_conciliacion.py
+
+from decimal import Decimal
+
+from django.test import TestCase
+from inventario.conciliacion import conciliar_stock, rangos_de_productos
+from inventario.models import Almacen, MovimientoInventario, Stock
+from central.models import Producto
+
+# ==============================================================================
+# PRUEBAS DE CONCILIACIÓN DE STOCK CONTRA MOVIMIENTOS
+# ==============================================================================
+
+class ConciliacionStockTests(TestCase):
+
+    def setUp(self):
+        self.producto = Producto.objects.create(
+            nombre='Producto Test', codigo_sku='TEST-001', precio_venta=100, costo_unitario=10, unidad_medida='Unidad'
+        )
+        self.otro = Producto.objects.create(
+            nombre='Otro', codigo_sku='TEST-002', precio_venta=5, costo_unitario=1, unidad_medida='Unidad'
+        )
+        self.almacen = Almacen.objects.create(nombre='Almacén Test', codigo='ALM-TEST')
+        for producto in (self.producto, self.otro):
+            MovimientoInventario.objects.create(
+                tipo_movimiento='E', producto=producto, almacen=self.almacen, cantidad=20, referencia_doc='E-1'
+            )
+        MovimientoInventario.objects.create(
+            tipo_movimiento='S', producto=self.producto, almacen=self.almacen, cantidad=5, referencia_doc='S-1'
+        )
+
+    def stock(self, producto):
+        return Stock.objects.get(producto=producto, almacen=self.almacen).cantidad
+
+    def test_sin_diferencias(self):
+        self.assertEqual(conciliar_stock(tamano_rango=1), [])
+
+    def test_detecta_y_corrige_desvio(self):
+        """Un cambio que no pasó por el Signal aparece como diferencia y --corregir lo revierte"""
+        Stock.objects.filter(producto=self.producto).update(cantidad=99)
+
+        self.assertEqual(
+            conciliar_stock(tamano_rango=1),
+            [(self.producto.id, self.almacen.id, Decimal('15'), Decimal('99'))]
+        )
+        self.assertEqual(self.stock(self.producto), 99)
+
+        conciliar_stock(tamano_rango=1, corregir=True)
+        self.assertEqual(self.stock(self.producto), 15)
+        self.assertEqual(self.stock(self.otro), 20)
+        self.assertEqual(conciliar_stock(), [])
+
+    def test_stock_sin_movimientos(self):
+        """Una fila de Stock sin movimientos que la respalden se lleva a cero"""
+        Stock.objects.filter(producto=self.otro).delete()
+        MovimientoInventario.objects.filter(producto=self.otro).delete()
+        Stock.objects.create(producto=self.otro, almacen=self.almacen, cantidad=7)
+
+        conciliar_stock(corregir=True)
+        self.assertEqual(self.stock(self.otro), 0)
+
+    def test_rangos_de_productos(self):
+        self.assertEqual(
+            rangos_de_productos(tamano_rango=1),
+            [(self.producto.id, self.producto.id), (self.otro.id, self.otro.id)]
+        )
@@ -0,0 +1,122 @@
+# Archivo: inventario/tests_conteos.py
+
+from decimal import Decimal
+
+from django.contrib.auth.models import Group, User
+from django.test import TestCase
+from rest_framework import status
+from rest_framework.test import APITestCase
+from inventario.conteos import ErrorConteo, abrir_conteo, cerrar_conteo, registrar_conteo
+from inventario.models import Almacen, ConteoFisicoDetalle, MovimientoInventario, Stock
+from central.models import CuentaContable, Moneda, Producto
+
+# ==============================================================================
+# PRUEBAS DE CONTEOS FÍSICOS (CONGELAR, CARGAR, CERRAR CON AJUSTES EN LOTE)
+# ==============================================================================
+
+class ConteoFisicoTests(TestCase):
+
+    def setUp(self):
+        # Los faltantes se publican como salidas y generan asiento de costo de venta
+        Moneda.objects.create(codigo_iso='USD', nombre='Dólar', simbolo='$', es_principal=True)
+        CuentaContable.objects.create(codigo='613505', nombre='Costo de Venta', tipo='G', naturaleza='D')
+        CuentaContable.objects.create(codigo='143505', nombre='Inventario', tipo='A', naturaleza='D')
+        self.almacen = Almacen.objects.create(nombre='Almacén Test', codigo='ALM-TEST')
+        self.productos = Producto.objects.bulk_create([
+            Producto(nombre=f'P{i}', codigo_sku=f'SKU-{i}', precio_venta=2, costo_unitario=1, unidad_medida='Unidad')
+            for i in range(4)
+        ])
+        for producto, cantidad in zip(self.productos[:3], (10, 20, 30)):
+            MovimientoInventario.objects.create(
+                tipo_movimiento='E', producto=producto, almacen=self.almacen, cantidad=cantidad, referencia_doc='INI'
+            )
+
+    def stock(self):
+        return dict(Stock.objects.filter(almacen=self.almacen).values_list('producto_id', 'cantidad'))
+
+    def test_abrir_congela_el_stock(self):
+        conteo = abrir_conteo(self.almacen.id)
+        self.assertEqual(
+            dict(conteo.detalles.values_list('producto_id', 'cantidad_sistema')),
+            {self.productos[0].id: 10, self.productos[1].id: 20, self.productos[2].id: 30}
+        )
+
+    def test_cerrar_publica_un_lote_de_ajustes(self):
+        """Solo los SKU con diferencia generan movimiento; los no contados no se tocan"""
+        p0, p1, p2, p3 = self.productos
+        conteo = abrir_conteo(self.almacen.id)
+        registrar_conteo(conteo.id, [(p0.id, 10), (p1.id, 5), (p1.id, 12), (p3.id, 4)])
+
+        resumen = cerrar_conteo(conteo.id)
+
+        self.assertEqual(resumen['ajustes'], 2)
+        self.assertEqual((resumen['skus'], resumen['contados'], resumen['con_diferencia']), (4, 3, 2))
+        self.assertEqual(self.stock(), {p0.id: 10, p1.id: 17, p2.id: 30, p3.id: 4})
+        ajustes = MovimientoInventario.objects.filter(referencia_doc=f'CONTEO-{conteo.id}')
+        self.assertEqual(
+            sorted(ajustes.values_list('producto_id', 'tipo_movimiento', 'cantidad')),
+            [(p1.id, 'S', Decimal('3')), (p3.id, 'E', Decimal('4'))]
+        )
+        conteo.refresh_from_db()
+        self.assertEqual(conteo.estado, 'C')
+
+    def test_omitidos_en_cero(self):
+        """En un conteo completo lo no contado se ajusta a cero"""
+        conteo = abrir_conteo(self.almacen.id)
+        registrar_conteo(conteo.id, [(self.productos[0].id, 10)])
+        cerrar_conteo(conteo.id, omitidos_en_cero=True)
+        self.assertEqual(set(self.stock().values()), {Decimal('10'), Decimal('0')})
+
+    def test_conteo_cerrado_no_acepta_cambios(self):
+        conteo = abrir_conteo(self.almacen.id)
+        cerrar_conteo(conteo.id)
+        with self.assertRaises(ErrorConteo):
+            registrar_conteo(conteo.id, [(self.productos[0].id, 1)])
+        with self.assertRaises(ErrorConteo):
+            cerrar_conteo(conteo.id)
+
+    def test_producto_inexistente(self):
+        conteo = abrir_conteo(self.almacen.id)
+        with self.assertRaises(ErrorConteo):
+            registrar_conteo(conteo.id, [(999999, 1)])
+        self.assertFalse(ConteoFisicoDetalle.objects.filter(conteo=conteo, cantidad_contada__isnull=False).exists())
+
+
+class ConteoFisicoAPITests(APITestCase):
+
+    def setUp(self):
+        Moneda.objects.create(codigo_iso='USD', nombre='Dólar', simbolo='$', es_principal=True)
+        CuentaContable.objects.create(codigo='613505', nombre='Costo de Venta', tipo='G', naturaleza='D')
+        CuentaContable.objects.create(codigo='143505', nombre='Inventario', tipo='A', naturaleza='D')
+        self.almacen = Almacen.objects.create(nombre='Almacén Test', codigo='ALM-TEST')
+        self.contado, self.sin_contar = Producto.objects.bulk_create([
+            Producto(nombre=f'P{i}', codigo_sku=f'SKU-{i}', precio_venta=2, costo_unitario=1, unidad_medida='Unidad')
+            for i in range(2)
+        ])
+        for producto in (self.contado, self.sin_contar):
+            MovimientoInventario.objects.create(
+                tipo_movimiento='E', producto=producto, almacen=self.almacen, cantidad=10, referencia_doc='INI'
+            )
+        usuario = User.objects.create_user(username='inventario_user', password='test123')
+        usuario.groups.add(Group.objects.create(name='Inventario'))
+        self.client.force_authenticate(user=usuario)
+        self.conteo = abrir_conteo(self.almacen.id)
+        registrar_conteo(self.conteo.id, [(self.contado.id, 7)])
+
+    def test_diferencias_con_el_conteo_abierto(self):
+        """Las diferencias se ven antes de cerrar; lo no contado no aparece"""
+        response = self.client.get(f'/api/inventario/conteos/{self.conteo.id}/diferencias/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [(fila['producto'], Decimal(fila['diferencia'])) for fila in response.data['results']],
+            [(self.contado.id, Decimal('-3'))]
+        )
+        self.assertEqual(response.data['resumen']['faltantes'], Decimal('-3'))
+        # Una consulta no escribe: la diferencia se guarda solo al cerrar
+        self.assertFalse(ConteoFisicoDetalle.objects.filter(conteo=self.conteo, diferencia__isnull=False).exists())
+
+    def test_omitidos_en_cero_false_desde_formulario(self):
+        """Un "false" enviado como formulario no ajusta a cero lo no contado"""
+        response = self.client.post(f'/api/inventario/conteos/{self.conteo.id}/cerrar/', {'omitidos_en_cero': 'false'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(Stock.objects.get(producto=self.sin_contar, almacen=self.almacen).cantidad, Decimal('10'))
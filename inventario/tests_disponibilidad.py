@@ -0,0 +1,60 @@
+# Archivo: inventario/tests_disponibilidad.py
+
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.test import TestCase
+from inventario.disponibilidad import disponibilidad_por_sku
+from inventario.models import Almacen, MovimientoInventario
+from central.models import Producto
+
+# ==============================================================================
+# PRUEBAS DE DISPONIBILIDAD POR SKU (CONSULTA EN LOTE CON CACHÉ)
+# ==============================================================================
+
+class DisponibilidadTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.norte = Almacen.objects.create(nombre='Norte', codigo='ALM-N')
+        self.sur = Almacen.objects.create(nombre='Sur', codigo='ALM-S')
+        self.tornillo, self.tuerca = Producto.objects.bulk_create([
+            Producto(nombre='Tornillo', codigo_sku='TOR-1', precio_venta=2, costo_unitario=1, unidad_medida='Unidad'),
+            Producto(nombre='Tuerca', codigo_sku='TUE-1', precio_venta=2, costo_unitario=1, unidad_medida='Unidad'),
+        ])
+        self.movimiento(self.tornillo, self.norte, 'E', 5)
+        self.movimiento(self.tornillo, self.sur, 'E', 7)
+
+    def movimiento(self, producto, almacen, tipo, cantidad):
+        MovimientoInventario.objects.create(
+            tipo_movimiento=tipo, producto=producto, almacen=almacen, cantidad=cantidad, referencia_doc='DISP'
+        )
+
+    def test_varios_skus_en_una_consulta(self):
+        with self.assertNumQueries(1):
+            disponibles, no_encontrados = disponibilidad_por_sku(['TOR-1', 'TUE-1', 'NO-EXISTE', 'TOR-1'])
+        self.assertEqual(disponibles['TOR-1']['total'], Decimal('12'))
+        self.assertEqual(disponibles['TOR-1']['almacenes'], {self.norte.id: Decimal('5'), self.sur.id: Decimal('7')})
+        self.assertEqual(disponibles['TUE-1'], {'producto': self.tuerca.id, 'total': Decimal('0'), 'almacenes': {}})
+        self.assertEqual(no_encontrados, ['NO-EXISTE'])
+
+    def test_segunda_consulta_sale_del_cache(self):
+        disponibilidad_por_sku(['TOR-1', 'TUE-1'])
+        with self.assertNumQueries(0):
+            disponibles, _ = disponibilidad_por_sku(['TOR-1', 'TUE-1'])
+        self.assertEqual(disponibles['TOR-1']['total'], Decimal('12'))
+
+    def test_movimiento_invalida_solo_su_producto(self):
+        disponibilidad_por_sku(['TOR-1', 'TUE-1'])
+        self.movimiento(self.tornillo, self.norte, 'S', 2)
+        with self.assertNumQueries(1):
+            disponibles, _ = disponibilidad_por_sku(['TOR-1', 'TUE-1'])
+        self.assertEqual(disponibles['TOR-1']['almacenes'][self.norte.id], Decimal('3'))
+
+    def test_cambio_de_sku(self):
+        disponibilidad_por_sku(['TOR-1'])
+        self.tornillo.codigo_sku = 'TOR-2'
+        self.tornillo.save()
+        disponibles, no_encontrados = disponibilidad_por_sku(['TOR-1', 'TOR-2'])
+        self.assertEqual(no_encontrados, ['TOR-1'])
+        self.assertEqual(disponibles['TOR-2']['total'], Decimal('12'))
@@ -0,0 +1,91 @@
+# Archivo: inventario/tests_kardex.py
+
+from datetime import date
+
+from django.test import TestCase
+from inventario.cortes import generar_corte
+from inventario.kardex import kardex
+from inventario.models import Almacen, MovimientoInventario
+from central.models import Producto
+
+# ==============================================================================
+# PRUEBAS DEL KARDEX (SALDOS ACUMULADOS Y PAGINACIÓN POR CURSOR)
+# ==============================================================================
+
+class KardexTests(TestCase):
+
+    def setUp(self):
+        self.producto = Producto.objects.create(
+            nombre='Producto Test', codigo_sku='TEST-001', precio_venta=100, costo_unitario=10, unidad_medida='Unidad'
+        )
+        self.almacen = Almacen.objects.create(nombre='Almacén Test', codigo='ALM-TEST')
+        self.otro = Almacen.objects.create(nombre='Almacén 2', codigo='ALM-2')
+
+    def movimiento(self, fecha, tipo, cantidad, almacen=None):
+        movimiento = MovimientoInventario.objects.create(
+            tipo_movimiento=tipo, producto=self.producto, almacen=almacen or self.almacen,
+            cantidad=cantidad, referencia_doc=f'{tipo}-{fecha}'
+        )
+        # 'fecha' es auto_now_add: se ajusta después para simular el historial
+        MovimientoInventario.objects.filter(pk=movimiento.pk).update(fecha=fecha)
+        return movimiento
+
+    def test_saldos_acumulados(self):
+        """Cada fila trae el saldo y el valor después del movimiento"""
+        self.movimiento(date(2026, 1, 1), 'E', 10)
+        self.movimiento(date(2026, 1, 2), 'S', 4)
+        self.movimiento(date(2026, 1, 3), 'E', 5)
+
+        pagina = kardex(self.producto.id)
+        self.assertEqual([fila['saldo'] for fila in pagina['filas']], [10, 6, 11])
+        self.assertEqual([fila['valor'] for fila in pagina['filas']], [100, 60, 110])
+        self.assertEqual([fila['salida'] for fila in pagina['filas']], [0, 4, 0])
+        self.assertIsNone(pagina['siguiente'])
+
+    def test_saldo_inicial_y_filtros(self):
+        """Con 'desde' el kardex parte del saldo previo; 'almacen' excluye los demás almacenes"""
+        self.movimiento(date(2026, 1, 1), 'E', 10)
+        self.movimiento(date(2026, 1, 1), 'E', 7, almacen=self.otro)
+        self.movimiento(date(2026, 2, 1), 'S', 3)
+
+        pagina = kardex(self.producto.id, almacen_id=self.almacen.id, desde=date(2026, 2, 1))
+        self.assertEqual((pagina['saldo_inicial'], pagina['valor_inicial']), (10, 100))
+        self.assertEqual([fila['saldo'] for fila in pagina['filas']], [7])
+
+        pagina = kardex(self.producto.id, desde=date(2026, 2, 1))
+        self.assertEqual([fila['saldo'] for fila in pagina['filas']], [14])
+
+    def test_valor_inicial_parte_del_corte(self):
+        """El valor previo sale del corte: los movimientos anteriores a él no se vuelven a sumar"""
+        self.movimiento(date(2025, 12, 1), 'E', 10)
+        self.movimiento(date(2025, 12, 2), 'S', 4)
+        generar_corte(date(2025, 12, 31))
+        MovimientoInventario.objects.filter(fecha__lte=date(2025, 12, 31)).delete()
+        self.movimiento(date(2026, 1, 5), 'E', 2)
+
+        pagina = kardex(self.producto.id, almacen_id=self.almacen.id, desde=date(2026, 2, 1))
+        self.assertEqual((pagina['saldo_inicial'], pagina['valor_inicial']), (8, 80))
+
+    def test_paginas_arrastran_el_saldo(self):
+        """Avanzar y retroceder por cursor da los mismos saldos que una sola página"""
+        for dia in range(1, 8):
+            self.movimiento(date(2026, 3, dia), 'E' if dia % 3 else 'S', dia)
+        completo = [fila['saldo'] for fila in kardex(self.producto.id, tamano=100)['filas']]
+
+        paginas, cursor = [], None
+        while True:
+            pagina = kardex(self.producto.id, cursor=cursor, tamano=3)
+            paginas.append(pagina)
+            if not pagina['siguiente']:
+                break
+            cursor = pagina['siguiente']
+        self.assertEqual([fila['saldo'] for pagina in paginas for fila in pagina['filas']], completo)
+        self.assertEqual(paginas[1]['saldo_inicial'], completo[2])
+
+        anterior = kardex(self.producto.id, cursor=paginas[-1]['anterior'], tamano=3)
+        self.assertEqual(anterior['filas'], paginas[-2]['filas'])
+        self.assertEqual(anterior['saldo_inicial'], paginas[-2]['saldo_inicial'])
+
+    def test_cursor_invalido(self):
+        with self.assertRaises(ValueError):
+            kardex(self.producto.id, cursor={'v': 'x'})
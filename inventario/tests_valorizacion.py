@@ -0,0 +1,96 @@
+# Archivo: inventario/tests_valorizacion.py
+
+from decimal import Decimal
+
+from django.test import TestCase, override_settings
+from inventario.existencias import crear_movimientos
+from inventario.models import Almacen, CapaCosto, MovimientoInventario, ValorizacionStock
+from inventario.valorizacion import inventario_valorizado
+from central.models import Producto
+
+# ==============================================================================
+# PRUEBAS DE VALORIZACIÓN DEL INVENTARIO (PROMEDIO Y PEPS)
+# ==============================================================================
+
+class ValorizacionTests(TestCase):
+
+    def setUp(self):
+        self.producto = Producto.objects.create(
+            nombre='Producto Test', codigo_sku='TEST-001', precio_venta=100, costo_unitario=10, unidad_medida='Unidad'
+        )
+        self.almacen = Almacen.objects.create(nombre='Almacén Test', codigo='ALM-TEST')
+
+    def movimiento(self, tipo, cantidad, costo_unitario=None):
+        return MovimientoInventario.objects.create(
+            tipo_movimiento=tipo, producto=self.producto, almacen=self.almacen,
+            cantidad=cantidad, costo_unitario=costo_unitario, referencia_doc=f'{tipo}-{cantidad}'
+        )
+
+    def valorizacion(self):
+        return ValorizacionStock.objects.get(producto=self.producto, almacen=self.almacen)
+
+    def test_costo_promedio_ponderado(self):
+        """Las salidas salen al costo promedio vigente"""
+        self.movimiento('E', 10, costo_unitario=10)
+        self.movimiento('E', 10, costo_unitario=20)
+        salida = self.movimiento('S', 5)
+
+        self.assertEqual(salida.costo_total, Decimal('75'))
+        salida.refresh_from_db()
+        self.assertEqual(salida.costo_total, Decimal('75'))
+        fila = self.valorizacion()
+        self.assertEqual((fila.cantidad, fila.valor_total, fila.costo_salidas), (15, Decimal('225'), Decimal('75')))
+        self.assertEqual(inventario_valorizado(), {'valor_total': Decimal('225'), 'costo_salidas': Decimal('75')})
+
+    def test_existencia_negativa_conserva_el_costo_promedio(self):
+        """Una salida sin existencias deja valor negativo: la entrada siguiente lo compensa"""
+        primera = self.movimiento('S', 5)                    # sin existencias: costo del producto (10)
+        self.movimiento('E', 10, costo_unitario=10)
+        segunda = self.movimiento('S', 5)
+
+        self.assertEqual((primera.costo_total, segunda.costo_total), (Decimal('50'), Decimal('50')))
+        fila = self.valorizacion()
+        self.assertEqual((fila.cantidad, fila.valor_total), (0, Decimal('0')))
+
+    @override_settings(HERMES_METODO_VALORIZACION='peps')
+    def test_capas_peps(self):
+        """Las salidas consumen primero las capas más antiguas"""
+        self.movimiento('E', 10, costo_unitario=10)
+        self.movimiento('E', 10, costo_unitario=20)
+        salida = self.movimiento('S', 15)
+
+        self.assertEqual(salida.costo_total, Decimal('200'))  # 10 x 10 + 5 x 20
+        self.assertEqual(self.valorizacion().valor_total, Decimal('100'))
+        self.assertEqual(
+            list(CapaCosto.objects.values_list('cantidad_disponible', flat=True)),
+            [Decimal('0'), Decimal('5')]
+        )
+
+    @override_settings(HERMES_METODO_VALORIZACION='peps')
+    def test_peps_entrada_cubre_primero_el_faltante(self):
+        """Una salida sin capas deja faltante: la entrada siguiente lo cubre y no abre capa por esas unidades"""
+        self.movimiento('S', 5)                              # sin existencias: costo del producto (10)
+        self.movimiento('E', 5, costo_unitario=12)
+        segunda = self.movimiento('S', 5)
+
+        # La capa de 12 ya cubrió la primera venta: la segunda vuelve al costo del producto
+        self.assertEqual(segunda.costo_total, Decimal('50'))
+        self.assertEqual(
+            list(CapaCosto.objects.values_list('cantidad_inicial', 'cantidad_disponible')),
+            [(Decimal('5'), Decimal('0'))]
+        )
+        self.assertEqual(self.valorizacion().cantidad, -5)
+
+    @override_settings(HERMES_METODO_VALORIZACION='peps')
+    def test_lote_igual_que_uno_a_uno(self):
+        """Un lote con entradas y salidas mezcladas queda igual que el camino por Signal"""
+        datos = [
+            {'tipo_movimiento': 'E', 'producto': self.producto.id, 'almacen': self.almacen.id,
+             'cantidad': 4, 'costo_unitario': Decimal('5'), 'referencia_doc': 'L-1'},
+            {'tipo_movimiento': 'E', 'producto': self.producto.id, 'almacen': self.almacen.id,
+             'cantidad': 4, 'costo_unitario': Decimal('7'), 'referencia_doc': 'L-2'},
+        ]
+        crear_movimientos(datos)
+        self.movimiento('S', 6)
+        fila = self.valorizacion()
+        self.assertEqual((fila.cantidad, fila.valor_total, fila.costo_salidas), (2, Decimal('14'), Decimal('34')))
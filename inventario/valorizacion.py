@@ -0,0 +1,174 @@
+# Archivo: inventario/valorizacion.py
+
+from collections import defaultdict, deque
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Sum
+
+from central.models import Producto
+from central.sql import upsert_sumando
+from .models import CapaCosto, MovimientoInventario, ValorizacionStock
+
+METODOS_VALORIZACION = ('promedio', 'peps')
+# Precisión de los costos (4 decimales, como costo_unitario/costo_total y ValorizacionStock)
+PRECISION_COSTO = Decimal('0.0001')
+
+
+def metodo_valorizacion():
+    """'promedio' (costo promedio ponderado, por defecto) o 'peps' (capas FIFO)."""
+    metodo = getattr(settings, 'HERMES_METODO_VALORIZACION', 'promedio')
+    if metodo not in METODOS_VALORIZACION:
+        raise ValueError(f"HERMES_METODO_VALORIZACION inválido: '{metodo}'. Opciones: {', '.join(METODOS_VALORIZACION)}.")
+    return metodo
+
+
+def _consumir_capas(capas, cantidad, modificadas):
+    """Consume 'cantidad' de las capas más antiguas. Retorna (costo, cantidad sin capa, último costo unitario)."""
+    costo, restante, ultimo_costo = Decimal('0'), cantidad, None
+    while restante > 0 and capas:
+        capa = capas[0]
+        tomada = min(restante, capa.cantidad_disponible)
+        costo += tomada * capa.costo_unitario
+        capa.cantidad_disponible -= tomada
+        restante -= tomada
+        ultimo_costo = capa.costo_unitario
+        if capa.pk:
+            modificadas[capa.pk] = capa
+        if capa.cantidad_disponible <= 0:
+            capas.popleft()
+    return costo, restante, ultimo_costo
+
+
+def valorizar_movimientos(movimientos):
+    """
+    Actualiza ValorizacionStock (y las capas PEPS) con movimientos ya guardados y
+    escribe en cada uno su costo_unitario/costo_total.
+
+    - Entradas: se valoran a su costo_total si ya lo traen (sin recalcularlo), si no
+      a su costo_unitario o, si tampoco lo traen, al del producto.
+    - Salidas: costo promedio vigente o capas más antiguas primero (PEPS). Si no hay
+      existencias valorizadas se usa el costo del producto; si tampoco existe, la
+      salida queda con costo_total=None (el asiento de costo de venta lo rechazará).
+    - Existencia negativa: el valor queda negativo y, en PEPS, la cantidad sin capa
+      es un faltante que las entradas siguientes cubren antes de abrir capa; así las
+      capas nunca suman más unidades que ValorizacionStock.
+
+    Las filas de ValorizacionStock se bloquean (SELECT ... FOR UPDATE, en orden de
+    clave) y todo se escribe con bulk_update: el número de consultas no depende del
+    número de movimientos del lote.
+    """
+    movimientos = sorted(
+        (m for m in movimientos if m.tipo_movimiento in ('E', 'S')),
+        key=lambda m: m.pk
+    )
+    if not movimientos:
+        return movimientos
+    peps = metodo_valorizacion() == 'peps'
+    claves = sorted({(m.producto_id, m.almacen_id) for m in movimientos})
+    productos = {producto_id for producto_id, _ in claves}
+    almacenes = {almacen_id for _, almacen_id in claves}
+
+    with transaction.atomic():
+        # Garantiza que cada fila exista antes de bloquearla
+        upsert_sumando(
+            ValorizacionStock, ['producto', 'almacen'], ['cantidad', 'valor_total', 'costo_salidas'],
+            [clave + (0, 0, 0) for clave in claves],
+        )
+        filas = {
+            (fila.producto_id, fila.almacen_id): fila
+            for fila in ValorizacionStock.objects.select_for_update()
+            .filter(producto_id__in=productos, almacen_id__in=almacenes)
+            .order_by('producto_id', 'almacen_id')
+        }
+        costos_producto = dict(Producto.objects.filter(pk__in=productos).values_list('id', 'costo_unitario'))
+
+        capas = defaultdict(deque)
+        if peps:
+            for capa in CapaCosto.objects.filter(
+                producto_id__in=productos, almacen_id__in=almacenes, cantidad_disponible__gt=0
+            ).order_by('id'):
+                capas[(capa.producto_id, capa.almacen_id)].append(capa)
+        nuevas_capas, capas_modificadas = [], {}
+
+        for movimiento in movimientos:
+            clave = (movimiento.producto_id, movimiento.almacen_id)
+            fila = filas[clave]
+            cantidad = Decimal(str(movimiento.cantidad))
+
+            if movimiento.tipo_movimiento == 'E':
+                costo_unitario = movimiento.costo_unitario
+                if costo_unitario is None and movimiento.costo_total is not None and cantidad:
+                    costo_unitario = (Decimal(str(movimiento.costo_total)) / cantidad).quantize(PRECISION_COSTO)
+                if costo_unitario is None:
+                    costo_unitario = costos_producto.get(movimiento.producto_id) or Decimal('0')
+                costo_unitario = Decimal(str(costo_unitario))
+                movimiento.costo_unitario = costo_unitario
+                if movimiento.costo_total is None:
+                    movimiento.costo_total = (costo_unitario * cantidad).quantize(PRECISION_COSTO)
+                else:
+                    # Un costo total dado (ej. el reverso de una salida) se respeta sin recalcular
+                    movimiento.costo_total = Decimal(str(movimiento.costo_total))
+                # Con existencia negativa (salidas sin capas que las cubrieran) la entrada
+                # primero cubre ese faltante: solo el resto queda disponible en su capa
+                faltante = max(-fila.cantidad, Decimal('0'))
+                fila.cantidad += cantidad
+                fila.valor_total += movimiento.costo_total
+                if fila.cantidad == 0:
+                    fila.valor_total = Decimal('0')
+                if peps:
+                    capa = CapaCosto(
+                        producto_id=movimiento.producto_id, almacen_id=movimiento.almacen_id,
+                        movimiento=movimiento, cantidad_inicial=cantidad,
+                        cantidad_disponible=max(cantidad - faltante, Decimal('0')), costo_unitario=costo_unitario,
+                    )
+                    if capa.cantidad_disponible > 0:
+                        capas[clave].append(capa)
+                    nuevas_capas.append(capa)
+                continue
+
+            # Salida
+            if peps:
+                costo, sin_capa, ultimo_costo = _consumir_capas(capas[clave], cantidad, capas_modificadas)
+                costo_respaldo = ultimo_costo if ultimo_costo is not None else costos_producto.get(movimiento.producto_id)
+            else:
+                costo, sin_capa = Decimal('0'), cantidad
+                costo_respaldo = fila.costo_promedio
+                if costo_respaldo is None:
+                    costo_respaldo = costos_producto.get(movimiento.producto_id)
+
+            if sin_capa > 0 and costo_respaldo is None:
+                movimiento.costo_unitario = movimiento.costo_total = None
+            else:
+                if sin_capa > 0:
+                    costo += sin_capa * Decimal(str(costo_respaldo))
+                movimiento.costo_total = costo.quantize(PRECISION_COSTO)
+                movimiento.costo_unitario = (costo / cantidad).quantize(PRECISION_COSTO) if cantidad else Decimal('0')
+                fila.valor_total -= movimiento.costo_total
+                fila.costo_salidas += movimiento.costo_total
+            fila.cantidad -= cantidad
+            # Con existencia negativa el valor también queda negativo: la próxima entrada
+            # lo compensa y el costo promedio sigue siendo valor / cantidad
+            if fila.cantidad == 0:
+                fila.valor_total = Decimal('0')
+
+        ValorizacionStock.objects.bulk_update(
+            [filas[clave] for clave in claves], ['cantidad', 'valor_total', 'costo_salidas']
+        )
+        MovimientoInventario.objects.bulk_update(movimientos, ['costo_unitario', 'costo_total'], batch_size=1000)
+        if capas_modificadas:
+            CapaCosto.objects.bulk_update(capas_modificadas.values(), ['cantidad_disponible'], batch_size=1000)
+        if nuevas_capas:
+            CapaCosto.objects.bulk_create(nuevas_capas, batch_size=1000)
+
+    return movimientos
+
+
+def inventario_valorizado(almacen=None):
+    """Valor total del inventario y costo acumulado de salidas: una fila por producto/almacén."""
+    filas = ValorizacionStock.objects.all()
+    if almacen is not None:
+        filas = filas.filter(almacen=almacen)
+    totales = filas.aggregate(valor_total=Sum('valor_total'), costo_salidas=Sum('costo_salidas'))
+    return {clave: valor or Decimal('0') for clave, valor in totales.items()}
@@ -1,26 +1,256 @@
 # Archivo: inventario/views.py
 
-from rest_framework import viewsets
+from datetime import date
+from rest_framework.utils.urls import replace_query_param
+from rest_framework import mixins, viewsets, status
+from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
-from .models import Almacen, Stock, MovimientoInventario
-from .serializers import AlmacenSerializer, StockSerializer, MovimientoInventarioSerializer
+from rest_framework.response import Response
+from .models import Almacen, Stock, MovimientoInventario, AlertaStockBajo, ConteoFisico
+from .serializers import (AlmacenSerializer, StockSerializer, MovimientoInventarioSerializer,
+    MovimientoLoteSerializer, PuntoReordenSerializer, AlertaStockBajoSerializer, DisponibilidadSerializer,
+    ConteoFisicoSerializer, ConteoFisicoDetalleSerializer, ConteoLineaSerializer, CerrarConteoSerializer,
+)
+from .existencias import ErrorMovimientos, crear_movimientos, validar_referencias
+from .alertas import fijar_puntos_reorden
+from .disponibilidad import disponibilidad_por_sku
+from .cortes import stock_a_fecha
+from .kardex import kardex
+from .conteos import (ErrorConteo, cancelar_conteo, cerrar_conteo, detalles_conteo, registrar_conteo,
+    resumen_conteo,
+)
+from central.models import Producto
+from central.contabilizacion import ErrorContabilizacion
+from central.pagination import PaginacionKeyset, codificar_cursor, decodificar_cursor
+from central.consultas import ConsultaOptimizadaMixin
 # Importamos permisos del núcleo
 from central.permissions import IsInventarioUser 
 
 # 1. Almacen ViewSet
-class AlmacenViewSet(viewsets.ModelViewSet):
+class AlmacenViewSet(ConsultaOptimizadaMixin, viewsets.ModelViewSet):
     queryset = Almacen.objects.all()
     serializer_class = AlmacenSerializer
     permission_classes = [IsInventarioUser]
 
 # 2. Stock ViewSet (Lista las existencias actuales)
-class StockViewSet(viewsets.ReadOnlyModelViewSet):
+class StockViewSet(ConsultaOptimizadaMixin, viewsets.ReadOnlyModelViewSet):
     queryset = Stock.objects.all()
     serializer_class = StockSerializer
     permission_classes = [IsInventarioUser]
 
+    def list(self, request, *args, **kwargs):
+        """
+        Con ?as_of=AAAA-MM-DD retorna las existencias al cierre de ese día, calculadas
+        desde el corte de stock más cercano (inventario/cortes.py). Filtros opcionales:
+        producto y almacen (ids).
+        """
+        as_of = request.query_params.get('as_of')
+        if not as_of:
+            return super().list(request, *args, **kwargs)
+        try:
+            fecha = date.fromisoformat(as_of)
+            filtros = {
+                nombre: [int(request.query_params[parametro])]
+                for nombre, parametro in (('productos', 'producto'), ('almacenes', 'almacen'))
+                if request.query_params.get(parametro)
+            }
+        except ValueError:
+            return Response(
+                {'error': 'as_of debe tener el formato AAAA-MM-DD; producto y almacen deben ser enteros'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        existencias = stock_a_fecha(fecha, **filtros)
+        productos = Producto.objects.in_bulk({producto_id for producto_id, _ in existencias})
+        almacenes = Almacen.objects.in_bulk({almacen_id for _, almacen_id in existencias})
+        filas = [
+            {
+                'producto': producto_id,
+                'producto_nombre': productos[producto_id].nombre,
+                'almacen': almacen_id,
+                'almacen_nombre': almacenes[almacen_id].nombre,
+                'cantidad': cantidad,
+            }
+            for (producto_id, almacen_id), cantidad in existencias.items()
+        ]
+        filas.sort(key=lambda fila: (fila['producto_nombre'], fila['almacen_nombre']))
+        return Response({'as_of': fecha, 'results': filas})
+
+    @action(detail=False, methods=['get'])
+    def alertas(self, request):
+        """Productos por debajo de su punto de reorden (tabla mantenida al cambiar Stock)."""
+        alertas = AlertaStockBajo.objects.select_related('producto', 'almacen')
+        if request.query_params.get('almacen'):
+            alertas = alertas.filter(almacen_id=request.query_params['almacen'])
+        pagina = self.paginate_queryset(alertas)
+        if pagina is not None:
+            return self.get_paginated_response(AlertaStockBajoSerializer(pagina, many=True).data)
+        return Response(AlertaStockBajoSerializer(alertas, many=True).data)
+
+    @action(detail=False, methods=['get', 'post'])
+    def disponibilidad(self, request):
+        """
+        Existencias por almacén de varios SKU en una petición: GET ?skus=A,B,C o
+        POST {"skus": [...]} (hasta 500). Responde {'results': {sku: {producto,
+        total, almacenes: {almacen_id: cantidad}}}, 'no_encontrados': [...]},
+        servido desde caché mientras el Stock del producto no cambie.
+        """
+        if request.method == 'GET':
+            datos = {'skus': [sku for sku in request.query_params.get('skus', '').split(',') if sku]}
+        else:
+            datos = request.data
+        serializer = DisponibilidadSerializer(data=datos)
+        serializer.is_valid(raise_exception=True)
+        disponibles, no_encontrados = disponibilidad_por_sku(serializer.validated_data['skus'])
+        return Response({'results': disponibles, 'no_encontrados': no_encontrados})
+
+    @action(detail=False, methods=['post'], url_path='puntos-reorden')
+    def puntos_reorden(self, request):
+        """
+        Fija puntos de reorden por producto y almacén. Recibe una lista de
+        {producto, almacen, punto_reorden}; punto_reorden null vuelve al valor por defecto.
+        """
+        serializer = PuntoReordenSerializer(data=request.data, many=True)
+        serializer.is_valid(raise_exception=True)
+        try:
+            validar_referencias(serializer.validated_data)
+        except ErrorMovimientos as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        actualizados = fijar_puntos_reorden(
+            (dato['producto'], dato['almacen'], dato['punto_reorden']) for dato in serializer.validated_data
+        )
+        return Response({'actualizados': actualizados})
+
 # 3. MovimientoInventario ViewSet (CRUD de los movimientos)
-class MovimientoInventarioViewSet(viewsets.ModelViewSet):
+class MovimientoInventarioViewSet(ConsultaOptimizadaMixin, viewsets.ModelViewSet):
     queryset = MovimientoInventario.objects.all()
     serializer_class = MovimientoInventarioSerializer
-    permission_classes = [IsInventarioUser]
\ No newline at end of file
+    permission_classes = [IsInventarioUser]
+
+    @action(detail=False, methods=['post'])
+    def lote(self, request):
+        """
+        Registra muchos movimientos a la vez (conteos físicos, escáneres de bodega).
+        Recibe una lista de {tipo_movimiento, producto, almacen, cantidad, referencia_doc};
+        todo el lote se guarda o se rechaza completo.
+        """
+        serializer = MovimientoLoteSerializer(data=request.data, many=True)
+        serializer.is_valid(raise_exception=True)
+        if not serializer.validated_data:
+            return Response({'error': 'El lote está vacío'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            movimientos = crear_movimientos(serializer.validated_data)
+        except (ErrorMovimientos, ErrorContabilizacion) as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(
+            {'creados': len(movimientos), 'ids': [movimiento.id for movimiento in movimientos]},
+            status=status.HTTP_201_CREATED
+        )
+
+
+    @action(detail=False, methods=['get'])
+    def kardex(self, request):
+        """
+        Kardex de un producto: movimientos en orden cronológico con entrada, salida,
+        saldo y valor acumulados (calculados en la base de datos). Parámetros:
+        producto (obligatorio), almacen, desde y hasta (AAAA-MM-DD). Se pagina por
+        cursor con los enlaces next/previous.
+        """
+        parametros = request.query_params
+        try:
+            producto = int(parametros['producto'])
+            almacen = int(parametros['almacen']) if parametros.get('almacen') else None
+            desde = date.fromisoformat(parametros['desde']) if parametros.get('desde') else None
+            hasta = date.fromisoformat(parametros['hasta']) if parametros.get('hasta') else None
+        except (KeyError, ValueError):
+            return Response(
+                {'error': 'producto es obligatorio; producto y almacen deben ser enteros y desde/hasta AAAA-MM-DD'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        token = parametros.get('cursor')
+        cursor = decodificar_cursor(token) if token else None
+        try:
+            pagina = kardex(
+                producto, almacen_id=almacen, desde=desde, hasta=hasta, cursor=cursor,
+                tamano=PaginacionKeyset().get_page_size(request),
+            )
+        except ValueError as e:
+            raise NotFound(str(e))
+
+        url = request.build_absolute_uri()
+        return Response({
+            'producto': producto,
+            'almacen': almacen,
+            'saldo_inicial': pagina['saldo_inicial'],
+            'valor_inicial': pagina['valor_inicial'],
+            'next': pagina['siguiente'] and replace_query_param(url, 'cursor', codificar_cursor(pagina['siguiente'])),
+            'previous': pagina['anterior'] and replace_query_param(url, 'cursor', codificar_cursor(pagina['anterior'])),
+            'results': pagina['filas'],
+        })
+
+
+# 4. ConteoFisico ViewSet (Inventario físico: abrir, cargar lo contado, cerrar)
+class ConteoFisicoViewSet(ConsultaOptimizadaMixin, mixins.CreateModelMixin, viewsets.ReadOnlyModelViewSet):
+    queryset = ConteoFisico.objects.all()
+    serializer_class = ConteoFisicoSerializer
+    permission_classes = [IsInventarioUser]
+
+    @action(detail=True, methods=['post'])
+    def lineas(self, request, pk=None):
+        """
+        Carga cantidades contadas: lista de {producto, cantidad}. Se puede llamar
+        varias veces (por zona o por escáner); un SKU ya cargado se reemplaza.
+        """
+        serializer = ConteoLineaSerializer(data=request.data, many=True)
+        serializer.is_valid(raise_exception=True)
+        try:
+            escritas = registrar_conteo(
+                pk, ((linea['producto'], linea['cantidad']) for linea in serializer.validated_data)
+            )
+        except ErrorConteo as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({'registradas': escritas})
+
+    @action(detail=True, methods=['get'])
+    def diferencias(self, request, pk=None):
+        """
+        SKU del conteo con su cantidad congelada, contada y diferencia. Por defecto
+        solo los que difieren; ?todos=1 lista todos. Incluye el resumen del conteo.
+        Mientras el conteo está abierto las diferencias se calculan en la consulta con
+        lo contado hasta el momento, sin escribir (los SKU no contados quedan sin diferencia).
+        """
+        conteo = self.get_object()
+        detalles = detalles_conteo(conteo).select_related('producto')
+        if not request.query_params.get('todos'):
+            detalles = detalles.exclude(diferencia_actual=0).exclude(diferencia_actual__isnull=True)
+        detalles = detalles.order_by('id')
+        pagina = self.paginate_queryset(detalles)
+        if pagina is not None:
+            respuesta = self.get_paginated_response(ConteoFisicoDetalleSerializer(pagina, many=True).data)
+        else:
+            respuesta = Response({'results': ConteoFisicoDetalleSerializer(detalles, many=True).data})
+        respuesta.data['resumen'] = resumen_conteo(conteo)
+        return respuesta
+
+    @action(detail=True, methods=['post'])
+    def cerrar(self, request, pk=None):
+        """
+        Calcula las diferencias y publica los ajustes en un solo lote. Con
+        {"omitidos_en_cero": true} los SKU no contados se ajustan a cero.
+        """
+        opciones = CerrarConteoSerializer(data=request.data)
+        opciones.is_valid(raise_exception=True)
+        try:
+            resumen = cerrar_conteo(pk, omitidos_en_cero=opciones.validated_data['omitidos_en_cero'])
+        except (ErrorConteo, ErrorMovimientos, ErrorContabilizacion) as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(resumen)
+
+    @action(detail=True, methods=['post'])
+    def cancelar(self, request, pk=None):
+        try:
+            cancelar_conteo(pk)
+        except ErrorConteo as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({'status': 'Conteo cancelado'})
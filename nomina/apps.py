@@ -0,0 +1,13 @@
+# Archivo: nomina/apps.py
+
+from django.apps import AppConfig
+from django.utils.translation import gettext_lazy as _
+
+class NominaConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'nomina'
+    verbose_name = _("Módulo de Nómina")
+
+    def ready(self):
+        # Registra el asiento de nómina en el motor de contabilización
+        import nomina.contabilizacion
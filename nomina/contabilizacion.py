@@ -0,0 +1,44 @@
+# Archivo: nomina/contabilizacion.py
+
+from central.contabilizacion import ErrorContabilizacion, registrar_contabilizador
+from central.maestros import cuentas_por_codigo, moneda_principal
+from central.models import CuentaContable, Moneda
+from .models import NominaEncabezado
+
+# Cuentas del asiento de nómina (ajustar según el plan contable)
+CUENTA_NOMINA = '510505'       # Gastos de nómina
+CUENTA_PROVISIONES = '260505'  # Provisiones
+CUENTA_POR_PAGAR = '210505'    # Nómina por pagar
+
+
+def asiento_nomina(nomina):
+    """Débito a Gastos por los devengos; crédito a Nómina por Pagar (neto) y Provisiones (deducciones)."""
+    try:
+        cuentas = cuentas_por_codigo(CUENTA_NOMINA, CUENTA_PROVISIONES, CUENTA_POR_PAGAR)
+        moneda_base = moneda_principal()
+    except (CuentaContable.DoesNotExist, Moneda.DoesNotExist) as e:
+        raise ErrorContabilizacion(f"Configuración contable no encontrada: {e}")
+
+    return {
+        'fecha': nomina.periodo.fecha_pago,
+        'referencia': f"NOM-{nomina.empleado.cedula}-{nomina.periodo.descripcion}",
+        'descripcion': f"Nómina {nomina.empleado.nombres} {nomina.periodo.descripcion}",
+        'entidad_id': None,  # No aplica a entidad comercial
+        'moneda_id': moneda_base.id,
+        'movimientos': [
+            (cuentas[CUENTA_NOMINA].id, 'D', nomina.total_devengos),
+            (cuentas[CUENTA_POR_PAGAR].id, 'C', nomina.neto_a_pagar),
+            (cuentas[CUENTA_PROVISIONES].id, 'C', nomina.total_deducciones),
+        ],
+    }
+
+
+def nominas_pendientes():
+    return (
+        NominaEncabezado.objects
+        .filter(asiento_contable__isnull=True)
+        .select_related('empleado', 'periodo')
+    )
+
+
+registrar_contabilizador('nominas', NominaEncabezado, asiento_nomina, 'asiento_contable', nominas_pendientes)
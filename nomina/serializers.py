@@ -3,7 +3,8 @@
 from rest_framework import serializers
 from django.db import transaction
 from .models import Empleado, ConceptoNomina, PeriodoNomina, NominaEncabezado, NominaDetalle
-from central.models import CuentaContable, TransaccionEncabezado, MovimientoContable
+from central.bandeja import contabilizar_o_encolar
+from central.contabilizacion import ErrorContabilizacion
 
 class EmpleadoSerializer(serializers.ModelSerializer):
     class Meta:
@@ -88,56 +89,9 @@ class NominaEncabezadoSerializer(serializers.ModelSerializer):
             return nomina
     
     def crear_asiento_contable(self, nomina):
-        """Crea el asiento contable automáticamente para la nómina"""
+        """Crea el asiento contable automáticamente para la nómina (motor de contabilización)"""
         try:
-            # Buscar cuentas contables (ajustar según tu plan contable)
-            cuenta_nomina = CuentaContable.objects.get(codigo='510505')  # Gastos de nómina
-            cuenta_provisiones = CuentaContable.objects.get(codigo='260505')  # Provisiones
-            cuenta_por_pagar = CuentaContable.objects.get(codigo='210505')  # Nómina por pagar
-            
-            # Usar moneda principal
-            from central.models import Moneda
-            moneda_principal = Moneda.objects.get(es_principal=True)
-            
-            # Crear encabezado del asiento
-            asiento = TransaccionEncabezado.objects.create(
-                fecha=nomina.periodo.fecha_pago,
-                referencia=f"NOM-{nomina.empleado.cedula}-{nomina.periodo.descripcion}",
-                descripcion=f"Nómina {nomina.empleado.nombres} {nomina.periodo.descripcion}",
-                entidad=None,  # No aplica a entidad comercial
-                moneda=moneda_principal,
-                tasa_cambio=1.0
-            )
-            
-            # Movimiento 1: Débito a Gastos de Nómina (total devengos)
-            MovimientoContable.objects.create(
-                encabezado=asiento,
-                cuenta=cuenta_nomina,
-                tipo_movimiento='D',
-                monto=nomina.total_devengos
-            )
-            
-            # Movimiento 2: Crédito a Nómina por Pagar (neto a pagar)
-            MovimientoContable.objects.create(
-                encabezado=asiento,
-                cuenta=cuenta_por_pagar,
-                tipo_movimiento='C',
-                monto=nomina.neto_a_pagar
-            )
-            
-            # Movimiento 3: Crédito a Provisiones (deducciones)
-            if nomina.total_deducciones > 0:
-                MovimientoContable.objects.create(
-                    encabezado=asiento,
-                    cuenta=cuenta_provisiones,
-                    tipo_movimiento='C',
-                    monto=nomina.total_deducciones
-                )
-            
-            # Enlazar asiento con nómina
-            nomina.asiento_contable = asiento
-            nomina.save()
-            
-        except (CuentaContable.DoesNotExist, Moneda.DoesNotExist) as e:
+            contabilizar_o_encolar('nominas', [nomina])
+        except ErrorContabilizacion as e:
             # En producción, esto debería manejarse mejor
-            print(f"ERROR: Configuración contable no encontrada: {e}")
\ No newline at end of file
+            print(f"ERROR: {e}")
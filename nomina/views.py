@@ -8,9 +8,10 @@ from .serializers import (
     EmpleadoSerializer, ConceptoNominaSerializer, 
     PeriodoNominaSerializer, NominaEncabezadoSerializer
 )
+from central.consultas import ConsultaOptimizadaMixin
 from central.permissions import IsContabilidadUser
 
-class EmpleadoViewSet(viewsets.ModelViewSet):
+class EmpleadoViewSet(ConsultaOptimizadaMixin, viewsets.ModelViewSet):
     queryset = Empleado.objects.all()
     serializer_class = EmpleadoSerializer
     permission_classes = [IsContabilidadUser]  # Contabilidad gestiona empleados
@@ -23,12 +24,12 @@ class EmpleadoViewSet(viewsets.ModelViewSet):
         empleado.save()
         return Response({'status': 'Empleado desactivado'})
 
-class ConceptoNominaViewSet(viewsets.ModelViewSet):
+class ConceptoNominaViewSet(ConsultaOptimizadaMixin, viewsets.ModelViewSet):
     queryset = ConceptoNomina.objects.all()
     serializer_class = ConceptoNominaSerializer
     permission_classes = [IsContabilidadUser]
 
-class PeriodoNominaViewSet(viewsets.ModelViewSet):
+class PeriodoNominaViewSet(ConsultaOptimizadaMixin, viewsets.ModelViewSet):
     queryset = PeriodoNomina.objects.all()
     serializer_class = PeriodoNominaSerializer
     permission_classes = [IsContabilidadUser]
@@ -46,7 +47,7 @@ class PeriodoNominaViewSet(viewsets.ModelViewSet):
             status=status.HTTP_400_BAD_REQUEST
         )
 
-class NominaEncabezadoViewSet(viewsets.ModelViewSet):
+class NominaEncabezadoViewSet(ConsultaOptimizadaMixin, viewsets.ModelViewSet):
     queryset = NominaEncabezado.objects.all()
     serializer_class = NominaEncabezadoSerializer
     permission_classes = [IsContabilidadUser]
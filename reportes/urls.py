@@ -1,7 +1,9 @@
 # Archivo: reportes/urls.py
 
 from django.urls import path
-from .views import DashboardView, ReporteVentasView, ReporteInventarioView, ReporteFinancieroView
+from .views import (DashboardView, ReporteVentasView, ReporteInventarioView, ReporteFinancieroView,
+    ReporteMovimientosView, ReporteCarteraView,
+)
 
 
 urlpatterns = [
@@ -9,4 +11,6 @@ urlpatterns = [
     path('ventas/', ReporteVentasView.as_view(), name='reporte-ventas'),
     path('financiero/', ReporteFinancieroView.as_view(), name='reporte-financiero'),
     path('inventario/', ReporteInventarioView.as_view(), name='reporte-inventario'),
+    path('movimientos/', ReporteMovimientosView.as_view(), name='reporte-movimientos'),
+    path('cartera/', ReporteCarteraView.as_view(), name='reporte-cartera'),
 ]
\ No newline at end of file
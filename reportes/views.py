@@ -5,9 +5,14 @@ from rest_framework.response import Response
 from rest_framework import status
 from django.db.models import Sum, Count, Avg
 from django.utils import timezone
-from datetime import timedelta
+from datetime import date, timedelta
 from central.models import Producto, EntidadComercial, TransaccionEncabezado
-from inventario.models import Stock, MovimientoInventario
+from inventario.models import AlertaStockBajo, Almacen, Stock, ResumenDiarioMovimiento
+from inventario.alertas import punto_reorden_por_defecto
+from inventario.cortes import stock_a_fecha
+from inventario.resumenes import serie_movimientos
+from inventario.valorizacion import inventario_valorizado
+from facturacion.cartera import antiguedad_cartera, cartera_abierta
 from facturacion.models import FacturaEncabezado, Pago
 from compras.models import OrdenCompra
 from nomina.models import NominaEncabezado, Empleado
@@ -25,21 +30,17 @@ class DashboardView(APIView):
         # Ventas del mes
         ventas_mes = FacturaEncabezado.objects.filter(
             fecha_emision__gte=inicio_mes,
-            estado='E'  # Emitidas
+            estado__in=['E', 'P']  # Emitidas (pendientes o ya pagadas)
         ).aggregate(
             total_ventas=Sum('total'),
             cantidad_facturas=Count('id')
         )
         
-        # Inventario valorizado
-        inventario_valorizado = Stock.objects.aggregate(
-            total_valor=Sum('cantidad')  # Aquí se podría multiplicar por costo
-        )
+        # Inventario valorizado (una fila por producto/almacén, mantenida en cada movimiento)
+        valorizacion = inventario_valorizado()
         
-        # Cuentas por cobrar
-        cuentas_por_cobrar = FacturaEncabezado.objects.filter(
-            estado='E'  # Emitidas (no pagadas)
-        ).aggregate(total_por_cobrar=Sum('total'))
+        # Cuentas por cobrar: saldo pendiente de la cartera abierta (descontados los pagos)
+        cuentas_por_cobrar = cartera_abierta().aggregate(total_por_cobrar=Sum('saldo_pendiente'))
         
         # Gastos de nómina del mes
         gastos_nomina = NominaEncabezado.objects.filter(
@@ -60,7 +61,8 @@ class DashboardView(APIView):
                 'facturas_mes': ventas_mes['cantidad_facturas'] or 0,
             },
             'inventario': {
-                'valor_total': inventario_valorizado['total_valor'] or 0,
+                'valor_total': valorizacion['valor_total'],
+                'costo_salidas': valorizacion['costo_salidas'],
                 'productos_activos': Producto.objects.filter(activo=True).count(),
             },
             'finanzas': {
@@ -86,7 +88,7 @@ class ReporteVentasView(APIView):
         fecha_inicio = request.GET.get('fecha_inicio')
         fecha_fin = request.GET.get('fecha_fin')
         
-        ventas = FacturaEncabezado.objects.filter(estado='E')
+        ventas = FacturaEncabezado.objects.filter(estado__in=['E', 'P'])
         
         if fecha_inicio:
             ventas = ventas.filter(fecha_emision__gte=fecha_inicio)
@@ -115,27 +117,36 @@ class ReporteInventarioView(APIView):
     permission_classes = [IsAuthenticated]
     
     def get(self, request):
-        """Reporte de inventario y stock"""
-        # Productos con stock bajo (menos de 10 unidades)
-        stock_bajo = Stock.objects.filter(
-            cantidad__lt=10
-        ).select_related('producto', 'almacen')
+        """Reporte de inventario y stock (con ?as_of=AAAA-MM-DD, al cierre de ese día)"""
+        as_of = request.GET.get('as_of')
+        if as_of:
+            try:
+                return Response(self.reporte_historico(date.fromisoformat(as_of)))
+            except ValueError:
+                return Response(
+                    {'error': 'as_of debe tener el formato AAAA-MM-DD'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
+        # Productos por debajo de su punto de reorden (tabla de alertas, ya al día)
+        stock_bajo = AlertaStockBajo.objects.select_related('producto', 'almacen')
         
         stock_bajo_data = [
             {
                 'producto': item.producto.nombre,
                 'almacen': item.almacen.nombre,
                 'cantidad': float(item.cantidad),
+                'punto_reorden': float(item.punto_reorden),
                 'sku': item.producto.codigo_sku
             }
             for item in stock_bajo
         ]
         
-        # Movimientos recientes (últimos 30 días)
+        # Movimientos recientes (últimos 30 días), desde el resumen diario
         fecha_limite = timezone.now().date() - timedelta(days=30)
-        movimientos_recientes = MovimientoInventario.objects.filter(
+        movimientos_recientes = ResumenDiarioMovimiento.objects.filter(
             fecha__gte=fecha_limite
-        ).count()
+        ).aggregate(total=Sum('movimientos'))['total'] or 0
         
         return Response({
             'stock_bajo': stock_bajo_data,
@@ -144,13 +155,108 @@ class ReporteInventarioView(APIView):
             'almacenes_activos': Stock.objects.values('almacen').distinct().count()
         })
 
+    def reporte_historico(self, fecha):
+        """Mismo reporte con las existencias al cierre de 'fecha' (corte de stock + movimientos posteriores)"""
+        existencias = stock_a_fecha(fecha)
+        # Umbrales vigentes (los puntos de reorden no se versionan)
+        defecto = punto_reorden_por_defecto()
+        umbrales = {
+            (producto_id, almacen_id): punto
+            for producto_id, almacen_id, punto in Stock.objects.filter(punto_reorden__isnull=False)
+            .values_list('producto_id', 'almacen_id', 'punto_reorden')
+        }
+        bajos = {
+            clave: cantidad for clave, cantidad in existencias.items()
+            if cantidad < umbrales.get(clave, defecto)
+        }
+        productos = Producto.objects.in_bulk({producto_id for producto_id, _ in bajos})
+        almacenes = Almacen.objects.in_bulk({almacen_id for _, almacen_id in bajos})
+
+        stock_bajo_data = [
+            {
+                'producto': productos[producto_id].nombre,
+                'almacen': almacenes[almacen_id].nombre,
+                'cantidad': float(cantidad),
+                'punto_reorden': float(umbrales.get((producto_id, almacen_id), defecto)),
+                'sku': productos[producto_id].codigo_sku
+            }
+            for (producto_id, almacen_id), cantidad in bajos.items()
+        ]
+
+        movimientos_recientes = ResumenDiarioMovimiento.objects.filter(
+            fecha__gt=fecha - timedelta(days=30), fecha__lte=fecha
+        ).aggregate(total=Sum('movimientos'))['total'] or 0
+
+        return {
+            'as_of': fecha,
+            'stock_bajo': stock_bajo_data,
+            'total_productos': Producto.objects.filter(activo=True).count(),
+            'movimientos_30_dias': movimientos_recientes,
+            'almacenes_activos': len({almacen_id for _, almacen_id in existencias}),
+        }
+
+class ReporteMovimientosView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        """
+        Serie de entradas y salidas de inventario (unidades vendidas = salidas) por
+        día o por mes, leída del resumen diario. Parámetros opcionales: desde y
+        hasta (AAAA-MM-DD, por defecto los últimos 12 meses), producto, almacen y
+        agrupacion=dia|mes.
+        """
+        hoy = timezone.now().date()
+        agrupacion = request.GET.get('agrupacion', 'dia')
+        try:
+            hasta = date.fromisoformat(request.GET['hasta']) if request.GET.get('hasta') else hoy
+            desde = date.fromisoformat(request.GET['desde']) if request.GET.get('desde') else hasta - timedelta(days=365)
+            producto = int(request.GET['producto']) if request.GET.get('producto') else None
+            almacen = int(request.GET['almacen']) if request.GET.get('almacen') else None
+        except ValueError:
+            return Response(
+                {'error': 'desde y hasta deben tener el formato AAAA-MM-DD; producto y almacen deben ser enteros'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if agrupacion not in ('dia', 'mes'):
+            return Response({'error': "agrupacion debe ser 'dia' o 'mes'"}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response({
+            'desde': desde,
+            'hasta': hasta,
+            'agrupacion': agrupacion,
+            'serie': serie_movimientos(desde, hasta, producto=producto, almacen=almacen, agrupacion=agrupacion),
+        })
+
+class ReporteCarteraView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        """
+        Antigüedad de cuentas por cobrar (por vencer, 0-30, 31-60, 61-90 y más de 90
+        días desde fecha_vencimiento), en total y por cliente. Solo lee la cartera
+        abierta (índice parcial). Parámetros opcionales: fecha_corte (AAAA-MM-DD,
+        por defecto hoy) y cliente.
+        """
+        try:
+            fecha_corte = (
+                date.fromisoformat(request.GET['fecha_corte']) if request.GET.get('fecha_corte')
+                else timezone.now().date()
+            )
+            cliente = int(request.GET['cliente']) if request.GET.get('cliente') else None
+        except ValueError:
+            return Response(
+                {'error': 'fecha_corte debe tener el formato AAAA-MM-DD; cliente debe ser entero'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        return Response(antiguedad_cartera(fecha_corte, cliente=cliente))
+
 class ReporteFinancieroView(APIView):
     permission_classes = [IsAuthenticated]
     
     def get(self, request):
         """Reporte financiero básico"""
         # Estado de resultados simplificado
-        ingresos = FacturaEncabezado.objects.filter(estado='E').aggregate(
+        ingresos = FacturaEncabezado.objects.filter(estado__in=['E', 'P']).aggregate(
             total=Sum('subtotal')  # Sin impuestos
         )['total'] or 0
         